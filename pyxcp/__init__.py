@@ -12,13 +12,22 @@ pretty.install()
 
 from .master import Master  # noqa: F401, E402
 from .master.async_master import AsyncMaster  # noqa: F401, E402
-from .transport import Can, Eth, SxI, Usb  # noqa: F401, E402
 from .transport.async_policy import AsyncPolicyAdapter, AsyncFrameSubscription, FrameNotification  # noqa: F401, E402
 
 
 console = Console()
 tb_install(show_locals=True, max_frames=3)  # Install custom exception handler.
 
+
+def __getattr__(name: str):
+    # Transport classes (Can, Eth, SxI, Usb) are imported on first access.
+    if name in ("Can", "Eth", "SxI", "Usb"):
+        from . import transport
+
+        return getattr(transport, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # if you update this manually, do not forget to update
 # pyproject.toml.
 __version__ = "0.29.14"
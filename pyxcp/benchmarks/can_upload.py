@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""
+Multi-frame UPLOAD throughput over (simulated) XCPonCAN-FD.
+
+A fake CAN-FD bus answers each UPLOAD with 64-byte frames (block mode, PID
+0xFF followed by up to 63 bytes, the last frame padded to a valid DLC), one
+every `--frame-time` microseconds (~130 us: 64 bytes at 5 Mbit/s data phase);
+the `Can` transport receives them with its usual listener thread. Measured is
+`Master.fetch()` of a calibration-image sized block, once with the former
+reassembly (`bytes +=` per frame, polling `resQueue` for CAN, list-based
+`fetch()`), once with the current one (`block_receive_into()` waiting on
+the response condition, preallocated `bytearray`), and streamed into a
+file with `Master.fetch_into()`.
+
+Run with ``--memory`` to also report the peak Python memory usage (tracemalloc,
+which slows down the allocation heavy variants considerably).
+
+Usage:
+    python -m pyxcp.benchmarks.can_upload [--size N] [--chunk N] [--frame-time US] [--memory]
+"""
+
+import argparse
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from functools import partial
+from types import SimpleNamespace
+
+from can import Message
+
+from pyxcp.master.master import Master
+from pyxcp.transport.can import Can, set_DLC
+from pyxcp.transport.transport_ext import NoOpPolicy
+from pyxcp.utils import short_sleep
+
+
+class FakeCanFdBus:
+    """python-can like bus with a simulated slave answering UPLOAD requests from `image`."""
+
+    def __init__(self, image: bytes, frame_time: float) -> None:
+        self.image = image
+        self.frame_time = frame_time
+        self.position = 0
+        self.frames = deque()
+        self.condition = threading.Condition()
+        self.filters = []
+        self.state = "ACTIVE"
+
+    def set_filters(self, filters) -> None:
+        self.filters = filters
+
+    def send(self, msg: Message) -> None:
+        if msg.data[0] == 0xF5:  # UPLOAD
+            length = msg.data[1]
+            data = self.image[self.position : self.position + length]
+            self.position += length
+            responses = []
+            due = time.perf_counter()
+            for offset in range(0, max(len(data), 1), 63):
+                payload = b"\xff" + data[offset : offset + 63]
+                payload += b"\xaa" * (set_DLC(len(payload)) - len(payload))
+                due += self.frame_time
+                responses.append((due, Message(arbitration_id=2, is_extended_id=False, is_fd=True, data=payload)))
+            with self.condition:
+                self.frames.extend(responses)
+                self.condition.notify()
+
+    def recv(self, timeout=None):
+        with self.condition:
+            if not self.frames and timeout:
+                self.condition.wait(timeout)
+            if not self.frames:
+                return None
+            due, msg = self.frames[0]
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)  # Frame still "on the bus".
+        with self.condition:
+            self.frames.popleft()
+        msg.timestamp = time.time()
+        return msg
+
+    def shutdown(self) -> None:
+        pass
+
+
+def make_master(bus: FakeCanFdBus):
+    can = SimpleNamespace(
+        can_id_master=1,
+        can_id_slave=2,
+        interface="custom",
+        channel=None,
+        use_default_listener=True,
+        fd=True,
+        max_dlc_required=False,
+        padding_value=0,
+        daq_identifier=[],
+        pid_off=False,
+    )
+    config = SimpleNamespace(can=can, create_daq_timestamps=False, alignment=1, timeout=2.0, latency_histograms=False)
+    transport = Can(config, policy=NoOpPolicy(), transport_layer_interface=bus)
+    transport.parent = SimpleNamespace(_setService=lambda service: None)
+    transport.connect()
+    master = SimpleNamespace(
+        slaveProperties=SimpleNamespace(bytesPerElement=1, maxCto=64, slaveBlockMode=True),
+        transport=transport,
+        transport_name="can",
+        memory_image=None,
+    )
+    master.upload = partial(Master.upload.__wrapped__, master)
+    master.upload_into = partial(Master.upload_into.__wrapped__, master)
+    master.fetch_into = partial(Master.fetch_into, master)
+    master._fetch_payload = partial(Master._fetch_payload, master)
+    return master
+
+
+def legacy_block_receive(transport, length_required: int) -> bytes:
+    block_response = b""
+    deadline = time.monotonic_ns() + transport.timeout
+    while len(block_response) < length_required:
+        if transport.resQueue:
+            block_response += transport.resQueue.popleft()[1:]
+        elif time.monotonic_ns() > deadline:
+            raise TimeoutError("block_receive")
+        else:
+            short_sleep()
+    return block_response
+
+
+def legacy_upload(master, length: int) -> bytes:
+    from pyxcp import types
+
+    response = master.transport.request(types.Command.UPLOAD, length)
+    if length > master.slaveProperties.maxCto - 1:
+        response += legacy_block_receive(master.transport, length - len(response))
+    return response
+
+
+def legacy_fetch(master, length: int, chunk_size: int) -> bytes:
+    result = []
+    for _ in range(length // chunk_size):
+        result.extend(legacy_upload(master, chunk_size)[:chunk_size])
+    if length % chunk_size:
+        result.extend(legacy_upload(master, length % chunk_size)[: length % chunk_size])
+    return bytes(result)
+
+
+def run(size: int, chunk: int, frame_time: float, variant: str, memory: bool) -> dict:
+    image = bytes(idx & 0xFF for idx in range(size))
+    bus = FakeCanFdBus(image, frame_time)
+    master = make_master(bus)
+    try:
+        if memory:
+            tracemalloc.start()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        if variant == "legacy":
+            data = legacy_fetch(master, size, chunk)
+        elif variant == "fetch":
+            data = Master.fetch(master, size, limit_payload=chunk)
+        else:
+            with open(os.devnull, "wb") as sink:
+                Master.fetch_into(master, size, sink, limit_payload=chunk)
+            data = image
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu_start
+        peak = tracemalloc.get_traced_memory()[1] if memory else 0
+        tracemalloc.stop()
+        assert data == image, "upload mismatch"
+        return {"elapsed": elapsed, "cpu": cpu, "peak": peak}
+    finally:
+        master.transport.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCPonCAN-FD multi-frame UPLOAD benchmark.")
+    parser.add_argument("--size", type=int, default=4 * 1024 * 1024, help="Bytes to upload (default: 4 MiB)")
+    parser.add_argument("--chunk", type=int, default=255, help="Bytes per UPLOAD command (default: 255)")
+    parser.add_argument("--frame-time", type=float, default=130.0, help="Bus time per frame in microseconds (default: 130)")
+    parser.add_argument("--memory", action="store_true", help="Report peak memory usage (tracemalloc).")
+    args = parser.parse_args()
+
+    print(f"fetch() of {args.size} bytes, {args.chunk} bytes per UPLOAD, CAN-FD frames of 64 bytes every {args.frame_time} us")
+    print(f"{'Reassembly':<34}{'wall [s]':>10}{'CPU [s]':>10}{'[MB/s]':>10}" + (f"{'peak [MiB]':>12}" if args.memory else ""))
+    variants = (
+        ("bytes +=, polling, list fetch()", "legacy"),
+        ("block_receive_into(), bytearray", "fetch"),
+        ("fetch_into(), file", "stream"),
+    )
+    for name, variant in variants:
+        r = run(args.size, args.chunk, args.frame_time / 1e6, variant, args.memory)
+        peak = f"{r['peak'] / 2**20:>12.2f}" if args.memory else ""
+        print(f"{name:<34}{r['elapsed']:>10.3f}{r['cpu']:>10.3f}{args.size / r['elapsed'] / 1e6:>10.2f}{peak}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Block-mode transmit throughput (DOWNLOAD_NEXT) against a loopback XCPonEth slave.
+
+The slave thread just drains its socket and counts the bytes. Measured is the time
+`block_request_many()` takes for a whole block, once with one `send()` per frame
+and once with the batched path (`EthBlockSender`: all frames in one buffer, a single
+`sendmsg()` for TCP, `sendmmsg()` for UDP).
+
+UDP datagrams that don't fit into the slave's receive buffer are dropped by the
+kernel; the received count shows whether the slave kept up.
+
+Linux only (the batched path needs `sendmmsg()`).
+
+Usage:
+    python -m pyxcp.benchmarks.eth_block_send [--frames N] [--size N] [--repeat N] [--tcp]
+"""
+
+import argparse
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+from pyxcp import types
+from pyxcp.transport.eth import Eth
+from pyxcp.transport.transport_ext import Pacer
+
+
+class SinkSlave(threading.Thread):
+    """Receives and discards everything, counting the bytes."""
+
+    def __init__(self, protocol: str = "UDP") -> None:
+        super().__init__(daemon=True)
+        self.protocol = protocol
+        kind = socket.SOCK_STREAM if protocol == "TCP" else socket.SOCK_DGRAM
+        self.sock = socket.socket(socket.AF_INET, kind)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        if protocol == "TCP":
+            self.sock.listen(1)
+        self.received = 0
+
+    def run(self) -> None:
+        conn = self.sock.accept()[0] if self.protocol == "TCP" else self.sock
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                return
+            self.received += len(data)
+
+
+def make_transport(port: int, protocol: str, batched: bool) -> Eth:
+    eth = SimpleNamespace(
+        host="127.0.0.1",
+        port=port,
+        protocol=protocol,
+        ipv6=False,
+        tcp_nodelay=True,
+        bind_to_address=None,
+        bind_to_port=None,
+        ptp_timestamping=False,
+        batched_block_send=batched,
+    )
+    config = SimpleNamespace(eth=eth, create_daq_timestamps=False, alignment=1, timeout=2.0, latency_histograms=False)
+    transport = Eth(config)
+    transport.parent = SimpleNamespace(_setService=lambda service: None)
+    return transport
+
+
+def run(protocol: str, batched: bool, frames: int, size: int, repeat: int) -> dict:
+    slave = SinkSlave(protocol)
+    slave.start()
+    transport = make_transport(slave.port, protocol, batched)
+    transport.connect()
+    data = bytes(range(size - 2))
+    requests = [(types.Command.DOWNLOAD_NEXT, (bytes((len(data),)) + data,)) for _ in range(frames)]
+    try:
+        transport.block_request_many(requests[:100])  # Warm-up.
+        sent = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sent += transport.block_request_many(requests, Pacer(0))
+        elapsed = time.perf_counter() - start
+        time.sleep(0.2)
+        return {"elapsed": elapsed, "bytes": sent, "received": slave.received}
+    finally:
+        transport.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCPonEth block-mode transmit benchmark (loopback).")
+    parser.add_argument("--frames", type=int, default=4096, help="Frames per block (default: 4096)")
+    parser.add_argument("--size", type=int, default=255, help="XCP packet size (MAX_CTO) in bytes (default: 255)")
+    parser.add_argument("--repeat", type=int, default=10, help="Blocks to send (default: 10)")
+    parser.add_argument("--tcp", action="store_true", help="Use TCP instead of UDP.")
+    args = parser.parse_args()
+
+    protocol = "TCP" if args.tcp else "UDP"
+    print(f"XCPonEth/{protocol} loopback -- {args.repeat} x {args.frames} DOWNLOAD_NEXT frames of {args.size} bytes")
+    print(f"{'Transmit path':<28}{'time [s]':>10}{'MB/s':>10}{'us/frame':>10}{'received':>12}")
+    for name, batched in (("send() per frame", False), ("EthBlockSender", True)):
+        r = run(protocol, batched, args.frames, args.size, args.repeat)
+        count = args.frames * args.repeat
+        print(
+            f"{name:<28}{r['elapsed']:>10.3f}{r['bytes'] / r['elapsed'] / 1e6:>10.1f}"
+            f"{r['elapsed'] / count * 1e6:>10.2f}{r['received'] / r['bytes']:>11.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
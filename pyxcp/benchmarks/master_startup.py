@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Time-to-first-CONNECT of XCPonCAN masters.
+
+Measured are
+- the time to `import pyxcp` (fresh interpreter) and which transport modules it loads,
+- python-can interface probing (`detect_available_configs()`): first call and cached,
+- per master: construction (`Master("can", ...)`, i.e. transport and interface setup)
+  and connecting (interface and CONNECT round trip) against a slave on a python-can `virtual` bus.
+
+The first master of a process pays for one-off work (imports, interface probing),
+the others show the steady-state cost of short-lived masters, e.g. in test suites.
+
+Usage:
+    python -m pyxcp.benchmarks.master_startup [--masters N] [--probe INTERFACE,...]
+"""
+
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import can
+
+from pyxcp import Master
+from pyxcp.config import General, Transport
+from pyxcp.transport.can import available_interface_configs
+
+
+CHANNEL = "pyxcp-startup-bench"
+CAN_ID_MASTER = 0x7E0
+CAN_ID_SLAVE = 0x7E1
+# Positive CONNECT response: RESOURCE, COMM_MODE_BASIC (Intel), MAX_CTO 8, MAX_DTO 8, versions 1.1.
+CONNECT_RESPONSE = bytes([0xFF, 0x1D, 0x00, 0x08, 0x08, 0x00, 0x01, 0x01])
+
+
+class VirtualSlave(threading.Thread):
+    """Answers CONNECT and DISCONNECT on the virtual bus."""
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.bus = can.Bus(interface="virtual", channel=CHANNEL)
+        self.running = True
+
+    def run(self) -> None:
+        while self.running:
+            message = self.bus.recv(0.1)
+            if message is None or message.arbitration_id != CAN_ID_MASTER:
+                continue
+            response = CONNECT_RESPONSE if message.data[0] == 0xFF else b"\xff"
+            self.bus.send(can.Message(arbitration_id=CAN_ID_SLAVE, data=response, is_extended_id=False))
+
+
+def make_config() -> SimpleNamespace:
+    transport = Transport()
+    transport.timeout = 1.0
+    transport.can.interface = "virtual"
+    transport.can.channel = CHANNEL
+    transport.can.can_id_master = CAN_ID_MASTER
+    transport.can.can_id_slave = CAN_ID_SLAVE
+    general = General()
+    general.connect_retries = 0
+    return SimpleNamespace(general=general, transport=transport)
+
+
+def import_time() -> dict:
+    code = (
+        "import sys, time; start = time.perf_counter(); import pyxcp; elapsed = time.perf_counter() - start; "
+        "print(elapsed, ','.join(m for m in ('can', 'eth', 'sxi', 'usb_transport') if f'pyxcp.transport.{m}' in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split()
+    return {"elapsed": float(output[0]), "transports": output[1] if len(output) > 1 else "-"}
+
+
+def probe_time(interface: str) -> tuple:
+    start = time.perf_counter()
+    available_interface_configs(interface)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    available_interface_configs(interface)
+    return first, time.perf_counter() - start
+
+
+def run(masters: int) -> list:
+    slave = VirtualSlave()
+    slave.start()
+    config = make_config()
+    samples = []
+    try:
+        for _ in range(masters):
+            start = time.perf_counter()
+            master = Master("can", config=config)
+            created = time.perf_counter()
+            master.transport.connect()
+            master.connect()
+            connected = time.perf_counter()
+            master.close()
+            samples.append((created - start, connected - created))
+    finally:
+        slave.running = False
+        slave.join()
+        slave.bus.shutdown()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCPonCAN time-to-first-CONNECT benchmark (python-can virtual bus).")
+    parser.add_argument("--masters", type=int, default=50, help="Masters to create and connect (default: 50)")
+    parser.add_argument("--probe", default="socketcan,pcan,vector", help="Interfaces to probe (default: socketcan,pcan,vector)")
+    args = parser.parse_args()
+    logging.getLogger("pyxcp").setLevel(logging.ERROR)
+
+    imported = import_time()
+    print(f"import pyxcp: {imported['elapsed'] * 1e3:.1f} ms, transport modules loaded: {imported['transports']}")
+    for interface in filter(None, args.probe.split(",")):
+        first, cached = probe_time(interface)
+        print(f"probe {interface!r}: first {first * 1e3:.2f} ms, cached {cached * 1e3:.3f} ms")
+    samples = run(args.masters)
+    print(f"{'':<22}{'construct [ms]':>16}{'CONNECT [ms]':>14}{'total [ms]':>12}")
+    first_construct, first_connect = samples[0]
+    print(
+        f"{'first master':<22}{first_construct * 1e3:>16.2f}{first_connect * 1e3:>14.2f}{(first_construct + first_connect) * 1e3:>12.2f}"
+    )
+    if len(samples) > 1:
+        construct = statistics.median(s[0] for s in samples[1:])
+        connect = statistics.median(s[1] for s in samples[1:])
+        print(f"{'further (median)':<22}{construct * 1e3:>16.2f}{connect * 1e3:>14.2f}{(construct + connect) * 1e3:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
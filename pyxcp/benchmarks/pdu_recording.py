@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Per-frame cost of the diagnostics PDU history (`BaseTransport._last_pdus`).
+
+Compares the former approach -- building a dict with a `hexDump()` rendered
+payload for every received frame -- with recording the raw frame into the
+binary `PduRingBuffer`, which defers all formatting until a diagnostics dump
+is actually requested.
+
+Usage:
+    python -m pyxcp.benchmarks.pdu_recording [--frames N] [--size N]
+"""
+
+import argparse
+import time
+from collections import deque
+
+from pyxcp.transport.base import DAQ_CODE, DAQ_PDU_DATA_LIMIT, PDU_DATA_LIMIT, PDU_IN, PduRingBuffer
+from pyxcp.transport.transport_ext import FrameCategory
+from pyxcp.utils import hexDump
+
+
+def run_legacy(frames) -> int:
+    last_pdus = deque(maxlen=200)
+    DAQ = FrameCategory.DAQ
+    start = time.perf_counter_ns()
+    for counter, (timestamp, payload) in enumerate(frames):
+        entry = {
+            "dir": "in",
+            "cat": DAQ.name,
+            "ctr": int(counter),
+            "ts": int(timestamp),
+            "len": int(len(payload)),
+            "data": hexDump(payload[:8])[:512],
+        }
+        last_pdus.append(entry)
+    return time.perf_counter_ns() - start
+
+
+def run_ring(frames) -> int:
+    ring = PduRingBuffer(capacity=200, max_data=PDU_DATA_LIMIT)
+    record = ring.record
+    start = time.perf_counter_ns()
+    for counter, (timestamp, payload) in enumerate(frames):
+        record(PDU_IN, DAQ_CODE, counter, timestamp, len(payload), payload, DAQ_PDU_DATA_LIMIT)
+    return time.perf_counter_ns() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Diagnostics PDU recording benchmark.")
+    parser.add_argument("--frames", type=int, default=200_000, help="Number of DAQ frames (default: 200000)")
+    parser.add_argument("--size", type=int, default=16, help="DAQ payload size in bytes (default: 16)")
+    args = parser.parse_args()
+
+    payload = bytes(range(args.size))
+    frames = [(idx * 1000, payload) for idx in range(args.frames)]
+
+    legacy = run_legacy(frames)
+    ring = run_ring(frames)
+    print(f"{args.frames} DAQ frames, {args.size} bytes payload")
+    print(f"{'Recorder':<22}{'[ns/frame]':>12}{'[kfps]':>12}")
+    for name, elapsed in (("dict + hexDump", legacy), ("PduRingBuffer", ring)):
+        print(f"{name:<22}{elapsed / args.frames:>12.1f}{args.frames / elapsed * 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
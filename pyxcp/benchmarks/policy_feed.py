@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+DAQ frame throughput of the transport -> policy hand-over.
+
+Compares feeding every received DAQ frame individually (one `policy_lock`
+acquisition and one Python/C++ crossing per frame, as `process_response()`
+does outside of a batch) with collecting the frames of one listener wake-up
+in a `FrameBatch` and handing them over via `feed_batch()`.
+
+Usage:
+    python -m pyxcp.benchmarks.policy_feed [--frames N] [--batch N] [--size N]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from pyxcp.transport.base import DAQ_CODE, FrameBatch
+from pyxcp.transport.transport_ext import FrameCategory, FrameRecorderPolicy, NoOpPolicy
+
+
+def run_single(policy, frames) -> float:
+    DAQ = FrameCategory.DAQ
+    feed = policy.feed
+    lock = threading.Lock()
+    start = time.perf_counter_ns()
+    for counter, (timestamp, payload) in enumerate(frames):
+        with lock:
+            feed(DAQ, counter, timestamp, payload)
+    return time.perf_counter_ns() - start
+
+
+def run_batched(policy, frames, batch_size: int) -> float:
+    batch = FrameBatch()
+    append = batch.append
+    feed_batch = policy.feed_batch
+    lock = threading.Lock()
+    start = time.perf_counter_ns()
+    for counter, (timestamp, payload) in enumerate(frames):
+        append(DAQ_CODE, counter, timestamp, payload)
+        if len(batch) >= batch_size:
+            with lock:
+                feed_batch(batch.data, batch.offsets, batch.lengths, batch.counters, batch.timestamps, batch.categories)
+            batch.clear()
+    if batch:
+        with lock:
+            feed_batch(batch.data, batch.offsets, batch.lengths, batch.counters, batch.timestamps, batch.categories)
+    return time.perf_counter_ns() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Policy feed throughput benchmark.")
+    parser.add_argument("--frames", type=int, default=200_000, help="Number of DAQ frames (default: 200000)")
+    parser.add_argument("--batch", type=int, default=64, help="Frames per feed_batch() call (default: 64)")
+    parser.add_argument("--size", type=int, default=16, help="DAQ payload size in bytes (default: 16)")
+    args = parser.parse_args()
+
+    payload = bytes(range(args.size))
+    frames = [(idx * 1000, payload) for idx in range(args.frames)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        policies = {
+            "NoOpPolicy": lambda: NoOpPolicy(),
+            "FrameRecorderPolicy": lambda: FrameRecorderPolicy(os.path.join(tmp_dir, f"bench_{time.perf_counter_ns()}")),
+        }
+        print(f"{args.frames} DAQ frames, {args.size} bytes payload, batch size {args.batch}")
+        print(f"{'Policy':<22}{'feed [kfps]':>14}{'feed_batch [kfps]':>20}")
+        for name, factory in policies.items():
+            policy = factory()
+            single = run_single(policy, frames)
+            policy.finalize()
+            policy = factory()
+            batched = run_batched(policy, frames, args.batch)
+            policy.finalize()
+            print(f"{name:<22}{args.frames / single * 1e6:>14.1f}{args.frames / batched * 1e6:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Round-trip latency of short XCP commands against a loopback XCPonEth slave.
+
+A tiny slave runs in a separate process (so it doesn't compete for the GIL) and
+answers SHORT_UPLOAD and GET_DAQ_CLOCK immediately, so the measured latency is
+dominated by the host-side request/response machinery (send, listener threads,
+completion, response checking).
+
+Run with ``--legacy`` to measure the previous completion path for comparison:
+response deque + condition variable polled in 100 ms slices, responses checked
+by parsing them with `types.Response`.
+
+Run with ``--native`` to receive via the native `EthNativeReceiver` thread,
+with ``--single-thread`` to read, frame and dispatch on one Python thread.
+
+Run with ``--histograms`` to enable the transport's own per-command latency
+histograms (`transport.latencies`) and print them, split into queueing,
+send->response and total time; comparing runs with and without it shows the
+recording overhead.
+
+Usage:
+    python -m pyxcp.benchmarks.request_latency [--iterations N] [--legacy] [--tcp] [--native] [--single-thread] [--histograms]
+"""
+
+import argparse
+import multiprocessing
+import socket
+import statistics
+import struct
+import time
+from types import SimpleNamespace
+from typing import Optional, Tuple
+
+from pyxcp import types
+from pyxcp.transport.base import EmptyFrameError, ResponseSlot
+from pyxcp.transport.eth import Eth
+
+
+HEADER = struct.Struct("<HH")
+
+
+class LoopbackSlave(multiprocessing.Process):
+    """Answers every command with a positive response of plausible size."""
+
+    def __init__(self, protocol: str = "UDP") -> None:
+        super().__init__(daemon=True)
+        self.protocol = protocol
+        self._port = multiprocessing.Queue()
+        self.port: Optional[int] = None
+
+    def start(self) -> None:
+        super().start()
+        self.port = self._port.get(timeout=10.0)
+
+    @staticmethod
+    def answer(request: bytes) -> bytes:
+        cmd = request[0]
+        if cmd == types.Command.SHORT_UPLOAD:
+            return b"\xff" + bytes(range(request[1]))
+        elif cmd == types.Command.GET_DAQ_CLOCK:
+            return b"\xff\x00\x00\x00" + struct.pack("<I", time.perf_counter_ns() & 0xFFFFFFFF)
+        return b"\xff"
+
+    def run(self) -> None:
+        kind = socket.SOCK_STREAM if self.protocol == "TCP" else socket.SOCK_DGRAM
+        self.sock = socket.socket(socket.AF_INET, kind)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        if self.protocol == "TCP":
+            self.sock.listen(1)
+        self._port.put(self.sock.getsockname()[1])
+        if self.protocol == "TCP":
+            conn, _ = self.sock.accept()
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            while True:
+                header = conn.recv(HEADER.size)
+                if not header:
+                    return
+                length, counter = HEADER.unpack(header)
+                response = self.answer(conn.recv(length))
+                conn.send(HEADER.pack(len(response), counter) + response)
+        else:
+            while True:
+                data, addr = self.sock.recvfrom(1024)
+                length, counter = HEADER.unpack_from(data)
+                response = self.answer(data[HEADER.size : HEADER.size + length])
+                self.sock.sendto(HEADER.pack(len(response), counter) + response, addr)
+
+
+def legacy_get(transport):
+    """The completion path used before `ResponseSlot` (kept here for comparison only)."""
+    start = transport.timestamp.value
+    with transport.resQueue_condition:
+        while not transport.resQueue:
+            if transport.timer_restart_event.is_set():
+                start = transport.timestamp.value
+                transport.timer_restart_event.clear()
+            elapsed = transport.timestamp.value - start
+            if elapsed > transport.timeout:
+                raise EmptyFrameError
+            remaining_sec = (transport.timeout - elapsed) / 1_000_000_000.0
+            transport.resQueue_condition.wait(timeout=min(remaining_sec, 0.1))
+        return transport.resQueue.popleft()
+
+
+def legacy_response_payload(transport, cmd, xcpPDU: bytes) -> bytes:
+    """The response check used before `BaseTransport._response_payload` (comparison only)."""
+    pid = types.Response.parse(xcpPDU).type
+    if pid == "ERR" and cmd.name != "SYNCH":
+        raise types.XcpResponseError(types.XcpError.parse(xcpPDU[1:]))
+    return xcpPDU[1:]
+
+
+def make_transport(port: int, protocol: str, native: bool = False, single_thread: bool = False, histograms: bool = False) -> Eth:
+    eth = SimpleNamespace(
+        host="127.0.0.1",
+        port=port,
+        protocol=protocol,
+        ipv6=False,
+        tcp_nodelay=True,
+        bind_to_address=None,
+        bind_to_port=None,
+        ptp_timestamping=False,
+        native_receiver=native,
+        single_thread_receive=single_thread,
+    )
+    config = SimpleNamespace(eth=eth, create_daq_timestamps=False, alignment=1, timeout=2.0, latency_histograms=histograms)
+    transport = Eth(config)
+    transport.parent = SimpleNamespace(_setService=lambda service: None)
+    return transport
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(
+    iterations: int, legacy: bool, protocol: str, native: bool = False, single_thread: bool = False, histograms: bool = False
+) -> Tuple[dict, Optional[dict]]:
+    slave = LoopbackSlave(protocol)
+    slave.start()
+    transport = make_transport(slave.port, protocol, native, single_thread, histograms)
+    if legacy:
+        # A slot that is never registered: the listener parks the response in `resQueue`.
+        transport._arm_response_slot = lambda cmd=None: ResponseSlot(transport.timeout)
+        transport._wait_response = lambda slot: legacy_get(transport)
+        transport._response_payload = lambda cmd, xcpPDU: legacy_response_payload(transport, cmd, xcpPDU)
+    transport.connect()
+
+    results = {}
+    commands = {
+        "SHORT_UPLOAD": (types.Command.SHORT_UPLOAD, (4, 0, 0, 0, 0, 0, 0)),
+        "GET_DAQ_CLOCK": (types.Command.GET_DAQ_CLOCK, ()),
+    }
+    try:
+        for name, (cmd, args) in commands.items():
+            for _ in range(min(iterations // 10, 500)):  # Warm-up.
+                transport.request(cmd, *args)
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter_ns()
+                transport.request(cmd, *args)
+                samples.append(time.perf_counter_ns() - start)
+            results[name] = {
+                "p50_us": percentile(samples, 0.50) / 1000.0,
+                "p99_us": percentile(samples, 0.99) / 1000.0,
+                "mean_us": statistics.fmean(samples) / 1000.0,
+                "max_us": max(samples) / 1000.0,
+            }
+    finally:
+        transport.close()
+        slave.terminate()
+    return results, transport.latencies.snapshot() if transport.latencies is not None else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCP request round-trip latency benchmark.")
+    parser.add_argument("--iterations", type=int, default=5000, help="Requests per command (default: 5000)")
+    parser.add_argument("--legacy", action="store_true", help="Use the previous polled completion path.")
+    parser.add_argument("--tcp", action="store_true", help="Use TCP instead of UDP.")
+    parser.add_argument("--native", action="store_true", help="Use the native receiver thread.")
+    parser.add_argument("--single-thread", action="store_true", help="Use the single-thread receive pipeline.")
+    parser.add_argument("--histograms", action="store_true", help="Record and print the transport's latency histograms.")
+    args = parser.parse_args()
+
+    protocol = "TCP" if args.tcp else "UDP"
+    mode = "legacy (deque + polled condition, parsed responses)" if args.legacy else "ResponseSlot"
+    receiver = "native" if args.native else "Python, single thread" if args.single_thread else "Python"
+    print(f"XCPonEth/{protocol} loopback -- completion: {mode} -- receiver: {receiver} -- {args.iterations} iterations")
+    print(f"{'Command':<16}{'p50 [us]':>10}{'p99 [us]':>10}{'mean [us]':>11}{'max [us]':>10}")
+    results, latencies = run(args.iterations, args.legacy, protocol, args.native, args.single_thread, args.histograms)
+    for name, r in results.items():
+        print(f"{name:<16}{r['p50_us']:>10.1f}{r['p99_us']:>10.1f}{r['mean_us']:>11.1f}{r['max_us']:>10.1f}")
+    if args.histograms:
+        print(f"\n{'Command':<16}{'Kind':<10}{'p50 [us]':>10}{'p99 [us]':>10}{'p99.9 [us]':>12}{'max [us]':>10}")
+        for name, kinds in latencies["commands"].items():
+            for kind in ("queue", "response", "total"):
+                h = kinds[kind]
+                print(
+                    f"{name:<16}{kind:<10}{h['p50'] / 1000:>10.1f}{h['p99'] / 1000:>10.1f}"
+                    f"{h['p99.9'] / 1000:>12.1f}{h['max'] / 1000:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
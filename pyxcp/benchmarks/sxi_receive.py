@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""
+XCPonSxI receive throughput over a pty pair.
+
+A "slave" thread writes DAQ frames (HEADER_LEN_BYTE, NO_CHECKSUM) into the
+controller side of a pseudo terminal, paced to `--baudrate` (10 bits per
+byte); an `SxI` transport reads the device side. Measured is the wall and
+CPU time until the last frame has passed `process_response()`, once with
+the former receive path (`read(1)` + `read(in_waiting)` via pyserial,
+frames handed to a second thread through a `Condition`-guarded deque), once
+with the current one (`SerialReader`: `poll()` + bulk `read()` without the
+GIL, frames dispatched directly from the receiving thread).
+
+Linux only.
+
+Usage:
+    python -m pyxcp.benchmarks.sxi_receive [--frames N] [--size N] [--baudrate N]
+"""
+
+import argparse
+import os
+import threading
+import time
+import tty
+from collections import deque
+from types import SimpleNamespace
+
+import serial
+
+from pyxcp.transport.sxi import SxI
+from pyxcp.transport.transport_ext import NoOpPolicy
+
+
+class CountingSxI(SxI):
+    """Counts processed frames and remembers when the last one was processed."""
+
+    def __init__(self, *args, **kws) -> None:
+        self.frames_processed = 0
+        self.last_processed = 0.0
+        super().__init__(*args, **kws)
+
+    def load_config(self, config) -> None:
+        self.config = config.sxi
+
+    def process_response(self, response: bytes, length: int, counter: int, recv_timestamp: int) -> None:
+        super().process_response(response, length, counter, recv_timestamp)
+        self.frames_processed += 1
+        self.last_processed = time.perf_counter()
+
+
+class LegacySxI(CountingSxI):
+    """Receive path before the single-thread `SerialReader` loop."""
+
+    def __init__(self, *args, **kws) -> None:
+        super().__init__(*args, **kws)
+        self._condition = threading.Condition()
+        self._frames = deque()
+
+    def start_listener(self) -> None:
+        super().start_listener()
+        self._frame_listener = threading.Thread(target=self._frame_listen, daemon=True)
+        self._frame_listener.start()
+
+    def close(self) -> None:
+        super().close()
+        self._frame_listener.join(timeout=2.0)
+
+    def listen(self) -> None:
+        while not self.closeEvent.is_set():
+            with self._condition:
+                while not self._frames:
+                    if not self._condition.wait(1.0):
+                        break
+                frames_to_process, self._frames = self._frames, deque()
+            if not frames_to_process:
+                continue
+            self.begin_policy_batch()
+            try:
+                for frame in frames_to_process:
+                    self.process_response(*frame)
+            finally:
+                self.flush_policy_batch()
+
+    def _frame_listen(self) -> None:
+        while not self.closeEvent.is_set():
+            data = self.comm_port.read(1)
+            if data:
+                self._read_timestamp = self.now()
+                self.receiver.feed_bytes(data)
+                data = self.comm_port.read(self.comm_port.in_waiting)
+                if data:
+                    self._read_timestamp = self.now()
+                    self.receiver.feed_bytes(data)
+
+    def frame_dispatcher(self, data: bytes, length: int, counter: int) -> None:
+        with self._condition:
+            self._frames.append((bytes(data), length, counter, self._read_timestamp))
+            self._condition.notify()
+
+
+def make_config(baudrate: int) -> SimpleNamespace:
+    sxi = SimpleNamespace(
+        port="pty",
+        bitrate=baudrate,
+        bytesize=8,
+        parity="N",
+        stopbits=1,
+        mode="ASYNCH_FULL_DUPLEX_MODE",
+        header_format="HEADER_LEN_BYTE",
+        tail_format="NO_CHECKSUM",
+        framing=False,
+        esc_sync=0x01,
+        esc_esc=0x00,
+    )
+    return SimpleNamespace(sxi=sxi, create_daq_timestamps=False, alignment=1, timeout=2.0, latency_histograms=False)
+
+
+def writer(fd: int, frames: int, size: int, baudrate: int) -> None:
+    frame = bytes([size, 0x00]) + bytes(size - 1)  # DAQ, ODT 0.
+    chunk_frames = max(1, 1024 // len(frame))
+    byte_time = 10.0 / baudrate
+    due = time.perf_counter()
+    sent = 0
+    while sent < frames:
+        count = min(chunk_frames, frames - sent)
+        os.write(fd, frame * count)
+        sent += count
+        due += count * len(frame) * byte_time
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run(klass, frames: int, size: int, baudrate: int) -> dict:
+    controller, device = os.openpty()
+    tty.setraw(device)
+    port = serial.Serial(os.ttyname(device), timeout=0.1)
+    transport = klass(make_config(baudrate), policy=NoOpPolicy(), transport_layer_interface=port)
+    try:
+        transport.start_listener()
+        time.sleep(0.1)
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        slave = threading.Thread(target=writer, args=(controller, frames, size, baudrate))
+        slave.start()
+        deadline = time.monotonic() + 10.0 + frames * (size + 1) * 10.0 / baudrate
+        while transport.frames_processed < frames and time.monotonic() < deadline:
+            time.sleep(0.005)
+        slave.join()
+        cpu = time.process_time() - cpu_start
+        return {
+            "elapsed": transport.last_processed - start,
+            "cpu": cpu,
+            "frames": transport.frames_processed,
+        }
+    finally:
+        transport.close()
+        port.close()
+        os.close(controller)
+        os.close(device)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCPonSxI receive benchmark (pty pair).")
+    parser.add_argument("--frames", type=int, default=200_000, help="DAQ frames to send (default: 200000)")
+    parser.add_argument("--size", type=int, default=16, help="XCP packet size in bytes (default: 16)")
+    parser.add_argument("--baudrate", type=int, default=4_000_000, help="Simulated line rate (default: 4000000)")
+    args = parser.parse_args()
+
+    print(f"{args.frames} DAQ frames of {args.size} bytes at {args.baudrate} baud (pty pair)")
+    print(f"{'Receive path':<38}{'wall [s]':>10}{'CPU [s]':>10}{'CPU/frame [us]':>16}{'frames':>10}")
+    for name, klass in (("read(1)+in_waiting, 2 threads", LegacySxI), ("SerialReader, single thread", CountingSxI)):
+        r = run(klass, args.frames, args.size, args.baudrate)
+        print(f"{name:<38}{r['elapsed']:>10.3f}{r['cpu']:>10.3f}{r['cpu'] / args.frames * 1e6:>16.2f}{r['frames']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""
+XCPonEth/UDP receive throughput under DAQ bursts.
+
+A loopback "slave" sends bursts of DAQ datagrams to a connected `Eth`
+transport, each burst as soon as the previous one has been processed;
+measured is the wall and CPU time until the last frame has passed
+`process_response()`, the resulting frame rate, and the number of datagrams
+lost (dropped by the kernel because the receiver fell behind). Compares one `recvfrom()`
+per datagram (``recv_batch_size = 1``) with draining the socket via
+`recvmmsg()` (Linux only), each with the two-thread (packet listener +
+listener) and the single-thread receive pipeline, optionally with the policy
+stage decoupled to a worker thread.
+
+Usage:
+    python -m pyxcp.benchmarks.udp_receive [--frames N] [--burst N] [--size N] [--batch N]
+"""
+
+import argparse
+import socket
+import struct
+import time
+from types import SimpleNamespace
+
+from pyxcp.transport.eth import Eth
+from pyxcp.transport.transport_ext import NoOpPolicy
+
+
+HEADER = struct.Struct("<HH")
+
+
+class CountingEth(Eth):
+    """Counts processed frames and remembers when the last one was processed."""
+
+    def __init__(self, *args, **kws) -> None:
+        self.frames_processed = 0
+        self.last_processed = 0.0
+        super().__init__(*args, **kws)
+
+    def load_config(self, config) -> None:
+        self.config = config.eth
+
+    def process_response(self, response: bytes, length: int, counter: int, recv_timestamp: int) -> None:
+        super().process_response(response, length, counter, recv_timestamp)
+        self.frames_processed += 1
+        self.last_processed = time.perf_counter()
+
+
+def make_transport(port: int, recv_batch_size: int, single_thread: bool = False, decouple_policy: bool = False) -> Eth:
+    eth = SimpleNamespace(
+        host="127.0.0.1",
+        port=port,
+        protocol="UDP",
+        ipv6=False,
+        tcp_nodelay=False,
+        bind_to_address=None,
+        bind_to_port=None,
+        ptp_timestamping=False,
+        native_receiver=False,
+        recv_batch_size=recv_batch_size,
+        single_thread_receive=single_thread,
+        decouple_policy=decouple_policy,
+    )
+    config = SimpleNamespace(eth=eth, create_daq_timestamps=True, alignment=1, timeout=2.0, latency_histograms=False)
+    transport = CountingEth(config, policy=NoOpPolicy())
+    transport.parent = SimpleNamespace(_setService=lambda service: None)
+    return transport
+
+
+def run(frames: int, burst: int, size: int, recv_batch_size: int, single_thread: bool, decouple_policy: bool) -> dict:
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    transport = make_transport(slave.getsockname()[1], recv_batch_size, single_thread, decouple_policy)
+    transport.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    transport.connect()
+    transport.set_max_packet_sizes(max_cto=255, max_dto=size)
+    slave.connect(transport.sock.getsockname())
+    datagrams = [HEADER.pack(size, counter & 0xFFFF) + bytes([0x00]) + bytes(size - 1) for counter in range(frames)]
+    try:
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        sent = 0
+        for offset in range(0, frames, burst):
+            for datagram in datagrams[offset : offset + burst]:
+                slave.send(datagram)
+            sent += len(datagrams[offset : offset + burst])
+            # Pace the slave: let the receiver catch up before the next burst (datagrams may get dropped).
+            deadline = time.perf_counter() + 0.2
+            while transport.frames_processed < sent and time.perf_counter() < deadline:
+                time.sleep(0)
+        elapsed = transport.last_processed - start
+        cpu = time.process_time() - cpu_start
+        reader = transport._batch_reader
+        return {
+            "elapsed": elapsed,
+            "cpu": cpu,
+            "processed": transport.frames_processed,
+            "syscalls": reader.syscalls if reader is not None else transport.frames_processed,
+        }
+    finally:
+        transport.close()
+        slave.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="XCPonEth/UDP receive throughput benchmark.")
+    parser.add_argument("--frames", type=int, default=60_000, help="Number of DAQ datagrams (default: 60000)")
+    parser.add_argument("--burst", type=int, default=500, help="Datagrams per burst (default: 500)")
+    parser.add_argument("--size", type=int, default=32, help="XCP packet size in bytes (default: 32)")
+    parser.add_argument("--batch", type=int, default=64, help="recvmmsg() batch size (default: 64)")
+    args = parser.parse_args()
+
+    print(f"{args.frames} DAQ datagrams in bursts of {args.burst}, {args.size} bytes")
+    print(f"{'Receive':<18}{'Pipeline':<24}{'wall [s]':>10}{'CPU [s]':>10}{'kfps':>8}{'recv calls':>12}{'lost':>8}")
+    pipelines = (
+        ("two threads", False, False),
+        ("single thread", True, False),
+        ("single + policy thread", True, True),
+    )
+    for name, batch_size in (("recvfrom", 1), (f"recvmmsg ({args.batch})", args.batch)):
+        for pipeline, single_thread, decouple_policy in pipelines:
+            r = run(args.frames, args.burst, args.size, batch_size, single_thread, decouple_policy)
+            print(
+                f"{name:<18}{pipeline:<24}{r['elapsed']:>10.3f}{r['cpu']:>10.3f}{r['processed'] / r['elapsed'] / 1000:>8.1f}"
+                f"{r['syscalls']:>12}{args.frames - r['processed']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -621,6 +621,22 @@ class Can(Configurable):
         config=True
     )
     fd = Bool(False, help="If CAN-FD frames should be supported.").tag(config=True)
+    native_socketcan = Bool(
+        False,
+        help="""*** Expert option *** -- Linux, interface 'socketcan': receive and transmit via a native raw CAN socket
+(`recvmmsg()`, kernel filters, kernel receive timestamps) instead of python-can.
+Bus parameters are not set, configure the interface with `ip link`.""",
+    ).tag(config=True)
+    drain_receive = Bool(
+        False,
+        help="""After a frame arrived, fetch all frames already queued by the interface (zero-timeout receives)
+and process them as one batch, instead of receiving frame by frame.""",
+    ).tag(config=True)
+    hardware_timestamps = Bool(
+        False,
+        help="""Native SocketCAN: use the controller's hardware receive timestamps, if provided by the driver.
+Note: these are in the controller's time base, not in the one of the host.""",
+    ).tag(config=True)
     data_bitrate = Integer(default_value=None, allow_none=True, help="Which bitrate to use for data phase in CAN FD.").tag(
         config=True
     )
@@ -731,7 +747,48 @@ class Eth(Configurable):
     tcp_nodelay = Bool(False, help="*** Expert option *** -- Disable Nagle's algorithm if `True`.").tag(config=True)
     bind_to_address = Unicode(default_value=None, allow_none=True, help="Bind to specific local address.").tag(config=True)
     bind_to_port = Integer(default_value=None, allow_none=True, help="Bind to specific local port.").tag(config=True)
-    ptp_timestamping = Bool(False, help="Enable IEEE 1588/PTP hardware timestamping.").tag(config=True)
+    ptp_timestamping = Bool(
+        False,
+        help="""Enable IEEE 1588/PTP hardware timestamping.
+Note: hardware (PHC) timestamps are in the NIC's time base, not in the one of the host;
+kernel software timestamps are mapped onto the transport clock.""",
+    ).tag(config=True)
+    recv_batch_size = Integer(
+        1,
+        help="""*** Expert option *** -- Linux/UDP: receive up to this many datagrams per `recvmmsg()` call
+(e.g. 64), with kernel receive timestamps. Values <= 1 use one `recvfrom()` per datagram.""",
+    ).tag(config=True)
+    max_datagram_size = Integer(
+        0,
+        help="""*** Expert option *** -- UDP receive buffer size per datagram in bytes.
+0: derived from MAX_CTO/MAX_DTO after CONNECT (at least 8196 bytes, room for several XCP packets).
+Set it if the slave packs more than that into one datagram; truncated datagrams are logged.""",
+    ).tag(config=True)
+    single_thread_receive = Bool(
+        False,
+        help="""*** Expert option *** -- Read, frame and dispatch received packets on a single thread,
+saving the thread hand-off per packet (lower response latency).""",
+    ).tag(config=True)
+    decouple_policy = Bool(
+        False,
+        help="""*** Expert option *** -- Feed received frames to the policy from a separate worker thread,
+so slow policies don't delay command responses.""",
+    ).tag(config=True)
+    native_receiver = Bool(
+        False,
+        help="""*** Expert option *** -- Receive in a native thread with the GIL released.
+DAQ frames are routed straight into the (C++) acquisition policy, only RES/ERR/EV/SERV frames reach Python.
+The policy is fed under `transport.policy_lock` (a native lock shared with the receive thread), never concurrently.
+The GIL stays released only for native policies: Python `feed()` overrides of `FrameAcquisitionPolicy` are called
+with the GIL once per batch, `DaqOnlinePolicy.on_daq_list()` once per DAQ list.
+Falls back to the Python receive path if the policy has no native `feed_batch()` (e.g. a Python subclass overriding
+the `feed()` of another native policy) or PTP timestamping is enabled.""",
+    ).tag(config=True)
+    batched_block_send = Bool(
+        False,
+        help="""*** Expert option *** -- Block-mode download/program: send the frames of a block from one buffer
+with a single `sendmsg()` (TCP) / `sendmmsg()` (UDP, Linux) instead of one `send()` per frame.""",
+    ).tag(config=True)
 
 
 class SxI(Configurable):
@@ -824,6 +881,20 @@ class Usb(Configurable):
         help="Ingoing: Alignment border.",
     ).tag(config=True)
     in_ep_recommended_host_bufsize = Integer(0, help="Ingoing: Recommended host buffer size.").tag(config=True)
+    in_ep_async_transfers = Integer(
+        0,
+        min=0,
+        help="""*** Expert option *** -- Keep this many asynchronous IN-EP transfers queued (libusb1 backend),
+so the device never waits for the host to resubmit. 0: one synchronous read at a time.
+Needs pyusb's libusb1 backend internals (checked against pyusb 1.2 and 1.3); falls back to synchronous reads
+if they are not available.""",
+    ).tag(config=True)
+    in_ep_transfer_size = Integer(
+        16384,
+        min=64,
+        help="""*** Expert option *** -- Size of each IN-EP transfer buffer in bytes
+(at least `in_ep_recommended_host_bufsize`).""",
+    ).tag(config=True)
     out_ep_number = Integer(0, help="Outgoing USB command endpoint number (OUT-EP for CMD and STIM).").tag(config=True)
     out_ep_transfer_type = Enum(
         values=["BULK_TRANSFER", "INTERRUPT_TRANSFER"],
@@ -863,6 +934,33 @@ class Transport(Configurable):
 if there is no response to a command.""",
     ).tag(config=True)
     alignment = Enum(values=[1, 2, 4, 8], default_value=1).tag(config=True)
+    latency_histograms = Bool(
+        False,
+        help="""Record per-command latency histograms (queueing, send->response, total),
+available as `transport.latencies` (see `pyxcp.timing.CommandLatencies`).""",
+    ).tag(config=True)
+    adaptive_timeouts = Bool(
+        False,
+        help="""*** Expert option *** -- Derive the response timeout of each command from its observed round-trip times:
+`adaptive_timeout_factor` x the `adaptive_timeout_percentile`, between `adaptive_timeout_min` and `timeout`.
+`timeout` applies until enough responses have been seen and after EV_CMD_PENDING (see `pyxcp.timing.AdaptiveTimeouts`).""",
+    ).tag(config=True)
+    adaptive_timeout_min = Float(
+        0.05,
+        min=0.0,
+        help="""*** Expert option *** -- Lower bound of adaptive response timeouts in seconds.""",
+    ).tag(config=True)
+    adaptive_timeout_percentile = Float(
+        99.9,
+        min=50.0,
+        max=100.0,
+        help="""*** Expert option *** -- Round-trip time percentile adaptive response timeouts are based on.""",
+    ).tag(config=True)
+    adaptive_timeout_factor = Float(
+        3.0,
+        min=1.0,
+        help="""*** Expert option *** -- Safety margin applied to the round-trip time percentile.""",
+    ).tag(config=True)
 
     can = Instance(Can).tag(config=True)
     eth = Instance(Eth).tag(config=True)
@@ -966,6 +1064,11 @@ class General(Configurable):
 Could be used if seed-and-key algorithm is known instead of `seed_n_key_dll`.""",
     ).tag(config=True)
     stim_support = Bool(False, help="").tag(config=True)
+    memory_image = Bool(
+        False,
+        help="""Cache uploaded memory on the host (`Master.memory_image`, see `pyxcp.master.MemoryImage`).
+Only for memory modified by the master alone (calibration data), not for measurement variables.""",
+    ).tag(config=True)
 
 
 class ProfileCreate(Application):
@@ -0,0 +1,415 @@
+#if !defined(__ETH_MMSG_HPP)
+#define __ETH_MMSG_HPP
+
+#if defined(__linux__)
+
+    #include <poll.h>
+    #include <sys/socket.h>
+    #include <sys/types.h>
+    #include <time.h>
+
+    #include <algorithm>
+    #include <atomic>
+    #include <cerrno>
+    #include <cstdint>
+    #include <cstring>
+    #include <limits>
+    #include <memory>
+    #include <mutex>
+    #include <stdexcept>
+    #include <string_view>
+    #include <system_error>
+    #include <vector>
+
+    #include "helper.hpp"
+    #include "pacer.hpp"
+
+/*
+    Datagrams received by one `recvmmsg()` call.
+
+    Datagram `idx` occupies `data[idx * datagram_size, idx * datagram_size + lengths[idx])`,
+    `timestamps[idx]` is its kernel receive time (SO_TIMESTAMPNS) on the transport clock.
+*/
+struct DatagramBatch {
+    DatagramBatch(std::size_t capacity, std::size_t datagram_size) :
+        data(capacity * datagram_size), lengths(capacity), timestamps(capacity), datagram_size(datagram_size) {
+    }
+
+    std::string_view datagram(std::size_t idx) const noexcept {
+        return std::string_view(data.data() + idx * datagram_size, lengths[idx]);
+    }
+
+    std::size_t size() const noexcept {
+        return count;
+    }
+
+    std::vector<char>          data;
+    std::vector<std::uint32_t> lengths;
+    std::vector<std::uint64_t> timestamps;
+    std::size_t                datagram_size;
+    std::size_t                count{ 0 };
+};
+
+/*
+    Batched UDP receive for XCPonEth (Linux).
+
+    Waits for the socket to become readable, then drains up to `max_datagrams`
+    queued datagrams with a single `recvmmsg()` into a preallocated batch taken
+    from a small pool -- no per-datagram syscalls or allocations. Batches go
+    back into the pool when the consumer drops them.
+
+    The datagram size can be changed at any time (e.g. to the negotiated
+    MAX_CTO/MAX_DTO after CONNECT), it takes effect with the next `receive()`.
+
+    Kernel timestamps (CLOCK_REALTIME) are mapped onto the monotonic transport
+    clock (`Timestamp`) once per batch.
+
+    Datagrams longer than `datagram_size` are cut off by the kernel (MSG_TRUNC);
+    they are counted in `truncated()`.
+*/
+class UdpBatchReader {
+   public:
+
+    UdpBatchReader(int sock, std::size_t max_datagrams, std::size_t datagram_size, std::uint64_t clock_offset = 0) :
+        m_socket(sock),
+        m_max_datagrams((std::max)(max_datagrams, std::size_t{ 1 })),
+        m_datagram_size(datagram_size),
+        m_timestamp(
+            clock_offset ? Timestamp(TimestampType::ABSOLUTE_TS, clock_offset) : Timestamp(TimestampType::ABSOLUTE_TS)
+        ),
+        m_pool(std::make_shared<Pool>()),
+        m_headers(m_max_datagrams),
+        m_iovecs(m_max_datagrams),
+        m_control(m_max_datagrams * CONTROL_SIZE) {
+        int       type     = 0;
+        socklen_t type_len = sizeof(type);
+        if (::getsockopt(m_socket, SOL_SOCKET, SO_TYPE, &type, &type_len) != 0 || type != SOCK_DGRAM) {
+            throw std::invalid_argument("UdpBatchReader: not a datagram socket");
+        }
+        int enable          = 1;
+        m_kernel_timestamps = ::setsockopt(m_socket, SOL_SOCKET, SO_TIMESTAMPNS, &enable, sizeof(enable)) == 0;
+    }
+
+    UdpBatchReader(const UdpBatchReader&)            = delete;
+    UdpBatchReader& operator=(const UdpBatchReader&) = delete;
+
+    /*
+        Wait up to `timeout_ms` for datagrams and receive all that are queued (max. `max_datagrams`).
+
+        Returns an empty pointer on timeout; throws `std::system_error` on socket errors.
+    */
+    std::shared_ptr<DatagramBatch> receive(int timeout_ms) {
+        pollfd pfd{ m_socket, POLLIN, 0 };
+        const int ready = ::poll(&pfd, 1, timeout_ms);
+        if (ready <= 0) {
+            if (ready < 0 && errno != EINTR) {
+                throw std::system_error(errno, std::generic_category(), "poll()");
+            }
+            return {};
+        }
+        if (pfd.revents & (POLLERR | POLLNVAL)) {
+            throw std::system_error(pfd.revents & POLLNVAL ? EBADF : EIO, std::generic_category(), "poll()");
+        }
+
+        const std::size_t datagram_size = m_datagram_size;
+        auto              batch         = acquire(datagram_size);
+        for (std::size_t idx = 0; idx < m_max_datagrams; ++idx) {
+            m_iovecs[idx]                     = iovec{ batch->data.data() + idx * datagram_size, datagram_size };
+            m_headers[idx].msg_hdr            = msghdr{};
+            m_headers[idx].msg_hdr.msg_iov    = &m_iovecs[idx];
+            m_headers[idx].msg_hdr.msg_iovlen = 1;
+            if (m_kernel_timestamps) {
+                m_headers[idx].msg_hdr.msg_control    = m_control.data() + idx * CONTROL_SIZE;
+                m_headers[idx].msg_hdr.msg_controllen = CONTROL_SIZE;
+            }
+            m_headers[idx].msg_len = 0;
+        }
+        const int count = ::recvmmsg(m_socket, m_headers.data(), static_cast<unsigned int>(m_max_datagrams), MSG_DONTWAIT, nullptr);
+        if (count < 0) {
+            if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR) {
+                return {};
+            }
+            throw std::system_error(errno, std::generic_category(), "recvmmsg()");
+        }
+        const std::uint64_t now = m_timestamp.absolute();
+        // Kernel timestamps are wall-clock; `realtime - absolute` maps them onto the transport clock.
+        const std::int64_t realtime_delta = static_cast<std::int64_t>(Timestamp::realtime() - now);
+
+        batch->count = static_cast<std::size_t>(count);
+        for (std::size_t idx = 0; idx < batch->count; ++idx) {
+            batch->lengths[idx]    = m_headers[idx].msg_len;
+            batch->timestamps[idx] = now;
+            if (m_headers[idx].msg_hdr.msg_flags & MSG_TRUNC) {
+                ++m_truncated;
+            }
+            if (m_kernel_timestamps) {
+                const auto kernel_ts = kernel_timestamp(m_headers[idx].msg_hdr);
+                if (kernel_ts != 0) {
+                    batch->timestamps[idx] = static_cast<std::uint64_t>(static_cast<std::int64_t>(kernel_ts) - realtime_delta);
+                }
+            }
+        }
+        ++m_syscalls;
+        m_datagrams += batch->count;
+        return batch;
+    }
+
+    std::size_t max_datagrams() const noexcept {
+        return m_max_datagrams;
+    }
+
+    std::size_t datagram_size() const noexcept {
+        return m_datagram_size;
+    }
+
+    void set_datagram_size(std::size_t datagram_size) noexcept {
+        m_datagram_size = (std::max)(datagram_size, std::size_t{ 1 });
+    }
+
+    bool kernel_timestamps() const noexcept {
+        return m_kernel_timestamps;
+    }
+
+    std::uint64_t datagrams() const noexcept {
+        return m_datagrams;
+    }
+
+    std::uint64_t syscalls() const noexcept {
+        return m_syscalls;
+    }
+
+    std::uint64_t truncated() const noexcept {
+        return m_truncated;
+    }
+
+   private:
+
+    static constexpr std::size_t CONTROL_SIZE = CMSG_SPACE(sizeof(timespec));
+
+    struct Pool {
+        std::mutex                                  mutex;
+        std::vector<std::unique_ptr<DatagramBatch>> batches;
+    };
+
+    // Take a batch from the pool (or allocate one); it returns itself when released.
+    // Pooled batches of a previous datagram size are discarded.
+    std::shared_ptr<DatagramBatch> acquire(std::size_t datagram_size) {
+        std::unique_ptr<DatagramBatch> batch;
+        {
+            std::lock_guard<std::mutex> lock(m_pool->mutex);
+            while (!batch && !m_pool->batches.empty()) {
+                batch = std::move(m_pool->batches.back());
+                m_pool->batches.pop_back();
+                if (batch->datagram_size != datagram_size) {
+                    batch.reset();
+                }
+            }
+        }
+        if (!batch) {
+            batch = std::make_unique<DatagramBatch>(m_max_datagrams, datagram_size);
+        }
+        batch->count = 0;
+        std::weak_ptr<Pool> pool = m_pool;
+        return std::shared_ptr<DatagramBatch>(batch.release(), [pool](DatagramBatch* released) {
+            if (auto owner = pool.lock()) {
+                std::lock_guard<std::mutex> lock(owner->mutex);
+                if (owner->batches.size() < MAX_POOLED) {
+                    owner->batches.emplace_back(released);
+                    return;
+                }
+            }
+            delete released;
+        });
+    }
+
+    static std::uint64_t kernel_timestamp(const msghdr& header) noexcept {
+        for (auto cmsg = CMSG_FIRSTHDR(&header); cmsg != nullptr; cmsg = CMSG_NXTHDR(const_cast<msghdr*>(&header), cmsg)) {
+            if (cmsg->cmsg_level == SOL_SOCKET && cmsg->cmsg_type == SCM_TIMESTAMPNS) {
+                timespec ts;
+                std::memcpy(&ts, CMSG_DATA(cmsg), sizeof(ts));
+                return static_cast<std::uint64_t>(ts.tv_sec) * 1'000'000'000 + ts.tv_nsec;
+            }
+        }
+        return 0;
+    }
+
+    static constexpr std::size_t MAX_POOLED = 8;
+
+    int                        m_socket;
+    std::size_t                m_max_datagrams;
+    std::atomic<std::size_t>   m_datagram_size;
+    Timestamp                  m_timestamp;
+    std::shared_ptr<Pool>      m_pool;
+    std::vector<mmsghdr>       m_headers;
+    std::vector<iovec>         m_iovecs;
+    std::vector<char>          m_control;
+    bool                       m_kernel_timestamps{ false };
+    std::atomic<std::uint64_t> m_datagrams{ 0 };
+    std::atomic<std::uint64_t> m_syscalls{ 0 };
+    std::atomic<std::uint64_t> m_truncated{ 0 };
+};
+
+/*
+    Batched transmit for XCPonEth block mode (Linux).
+
+    The frames of a block are gathered into one preallocated buffer and sent with
+    a single `sendmsg()` (TCP: one stream segment) or `sendmmsg()` (UDP: one
+    datagram per frame) instead of one `send()` per frame. With a separation time
+    (`Pacer` interval > 0) the frames go out one per slot, still from the buffer.
+
+    The socket is borrowed (connected, possibly non-blocking), not closed; a full
+    send buffer is waited on with `poll()` for up to `timeout_ms`.
+*/
+class EthBlockSender {
+   public:
+
+    static constexpr std::size_t MAX_DATAGRAMS = 1024;  // UIO_MAXIOV
+
+    explicit EthBlockSender(int sock, int timeout_ms = 2000) : m_socket(sock), m_timeout_ms(timeout_ms) {
+        int       type     = 0;
+        socklen_t type_len = sizeof(type);
+        if (::getsockopt(m_socket, SOL_SOCKET, SO_TYPE, &type, &type_len) != 0 || (type != SOCK_STREAM && type != SOCK_DGRAM)) {
+            throw std::invalid_argument("EthBlockSender: not a stream or datagram socket");
+        }
+        m_stream = type == SOCK_STREAM;
+    }
+
+    EthBlockSender(const EthBlockSender&)            = delete;
+    EthBlockSender& operator=(const EthBlockSender&) = delete;
+
+    // Send `frames` (complete XCPonEth frames); throws `std::system_error` on socket errors.
+    void send_block(const std::vector<std::string_view>& frames, Pacer& pacer) {
+        gather(frames);
+        const std::size_t count = frames.size();
+        if (pacer.interval_ns() > 0) {
+            for (std::size_t idx = 0; idx < count; ++idx) {
+                pacer.wait();
+                send_frames(idx, idx + 1);
+            }
+        } else if (count) {
+            send_frames(0, count);
+        }
+        m_frames += count;
+    }
+
+    bool stream() const noexcept {
+        return m_stream;
+    }
+
+    std::size_t buffer_size() const noexcept {
+        return m_buffer.size();
+    }
+
+    std::uint64_t frames() const noexcept {
+        return m_frames;
+    }
+
+    std::uint64_t syscalls() const noexcept {
+        return m_syscalls;
+    }
+
+   private:
+
+    // Copy the frames back-to-back into the buffer, remembering their offsets.
+    void gather(const std::vector<std::string_view>& frames) {
+        std::size_t total = 0;
+        for (const auto& frame : frames) {
+            total += frame.size();
+        }
+        if (m_buffer.size() < total) {
+            m_buffer.resize(total);
+        }
+        m_offsets.resize(frames.size() + 1);
+        std::size_t offset = 0;
+        for (std::size_t idx = 0; idx < frames.size(); ++idx) {
+            m_offsets[idx] = offset;
+            std::memcpy(m_buffer.data() + offset, frames[idx].data(), frames[idx].size());
+            offset += frames[idx].size();
+        }
+        m_offsets[frames.size()] = offset;
+    }
+
+    void send_frames(std::size_t first, std::size_t last) {
+        if (m_stream) {
+            send_stream(m_buffer.data() + m_offsets[first], m_offsets[last] - m_offsets[first]);
+        } else {
+            for (std::size_t idx = first; idx < last; idx += MAX_DATAGRAMS) {
+                send_datagrams(idx, (std::min)(last, idx + MAX_DATAGRAMS));
+            }
+        }
+    }
+
+    void send_stream(const char* data, std::size_t size) {
+        while (size) {
+            iovec  iov{ const_cast<char*>(data), size };
+            msghdr msg{};
+            msg.msg_iov    = &iov;
+            msg.msg_iovlen = 1;
+            const auto sent = ::sendmsg(m_socket, &msg, MSG_NOSIGNAL);
+            ++m_syscalls;
+            if (sent < 0) {
+                wait_writable("sendmsg()");
+                continue;
+            }
+            data += sent;
+            size -= static_cast<std::size_t>(sent);
+        }
+    }
+
+    void send_datagrams(std::size_t first, std::size_t last) {
+        const std::size_t count = last - first;
+        m_headers.resize((std::max)(m_headers.size(), count));
+        m_iovecs.resize((std::max)(m_iovecs.size(), count));
+        for (std::size_t idx = 0; idx < count; ++idx) {
+            const auto offset                 = m_offsets[first + idx];
+            m_iovecs[idx]                     = iovec{ m_buffer.data() + offset, m_offsets[first + idx + 1] - offset };
+            m_headers[idx].msg_hdr            = msghdr{};
+            m_headers[idx].msg_hdr.msg_iov    = &m_iovecs[idx];
+            m_headers[idx].msg_hdr.msg_iovlen = 1;
+            m_headers[idx].msg_len            = 0;
+        }
+        std::size_t done = 0;
+        while (done < count) {
+            const int sent = ::sendmmsg(m_socket, m_headers.data() + done, static_cast<unsigned int>(count - done), MSG_NOSIGNAL);
+            ++m_syscalls;
+            if (sent < 0) {
+                wait_writable("sendmmsg()");
+                continue;
+            }
+            done += static_cast<std::size_t>(sent);
+        }
+    }
+
+    // After a failed send: wait for buffer space (EAGAIN, ENOBUFS) or retry (EINTR), throw otherwise.
+    void wait_writable(const char* what) {
+        const int error = errno;
+        if (error == EINTR) {
+            return;
+        }
+        if (error != EAGAIN && error != EWOULDBLOCK && error != ENOBUFS) {
+            throw std::system_error(error, std::generic_category(), what);
+        }
+        pollfd    pfd{ m_socket, POLLOUT, 0 };
+        const int ready = ::poll(&pfd, 1, m_timeout_ms);
+        if (ready == 0) {
+            throw std::system_error(ETIMEDOUT, std::generic_category(), what);
+        }
+        if (ready < 0 && errno != EINTR) {
+            throw std::system_error(errno, std::generic_category(), "poll()");
+        }
+    }
+
+    int                        m_socket;
+    int                        m_timeout_ms;
+    bool                       m_stream{ false };
+    std::vector<char>          m_buffer;
+    std::vector<std::size_t>   m_offsets;
+    std::vector<mmsghdr>       m_headers;
+    std::vector<iovec>         m_iovecs;
+    std::uint64_t              m_frames{ 0 };
+    std::uint64_t              m_syscalls{ 0 };
+};
+
+#endif  // __linux__
+
+#endif  // __ETH_MMSG_HPP
@@ -0,0 +1,329 @@
+#if !defined(__ETH_NATIVE_HPP)
+#define __ETH_NATIVE_HPP
+
+#if defined(_WIN32)
+    #include <winsock2.h>
+    #include <ws2tcpip.h>
+    #pragma comment(lib, "Ws2_32.lib")
+#else
+    #include <poll.h>
+    #include <sys/socket.h>
+    #include <cerrno>
+#endif
+
+#include <atomic>
+#include <cstdint>
+#include <functional>
+#include <mutex>
+#include <string>
+#include <string_view>
+#include <thread>
+#include <vector>
+
+#include "eth_framing.hpp"
+#include "rekorder.hpp"
+
+#if defined(_WIN32)
+using native_socket_t = SOCKET;
+#else
+using native_socket_t = int;
+#endif
+
+/*
+    Native XCPonEth receive loop.
+
+    Owns the receiving side of an already connected UDP or TCP socket:
+    reads datagrams/stream chunks in its own thread, splits them into XCP
+    packets and classifies them by PID.
+
+    - DAQ packets (PID < 0xFC) are collected per wake-up and handed to
+      `daq_sink` as one `FrameBatchView`, without ever touching the
+      Python interpreter (if the sink is a native policy).
+    - RES/ERR/EV/SERV packets are handed to `dispatch` (the Python side
+      `process_response`), pending DAQ frames are flushed first to keep
+      the order seen by the policy.
+
+    `policy_mutex` (optional) is held while `daq_sink` runs, so the policy
+    is never fed concurrently with the frames fed by other threads under
+    the same mutex (the transport's `policy_lock`).
+*/
+class EthNativeReceiver {
+   public:
+
+    using batch_sink_t = std::function<void(const FrameBatchView&)>;
+    using dispatch_t   = std::function<void(const std::vector<std::uint8_t>&, std::uint16_t, std::uint16_t, std::uint64_t)>;
+
+    static constexpr std::size_t MAX_BATCH_FRAMES = 256;
+    static constexpr int         POLL_TIMEOUT_MS  = 20;
+
+    EthNativeReceiver(
+        native_socket_t sock, bool tcp, std::size_t recv_size, bool daq_timestamps, batch_sink_t daq_sink, dispatch_t dispatch,
+        std::uint64_t clock_offset = 0, std::mutex* policy_mutex = nullptr
+    ) :
+        m_socket(sock),
+        m_tcp(tcp),
+        m_recv_size(recv_size),
+        m_daq_timestamps(daq_timestamps),
+        m_daq_sink(std::move(daq_sink)),
+        m_dispatch(std::move(dispatch)),
+        m_policy_mutex(policy_mutex),
+        m_framing([this](const std::vector<std::uint8_t>& payload, std::uint16_t length, std::uint16_t counter, std::uint64_t timestamp) {
+            on_packet(payload, length, counter, timestamp);
+        }),
+        m_timestamp(
+            clock_offset ? Timestamp(TimestampType::ABSOLUTE_TS, clock_offset) : Timestamp(TimestampType::ABSOLUTE_TS)
+        ) {
+        m_offsets.reserve(MAX_BATCH_FRAMES);
+        m_lengths.reserve(MAX_BATCH_FRAMES);
+        m_counters.reserve(MAX_BATCH_FRAMES);
+        m_timestamps.reserve(MAX_BATCH_FRAMES);
+        m_categories.reserve(MAX_BATCH_FRAMES);
+    }
+
+    EthNativeReceiver(const EthNativeReceiver&)            = delete;
+    EthNativeReceiver& operator=(const EthNativeReceiver&) = delete;
+
+    ~EthNativeReceiver() {
+        stop();
+    }
+
+    void start() {
+        if (m_running.exchange(true)) {
+            return;
+        }
+        m_framing.reset();
+        m_thread = std::thread(&EthNativeReceiver::run, this);
+    }
+
+    void stop() {
+        m_running = false;
+        if (m_thread.joinable()) {
+            m_thread.join();
+        }
+    }
+
+    bool is_running() const noexcept {
+        return m_running;
+    }
+
+    // Peer closed the connection (TCP) or the socket failed; see `error()`.
+    bool is_closed() const noexcept {
+        return m_closed;
+    }
+
+    std::string error() const {
+        std::lock_guard<std::mutex> lock(m_error_mutex);
+        return m_error;
+    }
+
+    std::uint64_t daq_frames() const noexcept {
+        return m_daq_frames;
+    }
+
+    std::uint64_t daq_bytes() const noexcept {
+        return m_daq_bytes;
+    }
+
+    std::uint64_t dispatched_frames() const noexcept {
+        return m_dispatched_frames;
+    }
+
+    std::uint64_t first_daq_timestamp() const noexcept {
+        return m_first_daq_timestamp;
+    }
+
+    std::uint16_t last_counter() const noexcept {
+        return m_last_counter;
+    }
+
+    // UDP datagrams longer than `recv_size`, cut off by the socket.
+    std::uint64_t truncated() const noexcept {
+        return m_truncated;
+    }
+
+    std::size_t recv_size() const noexcept {
+        return m_recv_size;
+    }
+
+    // Takes effect with the next wake-up of the receive thread.
+    void set_recv_size(std::size_t recv_size) noexcept {
+        m_recv_size = (std::max)(recv_size, std::size_t{ 1 });
+    }
+
+   private:
+
+    void run() {
+        std::vector<char> buffer(m_recv_size);
+
+        while (m_running) {
+            int ready = wait_readable(POLL_TIMEOUT_MS);
+            if (ready == 0) {
+                continue;
+            } else if (ready < 0) {
+                fail("poll() failed");
+                break;
+            }
+            if (buffer.size() != m_recv_size) {
+                buffer.resize(m_recv_size);
+            }
+            // Drain everything that is already queued in the socket, then hand the batch over.
+            do {
+                const auto recv_timestamp = m_timestamp.absolute();
+                auto       count          = ::recv(m_socket, buffer.data(), static_cast<int>(buffer.size()), recv_flags());
+                if (!m_tcp && (count > static_cast<decltype(count)>(buffer.size()) || (count < 0 && message_too_long()))) {
+                    ++m_truncated;
+                    count = static_cast<decltype(count)>(buffer.size());
+                }
+                if (count > 0) {
+                    m_framing.feed_frame(std::string_view(buffer.data(), static_cast<std::size_t>(count)), recv_timestamp);
+                } else if (count == 0) {
+                    if (m_tcp) {
+                        fail("connection closed by peer");
+                        break;
+                    }
+                } else if (!would_block()) {
+                    fail("recv() failed");
+                    break;
+                } else {
+                    break;
+                }
+            } while (m_running && wait_readable(0) > 0);
+            flush_daq();
+        }
+        flush_daq();
+        m_running = false;
+    }
+
+    void on_packet(const std::vector<std::uint8_t>& payload, std::uint16_t length, std::uint16_t counter, std::uint64_t timestamp) {
+        if (length == 0) {
+            return;
+        }
+        m_last_counter = counter;
+        if (payload[0] >= 0xFC) {
+            flush_daq();
+            ++m_dispatched_frames;
+            m_dispatch(payload, length, counter, timestamp);
+            return;
+        }
+        if (m_first_daq_timestamp == 0) {
+            m_first_daq_timestamp = timestamp;
+        }
+        m_offsets.push_back(static_cast<std::uint32_t>(m_data.size()));
+        m_lengths.push_back(length);
+        m_counters.push_back(counter);
+        m_timestamps.push_back(m_daq_timestamps ? timestamp : 0ULL);
+        m_categories.push_back(static_cast<std::uint8_t>(FrameCategory::DAQ));
+        m_data.append(reinterpret_cast<const char*>(payload.data()), length);
+        ++m_daq_frames;
+        m_daq_bytes += length;
+        if (m_offsets.size() >= MAX_BATCH_FRAMES) {
+            flush_daq();
+        }
+    }
+
+    void flush_daq() {
+        if (m_offsets.empty()) {
+            return;
+        }
+        const FrameBatchView batch{
+            m_data.data(),     m_data.size(),       m_offsets.size(),    m_offsets.data(),
+            m_lengths.data(),  m_counters.data(),   m_timestamps.data(), m_categories.data(),
+        };
+        try {
+            if (m_policy_mutex) {
+                std::lock_guard<std::mutex> lock(*m_policy_mutex);
+                m_daq_sink(batch);
+            } else {
+                m_daq_sink(batch);
+            }
+        } catch (const std::exception& ex) {
+            fail(std::string("DAQ policy failed: ") + ex.what());
+        }
+        m_data.clear();
+        m_offsets.clear();
+        m_lengths.clear();
+        m_counters.clear();
+        m_timestamps.clear();
+        m_categories.clear();
+    }
+
+    int wait_readable(int timeout_ms) const noexcept {
+#if defined(_WIN32)
+        WSAPOLLFD pfd{ m_socket, POLLRDNORM, 0 };
+        return ::WSAPoll(&pfd, 1, timeout_ms);
+#else
+        pollfd pfd{ m_socket, POLLIN, 0 };
+        int    result = ::poll(&pfd, 1, timeout_ms);
+        if (result < 0 && errno == EINTR) {
+            return 0;
+        }
+        return result;
+#endif
+    }
+
+    // Linux: MSG_TRUNC makes `recv()` return the real length of a UDP datagram longer than the buffer.
+    int recv_flags() const noexcept {
+#if defined(__linux__)
+        return m_tcp ? 0 : MSG_TRUNC;
+#else
+        return 0;
+#endif
+    }
+
+    // Windows reports a datagram longer than the buffer as an error (the buffer is filled nevertheless).
+    static bool message_too_long() noexcept {
+#if defined(_WIN32)
+        return ::WSAGetLastError() == WSAEMSGSIZE;
+#else
+        return false;
+#endif
+    }
+
+    static bool would_block() noexcept {
+#if defined(_WIN32)
+        const auto err = ::WSAGetLastError();
+        return err == WSAEWOULDBLOCK || err == WSAEINTR;
+#else
+        return errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR;
+#endif
+    }
+
+    void fail(const std::string& message) {
+        {
+            std::lock_guard<std::mutex> lock(m_error_mutex);
+            m_error = message;
+        }
+        m_closed  = true;
+        m_running = false;
+    }
+
+    native_socket_t            m_socket;
+    bool                       m_tcp;
+    std::atomic<std::size_t>   m_recv_size;
+    bool                       m_daq_timestamps;
+    batch_sink_t               m_daq_sink;
+    dispatch_t                 m_dispatch;
+    std::mutex*                m_policy_mutex;
+    EthReceiver                m_framing;
+    Timestamp                  m_timestamp;
+    std::thread                m_thread;
+    std::atomic<bool>          m_running{ false };
+    std::atomic<bool>          m_closed{ false };
+    mutable std::mutex         m_error_mutex;
+    std::string                m_error;
+    std::atomic<std::uint64_t> m_daq_frames{ 0 };
+    std::atomic<std::uint64_t> m_daq_bytes{ 0 };
+    std::atomic<std::uint64_t> m_dispatched_frames{ 0 };
+    std::atomic<std::uint64_t> m_first_daq_timestamp{ 0 };
+    std::atomic<std::uint16_t> m_last_counter{ 0 };
+    std::atomic<std::uint64_t> m_truncated{ 0 };
+
+    std::string                m_data;
+    std::vector<std::uint32_t> m_offsets;
+    std::vector<std::uint32_t> m_lengths;
+    std::vector<std::uint32_t> m_counters;
+    std::vector<std::uint64_t> m_timestamps;
+    std::vector<std::uint8_t>  m_categories;
+};
+
+#endif  // __ETH_NATIVE_HPP
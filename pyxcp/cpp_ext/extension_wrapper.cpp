@@ -234,10 +234,14 @@ PYBIND11_MODULE(cpp_ext, m) {
 
     py::class_<Timestamp>(m, "Timestamp")
         .def(py::init<TimestampType>(), "ts_type"_a)
+        .def(py::init<TimestampType, std::uint64_t>(), "ts_type"_a, "offset"_a)
         .def_property_readonly("absolute", &Timestamp::absolute)
         .def_property_readonly("relative", &Timestamp::relative)
         .def_property_readonly("value", &Timestamp::get_value)
-        .def_property_readonly("initial_value", &Timestamp::get_initial_value);
+        .def_property_readonly("initial_value", &Timestamp::get_initial_value)
+        .def_property_readonly("offset", &Timestamp::get_offset)
+        .def_property_readonly_static("monotonic", [](py::object /* self */) { return Timestamp::monotonic(); })
+        .def_property_readonly_static("realtime", [](py::object /* self */) { return Timestamp::realtime(); });
 
     py::class_<TimestampInfo, PyTimestampInfo>(m, "TimestampInfo", py::dynamic_attr())
         .def(py::init<std::uint64_t>())
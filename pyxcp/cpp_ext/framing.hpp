@@ -12,6 +12,8 @@
 #include <mutex>
 #include <optional>
 #include <set>
+#include <span>
+#include <stdexcept>
 #include <thread>
 #include <tuple>
 #include <variant>
@@ -128,7 +130,7 @@ public:
     XcpFraming(const XcpFramingConfig& framing_type) : m_counter_send(0),
         m_framing_type(framing_type) {
 
-        m_send_buffer = new std::uint8_t[0xff + 8];
+        m_send_buffer = new std::uint8_t[SEND_BUFFER_SIZE];
 		reset_send_buffer_pointer();
     }
 
@@ -137,6 +139,19 @@ public:
     XcpFraming(XcpFraming&&) = delete;
 
 	FrameType prepare_request(std::uint32_t cmd, py::args data) {
+		std::vector<std::uint8_t> data_vec;
+		data_vec.reserve(data.size());
+		for (const auto& item : data) {
+			data_vec.push_back(item.cast<std::uint8_t>());
+		}
+		return prepare_request(cmd, std::span<const std::uint8_t>(data_vec));
+	}
+
+	FrameType prepare_request(std::uint32_t cmd, const std::vector<std::uint8_t>& data_vec) {
+		return prepare_request(cmd, std::span<const std::uint8_t>(data_vec));
+	}
+
+	FrameType prepare_request(std::uint32_t cmd, std::span<const std::uint8_t> data) {
 
 		std::vector<std::uint8_t> command_bytes{};
 		std::uint8_t frame_header_size{0};
@@ -147,6 +162,9 @@ public:
 		command_bytes = serialize_cmd_value(cmd);
 
 		auto xcp_packet_size = data.size() + command_bytes.size();
+		if (xcp_packet_size + MAX_FRAMING_OVERHEAD > SEND_BUFFER_SIZE) {
+			throw std::length_error("XcpFraming: request too long (" + std::to_string(xcp_packet_size) + " bytes)");
+		}
 
 		if (m_framing_type.header_len > 0) {
 			frame_header_size += m_framing_type.header_len;
@@ -206,14 +224,6 @@ public:
 		return result;
 	}
 
-	    FrameType prepare_request(std::uint32_t cmd, const std::vector<std::uint8_t>& data_vec) {
-        py::tuple data_tuple(data_vec.size());
-        for (size_t i = 0; i < data_vec.size(); ++i) {
-            data_tuple[i] = py::int_(data_vec[i]);
-        }
-        return prepare_request(cmd, data_tuple);
-    }
-
     std::optional<std::tuple<std::uint16_t, std::uint16_t>> unpack_header(const py::bytes& data, std::uint16_t initial_offset=0) const noexcept {
         auto data_view = bytes_as_string_view(data);
         if (std::size(data_view) >= (get_header_size() + initial_offset)) {
@@ -311,10 +321,10 @@ private:
 		}
 	}
 
-	void set_send_buffer(const py::args& values) noexcept {
-		for (auto idx=0; idx < values.size(); ++idx) {
-			m_send_buffer[m_send_buffer_offset] = values[idx].cast<std::uint8_t>();
-			m_send_buffer_offset++;
+	void set_send_buffer(std::span<const std::uint8_t> values) noexcept {
+		if (!values.empty()) {
+			std::memcpy(m_send_buffer + m_send_buffer_offset, values.data(), values.size());
+			m_send_buffer_offset += static_cast<std::uint16_t>(values.size());
 		}
 	}
 
@@ -351,6 +361,9 @@ private:
 	}
 
 private:
+    static constexpr std::size_t SEND_BUFFER_SIZE = 0xff + 8;
+    static constexpr std::size_t MAX_FRAMING_OVERHEAD = 8;  // Header (max. 4 bytes) plus fill and checksum.
+
     std::uint16_t m_counter_send;
     XcpFramingConfig m_framing_type;
     std::uint8_t * m_send_buffer = nullptr;
@@ -227,10 +227,30 @@ class TimestampInfo {
     std::int16_t  m_dst_offset{ 0 };
 };
 
+/*
+    Transport clock.
+
+    Timestamps are nanoseconds since the Unix epoch, but are derived from the
+    monotonic clock (CLOCK_MONOTONIC resp. `std::chrono::steady_clock`) plus a
+    single, process-wide realtime anchor taken on first use. Stepping the
+    system clock (NTP, manual changes) therefore never makes them jump or run
+    backwards, so they are safe for durations and timeouts as well; the
+    monotonic clock still follows the NTP frequency correction.
+*/
+struct ClockAnchor {
+    std::uint64_t realtime;
+    std::uint64_t monotonic;
+};
+
 class Timestamp {
    public:
 
-    explicit Timestamp(TimestampType ts_type) : m_type(ts_type) {
+    explicit Timestamp(TimestampType ts_type) : m_type(ts_type), m_offset(anchor().realtime - anchor().monotonic) {
+        m_initial = absolute();
+    }
+
+    // Share the time base of another `Timestamp` (see `get_offset()`), e.g. across extension modules.
+    Timestamp(TimestampType ts_type, std::uint64_t offset) : m_type(ts_type), m_offset(offset) {
         m_initial = absolute();
     }
 
@@ -238,11 +258,10 @@ class Timestamp {
     Timestamp(Timestamp &&)      = default;
 
     std::uint64_t get_value() const noexcept {
-        if (m_type == TimestampType::ABSOLUTE_TS) {
-            return absolute();
-        } else if (m_type == TimestampType::RELATIVE_TS) {
+        if (m_type == TimestampType::RELATIVE_TS) {
             return relative();
         }
+        return absolute();
     }
 
     std::uint64_t get_initial_value() const noexcept {
@@ -250,31 +269,49 @@ class Timestamp {
     }
 
     std::uint64_t absolute() const noexcept {
-        std::uint64_t current;
+        return m_offset + monotonic();
+    }
+
+    std::uint64_t relative() const noexcept {
+        return absolute() - m_initial;
+    }
+
+    // `absolute() - monotonic()`, i.e. the realtime anchor expressed on the monotonic clock.
+    std::uint64_t get_offset() const noexcept {
+        return m_offset;
+    }
 
+    static std::uint64_t monotonic() noexcept {
     #if defined(_WIN32) || defined(_WIN64)
-        current = std::chrono::duration_cast<std::chrono::nanoseconds>(m_clk.now().time_since_epoch()).count();
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count();
+    #else
+        timespec ts;
+        clock_gettime(CLOCK_MONOTONIC, &ts);
+        return static_cast<std::uint64_t>(ts.tv_sec) * 1'000'000'000 + ts.tv_nsec;
+    #endif  // _WIN32 || _WIN64
+    }
+
+    // Current wall-clock time -- not monotonic, only used for the anchor.
+    static std::uint64_t realtime() noexcept {
+    #if defined(_WIN32) || defined(_WIN64)
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::utc_clock::now().time_since_epoch()).count();
     #else
         // On MacOS `clock_gettime_nsec_np` could be used.
         timespec ts;
         clock_gettime(CLOCK_REALTIME, &ts);
-        current = static_cast<std::uint64_t>(ts.tv_sec) * 1'000'000'000 + ts.tv_nsec;
+        return static_cast<std::uint64_t>(ts.tv_sec) * 1'000'000'000 + ts.tv_nsec;
     #endif  // _WIN32 || _WIN64
-        return current;
     }
 
-    std::uint64_t relative() const noexcept {
-        return absolute() - m_initial;
+    static const ClockAnchor &anchor() noexcept {
+        static const ClockAnchor clock_anchor{ realtime(), monotonic() };
+        return clock_anchor;
     }
 
    private:
 
     TimestampType m_type;
-    #if defined(_WIN32) || defined(_WIN64)
-    std::chrono::utc_clock m_clk;
-    #else
-
-    #endif  // _WIN32 || _WIN64
+    std::uint64_t m_offset;
     std::uint64_t m_initial;
 };
 
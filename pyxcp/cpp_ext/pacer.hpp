@@ -0,0 +1,82 @@
+#if !defined(__PACER_HPP)
+#define __PACER_HPP
+
+#include <atomic>
+#include <chrono>
+#include <cstdint>
+#include <thread>
+
+/*
+    Transmit pacing at a minimum separation time (XCP MIN_ST / MIN_ST_PGM).
+
+    Frame slots are absolute deadlines on the steady clock (`previous + interval`),
+    so the time spent sending a frame does not add up to the separation time and
+    the schedule does not drift. Waiting sleeps for the bulk of the interval and
+    spins only for the last `SPIN_NS`, which keeps the jitter in the microsecond
+    range without burning a core for long intervals.
+
+    The first `wait()` (and any after a gap longer than the interval) returns at once.
+*/
+class Pacer {
+   public:
+
+    static constexpr std::int64_t SPIN_NS = 100'000;
+
+    explicit Pacer(std::uint64_t interval_ns = 0) : m_interval_ns(static_cast<std::int64_t>(interval_ns)) {
+    }
+
+    // Block until the next slot is due and claim it.
+    void wait() noexcept {
+        const auto now = now_ns();
+        if (m_interval_ns > 0 && m_next != 0 && now < m_next) {
+            const auto remaining = m_next - now;
+            if (remaining > SPIN_NS) {
+                std::this_thread::sleep_for(std::chrono::nanoseconds(remaining - SPIN_NS));
+            }
+            while (now_ns() < m_next) {
+                std::this_thread::yield();
+            }
+            m_waited_ns += m_next - now;
+            m_next += m_interval_ns;
+        } else {
+            m_next = now + m_interval_ns;
+        }
+        ++m_slots;
+    }
+
+    // Forget the schedule, the next `wait()` returns immediately.
+    void reset() noexcept {
+        m_next = 0;
+    }
+
+    std::uint64_t interval_ns() const noexcept {
+        return static_cast<std::uint64_t>(m_interval_ns);
+    }
+
+    void set_interval_ns(std::uint64_t interval_ns) noexcept {
+        m_interval_ns = static_cast<std::int64_t>(interval_ns);
+    }
+
+    // Number of slots handed out so far.
+    std::uint64_t slots() const noexcept {
+        return m_slots;
+    }
+
+    // Total time spent waiting for slots.
+    std::uint64_t waited_ns() const noexcept {
+        return static_cast<std::uint64_t>(m_waited_ns);
+    }
+
+    static std::int64_t now_ns() noexcept {
+        return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch()).count();
+    }
+
+   private:
+
+    std::int64_t               m_interval_ns;
+    std::int64_t               m_next{ 0 };
+    std::atomic<std::uint64_t> m_slots{ 0 };
+    std::int64_t               m_waited_ns{ 0 };
+};
+
+#endif  // __PACER_HPP
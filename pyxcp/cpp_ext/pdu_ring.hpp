@@ -0,0 +1,102 @@
+#if !defined(__PDU_RING_HPP)
+#define __PDU_RING_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <cstring>
+#include <vector>
+
+/*
+    Fixed-size ring buffer of the most recent PDUs, kept for diagnostics.
+
+    Recording is a plain copy of the frame header and a (truncated) payload
+    prefix into preallocated storage -- no allocation, no formatting.
+    Rendering to hex/JSON is left to the consumer, which only happens on
+    timeouts or errors.
+
+    Not synchronized; callers serialize access (the Python bindings are
+    only invoked with the GIL held).
+*/
+class PduRingBuffer {
+   public:
+
+    struct Entry {
+        std::uint8_t  direction;
+        std::uint8_t  category;
+        std::uint16_t data_length;
+        std::uint32_t counter;
+        std::uint64_t timestamp;
+        std::uint32_t length;
+    };
+
+    PduRingBuffer(std::size_t capacity, std::size_t max_data) :
+        m_capacity((std::max)(capacity, std::size_t{ 1 })),
+        m_max_data((std::min)(max_data, std::size_t{ 0xFFFF })),
+        m_entries(m_capacity),
+        m_data(m_capacity * m_max_data) {
+    }
+
+    // `prefix` (0..255): a byte stored in front of `data`, e.g. an ODT number passed separately (XCPonCAN PID_OFF).
+    void record(
+        std::uint8_t direction, std::uint8_t category, std::uint32_t counter, std::uint64_t timestamp, std::uint32_t length,
+        const char* data, std::size_t size, std::size_t data_limit, int prefix = -1
+    ) noexcept {
+        const auto        slot   = m_head;
+        const std::size_t extra  = prefix >= 0 ? 1 : 0;
+        const auto        stored = (std::min)({ size + extra, data_limit, m_max_data });
+
+        m_entries[slot] = Entry{ direction, category, static_cast<std::uint16_t>(stored), counter, timestamp, length };
+        if (stored != 0) {
+            char* dest = m_data.data() + slot * m_max_data;
+            if (extra) {
+                *dest++ = static_cast<char>(prefix);
+            }
+            if (stored > extra) {
+                std::memcpy(dest, data, stored - extra);
+            }
+        }
+        m_head = (m_head + 1) % m_capacity;
+        if (m_size < m_capacity) {
+            ++m_size;
+        }
+    }
+
+    // Visit the `last_n` most recent entries, oldest first.
+    template<typename Func>
+    void visit(std::size_t last_n, Func&& func) const {
+        const auto count = (std::min)(last_n, m_size);
+        auto       slot  = (m_head + m_capacity - count) % m_capacity;
+        for (std::size_t idx = 0; idx < count; ++idx) {
+            func(m_entries[slot], m_data.data() + slot * m_max_data);
+            slot = (slot + 1) % m_capacity;
+        }
+    }
+
+    void clear() noexcept {
+        m_head = 0;
+        m_size = 0;
+    }
+
+    std::size_t size() const noexcept {
+        return m_size;
+    }
+
+    std::size_t capacity() const noexcept {
+        return m_capacity;
+    }
+
+    std::size_t max_data() const noexcept {
+        return m_max_data;
+    }
+
+   private:
+
+    std::size_t        m_capacity;
+    std::size_t        m_max_data;
+    std::size_t        m_head{ 0 };
+    std::size_t        m_size{ 0 };
+    std::vector<Entry> m_entries;
+    std::vector<char>  m_data;
+};
+
+#endif  // __PDU_RING_HPP
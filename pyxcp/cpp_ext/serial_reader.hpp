@@ -0,0 +1,95 @@
+#if !defined(__SERIAL_READER_HPP)
+#define __SERIAL_READER_HPP
+
+#if defined(__linux__)
+
+    #include <poll.h>
+    #include <unistd.h>
+
+    #include <cerrno>
+    #include <cstddef>
+    #include <cstdint>
+    #include <string_view>
+    #include <system_error>
+    #include <vector>
+
+/*
+    Bulk reads from a serial port (XCPonSxI), Linux.
+
+    `read()` waits with `poll()` for the first byte and then keeps `read()`ing whatever
+    the driver has buffered, until nothing is left or the buffer is full; i.e. one call
+    per wake-up instead of `read(1)` followed by `read(in_waiting)`.
+    The file descriptor is borrowed (e.g. `serial.Serial.fileno()`), not closed.
+*/
+class SerialReader {
+   public:
+
+    static constexpr std::size_t DEFAULT_BUFFER_SIZE = 65536;
+
+    explicit SerialReader(int fd, std::size_t buffer_size = DEFAULT_BUFFER_SIZE) : m_fd(fd), m_buffer(buffer_size ? buffer_size : 1) {
+    }
+
+    // Bytes received within `timeout_ms`, empty on timeout. The view is valid until the next call.
+    std::string_view read(int timeout_ms) {
+        std::size_t size    = 0;
+        int         timeout = timeout_ms;
+        while (size < m_buffer.size()) {
+            pollfd    pfd{ m_fd, POLLIN, 0 };
+            const int ready = ::poll(&pfd, 1, timeout);
+            if (ready <= 0) {
+                if (ready < 0 && errno != EINTR) {
+                    throw std::system_error(errno, std::generic_category(), "poll()");
+                }
+                break;
+            }
+            if (pfd.revents & POLLNVAL) {
+                throw std::system_error(EBADF, std::generic_category(), "poll()");
+            }
+            const auto count = ::read(m_fd, m_buffer.data() + size, m_buffer.size() - size);
+            ++m_syscalls;
+            if (count < 0) {
+                if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR) {
+                    break;
+                }
+                throw std::system_error(errno, std::generic_category(), "read()");
+            }
+            if (count == 0) {
+                if (pfd.revents & (POLLERR | POLLHUP)) {
+                    throw std::system_error(EIO, std::generic_category(), "read()");
+                }
+                break;
+            }
+            size += static_cast<std::size_t>(count);
+            timeout = 0;  // Drain, don't wait any longer.
+        }
+        m_bytes_received += size;
+        return { reinterpret_cast<const char*>(m_buffer.data()), size };
+    }
+
+    int fileno() const noexcept {
+        return m_fd;
+    }
+
+    std::size_t buffer_size() const noexcept {
+        return m_buffer.size();
+    }
+
+    std::uint64_t bytes_received() const noexcept {
+        return m_bytes_received;
+    }
+
+    std::uint64_t syscalls() const noexcept {
+        return m_syscalls;
+    }
+
+   private:
+
+    int                       m_fd;
+    std::vector<std::uint8_t> m_buffer;
+    std::uint64_t             m_bytes_received{ 0 };
+    std::uint64_t             m_syscalls{ 0 };
+};
+
+#endif  // __linux__
+
+#endif  // __SERIAL_READER_HPP
@@ -0,0 +1,370 @@
+#if !defined(__SOCKETCAN_HPP)
+#define __SOCKETCAN_HPP
+
+#if defined(__linux__)
+
+    #include <linux/can.h>
+    #include <linux/can/raw.h>
+    #include <linux/net_tstamp.h>
+    #include <net/if.h>
+    #include <poll.h>
+    #include <sys/socket.h>
+    #include <time.h>
+    #include <unistd.h>
+
+    #include <algorithm>
+    #include <atomic>
+    #include <cerrno>
+    #include <cstdint>
+    #include <cstddef>
+    #include <cstring>
+    #include <mutex>
+    #include <stdexcept>
+    #include <string>
+    #include <string_view>
+    #include <system_error>
+    #include <unordered_map>
+    #include <utility>
+    #include <vector>
+
+    #include "helper.hpp"
+    #include "pacer.hpp"
+
+/*
+    Raw SocketCAN socket for XCPonCAN (Linux).
+
+    Frames are received with one `recvmmsg()` per wake-up straight into
+    preallocated `canfd_frame`s; filtering happens in the kernel
+    (CAN_RAW_FILTER), RTR, error and empty frames are skipped.
+
+    Receive timestamps come from the kernel (SO_TIMESTAMPING): software
+    timestamps are mapped onto the monotonic transport clock (`Timestamp`),
+    hardware timestamps -- if requested and provided by the driver -- are
+    passed through unchanged (controller time base).
+
+    Identifiers use the XCP/SocketCAN convention: bit 31 (CAN_EFF_FLAG) set
+    signals a 29-bit identifier.
+
+    Frames dropped by the kernel because the socket's receive queue was full
+    are reported via SO_RXQ_OVFL (`overflows()`).
+
+    PID_OFF: for identifiers registered with `set_pid_map()` the ODT number is
+    stored in the reserved byte right in front of the payload, `data()` then
+    covers both -- the translated PDU without any copying.
+*/
+class SocketCanReader {
+   public:
+
+    SocketCanReader(
+        const std::string& channel, bool fd, std::size_t max_frames, bool hardware_timestamps, std::uint64_t clock_offset = 0
+    ) :
+        m_channel(channel),
+        m_fd(fd),
+        m_max_frames((std::max)(max_frames, std::size_t{ 1 })),
+        m_hardware_timestamps(hardware_timestamps),
+        m_timestamp(
+            clock_offset ? Timestamp(TimestampType::ABSOLUTE_TS, clock_offset) : Timestamp(TimestampType::ABSOLUTE_TS)
+        ),
+        m_frames(m_max_frames),
+        m_timestamps(m_max_frames),
+        m_pids(m_max_frames),
+        m_headers(m_max_frames),
+        m_iovecs(m_max_frames),
+        m_control(m_max_frames * CONTROL_SIZE) {
+        const auto ifindex = ::if_nametoindex(channel.c_str());
+        if (ifindex == 0) {
+            throw std::system_error(errno, std::generic_category(), "SocketCAN interface '" + channel + "'");
+        }
+        m_socket = ::socket(PF_CAN, SOCK_RAW, CAN_RAW);
+        if (m_socket < 0) {
+            throw std::system_error(errno, std::generic_category(), "socket(PF_CAN)");
+        }
+        if (m_fd) {
+            int enable = 1;
+            if (::setsockopt(m_socket, SOL_CAN_RAW, CAN_RAW_FD_FRAMES, &enable, sizeof(enable)) != 0) {
+                fail("CAN_RAW_FD_FRAMES");
+            }
+        }
+        int flags = SOF_TIMESTAMPING_RX_SOFTWARE | SOF_TIMESTAMPING_SOFTWARE;
+        if (m_hardware_timestamps) {
+            flags |= SOF_TIMESTAMPING_RX_HARDWARE | SOF_TIMESTAMPING_RAW_HARDWARE;
+        }
+        m_kernel_timestamps = ::setsockopt(m_socket, SOL_SOCKET, SO_TIMESTAMPING, &flags, sizeof(flags)) == 0;
+        int enable          = 1;
+        ::setsockopt(m_socket, SOL_SOCKET, SO_RXQ_OVFL, &enable, sizeof(enable));
+
+        sockaddr_can address{};
+        address.can_family  = AF_CAN;
+        address.can_ifindex = static_cast<int>(ifindex);
+        if (::bind(m_socket, reinterpret_cast<sockaddr*>(&address), sizeof(address)) != 0) {
+            fail("bind(" + channel + ")");
+        }
+    }
+
+    SocketCanReader(const SocketCanReader&)            = delete;
+    SocketCanReader& operator=(const SocketCanReader&) = delete;
+
+    ~SocketCanReader() {
+        close();
+    }
+
+    // `(can_id, can_mask)` pairs as in `struct can_filter`; an empty list rejects everything.
+    void set_filters(const std::vector<std::pair<std::uint32_t, std::uint32_t>>& filters) {
+        std::vector<can_filter> kernel_filters;
+        kernel_filters.reserve(filters.size());
+        for (const auto& [can_id, can_mask] : filters) {
+            kernel_filters.push_back(can_filter{ can_id, can_mask });
+        }
+        const auto size = static_cast<socklen_t>(kernel_filters.size() * sizeof(can_filter));
+        if (::setsockopt(m_socket, SOL_CAN_RAW, CAN_RAW_FILTER, kernel_filters.empty() ? nullptr : kernel_filters.data(), size) !=
+            0) {
+            throw std::system_error(errno, std::generic_category(), "CAN_RAW_FILTER");
+        }
+    }
+
+    // Identifier (bit 31 set: 29-bit identifier) -> ODT number, for DAQ identifiers in PID_OFF mode.
+    void set_pid_map(const std::unordered_map<std::uint32_t, std::uint8_t>& pid_map) {
+        std::lock_guard<std::mutex> lock(m_pid_mutex);
+        m_pid_map = pid_map;
+    }
+
+    /*
+        Wait up to `timeout_ms` for frames and receive all that are queued (max. `max_frames`).
+
+        Returns the number of frames available via `identifier()`/`data()`/`timestamp()`, 0 on timeout;
+        throws `std::system_error` on socket errors.
+    */
+    std::size_t receive(int timeout_ms) {
+        m_count = 0;
+        pollfd    pfd{ m_socket, POLLIN, 0 };
+        const int ready = ::poll(&pfd, 1, timeout_ms);
+        if (ready <= 0) {
+            if (ready < 0 && errno != EINTR) {
+                throw std::system_error(errno, std::generic_category(), "poll()");
+            }
+            return 0;
+        }
+        if (pfd.revents & (POLLERR | POLLNVAL)) {
+            throw std::system_error(pfd.revents & POLLNVAL ? EBADF : EIO, std::generic_category(), "poll()");
+        }
+        for (std::size_t idx = 0; idx < m_max_frames; ++idx) {
+            m_iovecs[idx]                         = iovec{ &m_frames[idx], sizeof(canfd_frame) };
+            m_headers[idx].msg_hdr                = msghdr{};
+            m_headers[idx].msg_hdr.msg_iov        = &m_iovecs[idx];
+            m_headers[idx].msg_hdr.msg_iovlen     = 1;
+            m_headers[idx].msg_hdr.msg_control    = m_control.data() + idx * CONTROL_SIZE;
+            m_headers[idx].msg_hdr.msg_controllen = CONTROL_SIZE;
+            m_headers[idx].msg_len                = 0;
+        }
+        const int count = ::recvmmsg(m_socket, m_headers.data(), static_cast<unsigned int>(m_max_frames), MSG_DONTWAIT, nullptr);
+        if (count < 0) {
+            if (errno == EAGAIN || errno == EWOULDBLOCK || errno == EINTR) {
+                return 0;
+            }
+            throw std::system_error(errno, std::generic_category(), "recvmmsg()");
+        }
+        ++m_syscalls;
+        const std::uint64_t now = m_timestamp.absolute();
+        // Kernel software timestamps are wall-clock; `realtime - absolute` maps them onto the transport clock.
+        const std::int64_t realtime_delta = static_cast<std::int64_t>(Timestamp::realtime() - now);
+
+        std::lock_guard<std::mutex> lock(m_pid_mutex);
+        // Compact in place: keep data frames with payload only.
+        for (std::size_t idx = 0; idx < static_cast<std::size_t>(count); ++idx) {
+            const auto& frame = m_frames[idx];
+            if (m_headers[idx].msg_len < CAN_MTU || (frame.can_id & (CAN_RTR_FLAG | CAN_ERR_FLAG)) || frame.len == 0) {
+                continue;
+            }
+            std::uint64_t timestamp = now;
+            const auto [software, hardware] = parse_control(m_headers[idx].msg_hdr);
+            if (m_kernel_timestamps) {
+                if (m_hardware_timestamps && hardware != 0) {
+                    timestamp = hardware;
+                } else if (software != 0) {
+                    timestamp = static_cast<std::uint64_t>(static_cast<std::int64_t>(software) - realtime_delta);
+                }
+            }
+            if (m_count != idx) {
+                m_frames[m_count] = frame;
+            }
+            m_timestamps[m_count] = timestamp;
+            m_pids[m_count]       = false;
+            if (!m_pid_map.empty()) {
+                const auto pid = m_pid_map.find(identifier(m_count));
+                if (pid != m_pid_map.end()) {
+                    reinterpret_cast<std::uint8_t*>(&m_frames[m_count])[PID_OFFSET] = pid->second;
+                    m_pids[m_count]                                                 = true;
+                }
+            }
+            ++m_count;
+        }
+        m_frames_received += m_count;
+        return m_count;
+    }
+
+    // Raw identifier of received frame `idx` (bit 31 set: 29-bit identifier).
+    std::uint32_t identifier(std::size_t idx) const noexcept {
+        const auto can_id = m_frames[idx].can_id;
+        return (can_id & CAN_EFF_FLAG) ? (can_id & (CAN_EFF_FLAG | CAN_EFF_MASK)) : (can_id & CAN_SFF_MASK);
+    }
+
+    // Payload of received frame `idx`, prefixed with the ODT number for PID_OFF identifiers.
+    std::string_view data(std::size_t idx) const noexcept {
+        const auto&       frame  = m_frames[idx];
+        const std::size_t length = (std::min)(frame.len, std::uint8_t{ CANFD_MAX_DLEN });
+        if (m_pids[idx]) {
+            return std::string_view(reinterpret_cast<const char*>(&frame) + PID_OFFSET, length + 1);
+        }
+        return std::string_view(reinterpret_cast<const char*>(frame.data), length);
+    }
+
+    std::uint64_t timestamp(std::size_t idx) const noexcept {
+        return m_timestamps[idx];
+    }
+
+    std::size_t size() const noexcept {
+        return m_count;
+    }
+
+    // `identifier`: bit 31 set for 29-bit identifiers. `data` must already be padded to a valid (FD) length.
+    void send(std::uint32_t identifier, std::string_view data, bool fd, bool bitrate_switch) {
+        canfd_frame frame{};
+        frame.can_id = (identifier & CAN_EFF_FLAG) ? (identifier & (CAN_EFF_FLAG | CAN_EFF_MASK)) : (identifier & CAN_SFF_MASK);
+        const std::size_t max_length = fd ? CANFD_MAX_DLEN : CAN_MAX_DLEN;
+        if (data.size() > max_length) {
+            throw std::invalid_argument("SocketCanReader: payload exceeds " + std::to_string(max_length) + " bytes");
+        }
+        frame.len = static_cast<std::uint8_t>(data.size());
+        std::memcpy(frame.data, data.data(), data.size());
+        std::size_t mtu = CAN_MTU;
+        if (fd) {
+            frame.flags = bitrate_switch ? CANFD_BRS : 0;
+            mtu         = CANFD_MTU;
+        }
+        const auto written = ::write(m_socket, &frame, mtu);
+        if (written != static_cast<ssize_t>(mtu)) {
+            throw std::system_error(written < 0 ? errno : EIO, std::generic_category(), "write(" + m_channel + ")");
+        }
+    }
+
+    /*
+        Send `frames` (same identifier) one per `pacer` slot, e.g. the packets of a block-mode DOWNLOAD/PROGRAM.
+
+        A full transmit queue (ENOBUFS) is retried for up to `ENOBUFS_RETRY_NS`.
+    */
+    void send_block(std::uint32_t identifier, const std::vector<std::string_view>& frames, bool fd, bool bitrate_switch, Pacer& pacer) {
+        for (const auto& data : frames) {
+            pacer.wait();
+            const auto deadline = Pacer::now_ns() + ENOBUFS_RETRY_NS;
+            while (true) {
+                try {
+                    send(identifier, data, fd, bitrate_switch);
+                    break;
+                } catch (const std::system_error& ex) {
+                    if (ex.code().value() != ENOBUFS || Pacer::now_ns() > deadline) {
+                        throw;
+                    }
+                    std::this_thread::sleep_for(std::chrono::microseconds(50));
+                }
+            }
+        }
+    }
+
+    void close() noexcept {
+        if (m_socket >= 0) {
+            ::close(m_socket);
+            m_socket = -1;
+        }
+    }
+
+    int fileno() const noexcept {
+        return m_socket;
+    }
+
+    const std::string& channel() const noexcept {
+        return m_channel;
+    }
+
+    bool fd() const noexcept {
+        return m_fd;
+    }
+
+    bool kernel_timestamps() const noexcept {
+        return m_kernel_timestamps;
+    }
+
+    std::uint64_t frames_received() const noexcept {
+        return m_frames_received;
+    }
+
+    std::uint64_t syscalls() const noexcept {
+        return m_syscalls;
+    }
+
+    // Frames dropped by the kernel (receive queue overflow) since the socket was opened.
+    std::uint64_t overflows() const noexcept {
+        return m_overflows;
+    }
+
+   private:
+
+    static constexpr std::size_t CONTROL_SIZE = CMSG_SPACE(3 * sizeof(timespec)) + CMSG_SPACE(sizeof(std::uint32_t));
+    static constexpr std::int64_t ENOBUFS_RETRY_NS = 100'000'000;
+    // Reserved byte in front of `canfd_frame::data`, holds the ODT number in PID_OFF mode.
+    static constexpr std::size_t PID_OFFSET = offsetof(canfd_frame, data) - 1;
+    static_assert(offsetof(canfd_frame, data) == 8, "unexpected canfd_frame layout");
+
+    [[noreturn]] void fail(const std::string& what) {
+        const auto error = errno;
+        close();
+        throw std::system_error(error, std::generic_category(), what);
+    }
+
+    // (software, hardware) timestamps from SCM_TIMESTAMPING, 0 if not available; updates the overflow count.
+    std::pair<std::uint64_t, std::uint64_t> parse_control(const msghdr& header) noexcept {
+        std::pair<std::uint64_t, std::uint64_t> result{ 0, 0 };
+        for (auto cmsg = CMSG_FIRSTHDR(&header); cmsg != nullptr; cmsg = CMSG_NXTHDR(const_cast<msghdr*>(&header), cmsg)) {
+            if (cmsg->cmsg_level != SOL_SOCKET) {
+                continue;
+            }
+            if (cmsg->cmsg_type == SCM_TIMESTAMPING) {
+                timespec ts[3];
+                std::memcpy(ts, CMSG_DATA(cmsg), sizeof(ts));
+                result = { to_ns(ts[0]), to_ns(ts[2]) };
+            } else if (cmsg->cmsg_type == SO_RXQ_OVFL) {
+                std::uint32_t dropped = 0;
+                std::memcpy(&dropped, CMSG_DATA(cmsg), sizeof(dropped));
+                m_overflows = dropped;  // Cumulative count.
+            }
+        }
+        return result;
+    }
+
+    static std::uint64_t to_ns(const timespec& ts) noexcept {
+        return static_cast<std::uint64_t>(ts.tv_sec) * 1'000'000'000 + ts.tv_nsec;
+    }
+
+    std::string                m_channel;
+    bool                       m_fd;
+    std::size_t                m_max_frames;
+    bool                       m_hardware_timestamps;
+    Timestamp                  m_timestamp;
+    int                        m_socket{ -1 };
+    bool                       m_kernel_timestamps{ false };
+    std::vector<canfd_frame>   m_frames;
+    std::vector<std::uint64_t> m_timestamps;
+    std::vector<bool>          m_pids;
+    std::vector<mmsghdr>       m_headers;
+    std::vector<iovec>         m_iovecs;
+    std::vector<char>          m_control;
+    std::size_t                m_count{ 0 };
+    std::atomic<std::uint64_t> m_frames_received{ 0 };
+    std::atomic<std::uint64_t> m_syscalls{ 0 };
+    std::atomic<std::uint64_t> m_overflows{ 0 };
+    std::mutex                 m_pid_mutex;
+    std::unordered_map<std::uint32_t, std::uint8_t> m_pid_map;
+};
+
+#endif  // __linux__
+
+#endif  // __SOCKETCAN_HPP
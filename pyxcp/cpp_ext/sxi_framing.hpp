@@ -9,6 +9,8 @@
 #include <functional>
 #include <memory>
 #include <mutex>
+#include <span>
+#include <string_view>
 #include <thread>
 #include <vector>
 #include <iomanip>
@@ -149,18 +151,41 @@ template<SxiHeaderFormat Format, SxiChecksumType Checksum>
 class SxiReceiver {
    public:
 
+    using dispatch_handler_t = std::function<void(std::span<const uint8_t>, uint16_t, uint16_t)>;
+
     explicit SxiReceiver(
-        std::function<void(const std::vector<uint8_t>&, uint16_t, uint16_t)> dispatch_handler,
+        dispatch_handler_t dispatch_handler,
         std::chrono::milliseconds /*timeout*/ = std::chrono::milliseconds(0)
     ) :
         dispatch_(std::move(dispatch_handler)) {
         reset();
     }
 
-    void feed_bytes(const std::string& data) {
-        for (const auto& c : data) {
-            //feed(static_cast<uint8_t>(c));
-            feed(c);
+    /*
+        Bulk path: complete frames are located via their length header and checked/dispatched
+        in place, several per call; only a frame split across two calls (or one exceeding the
+        receive buffer) goes through the per-octet state machine.
+    */
+    void feed_bytes(std::string_view data) {
+        const auto* bytes = reinterpret_cast<const uint8_t*>(data.data());
+        std::size_t size  = data.size();
+        std::size_t pos   = 0;
+
+        // Finish a frame started by the previous call.
+        while (pos < size && state_ != State::Idle) {
+            feed(bytes[pos++]);
+        }
+        while (pos < size) {
+            const std::size_t frame_size = complete_frame_size(bytes + pos, size - pos);
+            if (frame_size == 0) {
+                break;
+            }
+            dispatch_frame(bytes + pos);
+            pos += frame_size;
+        }
+        // Partial frame (or one exceeding the buffer): per-octet.
+        while (pos < size) {
+            feed(bytes[pos++]);
         }
     }
 
@@ -243,34 +268,8 @@ class SxiReceiver {
                     payload_off = 4;
                 }
 
-                // verify checksum
-                if constexpr (Checksum == SxiChecksumType::Sum8) {
-                    uint8_t sum = 0;
-                    for (uint16_t i = 0; i < (payload_off + dlc_ + fill_); ++i) {
-                        sum += buffer_[i];
-                    }
-                    uint8_t rx = buffer_[payload_off + dlc_];
-                    if (sum != rx) {
-                        log_checksum_error(sum, rx, payload_off + dlc_ + 1);
-                        reset();
-                        return;
-                    }
-                } else if constexpr (Checksum == SxiChecksumType::Sum16) {
-                    uint16_t           count = (payload_off + dlc_ + fill_);
-                    uint16_t sum      = 0;
-
-                    for (uint16_t idx = 0; idx < count; idx += 2) {
-                        sum = static_cast<uint16_t>(sum + detail::make_word_le(&buffer_[idx]));
-                    }
-                    uint16_t rx = detail::make_word_le(&buffer_[payload_off + dlc_ + fill_]);
-                    if (sum != rx) {
-                        log_checksum_error(sum, rx, payload_off + dlc_ + fill_ + 2);
-                        reset();
-                        return;
-                    }
-                }
-                if (dispatch_) {
-                    dispatch_({ buffer_.data() + payload_off, buffer_.data() + payload_off + dlc_ }, dlc_, ctr_);
+                if (verify_checksum(buffer_.data(), payload_off, dlc_, fill_) && dispatch_) {
+                    dispatch_(std::span<const uint8_t>(buffer_.data() + payload_off, dlc_), dlc_, ctr_);
                     #if defined(XCP_TL_TEST_HOOKS)
                     std::fill(buffer_.begin(), buffer_.end(), 0xcc);
                     #endif
@@ -284,6 +283,98 @@ class SxiReceiver {
 
    private:
 
+    static constexpr uint16_t header_size() {
+        if constexpr (Format == SxiHeaderFormat::LenByte) {
+            return 1;
+        } else if constexpr (Format == SxiHeaderFormat::LenCtrWord || Format == SxiHeaderFormat::LenFillWord) {
+            return 4;
+        } else {
+            return 2;
+        }
+    }
+
+    static constexpr uint16_t checksum_size() {
+        if constexpr (Checksum == SxiChecksumType::Sum8) {
+            return 1;
+        } else if constexpr (Checksum == SxiChecksumType::Sum16) {
+            return 2;
+        } else {
+            return 0;
+        }
+    }
+
+    static uint16_t frame_length(const uint8_t* frame) {
+        if constexpr (Format == SxiHeaderFormat::LenByte || Format == SxiHeaderFormat::LenCtrByte ||
+                      Format == SxiHeaderFormat::LenFillByte) {
+            return frame[0];
+        } else {
+            return detail::make_word_le(frame);
+        }
+    }
+
+    static uint16_t frame_counter(const uint8_t* frame) {
+        if constexpr (Format == SxiHeaderFormat::LenCtrByte) {
+            return frame[1];
+        } else if constexpr (Format == SxiHeaderFormat::LenCtrWord) {
+            return detail::make_word_le(frame + 2);
+        } else {
+            return 0;
+        }
+    }
+
+    static uint16_t fill_size(uint16_t dlc) {
+        if constexpr (Checksum == SxiChecksumType::Sum16) {
+            return ((header_size() + dlc) % 2 != 0) ? 1u : 0u;
+        } else {
+            return 0;
+        }
+    }
+
+    // Size of the frame at `frame` if it is completely contained in `available` bytes (and fits the receive buffer), else 0.
+    std::size_t complete_frame_size(const uint8_t* frame, std::size_t available) const {
+        if (available < header_size()) {
+            return 0;
+        }
+        const uint16_t    dlc  = frame_length(frame);
+        const std::size_t size = header_size() + dlc + fill_size(dlc) + checksum_size();
+        return (size <= available && size <= buffer_.size()) ? size : 0;
+    }
+
+    void dispatch_frame(const uint8_t* frame) {
+        const uint16_t dlc  = frame_length(frame);
+        const uint16_t fill = fill_size(dlc);
+        if (verify_checksum(frame, header_size(), dlc, fill) && dispatch_) {
+            dispatch_(std::span<const uint8_t>(frame + header_size(), dlc), dlc, frame_counter(frame));
+        }
+    }
+
+    // Checksum over header, payload and fill (SUM8: bytes, SUM16: little-endian words), compared against the trailer.
+    bool verify_checksum(const uint8_t* frame, uint16_t payload_off, uint16_t dlc, uint16_t fill) {
+        const std::size_t count = payload_off + dlc + fill;
+        if constexpr (Checksum == SxiChecksumType::Sum8) {
+            uint32_t sum = 0;
+            for (std::size_t idx = 0; idx < count; ++idx) {
+                sum += frame[idx];
+            }
+            const uint8_t rx = frame[count];
+            if (static_cast<uint8_t>(sum) != rx) {
+                log_checksum_error(frame, static_cast<uint8_t>(sum), rx, static_cast<uint16_t>(count + 1));
+                return false;
+            }
+        } else if constexpr (Checksum == SxiChecksumType::Sum16) {
+            uint32_t sum = 0;
+            for (std::size_t idx = 0; idx < count; idx += 2) {
+                sum += detail::make_word_le(frame + idx);
+            }
+            const uint16_t rx = detail::make_word_le(frame + count);
+            if (static_cast<uint16_t>(sum) != rx) {
+                log_checksum_error(frame, static_cast<uint16_t>(sum), rx, static_cast<uint16_t>(count + 2));
+                return false;
+            }
+        }
+        return true;
+    }
+
     enum class State {
         Idle,
         UntilLength,
@@ -291,14 +382,14 @@ class SxiReceiver {
     };
 
     template<typename T>
-    void log_checksum_error(T calculated, T received, uint16_t packet_len) {
+    void log_checksum_error(const uint8_t* frame, T calculated, T received, uint16_t packet_len) {
         std::cerr << "SXI checksum error: Calculated " << std::hex << "0x" << static_cast<int>(calculated)
                   << ", but received " << "0x" << static_cast<int>(received) << "." << std::dec << std::endl;
         std::cerr << "Packet dump (" << packet_len << " bytes):" << std::endl;
         std::cerr << "[";
         std::ios_base::fmtflags flags(std::cerr.flags()); // save flags
         for (uint16_t i = 0; i < packet_len; ++i) {
-            std::cerr << std::hex << std::setw(2) << std::setfill('0') << static_cast<int>(buffer_[i]) << " ";
+            std::cerr << std::hex << std::setw(2) << std::setfill('0') << static_cast<int>(frame[i]) << " ";
             if ((i + 1) % 16 == 0) {
                 std::cerr << std::endl;
             }
@@ -326,7 +417,7 @@ class SxiReceiver {
     uint16_t                                         ctr_{ 0 };
     uint32_t                                         remaining_{ 0 };
     uint16_t                                         fill_ {0};
-    std::function<void(const std::vector<uint8_t>&, uint16_t, uint16_t)> dispatch_;
+    dispatch_handler_t                               dispatch_;
 };
 
 #endif // __SXI_FRAMING_HPP
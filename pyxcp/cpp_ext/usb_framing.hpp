@@ -0,0 +1,212 @@
+#if !defined(__USB_FRAMING_HPP)
+#define __USB_FRAMING_HPP
+
+#include <algorithm>
+#include <cstdint>
+#include <functional>
+#include <span>
+#include <string_view>
+#include <vector>
+
+#include "framing.hpp"
+
+// Ingoing message packing (XCPonUSB, IN-EP).
+enum class UsbMessagePacking : std::uint8_t {
+    Single,
+    Multiple,
+    Streaming,
+};
+
+/*
+    Splits IN-EP transfers into XCP messages (header: LEN [CTR|FILL], see `XcpFramingConfig`).
+
+    Each message starts at a multiple of `alignment` bytes (counted from the start of the
+    USB transfer, or of the stream for MESSAGE_PACKING_STREAMING). A host read also completes
+    when its buffer is full, so an incomplete rest is carried over to the next read in every
+    packing mode. With SINGLE/MULTIPLE packing a read ending in a short packet (its size is
+    not a multiple of `max_packet_size`) ends the USB transfer: an incomplete rest is dropped
+    there, and a message with LEN = 0 is padding up to the next `max_packet_size` boundary.
+    SINGLE is parsed like MULTIPLE, so a slave packing several messages anyway does not lose
+    any. `max_packet_size` = 0 (unknown): every read is taken as a complete USB transfer.
+*/
+class UsbReceiver {
+   public:
+
+    using dispatch_t = std::function<void(std::span<const std::uint8_t>, std::uint16_t, std::uint16_t, std::uint64_t)>;
+
+    UsbReceiver(
+        dispatch_t dispatch_handler, const XcpFramingConfig& framing, UsbMessagePacking packing, std::uint16_t alignment,
+        std::uint16_t max_packet_size = 0
+    ) :
+        m_dispatch(std::move(dispatch_handler)),
+        m_header_len(framing.header_len),
+        m_header_ctr(framing.header_ctr),
+        m_header_size(framing.header_len + framing.header_ctr + framing.header_fill),
+        m_streaming(packing == UsbMessagePacking::Streaming),
+        m_alignment(alignment ? alignment : 1),
+        m_max_packet_size(max_packet_size) {
+    }
+
+    void feed_transfer(std::string_view data, std::uint64_t timestamp) {
+        const auto* ptr = reinterpret_cast<const std::uint8_t*>(data.data());
+        std::size_t len = data.size();
+        std::size_t pos = std::min(m_skip, len);
+
+        ++m_transfers;
+        m_skip -= pos;
+        if (!m_pending.empty()) {
+            pos += complete_pending(ptr + pos, len - pos);
+            if (!m_pending.empty()) {
+                end_transfer(len);
+                return;
+            }
+            pos = skip_padding(pos, len);
+        }
+        while (pos < len) {
+            const std::size_t available = len - pos;
+            if (available < m_header_size) {
+                keep(ptr + pos, available, timestamp);
+                break;
+            }
+            const auto length = message_length(ptr + pos);
+            if (length == 0) {
+                pos = m_streaming ? skip_padding(pos + m_header_size, len) : skip_packet(pos, len);
+                continue;
+            }
+            const std::size_t size = m_header_size + length;
+            if (available < size) {
+                keep(ptr + pos, available, timestamp);
+                break;
+            }
+            dispatch(ptr + pos, timestamp);
+            pos = skip_padding(pos + size, len);
+        }
+        end_transfer(len);
+    }
+
+    void reset() noexcept {
+        m_pending.clear();
+        m_base = 0;
+        m_skip = 0;
+    }
+
+    std::uint16_t max_packet_size() const noexcept {
+        return m_max_packet_size;
+    }
+
+    void set_max_packet_size(std::uint16_t value) noexcept {
+        m_max_packet_size = value;
+    }
+
+    std::uint64_t messages() const noexcept {
+        return m_messages;
+    }
+
+    std::uint64_t transfers() const noexcept {
+        return m_transfers;
+    }
+
+    // Bytes dropped: LEN = 0 padding and messages cut off by a short packet (SINGLE/MULTIPLE packing).
+    std::uint64_t discarded() const noexcept {
+        return m_discarded;
+    }
+
+   private:
+
+    std::uint16_t message_length(const std::uint8_t* header) const noexcept {
+        return m_header_len == 1 ? header[0] : static_cast<std::uint16_t>(header[0] | (header[1] << 8));
+    }
+
+    std::uint16_t message_counter(const std::uint8_t* header) const noexcept {
+        const auto* ctr = header + m_header_len;
+        if (m_header_ctr == 1) {
+            return ctr[0];
+        } else if (m_header_ctr == 2) {
+            return static_cast<std::uint16_t>(ctr[0] | (ctr[1] << 8));
+        }
+        return 0;
+    }
+
+    void dispatch(const std::uint8_t* message, std::uint64_t timestamp) {
+        const auto length = message_length(message);
+        ++m_messages;
+        m_dispatch(std::span<const std::uint8_t>(message + m_header_size, length), length, message_counter(message), timestamp);
+    }
+
+    // Advance past the alignment padding following a message that ends at `pos`.
+    std::size_t skip_padding(std::size_t pos, std::size_t len) noexcept {
+        const std::size_t padding = (m_alignment - ((m_base + pos) % m_alignment)) % m_alignment;
+        const std::size_t skip    = std::min(padding, len - pos);
+        m_skip                    = padding - skip;
+        return pos + skip;
+    }
+
+    // SINGLE/MULTIPLE: advance past LEN = 0 padding at `pos`, up to the next packet boundary.
+    std::size_t skip_packet(std::size_t pos, std::size_t len) noexcept {
+        std::size_t end = len;
+        if (m_max_packet_size != 0) {
+            const std::uint64_t offset = m_base + pos;
+            end = static_cast<std::size_t>(std::min<std::uint64_t>(offset - offset % m_max_packet_size + m_max_packet_size - m_base, len));
+        }
+        m_discarded += end - pos;
+        return end;
+    }
+
+    void keep(const std::uint8_t* rest, std::size_t size, std::uint64_t timestamp) {
+        m_pending.assign(rest, rest + size);
+        m_pending_timestamp = timestamp;
+    }
+
+    // A read filled with whole packets may be continued by the next one; a short packet ends the USB transfer.
+    void end_transfer(std::size_t len) noexcept {
+        if (m_streaming || (m_max_packet_size != 0 && len % m_max_packet_size == 0)) {
+            m_base += len;
+            return;
+        }
+        m_discarded += m_pending.size();
+        m_pending.clear();
+        m_base = 0;
+        m_skip = 0;
+    }
+
+    // Continue the message carried over from the previous transfer; returns the number of bytes consumed.
+    std::size_t complete_pending(const std::uint8_t* ptr, std::size_t len) {
+        std::size_t consumed = take(ptr, len, m_header_size);
+        if (m_pending.size() < m_header_size) {
+            return consumed;
+        }
+        const std::size_t size = m_header_size + message_length(m_pending.data());
+        consumed += take(ptr + consumed, len - consumed, size);
+        if (m_pending.size() < size) {
+            return consumed;
+        }
+        if (size > m_header_size) {
+            dispatch(m_pending.data(), m_pending_timestamp);
+        }
+        m_pending.clear();
+        return consumed;
+    }
+
+    std::size_t take(const std::uint8_t* ptr, std::size_t len, std::size_t target) {
+        const std::size_t count = m_pending.size() < target ? std::min(target - m_pending.size(), len) : 0;
+        m_pending.insert(m_pending.end(), ptr, ptr + count);
+        return count;
+    }
+
+    dispatch_t                m_dispatch;
+    std::uint8_t              m_header_len;
+    std::uint8_t              m_header_ctr;
+    std::size_t               m_header_size;
+    bool                      m_streaming;
+    std::size_t               m_alignment;
+    std::uint16_t             m_max_packet_size;
+    std::vector<std::uint8_t> m_pending{};
+    std::uint64_t             m_pending_timestamp{ 0 };
+    std::uint64_t             m_base{ 0 };  // Position of the current read in the USB transfer (in the stream for STREAMING).
+    std::size_t               m_skip{ 0 };  // Padding still to skip at the start of the next transfer.
+    std::uint64_t             m_messages{ 0 };
+    std::uint64_t             m_transfers{ 0 };
+    std::uint64_t             m_discarded{ 0 };
+};
+
+#endif  // __USB_FRAMING_HPP
@@ -319,8 +319,8 @@ class TransportEventHandler(EventHandler):
         from pyxcp.types import Event
 
         if event_code == Event.EV_CMD_PENDING:
-            # Restart timeout detection
-            self.transport.timer_restart_event.set()
+            # Restart timeout detection (with the static timeout, the command may take a while)
+            self.transport.extend_response_deadline(pending=True)
             self.logger.debug("EV_CMD_PENDING: Restarted timeout detection")
             return True  # Fully handled
 
@@ -10,3 +10,4 @@
 from .master import Master  # noqa: F401
 from .async_master import AsyncMaster  # noqa: F401
 from .calibration import Calibration  # noqa: F401
+from .memory_image import MemoryImage  # noqa: F401
@@ -133,6 +133,13 @@ class Calibration:
                 # If we can't get basic segment info, skip this segment
                 continue
 
+        image = getattr(self.master, "memory_image", None)
+        if image is not None:
+            image.set_segments(
+                (s.number, s.address, s.length, s.address_extension)
+                for s in self.segments.values()
+                if s.address is not None and s.length is not None
+            )
         self._initialized = True
 
     def _check_initialized(self):
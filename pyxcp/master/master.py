@@ -10,6 +10,7 @@
 import functools
 import logging
 import struct
+import time
 import traceback
 import warnings
 from contextlib import suppress
@@ -35,9 +36,11 @@ from pyxcp.master.errorhandler import (
     set_suppress_xcp_error_log,
     wrapped,
 )
+from pyxcp.master.memory_image import MemoryImage
 from pyxcp.time_correlation import TimeCorrelationPropertiesResponse
 from pyxcp.transport.base import create_transport, BaseTransport
-from pyxcp.utils import decode_bytes, delay, short_sleep
+from pyxcp.transport.transport_ext import Pacer
+from pyxcp.utils import decode_bytes, delay
 
 # Type variables for better type hinting
 T = TypeVar("T")
@@ -185,6 +188,9 @@ class Master:
 
         self.time_correlation_properties: Optional[TimeCorrelationPropertiesResponse] = None
 
+        # Optional host-side cache of slave memory.
+        self.memory_image: Optional[MemoryImage] = MemoryImage() if getattr(self.config, "memory_image", False) else None
+
         # (D)Word (un-)packers are byte-order dependent
         # -- byte-order is returned by CONNECT_Resp (COMM_MODE_BASIC)
         self.BYTE_pack: Callable[[int], bytes] | None = None
@@ -313,6 +319,7 @@ class Master:
 
         # Set up byte order dependent properties
         self._setup_slave_properties(result, byte_order)
+        self.transport.set_max_packet_sizes(result.maxCto, result.maxDto)
 
         # Set up byte order dependent packers and unpackers
         self._setup_packers_and_unpackers(byte_order)
@@ -320,6 +327,10 @@ class Master:
         # Set up address granularity dependent properties
         self._setup_address_granularity()
 
+        if self.memory_image is not None:
+            self.memory_image.clear()
+            self.memory_image.granularity = self.slaveProperties.bytesPerElement
+
         return result
 
     def _setup_slave_properties(self, result: types.ConnectResponse, byte_order: types.ByteOrder) -> None:
@@ -542,6 +553,8 @@ class Master:
         """
         # Send GET_ID command to the slave
         response = self.transport.request(types.Command.GET_ID, mode)
+        if self.memory_image is not None:
+            self.memory_image.mta = None  # GET_ID may set the MTA.
         result = types.GetIDResponse.parse(response, byteOrder=self.slaveProperties.byteOrder)
         result.length = self.DWORD_unpack(response[3:7])[0]
 
@@ -702,7 +715,35 @@ class Master:
         addr = self.DWORD_pack(address)
 
         # Send SET_MTA command to the slave
-        return self.transport.request(types.Command.SET_MTA, 0, 0, address_ext, *addr)
+        response = self.transport.request(types.Command.SET_MTA, 0, 0, address_ext, *addr)
+        if self.memory_image is not None:
+            self.memory_image.mta = (address, address_ext)
+            self.memory_image.mta_stale = False
+        return response
+
+    def _sync_mta(self) -> None:
+        """Set the slave's MTA, if reads served from the memory image left it behind.
+
+        Called by MTA relative commands; no-op without :attr:`memory_image`.
+        """
+        image = self.memory_image
+        if image is not None and image.mta_stale:
+            address, address_ext = image.mta
+            self.mta = types.MtaType(address, address_ext)
+            self.transport.request(types.Command.SET_MTA, 0, 0, address_ext, *self.DWORD_pack(address))
+            image.mta_stale = False
+
+    def _memory_written(self, length: int) -> None:
+        """Invalidate `length` elements written at the MTA in the memory image and advance its MTA."""
+        image = self.memory_image
+        if image is None:
+            return
+        if image.mta is None:
+            image.invalidate()
+        else:
+            address, address_ext = image.mta
+            image.invalidate(address, length, address_ext)
+            image.mta = (address + length, address_ext)
 
     @wrapped
     def upload(self, length: int) -> bytes:
@@ -726,33 +767,81 @@ class Master:
         Note
         ----
         Address is set via :meth:`setMta` (Some services like :meth:`getID` also set the MTA).
+        With :attr:`memory_image`, the data is served from the image if completely known
+        (the slave's MTA is then updated by the next MTA relative command).
         """
         # Calculate the number of bytes to upload
         byte_count = length * self.slaveProperties.bytesPerElement
 
+        image = self.memory_image
+        mta = image.mta if image is not None else None
+        if mta is not None:
+            data = image.lookup(mta[0], length, mta[1])
+            if data is not None:
+                image.mta = (mta[0] + length, mta[1])
+                image.mta_stale = True
+                return data
+            self._sync_mta()
+
         # Send UPLOAD command to the slave
         response = self.transport.request(types.Command.UPLOAD, length)
 
-        # Handle block mode for large uploads
-        if byte_count > (self.slaveProperties.maxCto - 1):
-            # Receive the remaining bytes in block mode
-            block_response = self.transport.block_receive(length_required=(byte_count - len(response)))
-            response += block_response
-        # Handle CAN-specific upload format
-        elif self.transport_name == "can":
-            # Larger sizes will send in multiple CAN messages
-            # Each valid message will start with 0xFF followed by the upload bytes
-            # The last message might be padded to the required DLC
-            remaining_bytes = byte_count - len(response)  # NOTE: Due to padding the result may negative!
-            while remaining_bytes > 0:
-                if len(self.transport.resQueue):
-                    data = self.transport.resQueue.popleft()
-                    response += data[1 : remaining_bytes + 1]
-                    remaining_bytes = byte_count - len(response)
-                else:
-                    short_sleep()
+        remaining_bytes = byte_count - len(response)  # NOTE: Due to padding the result may negative!
+        # Block mode for large uploads; on CAN, larger sizes are sent in multiple messages as well.
+        # Each message starts with 0xFF followed by the upload bytes, the last one might be padded to the required DLC.
+        if remaining_bytes > 0 and (byte_count > (self.slaveProperties.maxCto - 1) or self.transport_name == "can"):
+            data = bytearray(byte_count)
+            data[: len(response)] = response
+            self.transport.block_receive_into(memoryview(data)[len(response) :])
+            response = bytes(data)
+        if mta is not None:
+            image.update(mta[0], response[:byte_count], mta[1])
+            image.mta = (mta[0] + length, mta[1])
         return response
 
+    @wrapped
+    def upload_into(self, length: int, buffer: Any) -> int:
+        """Like :meth:`upload`, but the data is written into `buffer`.
+
+        Block-mode transfers are received in place, without intermediate copies.
+
+        Parameters
+        ----------
+        length : int
+            Number of elements (address granularity) to upload
+        buffer : Any
+            Writable bytes-like object of at least `length` elements
+
+        Returns
+        -------
+        int
+            Number of bytes written
+        """
+        byte_count = length * self.slaveProperties.bytesPerElement
+        view = memoryview(buffer).cast("B")[:byte_count]
+
+        image = self.memory_image
+        mta = image.mta if image is not None else None
+        if mta is not None:
+            data = image.lookup(mta[0], length, mta[1])
+            if data is not None:
+                view[:] = data
+                image.mta = (mta[0] + length, mta[1])
+                image.mta_stale = True
+                return byte_count
+            self._sync_mta()
+
+        response = self.transport.request(types.Command.UPLOAD, length)
+        received = min(len(response), byte_count)
+        view[:received] = response[:received]
+        if received < byte_count and (byte_count > (self.slaveProperties.maxCto - 1) or self.transport_name == "can"):
+            self.transport.block_receive_into(view[received:])
+            received = byte_count
+        if mta is not None:
+            image.update(mta[0], view[:received], mta[1])
+            image.mta = (mta[0] + length, mta[1])
+        return received
+
     @wrapped
     def shortUpload(self, length: int, address: int, address_ext: int = 0x00) -> bytes:
         """Transfer data from slave to master with address information.
@@ -776,6 +865,12 @@ class Master:
         bytes
             The uploaded data
         """
+        image = self.memory_image
+        if image is not None:
+            data = image.lookup(address, length, address_ext)
+            if data is not None:
+                return data
+
         # Pack the address into bytes
         addr = self.DWORD_pack(address)
 
@@ -790,6 +885,10 @@ class Master:
         # Send SHORT_UPLOAD command to the slave
         response = self.transport.request(types.Command.SHORT_UPLOAD, length, 0, address_ext, *addr)
 
+        if image is not None:
+            image.update(address, response[:byte_count], address_ext)
+            image.mta = None  # SHORT_UPLOAD moves the MTA.
+
         # Return only the requested number of bytes
         return response[:byte_count]
 
@@ -823,7 +922,10 @@ class Master:
         bs = self.DWORD_pack(blocksize)
 
         # Send BUILD_CHECKSUM command to the slave
+        self._sync_mta()
         response = self.transport.request(types.Command.BUILD_CHECKSUM, 0, 0, 0, *bs)
+        if self.memory_image is not None:
+            self.memory_image.mta = None
 
         # Parse the response with the correct byte order
         return types.BuildChecksumResponse.parse(response, byteOrder=self.slaveProperties.byteOrder)
@@ -943,13 +1045,104 @@ class Master:
         Raises
         ------
         ValueError
-            If limit_payload is less than 8 bytes
+            If limit_payload is less than 8 bytes or `length` isn't a multiple of the address granularity
+        FrameSizeError
+            If the slave answers an UPLOAD with less data than requested
 
         Note
         ----
         Address is not included because of services implicitly setting
         address information like :meth:`getID`.
+
+        With :attr:`memory_image`, only the unknown parts of the range are uploaded.
         """
+        self._check_fetch_length(length)
+        image = self.memory_image
+        if image is not None and image.mta is not None:
+            return self._fetch_holes(length, limit_payload)
+        result = bytearray(length)
+        self.fetch_into(length, result, limit_payload)
+        return bytes(result)
+
+    def fetch_into(
+        self,
+        length: int,
+        destination: Any,
+        limit_payload: int | None = None,
+        callback: Callable[[int], None] | None = None,
+    ) -> int:
+        """Streaming variant of :meth:`fetch`.
+
+        The data is written chunk by chunk, as it arrives, into a file object
+        or a preallocated buffer; memory usage doesn't depend on `length`,
+        so this is the way to go for flash dumps or A2L files.
+
+        Parameters
+        ----------
+        length : int
+            The number of bytes to fetch (a multiple of the address granularity)
+        destination : Any
+            Binary file object (anything with a `write()` method) or writable bytes-like object
+            (`bytearray`, `memoryview`, ...) of at least `length` bytes
+        limit_payload : int, optional
+            Transfer less bytes than supported by transport-layer, by default None
+        callback : Callable[[int], None], optional
+            A callback function that is called with the percentage of completion,
+            by default None
+
+        Returns
+        -------
+        int
+            Number of bytes written.
+
+        Raises
+        ------
+        ValueError
+            If limit_payload is less than 8 bytes, `length` isn't a multiple of the
+            address granularity or `destination` is too small
+        FrameSizeError
+            If the slave answers an UPLOAD with less data than requested
+
+        Note
+        ----
+        Address is set via :meth:`setMta` (or implicitly, e.g. by :meth:`getID`).
+        Buffers are filled in place; file objects get slices of a single chunk buffer,
+        which is reused once `write()` returns.
+        """
+        bpe = self._check_fetch_length(length)
+        chunk_size = self._fetch_payload(limit_payload) // bpe * bpe
+        if hasattr(destination, "write"):
+            view = None
+            buffer = memoryview(bytearray(chunk_size))
+        else:
+            view = memoryview(destination).cast("B")
+            if len(view) < length:
+                raise ValueError(f"Destination too small: {len(view)} bytes, {length} required.")
+
+        offset = 0
+        percent_complete = 0
+        while offset < length:
+            size = min(chunk_size, length - offset)
+            received = self.upload_into(size // bpe, buffer if view is None else view[offset : offset + size])
+            if received != size:
+                raise types.FrameSizeError(f"UPLOAD returned {received} bytes, {size} requested.")
+            if view is None:
+                destination.write(buffer[:size])
+            offset += size
+            if callback and offset * 100 // length > percent_complete:
+                percent_complete = offset * 100 // length
+                callback(percent_complete)
+        return offset
+
+    def _check_fetch_length(self, length: int) -> int:
+        """Bytes per element, if `length` is a whole number of elements."""
+        bpe = self.slaveProperties.bytesPerElement
+        if length % bpe:
+            raise ValueError(f"Length must be a multiple of the address granularity ({bpe} bytes) - given: {length}")
+        return bpe
+
+    def _fetch_payload(self, limit_payload: int | None) -> int:
+        """Bytes per UPLOAD for :meth:`fetch`."""
         # Validate limit_payload
         if limit_payload is not None and limit_payload < 8:
             raise ValueError(f"Payload must be at least 8 bytes - given: {limit_payload}")
@@ -959,27 +1152,198 @@ class Master:
         max_payload = 255 if slave_block_mode else self.slaveProperties.maxCto - 1
 
         # Apply limit_payload if specified
-        payload = min(limit_payload, max_payload) if limit_payload else max_payload
+        return min(limit_payload, max_payload) if limit_payload else max_payload
+
+    def _fetch_holes(self, length: int, limit_payload: int | None) -> bytes:
+        """:meth:`fetch` with memory image: upload the unknown parts of the range only."""
+        image = self.memory_image
+        bpe = self.slaveProperties.bytesPerElement
+        address, address_ext = image.mta
+        elements = length // bpe
+        data = image.get(address, elements, address_ext)
+        if data is not None:
+            image.record_hit(len(data), round_trips=-(-length // self._fetch_payload(limit_payload)))
+        else:
+            # Misses are counted per UPLOAD.
+            for hole, size in image.holes(address, elements, address_ext):
+                if image.mta != (hole, address_ext) or image.mta_stale:
+                    self.setMta(hole, address_ext)
+                self.fetch_into(size * bpe, bytearray(size * bpe), limit_payload)
+            data = image.get(address, elements, address_ext)
+        if image.mta != (address + elements, address_ext):
+            image.mta = (address + elements, address_ext)
+            image.mta_stale = True
+        return data
 
-        # Calculate number of chunks and remaining bytes
-        chunk_size = payload
-        chunks = range(length // chunk_size)
-        remaining = length % chunk_size
+    pull = fetch  # fetch() may be completely replaced by pull() someday.
 
-        # Fetch data in chunks
-        result = []
-        for _ in chunks:
-            data = self.upload(chunk_size)
-            result.extend(data[:chunk_size])
+    @property
+    def pipeline_depth(self) -> int:
+        """Number of commands that may be in flight at once.
 
-        # Fetch remaining bytes
-        if remaining:
-            data = self.upload(remaining)
-            result.extend(data[:remaining])
+        `QUEUE_SIZE` if the slave supports interleaved mode (s. :meth:`getCommModeInfo`), else 1.
+        """
+        if self.slaveProperties.get("interleavedMode"):
+            return max(1, self.slaveProperties.get("queueSize") or 1)
+        return 1
 
-        return bytes(result)
+    def pipelined_requests(self, requests: Collection[tuple], queue_size: int | None = None) -> list[bytes | Exception]:
+        """Send raw commands using the interleaved communication model.
 
-    pull = fetch  # fetch() may be completely replaced by pull() someday.
+        Up to :attr:`pipeline_depth` commands are kept outstanding, which hides link latency
+        for command storms like SHORT_UPLOAD polling or DAQ list setup.
+
+        Parameters
+        ----------
+        requests : Collection[tuple]
+            `(types.Command, *data)` tuples, e.g. `(types.Command.SHORT_UPLOAD, 4, 0, 0, *self.DWORD_pack(addr))`
+        queue_size : int | None, optional
+            Override the number of outstanding commands, by default :attr:`pipeline_depth`
+
+        Returns
+        -------
+        list[bytes | Exception]
+            Response payload or exception, per request and in request order.
+
+        Note
+        ----
+        Errors are reported per request and are not passed through the error handler.
+        Call :meth:`getCommModeInfo` first; without it commands are sent one at a time.
+        """
+        return self.transport.request_pipelined(requests, queue_size or self.pipeline_depth)
+
+    def short_upload_pipelined(self, requests: Collection[tuple[int, int, int]]) -> list[bytes | Exception]:
+        """Pipelined variant of :meth:`shortUpload`.
+
+        Parameters
+        ----------
+        requests : Collection[tuple[int, int, int]]
+            `(length, address, address_ext)` tuples; length in elements (address granularity).
+
+        Returns
+        -------
+        list[bytes | Exception]
+            Uploaded data or exception, per request.
+        """
+        image = self.memory_image
+        if image is None:
+            return self._short_upload_pipelined(requests)
+        results = [image.lookup(address, length, ext) for length, address, ext in requests]
+        misses = [idx for idx, r in enumerate(results) if r is None]
+        if misses:
+            uploaded = self._short_upload_pipelined([requests[idx] for idx in misses])
+            image.mta = None  # SHORT_UPLOAD moves the MTA.
+            for idx, r in zip(misses, uploaded, strict=True):
+                if not isinstance(r, Exception):
+                    _, address, ext = requests[idx]
+                    image.update(address, r, ext)
+                results[idx] = r
+        return results
+
+    def _short_upload_pipelined(self, requests: Collection[tuple[int, int, int]]) -> list[bytes | Exception]:
+        bpe = self.slaveProperties.bytesPerElement
+        commands = [(types.Command.SHORT_UPLOAD, length, 0, ext, *self.DWORD_pack(address)) for length, address, ext in requests]
+        results = self.pipelined_requests(commands)
+        return [r if isinstance(r, Exception) else r[: length * bpe] for (length, _, _), r in zip(requests, results, strict=True)]
+
+    def read_many(self, requests: Collection[tuple[int, int, int]], max_gap: int = 16) -> list[bytes]:
+        """Read many, possibly scattered, memory ranges with as few round trips as possible.
+
+        Requests are sorted by address extension and address; ranges that overlap or
+        are at most `max_gap` elements apart are merged, as long as the merged range
+        doesn't need more round trips than its parts. Each merged range is read with
+
+        - one SHORT_UPLOAD if it fits into `MAX_CTO - 1` bytes,
+        - else SET_MTA + UPLOAD, 255 elements per UPLOAD in slave block mode
+          (s. :meth:`getCommModeInfo`), `MAX_CTO - 1` bytes otherwise.
+
+        SHORT_UPLOADs are pipelined if the slave supports interleaved mode (s. :attr:`pipeline_depth`).
+        With :attr:`memory_image`, requests already known aren't sent at all.
+
+        Parameters
+        ----------
+        requests : Collection[tuple[int, int, int]]
+            `(length, address, address_ext)` tuples, like :meth:`short_upload_pipelined`;
+            length in elements (address granularity).
+        max_gap : int, optional
+            Maximum number of unrequested elements between two ranges read together, by default 16
+
+        Returns
+        -------
+        list[bytes]
+            Uploaded data per request, in request order.
+        """
+        bpe = self.slaveProperties.bytesPerElement
+        short_size = (self.slaveProperties.maxCto - 1) // bpe
+        upload_size = 255 if self.slaveProperties.slaveBlockMode else short_size
+
+        def round_trips(length: int) -> int:
+            return 1 if length <= short_size else 1 + -(-length // upload_size)
+
+        result = [b""] * len(requests)
+        pending = range(len(requests))
+        image = self.memory_image
+        if image is not None:
+            pending = []
+            for idx, (length, address, ext) in enumerate(requests):
+                data = image.get(address, length, ext) if length > 0 else None
+                if data is None:
+                    pending.append(idx)
+                else:
+                    image.record_hit(len(data))
+                    result[idx] = data
+
+        # Merged ranges: [address_ext, start, end, [request indices]].
+        ranges = []
+        for idx in sorted(pending, key=lambda i: (requests[i][2], requests[i][1])):
+            length, address, ext = requests[idx]
+            if length <= 0:
+                continue
+            if ranges:
+                last = ranges[-1]
+                end = max(last[2], address + length)
+                if (
+                    last[0] == ext
+                    and address - last[2] <= max_gap
+                    and round_trips(end - last[1]) <= round_trips(last[2] - last[1]) + round_trips(length)
+                ):
+                    last[2] = end
+                    last[3].append(idx)
+                    continue
+            ranges.append([ext, address, address + length, [idx]])
+        self.logger.debug(f"read_many: {len(requests)} requests merged into {len(ranges)} ranges.")
+
+        data = [b""] * len(ranges)
+        short = [i for i, (_, start, end, _) in enumerate(ranges) if end - start <= short_size]
+        if self.pipeline_depth > 1 and len(short) > 1:
+            results = self.short_upload_pipelined([(ranges[i][2] - ranges[i][1], ranges[i][1], ranges[i][0]) for i in short])
+            for i, result in zip(short, results, strict=True):
+                if isinstance(result, Exception):
+                    raise result
+                data[i] = result
+        else:
+            for i in short:
+                ext, start, end, _ = ranges[i]
+                data[i] = self.shortUpload(end - start, start, ext)
+        for i, (ext, start, end, _) in enumerate(ranges):
+            if end - start <= short_size:
+                continue
+            self.setMta(start, ext)
+            buffer = bytearray()
+            remaining = end - start
+            while remaining:
+                length = min(upload_size, remaining)
+                buffer += self.upload(length)[: length * bpe]
+                remaining -= length
+            data[i] = bytes(buffer)
+
+        for (_, start, _, indices), block in zip(ranges, data, strict=True):
+            view = memoryview(block)
+            for idx in indices:
+                length, address, _ = requests[idx]
+                offset = (address - start) * bpe
+                result[idx] = bytes(view[offset : offset + length * bpe])
+        return result
 
     def push(self, address: int, address_ext: int, data: bytes, callback: Callable[[int], None] | None = None) -> None:
         """Convenience function for data-transfer from master to slave.
@@ -1017,6 +1381,7 @@ class Master:
             dl_func=self.download,
             dl_next_func=self.downloadNext,
             callback=callback,
+            block_commands=(types.Command.DOWNLOAD, types.Command.DOWNLOAD_NEXT),
         )
 
     def flash_program(self, address: int, data: bytes, callback: Callable[[int], None] | None = None) -> None:
@@ -1055,6 +1420,7 @@ class Master:
             dl_next_func=self.programNext,
             callback=callback,
             address_ext=0x00,
+            block_commands=(types.Command.PROGRAM, types.Command.PROGRAM_NEXT),
         )
 
     def _generalized_downloader(
@@ -1069,6 +1435,7 @@ class Master:
         dl_func: Callable[[bytes, int, bool], Any],
         dl_next_func: Callable[[bytes, int, bool], Any],
         callback: Callable[[int], None] | None = None,
+        block_commands: tuple[types.Command, types.Command] | None = None,
     ) -> None:
         """Generic implementation for downloading data to the slave.
 
@@ -1099,6 +1466,10 @@ class Master:
         callback : Callable[[int], None], optional
             A callback function that is called with the percentage of completion,
             by default None
+        block_commands : tuple[Command, Command], optional
+            Commands behind `dl_func` / `dl_next_func` (e.g. DOWNLOAD, DOWNLOAD_NEXT);
+            if given and the transport has a native block transmit path (:meth:`BaseTransport.has_native_block_send`),
+            the packets of a block are queued and sent paced at `minSt`, see :meth:`_block_downloader`.
         """
         # Set the Memory Transfer Address
         self.setMta(address, address_ext)
@@ -1106,12 +1477,18 @@ class Master:
         # Convert minSt from 100µs units to seconds
         minSt_seconds = minSt / 10000.0
 
+        if block_commands is not None and not self.transport.has_native_block_send():
+            # Per-packet `dl_func` / `dl_next_func` is as fast without a native transmit path.
+            block_commands = None
+
         # Create a partial function for block downloading
         block_downloader = functools.partial(
             self._block_downloader,
             dl_func=dl_func,
             dl_next_func=dl_next_func,
             minSt=minSt_seconds,
+            pacer=Pacer(int(minSt * 100_000)) if block_commands else None,
+            commands=block_commands,
         )
 
         # Calculate total length and maximum payload size
@@ -1126,7 +1503,13 @@ class Master:
 
         # Handle master block mode
         if master_block_mode:
+            start = time.perf_counter()
             self._download_master_block_mode(data, total_length, max_payload, offset, block_downloader, callback)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0.0:
+                self.logger.info(
+                    f"Block-mode download of {total_length} bytes in {elapsed:.3f} s ({total_length / elapsed / 1024:.1f} kB/s)"
+                )
         # Handle normal mode
         else:
             self._download_normal_mode(data, total_length, max_payload, offset, dl_func, callback)
@@ -1240,6 +1623,8 @@ class Master:
         dl_func: Callable[[bytes, int, bool], Any] | None = None,
         dl_next_func: Callable[[bytes, int, bool], Any] | None = None,
         minSt: float = 0.0,
+        pacer: Pacer | None = None,
+        commands: tuple[types.Command, types.Command] | None = None,
     ) -> None:
         """Re-usable block downloader for transferring data in blocks.
 
@@ -1260,10 +1645,49 @@ class Master:
             usually :meth:`downloadNext` or :meth:`programNext`, by default None
         minSt : float, optional
             Minimum separation time between frames in seconds, by default 0.0
+        pacer : Pacer | None, optional
+            Transmit pacer (MIN_ST); used together with `commands`.
+        commands : tuple[Command, Command] | None, optional
+            Commands behind `dl_func` and `dl_next_func`. If given, all packets but the last
+            are handed to the transport at once (:meth:`BaseTransport.block_request_many`),
+            which paces them with `pacer` and checks for negative responses between bursts;
+            the last packet is sent via `dl_next_func` (or `dl_func`) and awaits the response.
         """
         # Calculate sizes and offsets
         length = len(data)
         max_packet_size = self.slaveProperties.maxCto - 2  # Command ID + Length
+
+        if commands is not None:
+            first_cmd, next_cmd = commands
+            if pacer is None:
+                pacer = Pacer(int(minSt * 1e9))
+            requests = []
+            offset = 0
+            remaining_block_size = length
+            while remaining_block_size > max_packet_size:
+                # Payloads as `bytes`, framed without per-byte conversion.
+                packet_data = bytes(data[offset : offset + max_packet_size])
+                if offset == 0:
+                    requests.append((first_cmd, (bytes((length,)) + packet_data,)))
+                else:
+                    requests.append((next_cmd, (bytes((remaining_block_size,)) + packet_data,)))
+                offset += max_packet_size
+                remaining_block_size -= max_packet_size
+            try:
+                self._block_request_many(requests, pacer)
+            finally:
+                # Queued packets bypass `dl_func` / `dl_next_func`: written packet by packet, like they do;
+                # also if a burst failed, as part of the block may have reached the slave.
+                for _, (payload,) in requests:
+                    self._memory_written((len(payload) - 1) // self.slaveProperties.bytesPerElement)
+            pacer.wait()
+            packet_data = data[offset:]
+            if offset == 0:
+                dl_func(packet_data, len(packet_data), last=True)
+            else:
+                dl_next_func(packet_data, remaining_block_size, last=True)
+            return
+
         packets = range(length // max_packet_size)
         offset = 0
         remaining = length % max_packet_size
@@ -1310,6 +1734,16 @@ class Master:
             # Apply minimum separation time
             delay(minSt)
 
+    @wrapped
+    def _block_request_many(self, requests: list, pacer: Pacer) -> int:
+        """Send queued block-mode packets via :meth:`BaseTransport.block_request_many`.
+
+        Runs under the same XCP error-handling as :meth:`download` / :meth:`downloadNext`
+        (e.g. a negative response between two bursts).
+        """
+        self._sync_mta()
+        return self.transport.block_request_many(requests, pacer)
+
     @wrapped
     def download(self, data: bytes, block_mode_length: int | None = None, last: bool = False):
         """Transfer data from master to slave.
@@ -1328,16 +1762,19 @@ class Master:
         Adress is set via :meth:`setMta`
         """
 
+        self._sync_mta()
         if block_mode_length is None or last:
             # standard mode
             length = len(data)
             response = self.transport.request(types.Command.DOWNLOAD, length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return response
         else:
             # block mode
             if not isinstance(block_mode_length, int):
                 raise TypeError("block_mode_length must be int!")
             self.transport.block_request(types.Command.DOWNLOAD, block_mode_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return None
 
     @wrapped
@@ -1357,11 +1794,13 @@ class Master:
         if last:
             # last DOWNLOAD_NEXT packet in a block: the slave device has to send the response after this.
             response = self.transport.request(types.Command.DOWNLOAD_NEXT, remaining_block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return response
         else:
             # the slave device won't respond to consecutive DOWNLOAD_NEXT packets in block mode,
             # so we must not wait for any response
             self.transport.block_request(types.Command.DOWNLOAD_NEXT, remaining_block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return None
 
     @wrapped
@@ -1372,20 +1811,35 @@ class Master:
         ----------
         data : bytes
         """
-        return self.transport.request(types.Command.DOWNLOAD_MAX, *data)
+        self._sync_mta()
+        response = self.transport.request(types.Command.DOWNLOAD_MAX, *data)
+        self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
+        return response
 
     @wrapped
     def shortDownload(self, address: int, address_ext: int, data: bytes):
         length = len(data)
         addr = self.DWORD_pack(address)
-        return self.transport.request(types.Command.SHORT_DOWNLOAD, length, 0, address_ext, *addr, *data)
+        response = self.transport.request(types.Command.SHORT_DOWNLOAD, length, 0, address_ext, *addr, *data)
+        if self.memory_image is not None:
+            self.memory_image.invalidate(address, length // self.slaveProperties.bytesPerElement, address_ext)
+            self.memory_image.mta = None  # SHORT_DOWNLOAD moves the MTA.
+        return response
 
     @wrapped
     def modifyBits(self, shift_value: int, and_mask: int, xor_mask: int):
         # A = ( (A) & ((~((dword)(((word)~MA)<<S))) )^((dword)(MX<<S)) )
         am = self.WORD_pack(and_mask)
         xm = self.WORD_pack(xor_mask)
-        return self.transport.request(types.Command.MODIFY_BITS, shift_value, *am, *xm)
+        self._sync_mta()
+        response = self.transport.request(types.Command.MODIFY_BITS, shift_value, *am, *xm)
+        image = self.memory_image
+        if image is not None and image.mta is not None:
+            # Modifies the DWORD at the MTA, the MTA is not incremented.
+            image.invalidate(image.mta[0], max(1, 4 // self.slaveProperties.bytesPerElement), image.mta[1])
+        elif image is not None:
+            image.invalidate()
+        return response
 
     # Page Switching Commands (PAG)
     @wrapped
@@ -1401,7 +1855,10 @@ class Master:
         logicalDataSegment : int
         logicalDataPage : int
         """
-        return self.transport.request(types.Command.SET_CAL_PAGE, mode, logical_data_segment, logical_data_page)
+        response = self.transport.request(types.Command.SET_CAL_PAGE, mode, logical_data_segment, logical_data_page)
+        if self.memory_image is not None:
+            self.memory_image.set_cal_page(mode, logical_data_segment, logical_data_page)
+        return response
 
     @wrapped
     def getCalPage(self, mode: int, logical_data_segment: int):
@@ -1522,7 +1979,10 @@ class Master:
         dstSegment : int
         dstPage : int
         """
-        return self.transport.request(types.Command.COPY_CAL_PAGE, src_segment, src_page, dst_segment, dst_page)
+        response = self.transport.request(types.Command.COPY_CAL_PAGE, src_segment, src_page, dst_segment, dst_page)
+        if self.memory_image is not None:
+            self.memory_image.copy_cal_page(src_segment, src_page, dst_segment, dst_page)
+        return response
 
     # DAQ
 
@@ -2121,6 +2581,7 @@ class Master:
         self.slaveProperties.pgmProcessor.slaveBlockMode = result.commModePgm.slaveBlockMode
         self.slaveProperties.pgmProcessor.interleavedMode = result.commModePgm.interleavedMode
         self.slaveProperties.pgmProcessor.masterBlockMode = result.commModePgm.masterBlockMode
+        self.transport.set_max_packet_sizes(max(self.slaveProperties.maxCto, result.maxCtoPgm), self.slaveProperties.maxDto)
         return result
 
     @wrapped
@@ -2135,7 +2596,10 @@ class Master:
         clearRange : int
         """
         cr = self.DWORD_pack(clear_range)
+        self._sync_mta()
         response = self.transport.request(types.Command.PROGRAM_CLEAR, mode, 0, 0, *cr)
+        if self.memory_image is not None:
+            self.memory_image.invalidate()
         # ERR_ACCESS_LOCKED
         return response
 
@@ -2162,14 +2626,17 @@ class Master:
         #    d.extend(b"\x00\x00")  # alignment bytes
         # for e in data:
         #    d.extend(self.AG_pack(e))
+        self._sync_mta()
         if last:
             # last PROGRAM_NEXT packet in a block: the slave device has to send the response after this.
             response = self.transport.request(types.Command.PROGRAM, block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return response
         else:
             # the slave device won't respond to consecutive PROGRAM_NEXT packets in block mode,
             # so we must not wait for any response
             self.transport.block_request(types.Command.PROGRAM, block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return None
 
     @wrapped
@@ -2225,11 +2692,13 @@ class Master:
         if last:
             # last PROGRAM_NEXT packet in a block: the slave device has to send the response after this.
             response = self.transport.request(types.Command.PROGRAM_NEXT, remaining_block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return response
         else:
             # the slave device won't respond to consecutive PROGRAM_NEXT packets in block mode,
             # so we must not wait for any response
             self.transport.block_request(types.Command.PROGRAM_NEXT, remaining_block_length, *data)
+            self._memory_written(len(data) // self.slaveProperties.bytesPerElement)
             return None
 
     @wrapped
@@ -2241,7 +2710,10 @@ class Master:
             d.extend(b"\x00\x00\x00")  # alignment bytes
         for e in data:
             d.extend(self.AG_pack(e))
-        return self.transport.request(types.Command.PROGRAM_MAX, *d)
+        self._sync_mta()
+        response = self.transport.request(types.Command.PROGRAM_MAX, *d)
+        self._memory_written(len(data))
+        return response
 
     @wrapped
     def programVerify(self, ver_mode: int, ver_type: int, ver_value: int):
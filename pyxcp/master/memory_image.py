@@ -0,0 +1,237 @@
+"""Host-side image of slave memory.
+
+Caches uploaded data, so tools re-reading the same memory (CHARACTERISTICs, EPK,
+lookup tables, ...) don't pay a round trip each time. Only suitable for memory
+that is modified by the master alone, i.e. calibration data -- never for
+measurement variables.
+"""
+
+import bisect
+from typing import Any, Iterable, Optional
+
+# SET_CAL_PAGE mode bits.
+CAL_PAGE_MODE_XCP = 0x02
+CAL_PAGE_MODE_ALL = 0x80
+
+
+class MemoryImage:
+    """Interval map of known slave memory, per address extension and calibration page.
+
+    Data is kept per ``(address_ext, segment, page)``: addresses inside a segment
+    registered with :meth:`set_segments` belong to the page the XCP driver currently
+    accesses (s. :meth:`set_cal_page`), everything else to ``segment = page = None``.
+    Overlapping and adjacent ranges are merged, so a fully known range always lies
+    within a single block.
+
+    Addresses and lengths are in address units (elements, s. `granularity`), data in bytes.
+
+    Used by :class:`~pyxcp.master.Master` if `c.General.memory_image` is enabled:
+    UPLOAD, SHORT_UPLOAD, :meth:`~pyxcp.master.Master.fetch` and
+    :meth:`~pyxcp.master.Master.read_many` are served from the image if possible,
+    DOWNLOAD/SHORT_DOWNLOAD/MODIFY_BITS invalidate what they write, SET_CAL_PAGE and
+    COPY_CAL_PAGE what they may have changed.
+
+    Parameters
+    ----------
+    granularity: int
+        Bytes per address unit (address granularity).
+    """
+
+    def __init__(self, granularity: int = 1) -> None:
+        self.granularity = granularity
+        # (address_ext, segment, page) -> ([block start addresses], [block data]), sorted by address.
+        self._images: dict[tuple, tuple[list[int], list[bytearray]]] = {}
+        self._segments: list[tuple[int, int, int, int]] = []  # (address_ext, start, end, number)
+        self._pages: dict[int, int] = {}
+        # Mirror of the slave's MTA, maintained by the master: (address, address_ext) or None if unknown.
+        # `mta_stale`: reads were served from the image, so the slave's MTA lags behind.
+        self.mta: Optional[tuple[int, int]] = None
+        self.mta_stale = False
+        self.hits = 0
+        self.misses = 0
+        self.round_trips_saved = 0
+        self.bytes_hit = 0
+        self.bytes_fetched = 0
+
+    def __repr__(self) -> str:
+        return f"MemoryImage(blocks={self.blocks}, size={self.size}, hits={self.hits}, misses={self.misses})"
+
+    @property
+    def blocks(self) -> int:
+        """Number of contiguous known ranges."""
+        return sum(len(starts) for starts, _ in self._images.values())
+
+    @property
+    def size(self) -> int:
+        """Known bytes."""
+        return sum(len(block) for _, blocks in self._images.values() for block in blocks)
+
+    def set_segments(self, segments: Iterable[tuple[int, int, int, int]]) -> None:
+        """Register the calibration segments, e.g. from :class:`~pyxcp.master.Calibration`.
+
+        Parameters
+        ----------
+        segments: Iterable[tuple[int, int, int, int]]
+            `(number, address, length, address_ext)` tuples.
+
+        Note
+        ----
+        Known data is dropped, as it can't be assigned to pages retroactively.
+        """
+        self._segments = [(ext, address, address + length, number) for number, address, length, ext in segments]
+        self._images.clear()
+
+    def get(self, address: int, length: int, address_ext: int = 0) -> Optional[bytes]:
+        """Data of a range, if completely known (no statistics)."""
+        starts, blocks = self._images.get(self._key(address, address_ext), ((), ()))
+        idx = bisect.bisect_right(starts, address) - 1
+        if idx < 0:
+            return None
+        offset = address - starts[idx]
+        block = blocks[idx]
+        g = self.granularity
+        if (offset + length) * g > len(block):
+            return None
+        return bytes(block[offset * g : (offset + length) * g])
+
+    def lookup(self, address: int, length: int, address_ext: int = 0, round_trips: int = 1) -> Optional[bytes]:
+        """Like :meth:`get`, counting a hit (which saved `round_trips`) or a miss."""
+        data = self.get(address, length, address_ext)
+        if data is None:
+            self.misses += 1
+        else:
+            self.record_hit(len(data), round_trips)
+        return data
+
+    def record_hit(self, size: int, round_trips: int = 1) -> None:
+        self.hits += 1
+        self.round_trips_saved += round_trips
+        self.bytes_hit += size
+
+    def holes(self, address: int, length: int, address_ext: int = 0) -> list[tuple[int, int]]:
+        """Unknown `(address, length)` ranges within a range."""
+        starts, blocks = self._images.get(self._key(address, address_ext), ((), ()))
+        end = address + length
+        result = []
+        idx = max(0, bisect.bisect_right(starts, address) - 1)
+        while address < end:
+            if idx < len(starts) and starts[idx] < end:
+                block_start, block_end = starts[idx], starts[idx] + len(blocks[idx]) // self.granularity
+                if block_start > address:
+                    result.append((address, block_start - address))
+                address = max(address, block_end)
+                idx += 1
+            else:
+                result.append((address, end - address))
+                break
+        return result
+
+    def update(self, address: int, data: bytes, address_ext: int = 0) -> None:
+        """Store uploaded data."""
+        if not data:
+            return
+        g = self.granularity
+        self.bytes_fetched += len(data)
+        starts, blocks = self._images.setdefault(self._key(address, address_ext), ([], []))
+        end = address + len(data) // g
+        lo = bisect.bisect_left(starts, address)
+        if lo > 0 and starts[lo - 1] + len(blocks[lo - 1]) // g >= address:
+            lo -= 1
+        hi = bisect.bisect_right(starts, end)
+        if lo == hi:
+            starts.insert(lo, address)
+            blocks.insert(lo, bytearray(data))
+            return
+        start = min(starts[lo], address)
+        block = blocks[lo]
+        if starts[lo] > address:
+            block[0:0] = bytes((starts[lo] - address) * g)
+        for idx in range(lo + 1, hi):
+            offset = (starts[idx] - start) * g
+            if len(block) < offset:
+                block.extend(bytes(offset - len(block)))
+            block[offset:] = blocks[idx]
+        if (end - start) * g > len(block):
+            block.extend(bytes((end - start) * g - len(block)))
+        offset = (address - start) * g
+        block[offset : offset + len(data)] = data
+        starts[lo:hi] = [start]
+        blocks[lo:hi] = [block]
+
+    def invalidate(self, address: Optional[int] = None, length: int = 0, address_ext: Optional[int] = None) -> None:
+        """Forget a range (on all pages), or everything (of an address extension) if `address` is None."""
+        if address is None:
+            self._drop(lambda key: address_ext is None or key[0] == address_ext)
+            return
+        end = address + length
+        g = self.granularity
+        for key, (starts, blocks) in self._images.items():
+            if address_ext is not None and key[0] != address_ext:
+                continue
+            lo = max(0, bisect.bisect_right(starts, address) - 1)
+            hi = bisect.bisect_left(starts, end)
+            remaining_starts, remaining_blocks = [], []
+            for idx in range(lo, hi):
+                block_start, block = starts[idx], blocks[idx]
+                block_end = block_start + len(block) // g
+                if block_end <= address:
+                    remaining_starts.append(block_start)
+                    remaining_blocks.append(block)
+                    continue
+                if block_start < address:
+                    remaining_starts.append(block_start)
+                    remaining_blocks.append(block[: (address - block_start) * g])
+                if block_end > end:
+                    remaining_starts.append(end)
+                    remaining_blocks.append(block[(end - block_start) * g :])
+            starts[lo:hi] = remaining_starts
+            blocks[lo:hi] = remaining_blocks
+
+    def set_cal_page(self, mode: int, segment: int, page: int) -> None:
+        """Follow SET_CAL_PAGE: XCP accesses go to `page` now.
+
+        Data of other pages is kept; data that can't be assigned to a page
+        (unregistered addresses, page not known yet) is dropped.
+        """
+        if not mode & CAL_PAGE_MODE_XCP:
+            return
+        numbers = {number for *_, number in self._segments} if mode & CAL_PAGE_MODE_ALL else {segment}
+        for number in numbers:
+            self._pages[number] = page
+        self._drop(lambda key: key[1] is None or (key[1] in numbers and key[2] is None))
+
+    def copy_cal_page(self, src_segment: int, src_page: int, dst_segment: int, dst_page: int) -> None:
+        """Follow COPY_CAL_PAGE: the destination page is overwritten."""
+        self._drop(lambda key: key[1] is None or (key[1] == dst_segment and key[2] in (dst_page, None)))
+
+    def clear(self) -> None:
+        """Forget all data and the XCP pages (e.g. on CONNECT)."""
+        self._images.clear()
+        self._pages.clear()
+        self.mta = None
+        self.mta_stale = False
+
+    def reset_statistics(self) -> None:
+        self.hits = self.misses = self.round_trips_saved = self.bytes_hit = self.bytes_fetched = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """Hit/miss statistics and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "round_trips_saved": self.round_trips_saved,
+            "bytes_hit": self.bytes_hit,
+            "bytes_fetched": self.bytes_fetched,
+            "blocks": self.blocks,
+            "size": self.size,
+        }
+
+    def _key(self, address: int, address_ext: int) -> tuple:
+        for ext, start, end, number in self._segments:
+            if ext == address_ext and start <= address < end:
+                return (address_ext, number, self._pages.get(number))
+        return (address_ext, None, None)
+
+    def _drop(self, predicate) -> None:
+        for key in [key for key in self._images if predicate(key)]:
+            del self._images[key]
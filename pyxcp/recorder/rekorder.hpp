@@ -25,6 +25,7 @@
     #include <sstream>
     #include <stdexcept>
     #include <string>
+    #include <string_view>
     #include <thread>
     #include <utility>
     #include <variant>
@@ -279,6 +280,128 @@ inline void hexdump(blob_t const * buf, std::uint16_t sz) {
     printf("\n\r");
 }
 
+/*
+    Non-owning view of a batch of received frames.
+
+    All payloads are stored back-to-back in one contiguous buffer,
+    frame `idx` occupies `data[offsets[idx] .. offsets[idx] + lengths[idx])`.
+*/
+struct FrameBatchView {
+    const char*          data{ nullptr };
+    std::size_t          size{ 0 };
+    std::size_t          count{ 0 };
+    const std::uint32_t* offsets{ nullptr };
+    const std::uint32_t* lengths{ nullptr };
+    const std::uint32_t* counters{ nullptr };
+    const std::uint64_t* timestamps{ nullptr };
+    const std::uint8_t*  categories{ nullptr };
+
+    std::string_view payload(std::size_t idx) const noexcept {
+        return { data + offsets[idx], lengths[idx] };
+    }
+};
+
+/*
+    Type-erased `feed_batch()` of a native policy; lets native receive loops
+    (living in another extension module) feed policies without the GIL.
+*/
+struct FrameBatchSink {
+    void* policy{ nullptr };
+    void (*feed_batch)(void* policy, const FrameBatchView& batch){ nullptr };
+
+    void operator()(const FrameBatchView& batch) const {
+        feed_batch(policy, batch);
+    }
+};
+
+    #if STANDALONE_REKORDER == 0
+constexpr auto FRAME_BATCH_SINK_CAPSULE = "pyxcp.FrameBatchSink";
+
+/*
+    Validate the Python buffers of a `feed_batch()` call (e.g. `bytearray` +
+    `array.array("I" / "Q" / "B")`) and invoke `func` with a view on them.
+*/
+template<typename Func>
+void with_frame_batch(
+    const py::buffer& data, const py::buffer& offsets, const py::buffer& lengths, const py::buffer& counters,
+    const py::buffer& timestamps, const py::buffer& categories, Func&& func
+) {
+    const auto data_info       = data.request();
+    const auto offsets_info    = offsets.request();
+    const auto lengths_info    = lengths.request();
+    const auto counters_info   = counters.request();
+    const auto timestamps_info = timestamps.request();
+    const auto categories_info = categories.request();
+
+    const auto check_array = [](const py::buffer_info& info, py::ssize_t itemsize, const char* name) {
+        if (info.ndim != 1 || info.itemsize != itemsize) {
+            throw py::value_error(
+                std::string("feed_batch: '") + name + "' must be a one-dimensional array of " + std::to_string(itemsize) +
+                "-byte items."
+            );
+        }
+    };
+    check_array(offsets_info, sizeof(std::uint32_t), "offsets");
+    check_array(lengths_info, sizeof(std::uint32_t), "lengths");
+    check_array(counters_info, sizeof(std::uint32_t), "counters");
+    check_array(timestamps_info, sizeof(std::uint64_t), "timestamps");
+    check_array(categories_info, sizeof(std::uint8_t), "categories");
+
+    const auto count = offsets_info.shape[0];
+    if (lengths_info.shape[0] != count || counters_info.shape[0] != count || timestamps_info.shape[0] != count ||
+        categories_info.shape[0] != count) {
+        throw py::value_error("feed_batch: all frame arrays must have the same length.");
+    }
+
+    FrameBatchView batch{
+        static_cast<const char*>(data_info.ptr),
+        static_cast<std::size_t>(data_info.size * data_info.itemsize),
+        static_cast<std::size_t>(count),
+        static_cast<const std::uint32_t*>(offsets_info.ptr),
+        static_cast<const std::uint32_t*>(lengths_info.ptr),
+        static_cast<const std::uint32_t*>(counters_info.ptr),
+        static_cast<const std::uint64_t*>(timestamps_info.ptr),
+        static_cast<const std::uint8_t*>(categories_info.ptr),
+    };
+    for (std::size_t idx = 0; idx < batch.count; ++idx) {
+        if (static_cast<std::uint64_t>(batch.offsets[idx]) + batch.lengths[idx] > batch.size) {
+            throw py::value_error("feed_batch: frame " + std::to_string(idx) + " exceeds the data buffer.");
+        }
+        if (batch.categories[idx] > static_cast<std::uint8_t>(FrameCategory::STIM)) {
+            throw py::value_error("feed_batch: invalid frame category " + std::to_string(batch.categories[idx]) + ".");
+        }
+    }
+    func(batch);
+}
+
+/*
+    `feed_batch()` binding shared by all frame acquisition / DAQ policies.
+*/
+template<typename Policy>
+void policy_feed_batch(
+    Policy& self, const py::buffer& data, const py::buffer& offsets, const py::buffer& lengths, const py::buffer& counters,
+    const py::buffer& timestamps, const py::buffer& categories
+) {
+    with_frame_batch(data, offsets, lengths, counters, timestamps, categories, [&self](const FrameBatchView& batch) {
+        self.feed_batch(batch);
+    });
+}
+
+/*
+    Capsule wrapping a `FrameBatchSink` for `policy` (exposed as `_frame_batch_sink()`).
+    The capsule does not keep the policy alive, holders have to keep a reference.
+*/
+template<typename Policy>
+py::capsule policy_frame_batch_sink(Policy& self) {
+    auto* sink = new FrameBatchSink{ &self, [](void* policy, const FrameBatchView& batch) {
+                                        static_cast<Policy*>(policy)->feed_batch(batch);
+                                    } };
+    return py::capsule(sink, FRAME_BATCH_SINK_CAPSULE, [](PyObject* capsule) {
+        delete static_cast<FrameBatchSink*>(PyCapsule_GetPointer(capsule, FRAME_BATCH_SINK_CAPSULE));
+    });
+}
+    #endif /* STANDALONE_REKORDER */
+
     #include "reader.hpp"
     #include "unfolder.hpp"
     #include "writer.hpp"
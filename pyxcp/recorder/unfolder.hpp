@@ -1240,6 +1240,15 @@ class DAQPolicyBase {
 
     virtual void feed(std::uint8_t frame_cat, std::uint16_t counter, std::uint64_t timestamp, const std::string& payload) = 0;
 
+    virtual void feed_batch(const FrameBatchView& batch) {
+        for (std::size_t idx = 0; idx < batch.count; ++idx) {
+            feed(
+                batch.categories[idx], static_cast<std::uint16_t>(batch.counters[idx]), batch.timestamps[idx],
+                std::string(batch.payload(idx))
+            );
+        }
+    }
+
     virtual void initialize() = 0;
 
     virtual void finalize() = 0;
@@ -1271,6 +1280,21 @@ class DaqRecorderPolicy : public DAQPolicyBase {
         m_writer->add_frame(frame_cat, counter, timestamp, static_cast<std::uint16_t>(payload.size()), payload.c_str());
     }
 
+    void feed_batch(const FrameBatchView& batch) override {
+        if (!m_initialized) {
+            return;
+        }
+        for (std::size_t idx = 0; idx < batch.count; ++idx) {
+            if (batch.categories[idx] != static_cast<std::uint8_t>(FrameCategory::DAQ)) {
+                continue;
+            }
+            m_writer->add_frame(
+                batch.categories[idx], static_cast<std::uint16_t>(batch.counters[idx]), batch.timestamps[idx],
+                static_cast<std::uint16_t>(batch.lengths[idx]), batch.data + batch.offsets[idx]
+            );
+        }
+    }
+
     void create_writer(const std::string& file_name, std::uint32_t prealloc, std::uint32_t chunk_size, std::string_view metadata) {
         m_writer = std::make_unique<XcpLogFileWriter>(file_name, prealloc, chunk_size, metadata);
     }
@@ -177,6 +177,8 @@ PYBIND11_MODULE(rekorder, m) {
         .def(py::init<>())
         .def("create_writer", &DaqRecorderPolicy::create_writer)
         .def("feed", &DaqRecorderPolicy::feed)
+        .def("feed_batch", &policy_feed_batch<DaqRecorderPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+        .def("_frame_batch_sink", &policy_frame_batch_sink<DaqRecorderPolicy>)
         .def("set_parameters", &DaqRecorderPolicy::set_parameters)
         .def("initialize", &DaqRecorderPolicy::initialize)
         .def("finalize", &DaqRecorderPolicy::finalize);
@@ -185,6 +187,8 @@ PYBIND11_MODULE(rekorder, m) {
         .def(py::init<>())
         .def("on_daq_list", &DaqOnlinePolicy::on_daq_list)
         .def("feed", &DaqOnlinePolicy::feed)
+        .def("feed_batch", &policy_feed_batch<DaqOnlinePolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+        .def("_frame_batch_sink", &policy_frame_batch_sink<DaqOnlinePolicy>)
         .def("finalize", &DaqOnlinePolicy::finalize)
         .def("set_parameters", &DaqOnlinePolicy::set_parameters)
         .def("initialize", &DaqOnlinePolicy::initialize);
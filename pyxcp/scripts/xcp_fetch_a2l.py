@@ -1,27 +1,32 @@
 #!/usr/bin/env python
 """Fetch A2L file from XCP slave (if supported)."""
 
+import argparse
 import sys
 from pathlib import Path
 
+from rich.progress import Progress
 from rich.prompt import Confirm
 
 from pyxcp.cmdline import ArgumentParser
 from pyxcp.types import XcpGetIdType
+from pyxcp.utils import decode_bytes
 
 
 def main():
-    ap = ArgumentParser(description="Fetch A2L file from XCP slave.")
+    parser = argparse.ArgumentParser(description="Fetch A2L file from XCP slave.")
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Stream the file to disk as uploaded (encoding of the slave) instead of converting it to UTF-8.",
+    )
+    ap = ArgumentParser(parser)
 
     with ap.run() as x:
         x.connect()
 
         # TODO: error-handling.
         file_name = x.identifier(XcpGetIdType.FILENAME)
-        content = x.identifier(XcpGetIdType.FILE_TO_UPLOAD)
-        x.disconnect()
-        if not content:
-            sys.exit(f"Empty response from ID '{XcpGetIdType.FILE_TO_UPLOAD!r}'.")
         if not file_name:
             file_name = "output.a2l"
         if not file_name.lower().endswith(".a2l"):
@@ -31,8 +36,32 @@ def main():
             if not Confirm.ask(f"Destination file [green]{dest.name!r}[/green] already exists. Do you want to overwrite it?"):
                 print("Aborting...")
                 exit(1)
-        with dest.open("wt", encoding="utf-8") as of:
-            of.write(content)
+        gid = x.getId(XcpGetIdType.FILE_TO_UPLOAD)
+        if not gid.length:
+            x.disconnect()
+            sys.exit(f"Empty response from ID '{XcpGetIdType.FILE_TO_UPLOAD!r}'.")
+        if (gid.mode & 0x01) == 0x01:
+            content = bytes(gid.identification or b"")
+            if ap.args.raw:
+                dest.write_bytes(content)
+            else:
+                dest.write_text(decode_bytes(content), encoding="utf-8")
+        else:
+            with Progress() as progress:
+                task = progress.add_task(f"Uploading {gid.length} bytes", total=100)
+
+                def callback(percent):
+                    progress.update(task, completed=percent)
+
+                if ap.args.raw:
+                    # Written as uploaded (encoding of the slave), chunk by chunk.
+                    with dest.open("wb") as of:
+                        x.fetch_into(gid.length, of, callback=callback)
+                else:
+                    content = bytearray(gid.length)
+                    x.fetch_into(gid.length, content, callback=callback)
+                    dest.write_text(decode_bytes(content), encoding="utf-8")
+        x.disconnect()
         print(f"A2L data written to {file_name!r}.")
 
 
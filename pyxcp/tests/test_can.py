@@ -1,4 +1,5 @@
 import pytest
+from can import Message
 
 from pyxcp.transport.can import (
     CAN_EXTENDED_ID,
@@ -6,6 +7,7 @@ from pyxcp.transport.can import (
     MAX_29_BIT_IDENTIFIER,
     Identifier,
     IdentifierOutOfRangeError,
+    SoftwareFilter,
     calculate_filter,
     is_extended_identifier,
     pad_frame,
@@ -244,6 +246,44 @@ def test_filter_for_identifier_extended(capsys):
     assert i.create_filter_from_id() == {"can_id": 0x101, "can_mask": 0x1FFFFFFF, "extended": True}
 
 
+def test_software_filter_compiled():
+    fltr = SoftwareFilter()
+    assert not fltr.accept(Message(arbitration_id=0x101, is_extended_id=False))
+    fltr.set_filters(
+        [
+            Identifier(0x101).create_filter_from_id(),
+            Identifier(0x101 | CAN_EXTENDED_ID).create_filter_from_id(),
+            Identifier(0x7FF).create_filter_from_id(),
+            {"can_id": 0x500, "can_mask": 0x700, "extended": False},
+            {"can_id": 0x20, "can_mask": 0x7F0},
+            {"can_id": 0x800, "can_mask": 0x7FF | 0x800, "extended": False},  # never matches
+        ]
+    )
+    assert fltr.exact_standard == {0x101, 0x7FF}
+    assert fltr.exact_extended == {0x101}
+    assert len(fltr.masked) == 2
+    accepted = [(0x101, False), (0x101, True), (0x7FF, False), (0x5AB, False), (0x22, False), (0x22, True)]
+    rejected = [(0x102, False), (0x7FF, True), (0x5AB, True), (0x32, False), (0x800, False), (0x800, True)]
+    for arbitration_id, extended in accepted:
+        assert fltr.accept(Message(arbitration_id=arbitration_id, is_extended_id=extended))
+    for arbitration_id, extended in rejected:
+        assert not fltr.accept(Message(arbitration_id=arbitration_id, is_extended_id=extended))
+    fltr.accept_all()
+    assert fltr.accept(Message(arbitration_id=0x102, is_extended_id=False))
+
+
+def test_software_filter_extended_none():
+    fltr = SoftwareFilter()
+    # "extended" given but neither True nor False: the filter matches nothing.
+    fltr.set_filters([{"can_id": 0x101, "can_mask": 0x7FF, "extended": None}])
+    assert not fltr.accept(Message(arbitration_id=0x101, is_extended_id=False))
+    assert not fltr.accept(Message(arbitration_id=0x101, is_extended_id=True))
+    # Without "extended" both identifier types match.
+    fltr.set_filters([{"can_id": 0x101, "can_mask": 0x7FF}])
+    assert fltr.accept(Message(arbitration_id=0x101, is_extended_id=False))
+    assert fltr.accept(Message(arbitration_id=0x101, is_extended_id=True))
+
+
 def test_pad_frame_no_padding_1():
     frame = bytearray(b"\xaa")
     padded_frame = bytearray(b"\xaa")
@@ -260,3 +260,158 @@ def test_prepare_request_sxiL2C2CW_2():
     cmd = 0xFF
     request = framing.prepare_request(cmd, 0x00, 0x55)
     assert list(request) == [0x03, 0x00, 0x03, 0x00, 0xFF, 0x00, 0x55, 0x00, 0x5A, 0x01]
+
+
+def _sxi_frames(header_format, tail_format, payloads):
+    from pyxcp.transport.base import parse_header_format
+
+    header_len, header_ctr, header_fill = parse_header_format(header_format)
+    tail_cs = {
+        "NO_CHECKSUM": ChecksumType.NO_CHECKSUM,
+        "CHECKSUM_BYTE": ChecksumType.BYTE_CHECKSUM,
+        "CHECKSUM_WORD": ChecksumType.WORD_CHECKSUM,
+    }[tail_format]
+    config = XcpFramingConfig(
+        transport_layer_type=XcpTransportLayerType.SXI,
+        header_len=header_len,
+        header_ctr=header_ctr,
+        header_fill=header_fill,
+        tail_fill=False,
+        tail_cs=tail_cs,
+    )
+    framing = XcpFraming(config)
+    return [bytes(framing.prepare_request(payload[0], *payload[1:])) for payload in payloads]
+
+
+def test_sxi_receiver_bulk_and_split():
+    import random
+
+    from pyxcp.transport.sxi import get_receiver_class
+
+    rng = random.Random(4711)
+    payloads = [bytes([0xFF]) + bytes(rng.randrange(256) for _ in range(rng.randrange(0, 60))) for _ in range(50)]
+    for header_format in (
+        "HEADER_LEN_BYTE",
+        "HEADER_LEN_CTR_BYTE",
+        "HEADER_LEN_FILL_BYTE",
+        "HEADER_LEN_WORD",
+        "HEADER_LEN_CTR_WORD",
+        "HEADER_LEN_FILL_WORD",
+    ):
+        for tail_format in ("NO_CHECKSUM", "CHECKSUM_BYTE", "CHECKSUM_WORD"):
+            stream = b"".join(_sxi_frames(header_format, tail_format, payloads))
+            results = []
+            for chunks in (
+                [stream],  # All frames in one call.
+                [stream[idx : idx + 1] for idx in range(len(stream))],  # Octet by octet.
+                [stream[idx : idx + 7] for idx in range(0, len(stream), 7)],  # Frames split across calls.
+            ):
+                received = []
+                receiver = get_receiver_class(header_format, tail_format)(
+                    lambda data, length, counter, append=received.append: append((bytes(data), length, counter))
+                )
+                for chunk in chunks:
+                    receiver.feed_bytes(chunk)
+                results.append(received)
+            assert [data for data, _, _ in results[0]] == payloads, (header_format, tail_format)
+            assert results[0] == results[1] == results[2], (header_format, tail_format)
+
+
+def test_sxi_receiver_checksum_error_skips_frame():
+    from pyxcp.transport.sxi import get_receiver_class
+
+    frames = _sxi_frames("HEADER_LEN_CTR_WORD", "CHECKSUM_WORD", [b"\xff\x01", b"\xff\x02\x03", b"\xff\x04"])
+    corrupted = bytearray(frames[1])
+    corrupted[5] ^= 0x01
+    received = []
+    receiver = get_receiver_class("HEADER_LEN_CTR_WORD", "CHECKSUM_WORD")(
+        lambda data, length, counter: received.append(bytes(data))
+    )
+    receiver.feed_bytes(frames[0] + bytes(corrupted) + frames[2])
+    assert received == [b"\xff\x01", b"\xff\x04"]
+
+
+def _usb_receiver(header_format, packing, alignment, received, max_packet_size=0):
+    from pyxcp.transport.base import parse_header_format
+    from pyxcp.transport.transport_ext import UsbReceiver
+
+    header_len, header_ctr, header_fill = parse_header_format(header_format)
+    config = XcpFramingConfig(
+        transport_layer_type=XcpTransportLayerType.USB,
+        header_len=header_len,
+        header_ctr=header_ctr,
+        header_fill=header_fill,
+        tail_fill=False,
+        tail_cs=ChecksumType.NO_CHECKSUM,
+    )
+    return UsbReceiver(
+        lambda data, length, counter, timestamp: received.append((bytes(data), counter, timestamp)),
+        config,
+        packing,
+        alignment,
+        max_packet_size,
+    )
+
+
+def test_usb_receiver_multiple_aligned():
+    from pyxcp.transport.transport_ext import UsbMessagePacking
+
+    received = []
+    receiver = _usb_receiver("HEADER_LEN_CTR_WORD", UsbMessagePacking.MULTIPLE, 4, received)
+    # 3-byte packet, padded to 8 bytes; 4-byte packet; trailing partial header.
+    receiver.feed_transfer(b"\x03\x00\x01\x00\xff\x01\x02\xaa" + b"\x04\x00\x02\x00\x00\x01\x02\x03" + b"\x05\x00", 42)
+    assert received == [(b"\xff\x01\x02", 1, 42), (b"\x00\x01\x02\x03", 2, 42)]
+    assert receiver.discarded == 2
+    # LEN = 0: padding up to the end of the transfer.
+    receiver.feed_transfer(b"\x01\x00\x03\x00\xfe\xaa\xaa\xaa" + b"\x00\x00\x00\x00\x55\x55", 43)
+    assert received[-1] == (b"\xfe", 3, 43)
+    assert receiver.messages == 3
+    assert receiver.transfers == 2
+
+
+def test_usb_receiver_streaming():
+    from pyxcp.transport.transport_ext import UsbMessagePacking
+
+    messages = [bytes([0x00, idx]) + bytes(range(idx)) for idx in range(1, 40)]
+    stream = bytearray()
+    for message in messages:
+        stream += bytes([len(message), 0x00]) + message
+        stream += b"\xaa" * (-len(stream) % 2)  # 16-bit alignment.
+    for chunk_size in (1, 3, 64, len(stream)):
+        received = []
+        receiver = _usb_receiver("HEADER_LEN_FILL_BYTE", UsbMessagePacking.STREAMING, 2, received)
+        for offset in range(0, len(stream), chunk_size):
+            receiver.feed_transfer(bytes(stream[offset : offset + chunk_size]), offset)
+        assert [data for data, _, _ in received] == messages, chunk_size
+
+
+def test_usb_receiver_message_straddles_reads():
+    from pyxcp.transport.transport_ext import UsbMessagePacking
+
+    # Default configuration: HEADER_LEN_CTR_WORD, MESSAGE_PACKING_SINGLE, ALIGNMENT_8_BIT, 512 byte packets.
+    messages = [bytes([0x00, idx]) + bytes(range(8)) for idx in range(100)]
+    stream = b"".join(bytes([len(message), 0x00, idx, 0x00]) + message for idx, message in enumerate(messages))
+    received = []
+    receiver = _usb_receiver("HEADER_LEN_CTR_WORD", UsbMessagePacking.SINGLE, 1, received, 512)
+    # Reads of 512 bytes end with a full buffer, messages continue in the next read.
+    for offset in range(0, len(stream), 512):
+        receiver.feed_transfer(stream[offset : offset + 512], offset)
+    assert [data for data, _, _ in received] == messages
+    assert [counter for _, counter, _ in received] == list(range(100))
+    # Message 36 straddles the first two reads, it is stamped with the read it started in.
+    assert [timestamp for _, _, timestamp in received[36:38]] == [0, 512]
+    assert receiver.discarded == 0
+
+
+def test_usb_receiver_short_packet_ends_transfer():
+    from pyxcp.transport.transport_ext import UsbMessagePacking
+
+    received = []
+    receiver = _usb_receiver("HEADER_LEN_CTR_WORD", UsbMessagePacking.MULTIPLE, 1, received, 16)
+    # LEN = 0 is padding up to the next packet boundary, not to the end of the read.
+    receiver.feed_transfer(b"\x02\x00\x01\x00\xff\x01" + b"\x00" * 10 + b"\x01\x00\x02\x00\xfe" + b"\x03\x00\x03", 1)
+    assert received == [(b"\xff\x01", 1, 1), (b"\xfe", 2, 1)]
+    assert receiver.discarded == 13  # Padding and the message cut off by the short packet.
+    # The next read starts a new USB transfer.
+    receiver.feed_transfer(b"\x01\x00\x04\x00\xfd", 2)
+    assert received[-1] == (b"\xfd", 4, 2)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import io
 import selectors
 import socket
 import struct
@@ -104,6 +105,11 @@ class MockSocket(mock.MagicMock):
     def recvfrom(self, bufsize):
         return self.recv(bufsize), ("localhost", 5555)
 
+    def recv_into(self, buffer, nbytes=0, flags=0):
+        r = self.recv(nbytes or len(buffer))
+        buffer[: len(r)] = r
+        return len(r)
+
     def select(self, timeout):
         if self.data:
             key = selectors.SelectorKey(self, 0, selectors.EVENT_READ, None)
@@ -189,6 +195,50 @@ class MockCanInterface:  # CanInterfaceBase
         pass
 
 
+class MemorySlave:
+    """Answers memory access commands from `memory` (address extension -> bytes), MAX_CTO = 8.
+
+    Use as `MockSocket._mock_send.side_effect`; the commands received are logged in `commands`.
+    """
+
+    def __init__(self, ms: MockSocket, memory: dict):
+        self.ms = ms
+        self.memory = {ext: bytearray(data) for ext, data in memory.items()}
+        self.mta = [0, 0]
+        self.commands = []
+
+    def __call__(self, frame):
+        if len(frame) < 6:  # DISCONNECT
+            return
+        cmd, length = frame[4], frame[5]
+        ext, address = (frame[7], int.from_bytes(frame[8:12], "little")) if len(frame) == 12 else (0, 0)
+        if cmd == 0xF4:  # SHORT_UPLOAD
+            self.commands.append(("SHORT_UPLOAD", address, ext, length))
+            self.ms.push_packet(b"\xff" + self.memory[ext][address : address + length])
+        elif cmd == 0xF6:  # SET_MTA
+            self.commands.append(("SET_MTA", address, ext))
+            self.mta[:] = [address, ext]
+            self.ms.push_packet("FF")
+        elif cmd == 0xF5:  # UPLOAD
+            self.commands.append(("UPLOAD", length))
+            address, ext = self.mta
+            data = self.memory[ext][address : address + length]
+            self.mta[0] += length
+            for offset in range(0, length, 7):
+                self.ms.push_packet(b"\xff" + data[offset : offset + 7])
+        elif cmd in (0xF0, 0xEF):  # DOWNLOAD, DOWNLOAD_NEXT (master block mode: LEN is the remaining block size)
+            self.commands.append(("DOWNLOAD" if cmd == 0xF0 else "DOWNLOAD_NEXT", length))
+            address, ext = self.mta
+            data = frame[6 : 6 + length]
+            self.memory[ext][address : address + len(data)] = data
+            self.mta[0] += len(data)
+            if len(data) == length:  # Only the last packet of a block is answered.
+                self.ms.push_packet("FF")
+        else:
+            self.commands.append((types.Command(cmd).name,))
+            self.ms.push_packet("FF")
+
+
 class TestMaster:
     DefaultConnectCmd = bytes([0x02, 0x00, 0x00, 0x00, 0xFF, 0x00])
     # Response format: PID, Resource, CommModeBasic, MaxCto, MaxDto (2 bytes), ProtocolLayerVersion, TransportLayerVersion
@@ -719,6 +769,110 @@ class TestMaster:
 
         assert res == b"\x01\x02\x03\x04\x05\x06\x07\x08"
 
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testUploadBlockMode(self, mock_selector, mock_socket):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D C0 08 08 00 01 01")  # MAX_CTO = 8, slave block mode
+
+            xm.connect()
+
+            data = bytes(range(1, 21))
+            ms.push_packet(b"\xff" + data[0:7])
+            ms.push_packet(b"\xff" + data[7:14])
+            ms.push_packet(b"\xff" + data[14:20] + b"\xaa")  # Padding is discarded.
+
+            res = xm.upload(20)
+
+            ms._mock_send.assert_called_with(bytes([0x02, 0x00, 0x01, 0x00, 0xF5, 0x14]))
+
+        assert res == data
+
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testPushMasterBlockMode(self, mock_selector, mock_socket):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D C0 08 08 00 01 01")  # MAX_CTO = 8
+
+            xm.connect()
+            xm.slaveProperties.masterBlockMode = True
+            xm.slaveProperties.maxBs = 4
+            xm.slaveProperties.minSt = 1  # 100 us
+
+            ms.push_packet("FF")  # SET_MTA
+
+            def respond(frame):
+                if frame[4] == 0xEF and frame[5] == 4:
+                    ms.push_packet("FF")  # Response to the last DOWNLOAD_NEXT of the block.
+
+            ms._mock_send.side_effect = respond
+
+            data = bytes(range(1, 17))
+            start = time.perf_counter()
+            xm.push(0x1000, 0, data)
+            elapsed = time.perf_counter() - start
+
+            frames = [c.args[0][4:] for c in ms._mock_send.call_args_list[2:]]
+
+        # Packets before the last one are queued without waiting for a response.
+        assert frames == [
+            bytes([0xF0, 16, *data[0:6]]),
+            bytes([0xEF, 10, *data[6:12]]),
+            bytes([0xEF, 4, *data[12:16]]),
+        ]
+        assert elapsed >= 2 * 100e-6  # Two MIN_ST intervals.
+
+    @pytest.mark.parametrize("native", [False, True])
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testPushQueuedWithNativeBlockSend(self, mock_selector, mock_socket, native):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D 80 08 08 00 01 01")  # MAX_CTO = 8
+            xm.connect()
+            xm.slaveProperties.masterBlockMode = True
+            xm.slaveProperties.maxBs = 4
+            xm.slaveProperties.minSt = 0
+
+            ms.push_packet("FF")  # SET_MTA
+
+            def respond(frame):
+                if frame[4] == 0xEF and frame[5] == 4:
+                    ms.push_packet("FF")  # Response to the last DOWNLOAD_NEXT of the block.
+
+            ms._mock_send.side_effect = respond
+
+            data = bytes(range(1, 17))
+            with (
+                mock.patch.object(xm.transport, "has_native_block_send", return_value=native),
+                mock.patch.object(xm.transport, "block_request_many", wraps=xm.transport.block_request_many) as queued,
+            ):
+                xm.push(0x1000, 0, data)
+
+            frames = [c.args[0][4:] for c in ms._mock_send.call_args_list[2:]]
+
+        # Per-packet DOWNLOAD / DOWNLOAD_NEXT unless the transport sends blocks natively.
+        assert queued.called == native
+        assert frames == [
+            bytes([0xF0, 16, *data[0:6]]),
+            bytes([0xEF, 10, *data[6:12]]),
+            bytes([0xEF, 4, *data[12:16]]),
+        ]
+
     @mock.patch("pyxcp.transport.eth.socket.socket")
     @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
     def testShortUpload(self, mock_selector, mock_socket):
@@ -2157,3 +2311,243 @@ class TestMaster:
             assert res.sync_state.slv_clk_sync_state == 0x01
             assert res.clock_info.clk_relation is True
             assert res.cluster_id == 0x5678
+
+    @pytest.mark.parametrize("slave_block_mode", [False, True])
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testReadMany(self, mock_selector, mock_socket, slave_block_mode):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        memory = {ext: bytes((i * 7 + ext) & 0xFF for i in range(0x1000)) for ext in (0, 1)}
+        mta = [0, 0]
+        commands = []
+
+        def respond(frame):
+            if len(frame) < 6:  # DISCONNECT
+                return
+            cmd, length = frame[4], frame[5]
+            ext, address = (frame[7], int.from_bytes(frame[8:12], "little")) if len(frame) == 12 else (0, 0)
+            if cmd == 0xF4:  # SHORT_UPLOAD
+                commands.append(("SHORT_UPLOAD", address, ext, length))
+                ms.push_packet(b"\xff" + memory[ext][address : address + length])
+            elif cmd == 0xF6:  # SET_MTA
+                commands.append(("SET_MTA", address, ext))
+                mta[:] = [address, ext]
+                ms.push_packet("FF")
+            elif cmd == 0xF5:  # UPLOAD
+                commands.append(("UPLOAD", length))
+                data = memory[mta[1]][mta[0] : mta[0] + length]
+                mta[0] += length
+                for offset in range(0, length, 7):
+                    ms.push_packet(b"\xff" + data[offset : offset + 7])
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D C0 08 08 00 01 01" if slave_block_mode else "FF 1D 80 08 08 00 01 01")  # MAX_CTO = 8
+            xm.connect()
+            ms._mock_send.side_effect = respond
+
+            requests = [
+                (2, 0x104, 0),
+                (2, 0x100, 0),
+                (1, 0x106, 0),
+                (1, 0x110, 0),
+                (20, 0x200, 1),
+                (4, 0x300, 0),
+                (4, 0x302, 0),
+                (0, 0x400, 0),
+            ]
+            res = xm.read_many(requests)
+
+        assert res == [memory[ext][address : address + length] for length, address, ext in requests]
+        if slave_block_mode:
+            # 0x110 is merged as well: SET_MTA + one block-mode UPLOAD, like two SHORT_UPLOADs.
+            assert commands == [
+                ("SHORT_UPLOAD", 0x300, 0, 6),
+                ("SET_MTA", 0x100, 0),
+                ("UPLOAD", 17),
+                ("SET_MTA", 0x200, 1),
+                ("UPLOAD", 20),
+            ]
+        else:
+            assert commands == [
+                ("SHORT_UPLOAD", 0x100, 0, 7),
+                ("SHORT_UPLOAD", 0x110, 0, 1),
+                ("SHORT_UPLOAD", 0x300, 0, 6),
+                ("SET_MTA", 0x200, 1),
+                ("UPLOAD", 7),
+                ("UPLOAD", 7),
+                ("UPLOAD", 6),
+            ]
+
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testMemoryImage(self, mock_selector, mock_socket):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        memory = {0: bytes(range(256)) * 2}
+        slave = MemorySlave(ms, memory)
+        config = create_config()
+        config.general.memory_image = True
+
+        with Master("eth", config=config) as xm:
+            ms.push_packet("FF 1D 80 08 08 00 01 01")  # MAX_CTO = 8
+            xm.connect()
+            ms._mock_send.side_effect = slave
+            image = xm.memory_image
+
+            assert xm.shortUpload(4, 0x100) == memory[0][0x100:0x104]
+            assert xm.shortUpload(4, 0x100) == memory[0][0x100:0x104]
+            assert slave.commands == [("SHORT_UPLOAD", 0x100, 0, 4)]
+
+            # Served from the image: the slave's MTA is set again before the next UPLOAD.
+            slave.commands.clear()
+            xm.setMta(0x100)
+            assert xm.upload(4) == memory[0][0x100:0x104]
+            assert xm.upload(4) == memory[0][0x104:0x108]
+            assert slave.commands == [("SET_MTA", 0x100, 0), ("SET_MTA", 0x104, 0), ("UPLOAD", 4)]
+
+            # Only the holes are uploaded.
+            slave.commands.clear()
+            xm.setMta(0xFC)
+            assert xm.fetch(16) == memory[0][0xFC:0x10C]
+            assert slave.commands == [("SET_MTA", 0xFC, 0), ("UPLOAD", 4), ("SET_MTA", 0x108, 0), ("UPLOAD", 4)]
+            slave.commands.clear()
+            xm.setMta(0xFC)
+            assert xm.fetch(16) == memory[0][0xFC:0x10C]
+            assert slave.commands == [("SET_MTA", 0xFC, 0)]
+
+            # Written memory is invalidated.
+            slave.commands.clear()
+            xm.setMta(0x102)
+            xm.download(b"\xaa\xbb")
+            assert xm.shortUpload(4, 0x100) == b"\x00\x01\xaa\xbb"
+            assert xm.shortUpload(2, 0x106) == memory[0][0x106:0x108]
+            assert slave.commands == [("SET_MTA", 0x102, 0), ("DOWNLOAD", 2), ("SHORT_UPLOAD", 0x100, 0, 4)]
+
+            # Memory outside of known segments may change with the XCP page.
+            slave.commands.clear()
+            xm.setCalPage(0x02, 0, 1)
+            xm.shortUpload(2, 0x106)
+            assert slave.commands == [("SET_CAL_PAGE",), ("SHORT_UPLOAD", 0x106, 0, 2)]
+
+            assert image.snapshot() == {
+                "hits": 4,
+                "misses": 6,
+                "round_trips_saved": 6,  # fetch(16) with MAX_CTO = 8: three UPLOADs.
+                "bytes_hit": 26,
+                "bytes_fetched": 22,
+                "blocks": 1,
+                "size": 2,
+            }
+
+    @pytest.mark.parametrize("slave_block_mode", [False, True])
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testFetchInto(self, mock_selector, mock_socket, slave_block_mode):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        memory = {0: bytes(range(256)) * 4}
+        slave = MemorySlave(ms, memory)
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D C0 08 08 00 01 01" if slave_block_mode else "FF 1D 80 08 08 00 01 01")  # MAX_CTO = 8
+            xm.connect()
+            ms._mock_send.side_effect = slave
+
+            # File object, progress callback.
+            progress = []
+            out = io.BytesIO()
+            xm.setMta(0x10)
+            assert xm.fetch_into(600, out, callback=progress.append) == 600
+            assert out.getvalue() == memory[0][0x10:0x268]
+            assert progress[-1] == 100 and progress == sorted(progress)
+            uploads = [c for c in slave.commands if c[0] == "UPLOAD"]
+            assert uploads == (
+                [("UPLOAD", 255), ("UPLOAD", 255), ("UPLOAD", 90)] if slave_block_mode else [("UPLOAD", 7)] * 85 + [("UPLOAD", 5)]
+            )
+
+            # Preallocated buffer, filled in place.
+            buffer = bytearray(b"\xee" * 32)
+            xm.setMta(0x100)
+            assert xm.fetch_into(20, memoryview(buffer)[4:]) == 20
+            assert buffer == b"\xee" * 4 + memory[0][0x100:0x114] + b"\xee" * 8
+
+            xm.setMta(0x100)
+            assert xm.fetch(20) == memory[0][0x100:0x114]
+
+            with pytest.raises(ValueError):
+                xm.fetch_into(20, bytearray(10))
+
+            if not slave_block_mode:
+                # Short UPLOAD response (end of the slave's memory).
+                xm.setMta(0x3FC)
+                with pytest.raises(types.FrameSizeError):
+                    xm.fetch_into(8, bytearray(8))
+
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testFetchWordGranularity(self, mock_selector, mock_socket):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        slave = MemorySlave(ms, {0: bytes(256)})
+
+        with Master("eth", config=create_config()) as xm:
+            ms.push_packet("FF 1D 82 08 08 00 01 01")  # MAX_CTO = 8, AG = WORD
+            xm.connect()
+            assert xm.slaveProperties.bytesPerElement == 2
+            ms._mock_send.side_effect = slave
+
+            for length in (3, 11):
+                with pytest.raises(ValueError):
+                    xm.fetch(length)
+                with pytest.raises(ValueError):
+                    xm.fetch_into(length, bytearray(16))
+            assert not slave.commands
+
+    @pytest.mark.parametrize("native", [False, True])
+    @mock.patch("pyxcp.transport.eth.socket.socket")
+    @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+    def testMemoryImageBlockDownload(self, mock_selector, mock_socket, native):
+        ms = MockSocket()
+
+        mock_socket.return_value = ms
+        mock_selector.return_value = ms
+
+        memory = {0: bytes(range(256))}
+        slave = MemorySlave(ms, memory)
+        config = create_config()
+        config.general.memory_image = True
+
+        with Master("eth", config=config) as xm:
+            ms.push_packet("FF 1D 80 08 08 00 01 01")  # MAX_CTO = 8
+            xm.connect()
+            xm.slaveProperties.masterBlockMode = True
+            xm.slaveProperties.maxBs = 4
+            xm.slaveProperties.minSt = 0
+            ms._mock_send.side_effect = slave
+
+            assert xm.shortUpload(6, 0x10) == memory[0][0x10:0x16]
+            assert xm.shortUpload(4, 0x24) == memory[0][0x24:0x28]
+            with mock.patch.object(xm.transport, "has_native_block_send", return_value=native):
+                xm.push(0x10, 0, b"\xaa" * 16)
+            assert [c[0] for c in slave.commands[3:]] == ["DOWNLOAD", "DOWNLOAD_NEXT", "DOWNLOAD_NEXT"]
+            assert xm.memory_image.mta == (0x20, 0)  # Follows the queued packets as well.
+
+            # Every packet of the block invalidates, not just the last one.
+            slave.commands.clear()
+            assert xm.shortUpload(2, 0x14) == b"\xaa\xaa"
+            assert xm.shortUpload(4, 0x1E) == b"\xaa\xaa" + memory[0][0x20:0x22]
+            assert xm.shortUpload(4, 0x24) == memory[0][0x24:0x28]
+            assert slave.commands == [("SHORT_UPLOAD", 0x14, 0, 2), ("SHORT_UPLOAD", 0x1E, 0, 4)]
@@ -0,0 +1,74 @@
+from pyxcp.master.memory_image import MemoryImage
+
+
+def test_memory_image_intervals():
+    image = MemoryImage()
+    image.update(0x100, b"\x01\x02\x03\x04")
+    image.update(0x108, b"\x09\x0a")
+    assert image.get(0x101, 2) == b"\x02\x03"
+    assert image.get(0x102, 4) is None
+    assert image.holes(0xFE, 14) == [(0xFE, 2), (0x104, 4), (0x10A, 2)]
+
+    # Filling the hole merges the blocks, newer data wins.
+    image.update(0x103, b"\x14\x05\x06\x07\x08")
+    assert image.blocks == 1
+    assert image.get(0x100, 10) == bytes([1, 2, 3, 0x14, 5, 6, 7, 8, 9, 10])
+    assert image.holes(0x100, 10) == []
+
+    image.invalidate(0x102, 3)
+    assert image.holes(0x100, 10) == [(0x102, 3)]
+    assert image.get(0x105, 5) == bytes([6, 7, 8, 9, 10])
+    image.invalidate(address_ext=1)
+    assert image.size == 7
+    image.invalidate()
+    assert image.size == 0
+
+
+def test_memory_image_granularity():
+    image = MemoryImage(granularity=2)
+    image.update(0x10, b"\x01\x00\x02\x00")
+    image.update(0x12, b"\x03\x00")
+    assert image.get(0x11, 2) == b"\x02\x00\x03\x00"
+    assert image.holes(0x10, 4) == [(0x13, 1)]
+
+
+def test_memory_image_pages():
+    image = MemoryImage()
+    image.set_segments([(0, 0x1000, 0x100, 0)])
+    image.update(0x1000, b"\x00" * 4)  # Segment 0, page not known yet.
+    image.update(0x2000, b"\x00" * 4)  # Outside of all segments.
+
+    image.set_cal_page(0x01, 0, 1)  # ECU access only.
+    assert image.blocks == 2
+    image.set_cal_page(0x02, 0, 1)
+    assert image.blocks == 0
+
+    image.update(0x1000, b"\x01" * 4)
+    image.set_cal_page(0x02, 0, 0)
+    assert image.get(0x1000, 4) is None
+    image.update(0x1000, b"\x00" * 4)
+    image.set_cal_page(0x82, 0, 1)  # All segments.
+    assert image.get(0x1000, 4) == b"\x01" * 4
+
+    image.copy_cal_page(0, 0, 0, 1)
+    assert image.get(0x1000, 4) is None
+    image.set_cal_page(0x02, 0, 0)
+    assert image.get(0x1000, 4) == b"\x00" * 4
+
+
+def test_memory_image_statistics():
+    image = MemoryImage()
+    image.update(0, b"\x00" * 8)
+    assert image.lookup(0, 8, round_trips=2) == b"\x00" * 8
+    assert image.lookup(4, 8) is None
+    assert image.snapshot() == {
+        "hits": 1,
+        "misses": 1,
+        "round_trips_saved": 2,
+        "bytes_hit": 8,
+        "bytes_fetched": 8,
+        "blocks": 1,
+        "size": 8,
+    }
+    image.reset_statistics()
+    assert image.hits == image.misses == image.bytes_fetched == 0
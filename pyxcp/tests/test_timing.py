@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from pyxcp import types
+from pyxcp.timing import AdaptiveTimeouts, CommandLatencies, LatencyHistogram
+
+
+def test_histogram_exact_small_values():
+    hist = LatencyHistogram()
+    for value in range(1, 101):
+        hist.record(value)
+    assert hist.count == 100
+    assert hist.min == 1 and hist.max == 100
+    assert hist.mean == 50.5
+    assert hist.value_at_percentile(50) == 50
+    assert hist.value_at_percentile(99) == 99
+    assert hist.value_at_percentile(100) == 100
+
+
+def test_histogram_relative_precision():
+    hist = LatencyHistogram(significant_bits=7)
+    values = [1_000 * (i + 1) for i in range(1000)]  # 1 us .. 1 ms
+    for value in values:
+        hist.record(value)
+    for percentile in (50, 90, 99, 99.9):
+        expected = values[int(len(values) * percentile / 100) - 1]
+        assert abs(hist.value_at_percentile(percentile) - expected) / expected < 1 / 64
+
+
+def test_histogram_clamping_and_reset():
+    hist = LatencyHistogram(max_value=1_000_000)
+    hist.record(-5)
+    hist.record(10**12)
+    assert hist.min == 0 and hist.max == 10**12
+    assert hist.value_at_percentile(100) <= 10**12
+    hist.reset()
+    assert hist.count == 0
+    assert hist.snapshot() == {"count": 0, "min": 0, "max": 0, "mean": 0.0, "p50": 0, "p90": 0, "p99": 0, "p99.9": 0}
+
+
+def test_command_latencies_snapshot():
+    latencies = CommandLatencies("Eth")
+    latencies.record(types.Command.CONNECT, 1_000, 20_000, 25_000)
+    latencies.record(types.Command.CONNECT, 2_000, 30_000, 35_000)
+    latencies.record_block(types.Command.UPLOAD, 500_000)
+    latencies.record_timeout(types.Command.GET_STATUS)
+
+    snapshot = latencies.snapshot()
+    assert snapshot["transport"] == "Eth" and snapshot["unit"] == "ns"
+    assert list(snapshot["commands"]) == ["CONNECT", "UPLOAD", "GET_STATUS"]
+    connect = snapshot["commands"]["CONNECT"]
+    assert connect["queue"]["count"] == 2
+    assert connect["response"]["min"] == 20_000 and connect["response"]["max"] == 30_000
+    assert connect["timeouts"] == 0
+    assert snapshot["commands"]["UPLOAD"]["block"]["count"] == 1
+    assert snapshot["commands"]["GET_STATUS"] == {"timeouts": 1}
+    assert json.loads(latencies.to_json()) == snapshot
+
+    with pytest.raises(ValueError):
+        latencies.histogram(types.Command.CONNECT, "bogus")
+    latencies.reset()
+    assert latencies.snapshot()["commands"] == {}
+
+
+def test_adaptive_timeouts():
+    timeouts = AdaptiveTimeouts(floor=5_000_000, ceiling=2_000_000_000, percentile=99.9, factor=3.0)
+    connect, status = types.Command.CONNECT, types.Command.GET_STATUS
+    for _ in range(AdaptiveTimeouts.MIN_SAMPLES - 1):
+        timeouts.record(status, 10_000_000)
+    assert timeouts.timeout(status) == 2_000_000_000  # Not enough samples yet.
+    timeouts.record(status, 10_000_000)
+    assert timeouts.timeout(status) == pytest.approx(30_000_000, rel=0.02)
+    assert timeouts.timeout(connect) == 2_000_000_000
+
+    # Consecutive timeouts back off towards the ceiling, a response resets.
+    timeouts.record_timeout(status)
+    assert timeouts.timeout(status) == pytest.approx(60_000_000, rel=0.02)
+    for _ in range(10):
+        timeouts.record_timeout(status)
+    assert timeouts.timeout(status) == 2_000_000_000
+    timeouts.record(status, 10_000_000)
+    assert timeouts.timeout(status) == pytest.approx(30_000_000, rel=0.02)
+
+    # Floor.
+    for _ in range(AdaptiveTimeouts.MIN_SAMPLES):
+        timeouts.record(connect, 100_000)
+    assert timeouts.timeout(connect) == 5_000_000
+
+    snapshot = timeouts.snapshot()
+    assert snapshot["commands"]["GET_STATUS"]["samples"] == AdaptiveTimeouts.MIN_SAMPLES + 1
+    assert snapshot["commands"]["CONNECT"] == {"samples": 20, "timeout": 5_000_000, "consecutive_timeouts": 0}
+    timeouts.reset()
+    assert timeouts.timeout(status) == 2_000_000_000
@@ -1,15 +1,34 @@
+import logging
+import os
 import selectors
 import socket
 import struct
+import subprocess
+import sys
 import threading
+import time
 from unittest import mock
 
 import pytest
 import serial
+import can
+from can import Message
 from can.bus import BusABC
 
 import pyxcp.transport.base as tr
 from pyxcp import types
+from pyxcp.transport import transport_ext as tr_ext
+from pyxcp.transport.can import (
+    CanBusMultiplexer,
+    Identifier,
+    MultiplexedCan,
+    NativeSocketCan,
+    available_interface_configs,
+    invalidate_interface_configs,
+    socketcan_filters,
+)
+from pyxcp.transport.eth import RECV_SIZE, ReceiveBufferPool
+from pyxcp.transport.transport_ext import FrameAcquisitionPolicy, FrameCategory
 
 
 class MockSocket(mock.MagicMock):
@@ -54,6 +73,11 @@ class MockSocket(mock.MagicMock):
     def recvfrom(self, bufsize):
         return self.recv(bufsize), ("localhost", 5555)
 
+    def recv_into(self, buffer, nbytes=0, flags=0):
+        r = self.recv(nbytes or len(buffer))
+        buffer[: len(r)] = r
+        return len(r)
+
     def select(self, timeout):
         if self.data:
             key = selectors.SelectorKey(self, 0, selectors.EVENT_READ, None)
@@ -239,6 +263,177 @@ def test_factory_works_case_insensitive(mock_can_interface_map, mock_detect_conf
     )
 
 
+@pytest.mark.skipif(not hasattr(tr_ext, "SerialReader") or not hasattr(os, "openpty"), reason="Linux only")
+def test_sxi_single_thread_receive():
+    import tty
+
+    controller, device = os.openpty()
+    tty.setraw(device)
+    port = serial.Serial(os.ttyname(device), timeout=0.1)
+    config = create_config()
+    transport = tr.create_transport("sxi", config=config, transport_layer_interface=port)
+    received = []
+    transport.process_response = lambda data, length, counter, timestamp: received.append(bytes(data))
+    try:
+        transport.start_listener()
+        # Three frames in one write, the last one split across two writes.
+        os.write(controller, b"\x02\xff\x00\x03\xfe\x20\x01\x02\xff")
+        time.sleep(0.05)
+        os.write(controller, b"\x01")
+        deadline = time.monotonic() + 2.0
+        while len(received) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert received == [b"\xff\x00", b"\xfe\x20\x01", b"\xff\x01"]
+        assert transport.serial_reader is not None
+        assert transport.serial_reader.bytes_received == 10
+        assert transport.listener.is_alive()
+    finally:
+        transport.close()
+        port.close()
+        os.close(controller)
+        os.close(device)
+
+
+def test_sxi_read_port_honours_timeout():
+    from pyxcp.transport.sxi import SxI
+
+    transport = mock.MagicMock()
+    transport.comm_port = mock.MagicMock(timeout=2.0, in_waiting=2)
+    transport.comm_port.read.side_effect = [b"\x02", b"\xff\x00"]
+    assert SxI._read_port(transport, 100) == b"\x02\xff\x00"
+    assert transport.comm_port.timeout == 0.1
+
+
+def _fake_libusb_device(monkeypatch):
+    """pyusb device on a fake libusb1 backend; returns `(lib, device)`."""
+    import ctypes
+
+    import usb.backend
+    import usb.backend.libusb1 as libusb1
+
+    from pyxcp.transport import usb_transport
+
+    monkeypatch.setattr(usb_transport, "_libusb_function", lambda lib, name, restype, *argtypes: getattr(lib, name))
+
+    class FakeLibusb:
+        """Completes submitted transfers from `handle_events`, with data taken from `pending`."""
+
+        def __init__(self):
+            self.libusb_cancel_transfer = mock.MagicMock()
+            self.libusb_handle_events_timeout_completed = mock.MagicMock(side_effect=self.handle_events)
+            self.libusb_free_transfer = mock.MagicMock()
+            self.submitted = []
+            self.pending = [b"\x01\x02\x03", b"", b"\x04" * 64]
+
+        def libusb_alloc_transfer(self, iso_packets):
+            return ctypes.pointer(usb_transport._LibusbTransfer())
+
+        def libusb_submit_transfer(self, transfer_p):
+            self.submitted.append(transfer_p)
+            return 0
+
+        def handle_events(self, ctx, timeout, completed):
+            if self.submitted:
+                transfer_p = self.submitted.pop(0)
+                transfer = transfer_p.contents
+                if self.pending:
+                    data = self.pending.pop(0)
+                    ctypes.memmove(transfer.buffer, data, len(data))
+                    transfer.actual_length = len(data)
+                    transfer.status = usb_transport.LIBUSB_TRANSFER_COMPLETED
+                else:
+                    transfer.status = usb_transport.LIBUSB_TRANSFER_CANCELLED
+                transfer.callback(transfer_p)
+            return 0
+
+    class FakeBackend(libusb1._LibUSB):
+        def __init__(self, lib):
+            usb.backend.IBackend.__init__(self)
+            self.lib = lib
+            self.ctx = ctypes.c_void_p()  # NULL, so finalizing does not call libusb_exit().
+
+    lib = FakeLibusb()
+    device = mock.MagicMock()
+    device._ctx.backend = FakeBackend(lib)
+    device._ctx.handle.handle = ctypes.c_void_p()
+    return lib, device
+
+
+def test_usb_async_bulk_reader(monkeypatch):
+    from pyxcp.transport.usb_transport import AsyncBulkReader
+
+    lib, device = _fake_libusb_device(monkeypatch)
+    received = []
+    reader = AsyncBulkReader(device, 0x81, 2, 64, lambda data, timestamp: received.append(bytes(data)), lambda: 0)
+    reader.run(lambda: not lib.pending)
+    assert received == [b"\x01\x02\x03", b"\x04" * 64]  # Empty transfer is not handed on.
+    assert reader.completed == 3
+    assert reader.in_flight == 0
+    lib.libusb_cancel_transfer.assert_called()
+    reader.close()
+    assert lib.libusb_free_transfer.call_count == 2
+
+
+def test_usb_async_bulk_reader_handler_error(caplog, monkeypatch):
+    from pyxcp.transport.usb_transport import AsyncBulkReader
+
+    lib, device = _fake_libusb_device(monkeypatch)
+    received = []
+
+    def on_transfer(data, timestamp):
+        if data[0] == 0x01:
+            raise ValueError("dispatch failed")
+        received.append(bytes(data))
+
+    reader = AsyncBulkReader(device, 0x81, 2, 64, on_transfer, lambda: 0)
+    with caplog.at_level(logging.ERROR, logger="pyxcp.transport"):
+        reader.run(lambda: not lib.pending)
+    # Logged, and the transfer was resubmitted.
+    assert "dispatch failed" in caplog.text
+    assert received == [b"\x04" * 64]
+    assert reader.error is None
+    reader.close()
+
+
+def test_usb_libusb_bindings_match_pyusb(monkeypatch):
+    import usb.backend.libusb1 as libusb1
+    from usb.core import USBError
+
+    from pyxcp.transport import usb_transport
+
+    # Own `struct libusb_transfer` has the same layout as pyusb's.
+    for name, _ in usb_transport._LibusbTransfer._fields_:
+        assert getattr(usb_transport._LibusbTransfer, name).offset == getattr(libusb1._libusb_transfer, name).offset
+    for name in ("COMPLETED", "TIMED_OUT", "CANCELLED", "STALL", "NO_DEVICE", "OVERFLOW"):
+        assert getattr(usb_transport, f"LIBUSB_TRANSFER_{name}") == getattr(libusb1, f"LIBUSB_TRANSFER_{name}")
+
+    lib, device = _fake_libusb_device(monkeypatch)
+    assert usb_transport._libusb1_handles(device) == (lib, device._ctx.backend.ctx, device._ctx.handle.handle)
+    device._ctx.managed_open.assert_called_once_with()
+    with pytest.raises(USBError):
+        usb_transport._libusb1_handles(mock.MagicMock(spec=["read"]))
+
+
+def test_usb_process_transfer_logs_dispatch_errors():
+    from pyxcp.transport.usb_transport import Usb
+
+    transport = mock.MagicMock()
+    transport.receiver.feed_transfer.side_effect = ValueError("dispatch failed")
+    Usb.process_transfer(transport, b"\x01\x00\x00\x00\xff", 0)
+    transport.logger.exception.assert_called_once()
+    transport.flush_policy_batch.assert_called_once_with()
+
+
+def test_usb_async_fallback_on_changed_pyusb():
+    from pyxcp.transport.usb_transport import Usb
+
+    # pyusb without the private `Device._ctx` the asynchronous reader relies on.
+    transport = mock.MagicMock(in_ep_async_transfers=2, device=mock.MagicMock(spec=["read"]))
+    Usb.listen(transport)
+    transport._listen_sync.assert_called_once_with()
+    transport._listen_async.assert_not_called()
+
+
 def test_factory_invalid_transport_name_raises():
     with pytest.raises(ValueError):
         tr.create_transport("xCp")
@@ -268,6 +463,38 @@ def test_transport_classes():
     assert issubclass(transports.get("sxi"), tr.BaseTransport)
 
 
+def test_transports_imported_on_demand():
+    code = (
+        "import sys, pyxcp; from pyxcp.transport.base import create_transport; "
+        "loaded = lambda: sorted(m for m in ('can', 'eth', 'sxi', 'usb_transport') if f'pyxcp.transport.{m}' in sys.modules); "
+        "print(loaded()); "
+        "from pyxcp.transport import Eth; print(loaded())"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.splitlines()
+    assert output == ["[]", "['eth']"]
+
+
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+def test_can_interface_configs_cached(mock_detect_configs):
+    mock_detect_configs.return_value = [{"interface": "virtual", "channel": "0"}]
+    invalidate_interface_configs()
+    assert available_interface_configs("virtual") == [{"interface": "virtual", "channel": "0"}]
+    assert available_interface_configs("virtual") == [{"interface": "virtual", "channel": "0"}]
+    assert mock_detect_configs.call_count == 1
+
+    mock_detect_configs.side_effect = OSError("driver library not found")
+    assert available_interface_configs("pcan") == []
+    assert available_interface_configs("pcan") == []
+    assert mock_detect_configs.call_count == 2
+
+    invalidate_interface_configs("virtual")
+    mock_detect_configs.side_effect = None
+    available_interface_configs("virtual")
+    available_interface_configs("pcan")
+    assert mock_detect_configs.call_count == 3
+    invalidate_interface_configs()
+
+
 @mock.patch("pyxcp.transport.eth.socket.socket")
 @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
 def test_eth_request(mock_selector, mock_socket):
@@ -357,6 +584,230 @@ def test_can_request(mock_can_interface_map, mock_detect_configs):
     assert sent_msg.data == b"\xff\x00"
 
 
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_drain_receive(mock_can_interface_map, mock_detect_configs):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.__getitem__.return_value = MockCanInterfaceConfig()
+    mock_can = create_mock_can_interface()
+    queued = [
+        Message(is_extended_id=False, arbitration_id=2, data=b"\x00\x01", timestamp=1.0, channel="can0"),
+        Message(is_extended_id=False, arbitration_id=0x555, data=b"\x00\x02", timestamp=1.1, channel="can0"),  # software-filtered
+        Message(is_extended_id=False, arbitration_id=2, is_error_frame=True, channel="can0"),
+        Message(is_extended_id=False, arbitration_id=2, is_remote_frame=True, channel="can0"),
+        Message(is_extended_id=False, arbitration_id=2, data=b"\x00\x03", timestamp=1.2, channel="can1"),
+    ]
+    mock_can.recv.side_effect = lambda timeout=None: queued.pop(0) if queued else None
+    config = create_config()
+    config.can.drain_receive = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy, transport_layer_interface=mock_can)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+
+    frames = transport.can_interface.read_batch(100)
+    assert frames == [(2, b"\x00\x01", 1_000_000_000), (2, b"\x00\x03", 1_200_000_000)]
+    # Only the first receive blocks.
+    assert [c.args[0] for c in mock_can.recv.call_args_list] == [0.1, 0.0, 0.0, 0.0, 0.0, 0.0]
+    counters = transport.receive_counters()
+    assert counters["can0"].as_dict() == {
+        "received": 1,
+        "filtered": 1,
+        "error_frames": 1,
+        "invalid": 1,
+        "recv_errors": 0,
+        "overflows": 0,
+        "dropped": 3,
+    }
+    assert counters["can1"].received == 1
+
+    queued.extend(
+        Message(is_extended_id=False, arbitration_id=2, data=bytes([0x00, counter]), channel="can0") for counter in range(5)
+    )
+    transport.start_listener()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 5 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [bytes([0x00, counter]) for counter in range(5)]
+        assert transport.receive_counters()["can0"].received == 6
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+
+
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_drain_receive_survives_errors(mock_can_interface_map, mock_detect_configs):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.__getitem__.return_value = MockCanInterfaceConfig()
+    mock_can = create_mock_can_interface()
+    # Backend failures that are not `CanError`s must not end the listener thread.
+    queued = [
+        ValueError("backend failure"),
+        OSError("device busy"),
+        Message(is_extended_id=False, arbitration_id=2, data=b"\x00\x01", channel="can0"),
+    ]
+
+    def recv(timeout=None):
+        if not queued:
+            return None
+        item = queued.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    mock_can.recv.side_effect = recv
+    config = create_config()
+    config.can.drain_receive = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy, transport_layer_interface=mock_can)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+    transport.start_listener()
+    try:
+        deadline = time.monotonic() + 2.0
+        while not policy.frames and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [b"\x00\x01"]
+        assert transport.listener.is_alive()
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+
+
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_drain_receive_backs_off_on_errors(mock_can_interface_map, mock_detect_configs):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.__getitem__.return_value = MockCanInterfaceConfig()
+    mock_can = create_mock_can_interface()
+    mock_can.recv.side_effect = OSError("device unplugged")
+    config = create_config()
+    config.can.drain_receive = True
+    transport = tr.create_transport("can", config=config, transport_layer_interface=mock_can)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+    transport.start_listener()
+    try:
+        time.sleep(0.3)
+        # 50, 100, 200 ms apart; without back-off the failing recv() is called in a tight loop.
+        assert mock_can.recv.call_count <= 4
+        assert transport.listener.is_alive()
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+    assert not transport.listener.is_alive()
+
+
+@pytest.mark.parametrize("drain_receive", [False, True])
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_pid_off_odt_out_of_band(mock_can_interface_map, mock_detect_configs, drain_receive):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.__getitem__.return_value = MockCanInterfaceConfig()
+    mock_can = create_mock_can_interface()
+    queued = [
+        Message(is_extended_id=False, arbitration_id=0x301, data=b"\x10\x20", channel="can0"),
+        Message(is_extended_id=False, arbitration_id=2, data=b"\x00\x01", channel="can0"),
+    ]
+    payloads = [msg.data for msg in queued]
+    mock_can.recv.side_effect = lambda timeout=None: queued.pop(0) if queued else None
+    config = create_config()
+    config.can.daq_identifier = [0x300, 0x301]
+    config.can.drain_receive = drain_receive
+    policy = RecordingPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy, transport_layer_interface=mock_can)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+    transport.start_listener()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [b"\x01\x10\x20", b"\x00\x01"]
+        # The ODT number is passed separately, the received messages are left alone.
+        assert payloads == [b"\x10\x20", b"\x00\x01"]
+        assert transport._last_pdus.entries(2)[0][4:] == (3, b"\x01\x10\x20")
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+
+
+def test_can_bus_multiplexer():
+    ecus = can.Bus(interface="virtual", channel="pyxcp_mux_test")
+    bus = can.Bus(interface="virtual", channel="pyxcp_mux_test")
+    bus.set_filters([{"can_id": 0x123, "can_mask": 0x7FF, "extended": False}])
+    mux = CanBusMultiplexer(bus)
+    transports = []
+    for master_id, slave_id, daq_ids in ((1, 2, [0x300, 0x301]), (3, 4, [])):
+        config = create_config()
+        config.can.can_id_master = master_id
+        config.can.can_id_slave = slave_id
+        config.can.daq_identifier = daq_ids
+        config.can.use_default_listener = True
+        transport = tr.create_transport("can", config=config, policy=RecordingPolicy(), transport_layer_interface=mux)
+        transport.parent = mock.MagicMock()
+        assert isinstance(transport.can_interface, MultiplexedCan)
+        transport.connect()
+        assert not transport.listener.is_alive()  # The multiplexer receives.
+        transports.append(transport)
+    first, second = transports
+    try:
+        assert {fltr["can_id"] for fltr in bus.filters} == {2, 0x300, 0x301, 4}
+        with pytest.raises(ValueError):
+            mux.attach(mock.MagicMock(can_id_slave=Identifier(4), can_id_pid_map={}), [])
+
+        for arbitration_id, data in ((2, b"\x00\x01"), (4, b"\x00\x02"), (0x301, b"\x10"), (4, b"\x00\x03"), (0x7FF, b"\x00")):
+            ecus.send(Message(arbitration_id=arbitration_id, is_extended_id=False, data=data))
+        deadline = time.monotonic() + 2.0
+        while (len(first.policy.frames) < 2 or len(second.policy.frames) < 2) and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in first.policy.frames] == [b"\x00\x01", b"\x01\x10"]  # PID_OFF: DAQ-ID -> ODT number
+        assert [f[3] for f in second.policy.frames] == [b"\x00\x02", b"\x00\x03"]
+
+        first.send(b"\xff\x00")
+        second.send(b"\xff\x00")
+        assert [ecus.recv(1.0).arbitration_id for _ in range(2)] == [1, 3]
+    finally:
+        first.close()
+        assert {fltr["can_id"] for fltr in bus.filters} == {4}
+        assert mux._receiver.is_alive()
+        second.close()
+    assert mux._receiver is None
+    assert bus.filters == [{"can_id": 0x123, "can_mask": 0x7FF, "extended": False}]  # Restored.
+    bus.shutdown()
+    ecus.shutdown()
+
+
+@pytest.mark.parametrize("multiplexed", [False, True])
+def test_can_python_can_block_send(multiplexed):
+    ecus = can.Bus(interface="virtual", channel="pyxcp_block_send_test")
+    bus = can.Bus(interface="virtual", channel="pyxcp_block_send_test")
+    config = create_config()
+    config.can.can_id_master = 0x100
+    config.can.can_id_slave = 0x101
+    config.can.max_dlc_required = True
+    transport = tr.create_transport("can", config=config, transport_layer_interface=CanBusMultiplexer(bus) if multiplexed else bus)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+    try:
+        assert transport.has_native_block_send()
+        requests = [(types.Command.DOWNLOAD_NEXT, (20 - idx, idx)) for idx in range(20)]
+        pacer = tr_ext.Pacer(100_000)
+        start = time.perf_counter()
+        assert transport.block_request_many(requests, pacer) == 20 * 3
+        assert time.perf_counter() - start >= 19 * 100e-6  # First slot is immediate.
+        assert pacer.slots == 20
+        frames = [ecus.recv(1.0) for _ in range(20)]
+        assert {msg.arbitration_id for msg in frames} == {0x100}
+        assert [bytes(msg.data) for msg in frames] == [bytes([0xEF, 20 - idx, idx, 0, 0, 0, 0, 0]) for idx in range(20)]
+    finally:
+        transport.close()
+        bus.shutdown()
+        ecus.shutdown()
+
+
 @mock.patch("pyxcp.transport.eth.socket.socket")
 @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
 def test_request_optional_response(mock_selector, mock_socket):
@@ -400,6 +851,117 @@ def test_block_receive(mock_selector, mock_socket):
     transport.close()
 
 
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_block_receive_into(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    transport = tr.create_transport("eth", config=config)
+
+    buffer = bytearray(b"\x00" * 7)
+    view = memoryview(buffer)
+
+    def respond():
+        for frame in (b"\xff\x01\x02", b"\xff\x03\x04\x05", b"\xff\x06\xaa\xaa"):  # last one padded
+            time.sleep(0.01)
+            with transport.resQueue_condition:
+                transport.resQueue.append(frame)
+                transport.resQueue_condition.notify()
+
+    responder = threading.Thread(target=respond)
+    responder.start()
+    transport.block_receive_into(view[1:])
+    responder.join()
+    assert buffer == b"\x00\x01\x02\x03\x04\x05\x06"
+    transport.close()
+
+
+def test_pacer():
+    pacer = tr_ext.Pacer(200_000)
+    start = time.perf_counter()
+    for _ in range(11):
+        pacer.wait()
+    elapsed = time.perf_counter() - start
+    assert pacer.slots == 11
+    assert elapsed >= 10 * 200e-6  # First slot is immediate.
+    pacer.reset()
+    start = time.perf_counter()
+    pacer.wait()
+    assert time.perf_counter() - start < 200e-6
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_block_request_many(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    transport.BLOCK_BURST_SIZE = 2
+
+    requests = [(types.Command.DOWNLOAD_NEXT, (6 - idx, idx)) for idx in range(5)]
+    sent = transport.block_request_many(requests, tr_ext.Pacer(0))
+    assert ms._mock_send.call_count == 5
+    assert sent == 5 * 7  # Header + DOWNLOAD_NEXT, remaining length, one data byte.
+    assert ms._mock_send.call_args_list[4].args[0][4:] == bytes([0xEF, 0x02, 0x04])
+
+    # Negative response while the block is in transit: raised before the next burst.
+    ms._mock_send.reset_mock()
+    original_send_block = transport.send_block
+
+    def send_block(frames, pacer):
+        original_send_block(frames, pacer)
+        transport.resQueue.append(b"\xfe\x29")  # ERR_SEQUENCE
+
+    transport.send_block = send_block
+    transport.policy = policy = RecordingPolicy()
+    with pytest.raises(types.XcpResponseError):
+        transport.block_request_many(requests)
+    assert ms._mock_send.call_count == 2
+    # Only the frames actually sent are recorded.
+    assert [frame[3][4:] for frame in policy.frames] == [frame[4:] for frame in (c.args[0] for c in ms._mock_send.call_args_list)]
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_block_request_many_fed_per_burst(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    transport.policy = policy = RecordingPolicy()
+    transport.BLOCK_BURST_SIZE = 2
+    send_times = []
+    original_send_block = transport.send_block
+
+    def send_block(frames, pacer):
+        send_times.append(transport.now())
+        original_send_block(frames, pacer)
+        time.sleep(0.002)
+
+    transport.send_block = send_block
+    requests = [(types.Command.DOWNLOAD_NEXT, (6 - idx, idx)) for idx in range(5)]
+    transport.block_request_many(requests, tr_ext.Pacer(0))
+    timestamps = [frame[2] for frame in policy.frames]
+    assert [frame[1] for frame in policy.frames] == sorted(frame[1] for frame in policy.frames)
+    # Each burst is fed right before it is sent, not the whole block up front.
+    for burst, sent_at in enumerate(send_times):
+        assert all(ts <= sent_at for ts in timestamps[burst * 2 : burst * 2 + 2])
+        if burst:
+            assert all(ts > send_times[burst - 1] for ts in timestamps[burst * 2 : burst * 2 + 2])
+    transport.close()
+
+
 @mock.patch("pyxcp.transport.eth.socket.socket")
 @mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
 def test_block_receive_timeout(mock_selector, mock_socket):
@@ -483,3 +1045,1049 @@ def test_eth_process_response_event(mock_selector, mock_socket):
 
     assert transport.timer_restart_event.is_set()
     transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_response_resolves_pending_slot(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+
+    def respond():
+        while not transport._response_slots:
+            pass
+        transport.process_response(b"\xff\x01\x02", 3, 0, 0)
+
+    responder = threading.Thread(target=respond)
+    responder.start()
+    assert transport.request(types.Command.GET_STATUS) == b"\x01\x02"
+    responder.join()
+    # Response went straight into the slot, not through the queue.
+    assert len(transport.resQueue) == 0
+    assert not transport._response_slots
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_daq_activity_extends_response_deadline(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.timeout = 0.2
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+
+    def busy_slave():
+        while not transport._response_slots:
+            pass
+        for _ in range(5):  # 0.5s of DAQ traffic -- longer than the timeout.
+            time.sleep(0.1)
+            transport.process_response(b"\x00\x11\x22", 3, 0, 0)
+        transport.process_response(b"\xff\x00", 2, 1, 0)
+
+    slave = threading.Thread(target=busy_slave)
+    slave.start()
+    assert transport.request(types.Command.GET_STATUS) == b"\x00"
+    slave.join()
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_adaptive_response_timeout(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.timeout = 2.0
+    config.adaptive_timeouts = True
+    config.adaptive_timeout_min = 0.05
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    cmd = types.Command.GET_STATUS
+    for _ in range(tr.AdaptiveTimeouts.MIN_SAMPLES):
+        transport.adaptive_timeouts.record(cmd, 1_000_000)
+    assert transport.response_timeout(cmd) == 50_000_000
+    assert transport.response_timeout(types.Command.CONNECT) == transport.timeout
+
+    # Dead link: fails after the adaptive timeout, not after `timeout`.
+    start = time.monotonic()
+    with pytest.raises(types.XcpTimeoutError, match="adaptive timeout"):
+        transport.request(cmd)
+    assert time.monotonic() - start < 1.0
+    assert transport.response_timeout(cmd) == 100_000_000
+
+    # EV_CMD_PENDING switches the outstanding request to the static timeout.
+    def pending_slave():
+        while not transport._response_slots:
+            pass
+        transport.process_response(b"\xfd\x05", 2, 0, 0)
+        time.sleep(0.3)
+        transport.process_response(b"\xff\x00", 2, 1, 0)
+
+    slave = threading.Thread(target=pending_slave)
+    slave.start()
+    assert transport.request(cmd) == b"\x00"
+    slave.join()
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_late_response_after_adaptive_timeout(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.adaptive_timeouts = True
+    config.adaptive_timeout_min = 0.05
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    cmd = types.Command.GET_STATUS
+    for _ in range(tr.AdaptiveTimeouts.MIN_SAMPLES):
+        transport.adaptive_timeouts.record(cmd, 1_000_000)
+
+    # Slow but working link: the reply comes after the adaptive timeout.
+    with pytest.raises(types.XcpTimeoutError):
+        transport.request(cmd)
+    transport.process_response(b"\xff\x01", 2, 0, 0)
+    assert list(transport.resQueue) == [b"\xff\x01"]
+
+    # The late reply is discarded, the next command gets its own.
+    def slave():
+        while not transport._response_slots:
+            pass
+        transport.process_response(b"\xff\x02", 2, 1, 0)
+
+    responder = threading.Thread(target=slave, daemon=True)
+    responder.start()
+    assert transport.request(cmd) == b"\x02"
+    responder.join()
+    assert not transport.resQueue
+
+    # Without a preceding timeout a parked response is still taken (e.g. a block-mode error).
+    transport.resQueue.append(b"\xff\x03")
+    assert transport.request(cmd) == b"\x03"
+    transport.close()
+
+
+def test_response_slot_times_out():
+    slot = tr.ResponseSlot(10_000_000)
+    start = time.monotonic()
+    assert slot.wait() is None
+    assert slot.response is None
+    assert time.monotonic() - start >= 0.01
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_request_pipelined(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.latency_histograms = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    max_in_flight = []
+
+    def slave():
+        responses = [b"\xff\x01", b"\xfe\x22", b"\xff\x03", b"\xff\x04"]
+        for response in responses:
+            while not transport._response_slots:
+                pass
+            max_in_flight.append(len(transport._response_slots))
+            transport.process_response(response, len(response), 0, 0)
+
+    responder = threading.Thread(target=slave)
+    requests = [(types.Command.SHORT_UPLOAD, 1, 0, 0, 0, 0, 0, i) for i in range(4)]
+    responder.start()
+    results = transport.request_pipelined(requests, queue_size=2)
+    responder.join()
+
+    assert results[0] == b"\x01"
+    assert isinstance(results[1], types.XcpResponseError)
+    assert results[1].get_error_code() == types.XcpError.ERR_OUT_OF_RANGE
+    assert results[2:] == [b"\x03", b"\x04"]
+    assert max(max_in_flight) <= 2
+    assert ms._mock_send.call_count == 4
+    latencies = transport.latencies.snapshot()["commands"]["SHORT_UPLOAD"]
+    assert [latencies[kind]["count"] for kind in ("queue", "response", "total")] == [4, 4, 4]
+    assert latencies["total"]["max"] >= latencies["response"]["max"]
+    assert transport.timing.min is not None  # Same bookkeeping as `request()`.
+    assert [f[3] for f in policy.frames if f[0] == FrameCategory.ERROR] == [b"\x22"]
+
+    # The same negative response to a sequential request.
+    transport.resQueue.append(b"\xfe\x22")
+    with pytest.raises(types.XcpResponseError) as excinfo:
+        transport.request(types.Command.SHORT_UPLOAD, 1, 0, 0, 0, 0, 0, 0)
+    assert excinfo.value.get_error_code() == results[1].get_error_code()
+    assert [f[3] for f in policy.frames if f[0] == FrameCategory.ERROR] == [b"\x22"] * 2
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_request_pipelined_timeout(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.timeout = 0.1
+    config.latency_histograms = True
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+
+    transport.resQueue.append(b"\xff\xaa")
+    requests = [(types.Command.GET_STATUS,)] * 4
+    results = transport.request_pipelined(requests, queue_size=2)
+
+    assert results[0] == b"\xaa"
+    assert all(isinstance(r, types.XcpTimeoutError) for r in results[1:])
+    assert len({id(r) for r in results[1:]}) == 3
+    assert all("aborted after an earlier timeout (GET_STATUS)" in str(r) for r in results[2:])
+    # Aborted after the first timeout: the fourth request was never sent, SYNCH was.
+    assert ms._mock_send.call_count == 4
+    assert transport.last_command_sent == types.Command.SYNCH
+    assert not transport._response_slots
+    assert transport.latencies.snapshot()["commands"]["GET_STATUS"]["timeouts"] == 1
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_request_pipelined_timeout_resynchronises(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.timeout = 0.1
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+
+    def slave():
+        deadline = time.monotonic() + 1.0
+        # Two pipelined requests and the SYNCH sent after the timeout.
+        while ms._mock_send.call_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        # Late responses to both abandoned requests, then ERR_CMD_SYNCH.
+        for response in (b"\xff\x01", b"\xff\x02", b"\xfe\x00"):
+            transport.process_response(response, len(response), 0, 0)
+        while (ms._mock_send.call_count < 4 or not transport._response_slots) and time.monotonic() < deadline:
+            time.sleep(0.001)
+        transport.process_response(b"\xff\x07", 2, 0, 0)
+
+    responder = threading.Thread(target=slave)
+    responder.start()
+    results = transport.request_pipelined([(types.Command.GET_STATUS,)] * 2, queue_size=2)
+    assert all(isinstance(r, types.XcpTimeoutError) for r in results)
+    assert transport.request(types.Command.GET_STATUS) == b"\x07"
+    responder.join()
+    assert not transport.resQueue
+    transport.close()
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_request_pipelined_synch(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    transport.resQueue.append(b"\xfe\x00")
+    assert transport.request_pipelined([(types.Command.SYNCH,)]) == [b"\x00"]
+    transport.close()
+
+
+def test_transport_clock():
+    ts = tr.Timestamp(tr.TimestampType.ABSOLUTE_TS)
+    # Realtime anchored: close to the wall clock, but derived from the monotonic clock.
+    assert abs(ts.value - time.time_ns()) < 1_000_000_000
+    assert ts.offset + ts.monotonic <= ts.value
+    values = [ts.value for _ in range(1000)]
+    assert values == sorted(values)
+
+    shared = tr.Timestamp(tr.TimestampType.ABSOLUTE_TS, ts.offset)
+    assert shared.offset == ts.offset
+    relative = tr.Timestamp(tr.TimestampType.RELATIVE_TS)
+    assert relative.value < 1_000_000_000
+
+    offset = tr.perf_counter_offset(ts)
+    before = ts.value
+    now = time.perf_counter_ns() + offset
+    after = ts.value
+    assert before - 100_000 <= now <= after + 100_000
+
+
+@mock.patch("pyxcp.transport.eth.socket.SO_TIMESTAMPING", 37, create=True)
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_eth_kernel_timestamps_on_transport_clock(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+    transport = tr.create_transport("eth", config=create_config())
+
+    def ancdata(software, hardware=0):
+        data = struct.pack("qqqqqq", software // 1_000_000_000, software % 1_000_000_000, 0, 0, 0, 0)
+        if hardware:
+            data = data[:32] + struct.pack("qq", hardware // 1_000_000_000, hardware % 1_000_000_000)
+        return [(socket.SOL_SOCKET, 37, data)]
+
+    now = transport.now()
+    realtime_delta = 5_000_000_000  # e.g. the wall clock was stepped by NTP
+    received = now - 1_000
+    assert transport._extract_linux_timestamp(ancdata(received + realtime_delta), realtime_delta) == received
+    # Hardware (PHC) timestamps stay in the NIC's time base.
+    assert transport._extract_linux_timestamp(ancdata(received + realtime_delta, 42_000_000_123), realtime_delta) == 42_000_000_123
+    assert transport._extract_linux_timestamp([], realtime_delta) is None
+    transport.close()
+
+
+class RecordingPolicy(FrameAcquisitionPolicy):
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    def feed(self, category, counter, timestamp, payload):
+        self.frames.append((category, counter, timestamp, payload))
+
+    def finalize(self):
+        pass
+
+
+class PythonFeedPolicy(tr_ext.NoOpPolicy):
+    """Native policy with `feed()` overridden in Python; its native `feed_batch()` would bypass the override."""
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    def feed(self, category, counter, timestamp, payload):
+        self.frames.append((category, counter, timestamp, payload))
+
+
+def test_batch_feeder_python_feed_override():
+    from pyxcp.transport.async_policy import AsyncPolicyAdapter
+
+    assert tr.batch_feeder(tr_ext.NoOpPolicy()) is not None
+    assert tr.batch_feeder(PythonFeedPolicy()) is None
+    assert tr.batch_feeder(RecordingPolicy()) is None
+    patched = tr_ext.NoOpPolicy()
+    patched.feed = lambda *args: None
+    assert tr.batch_feeder(patched) is None
+    assert tr.batch_feeder(AsyncPolicyAdapter(PythonFeedPolicy())) is not None
+
+    batch = tr.FrameBatch()
+    batch.append(tr.DAQ_CODE, 1, 100, b"\x00\x01\x02")
+    batch.append(tr.RESPONSE_CODE, 2, 200, b"\xff\x10")
+    expected = list(batch.frames())
+    delegate = PythonFeedPolicy()
+    AsyncPolicyAdapter(delegate).feed_batch(
+        batch.data, batch.offsets, batch.lengths, batch.counters, batch.timestamps, batch.categories
+    )
+    assert delegate.frames == expected
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("eth", config=create_config(), policy=policy)
+    transport._policy_batch = batch
+    transport._feed_policy_batch()
+    assert policy.frames == expected
+    transport.close()
+
+
+@pytest.mark.skipif(not hasattr(tr_ext, "SerialReader") or not hasattr(os, "openpty"), reason="Linux only")
+def test_sxi_listener_python_feed_policy():
+    import tty
+
+    controller, device = os.openpty()
+    tty.setraw(device)
+    port = serial.Serial(os.ttyname(device), timeout=0.1)
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("sxi", config=create_config(), policy=policy, transport_layer_interface=port)
+    try:
+        transport.start_listener()
+        os.write(controller, b"\x02\x00\x01\x02\x00\x02")
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [(f[0], f[3]) for f in policy.frames] == [(FrameCategory.DAQ, b"\x00\x01"), (FrameCategory.DAQ, b"\x00\x02")]
+    finally:
+        transport.close()
+        port.close()
+        os.close(controller)
+        os.close(device)
+
+
+def test_usb_process_transfer_python_feed_policy():
+    from types import SimpleNamespace
+
+    class UsbConfig(SimpleNamespace):
+        def get(self, name, default=None):
+            return getattr(self, name, default)
+
+    config = create_config()
+    config.usb = UsbConfig(
+        header_format="HEADER_LEN_CTR_WORD",
+        serial_number="",
+        vendor_id=0,
+        product_id=0,
+        configuration_number=1,
+        interface_number=0,
+        library="",
+        in_ep_number=1,
+        in_ep_transfer_type="BULK_TRANSFER",
+        in_ep_max_packet_size=512,
+        in_ep_polling_interval=0,
+        in_ep_message_packing="MESSAGE_PACKING_STREAMING",
+        in_ep_alignment="ALIGNMENT_8_BIT",
+        in_ep_recommended_host_bufsize=0,
+        out_ep_number=1,
+    )
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("usb", config=config, policy=policy)
+    transport.process_transfer(b"\x02\x00\x01\x00\x00\x01" + b"\x02\x00\x02\x00\x00\x02", 42)
+    assert [(f[0], f[1], f[3]) for f in policy.frames] == [(FrameCategory.DAQ, 1, b"\x00\x01"), (FrameCategory.DAQ, 2, b"\x00\x02")]
+
+
+@pytest.mark.parametrize("single_thread_receive", [False, True])
+def test_eth_listener_python_feed_policy(single_thread_receive):
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.single_thread_receive = single_thread_receive
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        master_address = transport.sock.getsockname()
+        for counter in range(5):
+            slave.sendto(struct.pack("<HH", 2, counter) + bytes([0x00, counter]), master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 5 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [bytes([0x00, counter]) for counter in range(5)]
+    finally:
+        transport.close()
+        slave.close()
+
+
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_drain_receive_python_feed_policy(mock_can_interface_map, mock_detect_configs):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.__getitem__.return_value = MockCanInterfaceConfig()
+    mock_can = create_mock_can_interface()
+    queued = [Message(is_extended_id=False, arbitration_id=2, data=bytes([0x00, counter]), channel="can0") for counter in range(5)]
+    mock_can.recv.side_effect = lambda timeout=None: queued.pop(0) if queued else None
+    config = create_config()
+    config.can.drain_receive = True
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy, transport_layer_interface=mock_can)
+    transport.parent = mock.MagicMock()
+    transport.can_interface.connect()
+    transport.start_listener()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 5 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [bytes([0x00, counter]) for counter in range(5)]
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+
+
+def test_frame_batch_feed_batch():
+    batch = tr.FrameBatch()
+    batch.append(tr.DAQ_CODE, 1, 100, b"\x00\x01\x02")
+    batch.append(tr.RESPONSE_CODE, 2, 200, b"\xff\x10")
+    policy = RecordingPolicy()
+    policy.feed_batch(batch.data, batch.offsets, batch.lengths, batch.counters, batch.timestamps, batch.categories)
+    assert policy.frames == list(batch.frames())
+    assert policy.frames == [(FrameCategory.DAQ, 1, 100, b"\x00\x01\x02"), (FrameCategory.RESPONSE, 2, 200, b"\xff\x10")]
+    with pytest.raises(ValueError):
+        policy.feed_batch(batch.data, batch.offsets, batch.lengths[:1], batch.counters, batch.timestamps, batch.categories)
+    batch.clear()
+    assert len(batch) == 0 and not batch.data
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_policy_batch_per_wakeup(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.create_daq_timestamps = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+
+    transport.begin_policy_batch()
+    transport.process_response(b"\x00\x11\x22", 3, 1, 1000)
+    transport.process_response(b"\x01\x33\x44", 3, 2, 2000)
+    assert policy.frames == []
+    # A response is fed right away, together with the frames collected before it.
+    transport.process_response(b"\xff\x55", 2, 3, 3000)
+    assert len(policy.frames) == 3
+    transport.flush_policy_batch()
+
+    assert [f[0] for f in policy.frames] == [FrameCategory.DAQ, FrameCategory.DAQ, FrameCategory.RESPONSE]
+    assert policy.frames[0][1:] == (1, 1000, b"\x00\x11\x22")
+    assert policy.frames[1][3] == b"\x01\x33\x44"
+    assert policy.frames[2][3] == b"\xff\x55"
+    assert transport.resQueue.popleft() == b"\xff\x55"
+
+    # Outside of a batch frames are fed immediately.
+    transport.process_response(b"\x00\x66", 2, 4, 4000)
+    assert len(policy.frames) == 4
+    transport.close()
+
+
+@pytest.mark.parametrize("decouple_policy", [False, True])
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_policy_records_response_before_next_command(mock_selector, mock_socket, decouple_policy):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    if decouple_policy:
+        transport.start_policy_worker()
+
+    def requests():
+        transport.request(types.Command.GET_STATUS)
+        transport.request(types.Command.SYNCH)
+
+    requester = threading.Thread(target=requests)
+    requester.start()
+    # One listener wake-up: DAQ, then the response, which unblocks the next command.
+    transport.begin_policy_batch()
+    while not transport._response_slots:
+        pass
+    transport.process_response(b"\x00\x11", 2, 1, 0)
+    transport.process_response(b"\xff\x01", 2, 2, 0)
+    while not transport._response_slots:
+        pass
+    transport.process_response(b"\xfe\x00", 2, 3, 0)
+    transport.flush_policy_batch()
+    requester.join()
+    transport.stop_policy_worker()
+
+    assert [(f[0], f[3][4:] if f[0] == FrameCategory.CMD else f[3]) for f in policy.frames] == [
+        (FrameCategory.CMD, b"\xfd"),
+        (FrameCategory.DAQ, b"\x00\x11"),
+        (FrameCategory.RESPONSE, b"\xff\x01"),
+        (FrameCategory.CMD, b"\xfc"),
+        (FrameCategory.RESPONSE, b"\xfe\x00"),
+    ]
+    transport.close()
+
+
+def test_pdu_ring_buffer():
+    ring = tr.PduRingBuffer(capacity=3, max_data=4)
+    assert len(ring) == 0 and ring.capacity == 3 and ring.max_data == 4
+    for idx in range(5):
+        ring.record(tr.PDU_IN, tr.DAQ_CODE, idx, idx * 10, 6, bytes([idx] * 6))
+    ring.record(tr.PDU_IN, tr.RESPONSE_CODE, 5, 50, 2, bytearray(b"\xff\x01"), 1)
+    assert len(ring) == 3
+    assert ring.entries() == [
+        (tr.PDU_IN, tr.DAQ_CODE, 3, 30, 6, b"\x03\x03\x03\x03"),
+        (tr.PDU_IN, tr.DAQ_CODE, 4, 40, 6, b"\x04\x04\x04\x04"),
+        (tr.PDU_IN, tr.RESPONSE_CODE, 5, 50, 2, b"\xff"),
+    ]
+    assert [e[2] for e in ring.entries(2)] == [4, 5]
+    ring.clear()
+    assert ring.entries() == []
+
+
+@mock.patch("pyxcp.transport.eth.socket.socket")
+@mock.patch("pyxcp.transport.eth.selectors.DefaultSelector")
+def test_last_pdus_diagnostics(mock_selector, mock_socket):
+    ms = MockSocket()
+    mock_socket.return_value = ms
+    mock_selector.return_value = ms
+
+    config = create_config()
+    config.create_daq_timestamps = True
+    transport = tr.create_transport("eth", config=config, policy=tr.NoOpPolicy())
+    transport.process_response(bytes(range(16)), 16, 1, 1000)
+    transport.process_response(b"\xff\x10\x20", 3, 2, 2000)
+
+    pdus = transport._last_pdu_entries(10)
+    assert pdus == [
+        {"dir": "in", "cat": "DAQ", "ctr": 1, "ts": 1000, "len": 16, "data": tr.hexDump(bytes(range(8)))},
+        {"dir": "in", "cat": "RESPONSE", "ctr": 2, "ts": 2000, "len": 3, "data": tr.hexDump(b"\xff\x10\x20")},
+    ]
+    assert tr.hexDump(b"\xff\x10\x20") in transport._build_diagnostics_dump()
+    transport.close()
+
+
+def test_eth_native_receiver():
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.native_receiver = True
+    config.create_daq_timestamps = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        assert transport._native_receiver is not None
+        assert not transport.listener.is_alive()
+        master_address = transport.sock.getsockname()
+        # Two DAQ packets in one datagram, then a response.
+        slave.sendto(b"\x03\x00\x01\x00\x00\x11\x22" + b"\x02\x00\x02\x00\x01\x33", master_address)
+        slave.sendto(b"\x02\x00\x03\x00\xff\x55", master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert transport._native_receiver.daq_frames == 2
+        assert transport._native_receiver.dispatched_frames == 1
+        assert [f[0] for f in policy.frames] == [FrameCategory.DAQ, FrameCategory.DAQ, FrameCategory.RESPONSE]
+        assert policy.frames[0][3] == b"\x00\x11\x22"
+        assert policy.frames[1][3] == b"\x01\x33"
+        assert policy.frames[0][2] != 0
+        assert transport.resQueue.popleft() == b"\xff\x55"
+    finally:
+        transport.close()
+        slave.close()
+    assert transport._native_receiver is None
+
+
+def test_eth_native_receiver_holds_policy_lock():
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.native_receiver = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        assert isinstance(transport.policy_lock, tr_ext.PolicyLock)
+        master_address = transport.sock.getsockname()
+        with transport.policy_lock:
+            slave.sendto(b"\x02\x00\x01\x00\x00\x11", master_address)
+            time.sleep(0.1)
+            assert policy.frames == []  # The native thread waits for the lock.
+        deadline = time.monotonic() + 2.0
+        while not policy.frames and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [b"\x00\x11"]
+    finally:
+        transport.close()
+        slave.close()
+
+
+def test_eth_native_receiver_python_feed_policy():
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.native_receiver = True
+    policy = PythonFeedPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        # The native `feed_batch()` would bypass `feed()`: Python receiver.
+        assert transport._native_receiver is None
+        slave.sendto(b"\x02\x00\x01\x00\x00\x11", transport.sock.getsockname())
+        deadline = time.monotonic() + 2.0
+        while not policy.frames and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [b"\x00\x11"]
+    finally:
+        transport.close()
+        slave.close()
+
+
+@pytest.mark.skipif(not hasattr(tr_ext, "UdpBatchReader"), reason="recvmmsg() receive is Linux only")
+def test_eth_batched_receive():
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.recv_batch_size = 64
+    config.create_daq_timestamps = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        master_address = transport.sock.getsockname()
+        sent = transport.now()
+        for counter in range(20):
+            slave.sendto(struct.pack("<HH", 2, counter) + bytes([0x00, counter]), master_address)
+        slave.sendto(struct.pack("<HH", 2, 20) + b"\xff\x55", master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 21 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        reader = transport._batch_reader
+        assert reader is not None
+        assert reader.datagrams == 21 and reader.syscalls <= 21
+        assert [f[1] for f in policy.frames] == list(range(21))
+        assert [f[3] for f in policy.frames[:20]] == [bytes([0x00, counter]) for counter in range(20)]
+        # Kernel receive timestamps, mapped onto the transport clock.
+        assert all(sent - 1_000_000 <= f[2] <= transport.now() for f in policy.frames)
+        assert transport.resQueue.popleft() == b"\xff\x55"
+    finally:
+        transport.close()
+        slave.close()
+
+
+@pytest.mark.parametrize("recv_batch_size", [1, 64])
+@pytest.mark.parametrize("decouple_policy", [False, True])
+def test_eth_single_thread_receive(recv_batch_size, decouple_policy):
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.recv_batch_size = recv_batch_size
+    config.eth.single_thread_receive = True
+    config.eth.decouple_policy = decouple_policy
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        assert not transport._packet_listener.is_alive()
+        assert (transport._policy_worker is not None) == decouple_policy
+        master_address = transport.sock.getsockname()
+        for counter in range(20):
+            slave.sendto(struct.pack("<HH", 2, counter) + bytes([0x00, counter]), master_address)
+        slave.sendto(struct.pack("<HH", 2, 20) + b"\xff\x55", master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 21 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[1] for f in policy.frames] == list(range(21))
+        assert [f[3] for f in policy.frames[:20]] == [bytes([0x00, counter]) for counter in range(20)]
+        assert transport.resQueue.popleft() == b"\xff\x55"
+    finally:
+        transport.close()
+        slave.close()
+    assert transport._policy_worker is None
+
+
+@pytest.mark.skipif(not hasattr(tr_ext, "EthBlockSender"), reason="sendmmsg() transmit is Linux only")
+@pytest.mark.parametrize("protocol", ["TCP", "UDP"])
+@pytest.mark.parametrize("min_st", [0, 20_000])
+def test_eth_batched_block_send(protocol, min_st):
+    tcp = protocol == "TCP"
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM if tcp else socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    if tcp:
+        server.listen(1)
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = server.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.protocol = protocol
+    config.eth.batched_block_send = True
+    transport = tr.create_transport("eth", config=config)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    slave = server.accept()[0] if tcp else server
+    slave.settimeout(2.0)
+    try:
+        sender = transport._block_sender
+        assert sender is not None and sender.stream == tcp
+        assert transport.has_native_block_send()
+        requests = [(types.Command.DOWNLOAD_NEXT, (200 - idx, idx & 0xFF)) for idx in range(200)]
+        pacer = tr_ext.Pacer(min_st)
+        assert transport.block_request_many(requests, pacer) == 200 * 7
+        assert sender.frames == 200
+        if min_st:
+            assert pacer.slots == 200
+        else:
+            assert sender.syscalls < 200
+        if tcp:
+            received = b""
+            while len(received) < 200 * 7:
+                received += slave.recv(65536)
+            frames = [received[offset : offset + 7] for offset in range(0, len(received), 7)]
+        else:
+            frames = [slave.recv(65536) for _ in range(200)]
+        assert [struct.unpack("<HH", frame[:4]) for frame in frames] == [(3, counter) for counter in range(200)]
+        assert [frame[4:] for frame in frames] == [bytes([0xEF, 200 - idx, idx]) for idx in range(200)]
+    finally:
+        transport.close()
+        if tcp:
+            slave.close()
+        server.close()
+
+
+def test_receive_buffer_pool():
+    pool = ReceiveBufferPool(512)
+    buffer = pool.acquire()
+    assert len(buffer) == 512
+    pool.release(buffer)
+    assert pool.acquire() is buffer
+    pool.release(buffer)
+    pool.resize(2048)
+    assert len(pool.acquire()) == 2048
+    pool.release(buffer)  # previous size: dropped
+    pool.release(b"\x00" * 2048)  # not a pool buffer
+    assert len(pool._buffers) == 0
+
+
+@pytest.mark.parametrize("recv_batch_size", [1, 64])
+def test_eth_datagram_size_from_max_dto(recv_batch_size):
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.recv_batch_size = recv_batch_size
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        assert transport.datagram_size == RECV_SIZE
+        transport.set_max_packet_sizes(max_cto=255, max_dto=4000)
+        assert transport.datagram_size == RECV_SIZE  # Never below, several packets may share a datagram.
+        transport.set_max_packet_sizes(max_cto=255, max_dto=9000)
+        assert transport.datagram_size == 9004
+        master_address = transport.sock.getsockname()
+        payload = bytes([0x00]) + bytes(range(256)) * 35 + bytes(39)
+        for counter in range(3):
+            slave.sendto(struct.pack("<HH", len(payload), counter) + payload, master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 3 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[1] for f in policy.frames] == [0, 1, 2]
+        assert all(f[3] == payload for f in policy.frames)
+        if recv_batch_size > 1 and transport._batch_reader is not None:
+            assert transport._batch_reader.datagram_size == 9004
+        assert transport.truncated_datagrams == 0
+    finally:
+        transport.close()
+        slave.close()
+
+
+@pytest.mark.parametrize("receiver", ["recv", "recvmmsg", "native"])
+def test_eth_packed_datagrams(receiver):
+    slave = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    slave.bind(("127.0.0.1", 0))
+    config = create_config()
+    config.eth.host = "127.0.0.1"
+    config.eth.port = slave.getsockname()[1]
+    config.eth.bind_to_address = None
+    config.eth.recv_batch_size = 64 if receiver == "recvmmsg" else 1
+    config.eth.native_receiver = receiver == "native"
+    policy = RecordingPolicy()
+    transport = tr.create_transport("eth", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    transport.connect()
+    try:
+        transport.set_max_packet_sizes(max_cto=255, max_dto=40)
+        master_address = transport.sock.getsockname()
+        # 100 DTOs packed into one 4400 byte datagram.
+        dtos = [bytes([idx]) + bytes(39) for idx in range(100)]
+        slave.sendto(b"".join(struct.pack("<HH", 40, idx) + dto for idx, dto in enumerate(dtos)), master_address)
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 100 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == dtos
+        # Longer than the receive buffer: truncated, counted, the packets that fit are kept.
+        slave.sendto(b"".join(struct.pack("<HH", 96, idx) + bytes(96) for idx in range(100)), master_address)
+        deadline = time.monotonic() + 2.0
+        while transport.truncated_datagrams < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        time.sleep(0.05)
+        assert transport.truncated_datagrams == 1
+        assert len(policy.frames) == 100 + RECV_SIZE // 100
+    finally:
+        transport.close()
+        slave.close()
+
+
+def test_eth_datagram_size_configured():
+    config = create_config()
+    config.eth.max_datagram_size = 9000
+    transport = tr.create_transport("eth", config=config)
+    try:
+        assert transport.datagram_size == 9000
+        transport.set_max_packet_sizes(max_cto=255, max_dto=1024)
+        assert transport.datagram_size == 9000
+    finally:
+        transport.close()
+
+
+def test_socketcan_filters():
+    filters = [
+        Identifier(0x7E1).create_filter_from_id(),
+        Identifier(0x80001234).create_filter_from_id(),
+        {"can_id": 0x100, "can_mask": 0x700},
+    ]
+    assert socketcan_filters(filters) == [
+        (0x7E1, 0x800007FF),
+        (0x80001234, 0x9FFFFFFF),
+        (0x100, 0x700),
+    ]
+
+
+class FakeSocketCanReader:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.sent = []
+        self.filters = []
+        self.pid_map = {}
+
+    def __call__(self, **kwargs):
+        return self
+
+    def set_filters(self, filters):
+        self.filters = filters
+
+    def set_pid_map(self, pid_map):
+        self.pid_map = pid_map
+
+    def receive(self, timeout_ms):
+        if self.batches:
+            return [
+                (raw_id, data if raw_id not in self.pid_map else bytes([self.pid_map[raw_id]]) + data, timestamp)
+                for raw_id, data, timestamp in self.batches.pop(0)
+            ]
+        time.sleep(timeout_ms / 1000.0)
+        return []
+
+    def send(self, identifier, data, fd=False, bitrate_switch=False):
+        self.sent.append((identifier, data, fd))
+
+    def close(self):
+        pass
+
+
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_native_socketcan(mock_can_interface_map, mock_detect_configs):
+    if not hasattr(tr_ext, "SocketCanReader"):
+        pytest.skip("native SocketCAN backend requires Linux")
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.get.return_value = MockCanInterfaceConfig()
+    mock_can_interface_map.__contains__.return_value = True
+    config = create_config()
+    config.can.interface = "socketcan"
+    config.can.socketcan = MockCanInterfaceConfig()
+    config.can.native_socketcan = True
+    config.can.daq_identifier = [0x300, 0x80000301]
+    config.create_daq_timestamps = True
+    policy = RecordingPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    assert isinstance(transport.can_interface, NativeSocketCan)
+
+    reader = FakeSocketCanReader(
+        [
+            [(0x300, b"\x10\x20", 1_000), (0x80000301, b"\x30", 2_000), (0x300, b"\x11\x21", 3_000)],
+            [(0x2, b"\xff\x00", 4_000)],
+        ]
+    )
+    with mock.patch.object(tr_ext, "SocketCanReader", reader, create=True):
+        transport.can_interface.connect()
+    assert reader.pid_map == {0x300: 0, 0x80000301: 1}
+    assert reader.filters == [(2, 0x800007FF), (0x300, 0x800007FF), (0x80000301, 0x9FFFFFFF)]
+    # DAQ identifiers added later are translated as well.
+    transport.can_id_pid_map[0x302] = bytes([2])
+    transport.can_interface.update_daq_filters(transport.daq_identifier + [Identifier(0x302)])
+    assert reader.pid_map == {0x300: 0, 0x80000301: 1, 0x302: 2}
+    assert reader.filters[-1] == (0x302, 0x800007FF)
+    transport.start_listener()
+    try:
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 4 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        # PID_OFF: CAN-ID translated to the ODT number.
+        assert [(f[2], f[3]) for f in policy.frames[:3]] == [
+            (1_000, b"\x00\x10\x20"),
+            (2_000, b"\x01\x30"),
+            (3_000, b"\x00\x11\x21"),
+        ]
+        assert policy.frames[3][3] == b"\xff\x00"
+        assert transport.resQueue.popleft() == b"\xff\x00"
+        transport.send(b"\xff\x00")
+        assert reader.sent == [(1, b"\xff\x00", False)]
+    finally:
+        transport.finish_listener()
+        transport.listener.join(timeout=1.0)
+
+
+@pytest.mark.skipif(not os.path.exists("/sys/class/net/vcan0"), reason="requires a SocketCAN interface 'vcan0'")
+@mock.patch("pyxcp.transport.can.detect_available_configs")
+@mock.patch("pyxcp.transport.can.CAN_INTERFACE_MAP")
+def test_can_native_socketcan_vcan0(mock_can_interface_map, mock_detect_configs):
+    mock_detect_configs.return_value = []
+    mock_can_interface_map.get.return_value = MockCanInterfaceConfig()
+    mock_can_interface_map.__contains__.return_value = True
+    config = create_config()
+    config.can.interface = "socketcan"
+    config.can.socketcan = MockCanInterfaceConfig()
+    config.can.native_socketcan = True
+    config.can.use_default_listener = True
+    config.can.daq_identifier = [0x300]
+    policy = RecordingPolicy()
+    transport = tr.create_transport("can", config=config, policy=policy)
+    transport.parent = mock.MagicMock()
+    slave = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+    slave.bind(("vcan0",))
+    slave.settimeout(1.0)
+    can_frame = struct.Struct("=IB3x8s")
+    transport.connect()
+    try:
+        assert isinstance(transport.can_interface, NativeSocketCan)
+        transport.send(b"\xff\x00")
+        can_id, length, data = can_frame.unpack(slave.recv(can_frame.size))
+        assert (can_id, data[:length]) == (1, b"\xff\x00")
+        slave.send(can_frame.pack(0x7FF, 2, b"\xff\x01"))  # filtered out by the kernel
+        for counter in range(10):
+            slave.send(can_frame.pack(2, 2, bytes([0x00, counter])))
+        slave.send(can_frame.pack(0x300, 2, b"\x10\x20"))  # PID_OFF
+        deadline = time.monotonic() + 2.0
+        while len(policy.frames) < 11 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert [f[3] for f in policy.frames] == [bytes([0x00, counter]) for counter in range(10)] + [b"\x00\x10\x20"]
+        assert transport.can_interface.reader.frames_received == 11
+    finally:
+        transport.close()
+        slave.close()
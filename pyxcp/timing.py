@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import json
 import time
 
 
@@ -28,7 +29,10 @@ class Timing:
 
     def stop(self):
         self._stop = time.perf_counter()
-        elapsed = self._stop - self._start
+        self.record(self._stop - self._start)
+
+    def record(self, elapsed: float):
+        """Add a measurement taken elsewhere, e.g. of overlapping (pipelined) requests; `elapsed` in seconds."""
         if self._record:
             self._values.append(elapsed)
         if self._previous:
@@ -58,3 +62,249 @@ class Timing:
     @property
     def values(self):
         return self._values
+
+
+class LatencyHistogram:
+    """HDR-style (log-linear) histogram of latency samples in nanoseconds.
+
+    Values are bucketed with a constant relative precision: each power-of-two
+    range is split into ``2 ** (significant_bits - 1)`` linear sub-buckets, so the
+    reported percentiles are within ``2 ** -(significant_bits - 1)`` of the
+    recorded values, independent of their magnitude. Recording a sample is a
+    handful of integer operations on a preallocated list.
+
+    Parameters
+    ----------
+    significant_bits: int
+        Binary precision of the buckets (default 7, i.e. better than 1.6%).
+    max_value: int
+        Largest trackable value; bigger samples are counted in the topmost bucket.
+    """
+
+    __slots__ = ("_sub_bits", "_half_bits", "_counts", "count", "total", "min", "max")
+
+    PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+    def __init__(self, significant_bits: int = 7, max_value: int = 3600 * 1_000_000_000):
+        self._sub_bits = max(2, significant_bits)
+        self._half_bits = self._sub_bits - 1
+        self._counts = [0] * (self._index_of(max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index_of(self, value: int) -> int:
+        shift = value.bit_length() - self._sub_bits
+        if shift <= 0:
+            return value
+        return (shift << self._half_bits) + (value >> shift)
+
+    def _bucket_range(self, index: int):
+        """Lowest and highest value counted in bucket `index`."""
+        if index < (1 << self._sub_bits):
+            return index, index
+        shift = (index >> self._half_bits) - 1
+        low = (index - (shift << self._half_bits)) << shift
+        return low, low + (1 << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        shift = value.bit_length() - self._sub_bits
+        index = value if shift <= 0 else (shift << self._half_bits) + (value >> shift)
+        counts = self._counts
+        if index >= len(counts):
+            index = len(counts) - 1
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Highest value equivalent to the sample at `percentile` (0..100)."""
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            if count:
+                seen += count
+                if seen >= rank:
+                    return min(self._bucket_range(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def snapshot(self) -> dict:
+        """Summary statistics as a JSON-serializable dict (all values in nanoseconds)."""
+        result = {
+            "count": self.count,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "mean": round(self.mean, 1),
+        }
+        for percentile in self.PERCENTILES:
+            result[f"p{percentile:g}"] = self.value_at_percentile(percentile)
+        return result
+
+
+class CommandLatencies:
+    """Per-command latency histograms of a transport.
+
+    Every kind of measurement gets its own :class:`LatencyHistogram` per command
+    (usually a :class:`pyxcp.types.Command`):
+
+    - ``queue``: request entry until the frame is handed to the transport
+      (waiting for the command lock, framing, policy) -- host side.
+    - ``response``: frame sent until the response is received by the listener
+      -- slave processing plus wire time.
+    - ``total``: request entry until the caller got the response, including
+      the wake-up of the requesting thread.
+    - ``block``: additional time spent collecting block-mode response frames.
+    """
+
+    KINDS = ("queue", "response", "total", "block")
+
+    def __init__(self, name: str = "") -> None:
+        self.name = name
+        self._histograms = {}
+        self._timeouts = {}
+
+    def histogram(self, command, kind: str) -> LatencyHistogram:
+        try:
+            return self._histograms[command][kind]
+        except KeyError:
+            if kind not in self.KINDS:
+                raise ValueError(f"Unknown latency kind {kind!r}, expected one of {self.KINDS}") from None
+            histogram = LatencyHistogram()
+            self._histograms.setdefault(command, {})[kind] = histogram
+            return histogram
+
+    def record(self, command, queue: int, response: int, total: int) -> None:
+        """Record one completed request (durations in nanoseconds)."""
+        histograms = self._histograms.get(command)
+        if histograms is None or "total" not in histograms:
+            histograms = {kind: self.histogram(command, kind) for kind in ("queue", "response", "total")}
+        histograms["queue"].record(queue)
+        histograms["response"].record(response)
+        histograms["total"].record(total)
+
+    def record_block(self, command, duration: int) -> None:
+        self.histogram(command, "block").record(duration)
+
+    def record_timeout(self, command) -> None:
+        self._timeouts[command] = self._timeouts.get(command, 0) + 1
+
+    @property
+    def commands(self):
+        return list(dict.fromkeys([*self._histograms, *self._timeouts]))
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._timeouts.clear()
+
+    def snapshot(self) -> dict:
+        """All histograms as a JSON-serializable dict, keyed by command name."""
+        commands = {}
+        for command in self.commands:
+            name = getattr(command, "name", str(command))
+            entry = {kind: histogram.snapshot() for kind, histogram in self._histograms.get(command, {}).items()}
+            entry["timeouts"] = self._timeouts.get(command, 0)
+            commands[name] = entry
+        return {"transport": self.name, "unit": "ns", "commands": commands}
+
+    def to_json(self, **kws) -> str:
+        return json.dumps(self.snapshot(), **kws)
+
+
+class AdaptiveTimeouts:
+    """Per-command response timeouts derived from the observed round-trip times.
+
+    Once a command has completed ``MIN_SAMPLES`` times, its timeout is ``factor``
+    times the ``percentile`` of its send->response times, clamped to
+    ``[floor, ceiling]``; before that the ceiling (the static transport timeout)
+    applies. The quantile is re-evaluated every ``UPDATE_INTERVAL`` samples.
+
+    Every consecutive timeout of a command doubles its timeout (up to the ceiling),
+    so the error handler's repetitions back off towards the static value;
+    the next response resets it.
+
+    Parameters
+    ----------
+    floor: int
+        Lower bound in nanoseconds.
+    ceiling: int
+        Upper bound in nanoseconds.
+    percentile: float
+        Round-trip time percentile (0..100) the timeout is based on.
+    factor: float
+        Safety margin applied to the percentile.
+    """
+
+    MIN_SAMPLES = 20
+    UPDATE_INTERVAL = 16
+
+    def __init__(self, floor: int, ceiling: int, percentile: float = 99.9, factor: float = 3.0) -> None:
+        self.floor = floor
+        self.ceiling = max(floor, ceiling)
+        self.percentile = percentile
+        self.factor = factor
+        self._histograms = {}
+        self._timeouts = {}
+        self._misses = {}
+
+    def record(self, command, rtt: int) -> None:
+        """Record the send->response time (ns) of a completed request."""
+        histogram = self._histograms.get(command)
+        if histogram is None:
+            histogram = self._histograms[command] = LatencyHistogram()
+        histogram.record(rtt)
+        if self._misses:
+            self._misses.pop(command, None)
+        count = histogram.count
+        if count == self.MIN_SAMPLES or (count > self.MIN_SAMPLES and count % self.UPDATE_INTERVAL == 0):
+            timeout = int(self.factor * histogram.value_at_percentile(self.percentile))
+            self._timeouts[command] = min(self.ceiling, max(self.floor, timeout))
+
+    def record_timeout(self, command) -> None:
+        self._misses[command] = self._misses.get(command, 0) + 1
+
+    def timeout(self, command) -> int:
+        """Current response timeout of `command` in nanoseconds."""
+        timeout = self._timeouts.get(command)
+        if timeout is None:
+            return self.ceiling
+        misses = self._misses.get(command)
+        if misses:
+            timeout <<= min(misses, 32)
+        return min(timeout, self.ceiling)
+
+    def reset(self) -> None:
+        self._histograms.clear()
+        self._timeouts.clear()
+        self._misses.clear()
+
+    def snapshot(self) -> dict:
+        """Current timeouts as a JSON-serializable dict, keyed by command name (values in nanoseconds)."""
+        commands = {}
+        for command in dict.fromkeys([*self._histograms, *self._misses]):
+            histogram = self._histograms.get(command)
+            commands[getattr(command, "name", str(command))] = {
+                "samples": histogram.count if histogram is not None else 0,
+                "timeout": self.timeout(command),
+                "consecutive_timeouts": self._misses.get(command, 0),
+            }
+        return {"floor": self.floor, "ceiling": self.ceiling, "unit": "ns", "commands": commands}
@@ -1,4 +1,6 @@
 #!/usr/bin/env python
+import importlib
+
 from .transport_ext import (
     FrameAcquisitionPolicy,  # noqa: F401
     FrameCategory,  # noqa: F401
@@ -9,7 +11,19 @@ from .transport_ext import (
 )
 from .async_policy import AsyncPolicyAdapter, AsyncFrameSubscription, FrameNotification, SubscriptionClosedError  # noqa: F401
 
-from .can import Can  # noqa: F401
-from .eth import Eth  # noqa: F401
-from .sxi import SxI  # noqa: F401
-from .usb_transport import Usb  # noqa: F401
+# Transport classes are imported on first access (`create_transport()` imports only the one it needs).
+_TRANSPORT_CLASSES = {
+    "Can": ".can",
+    "Eth": ".eth",
+    "SxI": ".sxi",
+    "Usb": ".usb_transport",
+}
+
+
+def __getattr__(name: str):
+    module = _TRANSPORT_CLASSES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    transport_class = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = transport_class
+    return transport_class
@@ -5,6 +5,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any, Iterable, Optional
 
+from .base import batch_feeder
 from .transport_ext import FrameCategory
 
 
@@ -105,6 +106,10 @@ class AsyncPolicyAdapter:
     mirrored into ``asyncio`` queues through :class:`AsyncFrameSubscription`.
     """
 
+    # Frames have to pass `feed()`/`feed_batch()` to reach the subscriptions,
+    # so don't let native receivers bypass the adapter via `__getattr__`.
+    _frame_batch_sink = None
+
     def __init__(self, delegate: Any = None) -> None:
         self.delegate = delegate
         self.logger = logging.getLogger("pyxcp.async_policy")
@@ -167,6 +172,29 @@ class AsyncPolicyAdapter:
         for subscription in tuple(self._subscriptions):
             subscription.publish(notification)
 
+    def feed_batch(self, data, offsets, lengths, counters, timestamps, categories) -> None:
+        delegate_feed_batch = batch_feeder(self.delegate) if self.delegate is not None else None
+        if delegate_feed_batch is not None:
+            delegate_feed_batch(data, offsets, lengths, counters, timestamps, categories)
+        elif self.delegate is not None:
+            for offset, length, counter, timestamp, category in zip(
+                offsets, lengths, counters, timestamps, categories, strict=True
+            ):
+                self.delegate.feed(FrameCategory(category), counter, timestamp, bytes(data[offset : offset + length]))
+
+        subscriptions = tuple(self._subscriptions)
+        if not subscriptions:
+            return
+        for offset, length, counter, timestamp, category in zip(offsets, lengths, counters, timestamps, categories, strict=True):
+            notification = FrameNotification(
+                category=FrameCategory(category),
+                counter=int(counter),
+                timestamp=int(timestamp),
+                payload=bytes(data[offset : offset + length]),
+            )
+            for subscription in subscriptions:
+                subscription.publish(notification)
+
     def finalize(self) -> None:
         if self._finalized:
             return
@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 import abc
+import functools
+import importlib
 import logging
+from array import array
 import threading
+import time
 from collections import deque
-from typing import Any, Dict, Optional, Type
-from pyxcp.timing import Timing
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, Union
+from pyxcp.timing import AdaptiveTimeouts, CommandLatencies, Timing
 import pyxcp.types as types
 
 from pyxcp.cpp_ext.cpp_ext import Timestamp, TimestampType
@@ -13,6 +17,8 @@ from pyxcp.transport.transport_ext import (
     FrameAcquisitionPolicy,
     LegacyFrameAcquisitionPolicy,
     NoOpPolicy,
+    Pacer,
+    PduRingBuffer,
     XcpFraming,
     XcpFramingConfig,
     XcpTransportLayerType,  # noqa: F401
@@ -29,6 +35,170 @@ class EmptyFrameError(Exception):
     """Raised when an empty frame is received."""
 
 
+class ResponseSlot:
+    """Single-shot completion for one outstanding request.
+
+    The listener thread resolves the slot directly from :meth:`BaseTransport.process_response`,
+    the requesting thread blocks in :meth:`wait` until the response arrives or the deadline expires.
+    The deadline may be pushed forward (DAQ activity, EV_CMD_PENDING) without waking the waiter;
+    it only re-checks the deadline when the previous one has passed.
+
+    Parameters
+    ----------
+    timeout_ns: int
+        Response timeout in nanoseconds, measured on the monotonic clock.
+    """
+
+    __slots__ = ("_done", "_timeout_ns", "deadline", "response", "received")
+
+    def __init__(self, timeout_ns: int) -> None:
+        # A bare lock is the cheapest cross-thread handoff CPython offers:
+        # held while pending, released exactly once by `resolve()`.
+        self._done = threading.Lock()
+        self._done.acquire()
+        self._timeout_ns = timeout_ns
+        self.deadline: int = time.monotonic_ns() + timeout_ns
+        self.response: Optional[bytes] = None
+        # Reception timestamp (transport clock), 0 if unknown.
+        self.received: int = 0
+
+    def resolve(self, response: bytes, received: int = 0) -> None:
+        self.received = received
+        self.response = response
+        self._done.release()
+
+    def extend(self, timeout_ns: Optional[int] = None) -> None:
+        """Restart the timeout window, starting now (with `timeout_ns` from now on, if given)."""
+        if timeout_ns is not None:
+            self._timeout_ns = timeout_ns
+        self.deadline = time.monotonic_ns() + self._timeout_ns
+
+    @property
+    def timeout(self) -> int:
+        """Length of the timeout window in nanoseconds."""
+        return self._timeout_ns
+
+    def wait(self) -> Optional[bytes]:
+        """Block until resolved or timed out.
+
+        Returns
+        -------
+        bytes or None
+            The response PDU, or `None` on timeout.
+        """
+        acquire = self._done.acquire
+        while True:
+            remaining = self.deadline - time.monotonic_ns()
+            if remaining <= 0:
+                return self.response
+            if acquire(timeout=remaining / 1_000_000_000.0):
+                return self.response
+
+
+# Frame categories indexed by their integer code, the representation used by `FrameBatch`
+# (converting the enum on every frame would cost more than the batching saves).
+FRAME_CATEGORIES: Tuple[FrameCategory, ...] = tuple(sorted(FrameCategory.__members__.values(), key=int))
+RESPONSE_CODE: int = int(FrameCategory.RESPONSE)
+EVENT_CODE: int = int(FrameCategory.EVENT)
+SERV_CODE: int = int(FrameCategory.SERV)
+DAQ_CODE: int = int(FrameCategory.DAQ)
+
+# PID of a negative response (`types.Response` ERR); checked directly, parsing the PDU costs more than the round trip.
+ERR_PID: int = 0xFE
+
+# Diagnostics ring buffer (`_last_pdus`): directions and stored payload prefix sizes.
+PDU_IN: int = 0
+PDU_DIRECTIONS: Tuple[str, ...] = ("in", "out")
+PDU_DATA_LIMIT: int = 171  # The rendered `hexDump(...)[:512]` never shows more.
+DAQ_PDU_DATA_LIMIT: int = 8
+
+
+class FrameBatch:
+    """Frames received during one listener wake-up, handed to the policy in a single call.
+
+    Payloads are stored back-to-back in `data`, the parallel arrays hold offset,
+    length, counter, timestamp and category code of each frame -- exactly the
+    arguments of the policies' `feed_batch()`.
+    """
+
+    __slots__ = ("data", "offsets", "lengths", "counters", "timestamps", "categories")
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.offsets = array("I")
+        self.lengths = array("I")
+        self.counters = array("I")
+        self.timestamps = array("Q")
+        self.categories = array("B")
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def append(self, category: int, counter: int, timestamp: int, payload: bytes, prefix: bytes = b"") -> None:
+        """Append a frame; `prefix` (e.g. a separately passed ODT number) is stored in front of `payload`."""
+        self.offsets.append(len(self.data))
+        self.lengths.append(len(prefix) + len(payload))
+        self.counters.append(counter)
+        self.timestamps.append(timestamp)
+        self.categories.append(category)
+        if prefix:
+            self.data += prefix
+        self.data += payload
+
+    def frames(self):
+        """Iterate as `(category, counter, timestamp, payload)`, for policies without `feed_batch()`."""
+        data = self.data
+        for offset, length, counter, timestamp, category in zip(
+            self.offsets, self.lengths, self.counters, self.timestamps, self.categories, strict=True
+        ):
+            yield FRAME_CATEGORIES[category], counter, timestamp, bytes(data[offset : offset + length])
+
+    def clear(self) -> None:
+        del self.data[:]
+        del self.offsets[:]
+        del self.lengths[:]
+        del self.counters[:]
+        del self.timestamps[:]
+        del self.categories[:]
+
+
+def batch_feeder(policy: Any) -> Optional[Callable[..., None]]:
+    """`policy.feed_batch`, if feeding a batch through it is equivalent to calling `policy.feed()` per frame.
+
+    The native policies' `feed_batch()` calls their C++ `feed()`, so it would bypass a `feed()`
+    overridden in Python (in a subclass or on the instance); such policies get `None` and have
+    to be fed frame by frame.
+    """
+    feed_batch = getattr(policy, "feed_batch", None)
+    if feed_batch is None or "feed" in getattr(policy, "__dict__", ()) or not _feed_batch_follows_feed(type(policy)):
+        return None
+    return feed_batch
+
+
+@functools.cache
+def _feed_batch_follows_feed(cls: type) -> bool:
+    # `feed_batch()` has to be defined by the class that defines `feed()`, or by a subclass of it.
+    feed_owner = next((klass for klass in cls.__mro__ if "feed" in vars(klass)), None)
+    batch_owner = next((klass for klass in cls.__mro__ if "feed_batch" in vars(klass)), None)
+    return batch_owner is not None and (feed_owner is None or issubclass(batch_owner, feed_owner))
+
+
+def perf_counter_offset(timestamp: Timestamp) -> int:
+    """Offset between `time.perf_counter_ns()` and the transport clock `timestamp.absolute`.
+
+    Both are monotonic, so `time.perf_counter_ns() + offset` yields transport timestamps
+    without calling into the extension module.
+    """
+    best_window, offset = None, 0
+    for _ in range(5):
+        before = time.perf_counter_ns()
+        value = timestamp.absolute
+        after = time.perf_counter_ns()
+        if best_window is None or after - before < best_window:
+            best_window, offset = after - before, value - (before + after) // 2
+    return offset
+
+
 def parse_header_format(header_format: str) -> tuple:
     """SxI and USB framing is configurable."""
     if header_format == "HEADER_LEN_BYTE":
@@ -59,6 +229,12 @@ class BaseTransport(metaclass=abc.ABCMeta):
 
     """
 
+    # Upper bound of frames collected per policy batch; keeps recorder latency bounded under burst traffic.
+    POLICY_BATCH_SIZE: int = 256
+
+    # Block-mode frames sent between two checks for a negative response, see `block_request_many()`.
+    BLOCK_BURST_SIZE: int = 32
+
     def __init__(
         self,
         config,
@@ -87,6 +263,14 @@ class BaseTransport(metaclass=abc.ABCMeta):
 
         self.command_lock: threading.Lock = threading.Lock()
         self.policy_lock: threading.Lock = threading.Lock()
+        # Received frames are collected here between `begin_policy_batch()` and `flush_policy_batch()`.
+        self._policy_batch: FrameBatch = FrameBatch()
+        self._batching: bool = False
+        # Optional policy stage decoupled from the receive thread, see `start_policy_worker()`.
+        self._policy_worker: Optional[threading.Thread] = None
+        self._policy_queue: deque = deque()
+        self._policy_queue_condition: threading.Condition = threading.Condition()
+        self._spare_batches: List[FrameBatch] = []
 
         self.logger = logging.getLogger("pyxcp.transport")
         self._debug: bool = self.logger.getEffectiveLevel() <= logging.DEBUG
@@ -94,14 +278,36 @@ class BaseTransport(metaclass=abc.ABCMeta):
             self.logger.info(f"Transport - User Supplied Transport-Layer Interface: '{transport_layer_interface!s}'")
         self.counter_received: int = -1
         self.create_daq_timestamps: bool = config.create_daq_timestamps
+        # Monotonic, realtime-anchored clock (ns since the epoch) for all frame and send/receive timestamps.
         self.timestamp = Timestamp(TimestampType.ABSOLUTE_TS)
+        self._clock_offset: int = perf_counter_offset(self.timestamp)
         self._start_datetime: CurrentDatetime = CurrentDatetime(self.timestamp.initial_value)
         self.alignment: int = config.alignment
         self.timeout: int = seconds_to_nanoseconds(config.timeout)
         self.timer_restart_event: threading.Event = threading.Event()
         self.timing: Timing = Timing()
+        # Per-command latency histograms, see `pyxcp.timing.CommandLatencies`.
+        self.latencies: Optional[CommandLatencies] = (
+            CommandLatencies(self.__class__.__name__) if getattr(config, "latency_histograms", False) else None
+        )
+        # Per-command response timeouts from observed round-trip times, see `pyxcp.timing.AdaptiveTimeouts`.
+        self.adaptive_timeouts: Optional[AdaptiveTimeouts] = (
+            AdaptiveTimeouts(
+                floor=seconds_to_nanoseconds(getattr(config, "adaptive_timeout_min", 0.05)),
+                ceiling=self.timeout,
+                percentile=getattr(config, "adaptive_timeout_percentile", 99.9),
+                factor=getattr(config, "adaptive_timeout_factor", 3.0),
+            )
+            if getattr(config, "adaptive_timeouts", False)
+            else None
+        )
+        # Responses that arrive while no request is waiting (block-mode errors, multi-frame uploads).
         self.resQueue: deque = deque()
         self.resQueue_condition: threading.Condition = threading.Condition()
+        # Outstanding requests, oldest first; responses are matched in order (XCP interleaved mode).
+        self._response_slots: deque = deque()
+        # Set by a timed-out request: its reply may still arrive and must not be taken for the next one's.
+        self._late_response_pending: bool = False
         self.listener: threading.Thread = threading.Thread(
             target=self.listen,
             args=(),
@@ -112,22 +318,17 @@ class BaseTransport(metaclass=abc.ABCMeta):
         self.first_daq_timestamp: Optional[int] = None
         # self.timestamp_origin = self.timestamp.value
         # self.datetime_origin = datetime.fromtimestamp(self.timestamp_origin)
-        self.pre_send_timestamp: int = self.timestamp.value
-        self.post_send_timestamp: int = self.timestamp.value
-        self.recv_timestamp: int = self.timestamp.value
+        self.pre_send_timestamp: int = self.now()
+        self.post_send_timestamp: int = self.pre_send_timestamp
+        self.recv_timestamp: int = self.pre_send_timestamp
 
         # Frame counters for diagnostics
         self.frames_sent = 0
         self.frames_received = 0
         self.last_command_sent = None
 
-        # Ring buffer for last PDUs to aid diagnostics on failures
-        try:
-            from collections import deque as _dq
-
-            self._last_pdus = _dq(maxlen=200)
-        except Exception:
-            self._last_pdus = []
+        # Ring buffer for last PDUs to aid diagnostics on failures; raw bytes only, rendered on demand.
+        self._last_pdus: PduRingBuffer = PduRingBuffer(capacity=200, max_data=PDU_DATA_LIMIT)
 
         # XCP 1.5 Event Handler Chain (Chain-of-Responsibility)
         from pyxcp.events import create_default_event_chain
@@ -153,6 +354,7 @@ class BaseTransport(metaclass=abc.ABCMeta):
                 self.listener.join(timeout=0.5)
         except Exception:  # nosec
             pass  # Listener thread cleanup failure is non-critical
+        self.stop_policy_worker()
         self.close_connection()
 
     @abc.abstractmethod
@@ -160,35 +362,97 @@ class BaseTransport(metaclass=abc.ABCMeta):
         pass
 
     def get(self):
-        """Get an item from resQueue with blocking wait and timeout."""
-        start: int = self.timestamp.value
-        timeout_ns: int = self.timeout
+        """Get the next response, blocking until it arrives or the timeout expires."""
+        return self._wait_response(self._arm_response_slot())
 
+    def response_timeout(self, cmd=None) -> int:
+        """Response timeout for `cmd` in nanoseconds: adaptive if enabled, `timeout` otherwise."""
+        if cmd is None or self.adaptive_timeouts is None:
+            return self.timeout
+        return self.adaptive_timeouts.timeout(cmd)
+
+    def _arm_response_slot(self, cmd=None) -> ResponseSlot:
+        """Install a completion slot for the next response (to `cmd`, if known).
+
+        Must be called *before* the request is sent, so the listener can resolve the slot
+        directly. A response already sitting in `resQueue` completes the slot immediately,
+        unless a request timed out since: then it is the late reply to that request and is discarded.
+        """
+        slot = ResponseSlot(self.response_timeout(cmd))
         with self.resQueue_condition:
-            while not self.resQueue:
-                # Check for timeout
-                if self.timer_restart_event.is_set():
-                    start = self.timestamp.value
-                    self.timer_restart_event.clear()
-
-                elapsed = self.timestamp.value - start
-                if elapsed > timeout_ns:
-                    raise EmptyFrameError
-
-                # Calculate remaining timeout in seconds for wait()
-                remaining_ns = timeout_ns - elapsed
-                remaining_sec = remaining_ns / 1_000_000_000.0
-
-                # Wait for notification or timeout
-                # Use a small max timeout to check timer_restart_event periodically
-                wait_time = min(remaining_sec, 0.1)
-                if not self.resQueue_condition.wait(timeout=wait_time):
-                    # Timeout occurred, loop will check timeout condition
-                    continue
+            if self.timer_restart_event.is_set():
+                self.timer_restart_event.clear()
+            if self._late_response_pending:
+                self._late_response_pending = False
+                if self.resQueue:
+                    self.logger.debug(f"Discarding {len(self.resQueue)} late response(s) to a timed-out request.")
+                    self.resQueue.clear()
+            if self.resQueue and not self._response_slots:
+                slot.resolve(self.resQueue.popleft())
+            else:
+                self._response_slots.append(slot)
+        return slot
 
-            # Item is available
-            item = self.resQueue.popleft()
-            return item
+    def _wait_response(self, slot: ResponseSlot) -> bytes:
+        response = slot.wait()
+        if response is None:
+            # Timed out -- a resolved slot has already been detached by the listener.
+            with self.resQueue_condition:
+                if slot in self._response_slots:
+                    self._response_slots.remove(slot)
+                response = slot.response
+                if response is None:
+                    self._late_response_pending = True
+            if response is None:
+                raise EmptyFrameError
+        return response
+
+    def _cancel_response_slots(self) -> None:
+        """Forget all outstanding requests; late responses end up in `resQueue`."""
+        with self.resQueue_condition:
+            self._response_slots.clear()
+
+    def _resynchronise(self) -> None:
+        """Abandon all outstanding requests, then send SYNCH and discard every response up to its ERR_CMD_SYNCH.
+
+        Late responses to the abandoned requests would otherwise be taken as the replies to later commands.
+        The caller holds `command_lock`.
+        """
+        self._cancel_response_slots()
+        with self.resQueue_condition:
+            self.resQueue.clear()
+        cmd = types.Command.SYNCH
+        frame = self._prepare_request(cmd)
+        self._feed_sent(FrameCategory.CMD, self.framing.counter_send, self.now(), frame)
+        self.last_command_sent = cmd
+        self.frames_sent += 1
+        slot = self._arm_response_slot(cmd)
+        self.send(frame)
+        while True:
+            try:
+                xcpPDU = self._wait_response(slot)
+            except EmptyFrameError:
+                self.logger.warning("No response to SYNCH, late responses may still arrive")
+                return
+            self.frames_received += 1
+            if xcpPDU[:2] == b"\xfe\x00":  # ERR_CMD_SYNCH
+                return
+            slot = self._arm_response_slot(cmd)
+
+    def extend_response_deadline(self, pending: bool = False) -> None:
+        """Restart the timeout of outstanding requests, e.g. on EV_CMD_PENDING or DAQ activity.
+
+        `pending`: the slave announced a long-running command (EV_CMD_PENDING),
+        adaptive timeouts give way to the static `timeout`.
+        """
+        self.timer_restart_event.set()
+        timeout = self.timeout if pending and self.adaptive_timeouts is not None else None
+        for slot in tuple(self._response_slots):
+            slot.extend(timeout)
+
+    def now(self) -> int:
+        """Current transport time, equivalent to `self.timestamp.value` but cheaper."""
+        return time.perf_counter_ns() + self._clock_offset
 
     @property
     def start_datetime(self) -> int:
@@ -200,6 +464,13 @@ class BaseTransport(metaclass=abc.ABCMeta):
         """
         return self._start_datetime
 
+    def set_max_packet_sizes(self, max_cto: int, max_dto: int) -> None:
+        """Negotiated MAX_CTO/MAX_DTO (CONNECT, PROGRAM_START).
+
+        Transports may size their receive buffers accordingly;
+        the base transport ignores the sizes.
+        """
+
     def start_listener(self):
         if self.listener.is_alive():
             self.finish_listener()
@@ -217,46 +488,135 @@ class BaseTransport(metaclass=abc.ABCMeta):
         if hasattr(self, "closeEvent"):
             self.closeEvent.set()
 
+    def _record_latency(self, cmd, entered: int, sent: int, slot: ResponseSlot) -> None:
+        done = self.now()
+        received = slot.received
+        if not sent <= received <= done:
+            # Unknown, or taken from a different time base (e.g. CAN hardware timestamps).
+            received = done
+        if self.adaptive_timeouts is not None:
+            self.adaptive_timeouts.record(cmd, received - sent)
+        if self.latencies is not None:
+            self.latencies.record(cmd, sent - entered, received - sent, done - entered)
+
+    def _record_timeout(self, cmd) -> None:
+        if self.adaptive_timeouts is not None:
+            self.adaptive_timeouts.record_timeout(cmd)
+        if self.latencies is not None:
+            self.latencies.record_timeout(cmd)
+
     def _request_internal(self, cmd, ignore_timeout=False, *data):
+        entered = self.now()
         with self.command_lock:
             frame = self._prepare_request(cmd, *data)
             self.timing.start()
-            with self.policy_lock:
-                self.policy.feed(FrameCategory.CMD, self.framing.counter_send, self.timestamp.value, frame)
+            self._feed_sent(FrameCategory.CMD, self.framing.counter_send, self.now(), frame)
 
             # Track command for diagnostics
             self.last_command_sent = cmd
             self.frames_sent += 1
 
+            slot = self._arm_response_slot(cmd)
+            sent = self.now()
             self.send(frame)
             try:
-                xcpPDU = self.get()
+                xcpPDU = self._wait_response(slot)
                 self.frames_received += 1
             except EmptyFrameError:
+                self._record_timeout(cmd)
                 if not ignore_timeout:
                     # Build enhanced timeout message with diagnostics
-                    MSG = self._build_timeout_message(cmd)
-                    with self.policy_lock:
-                        self.policy.feed(
-                            FrameCategory.METADATA, self.framing.counter_send, self.timestamp.value, bytes(MSG, "utf8")
-                        ) if self._diagnostics_enabled() else ""
+                    MSG = self._build_timeout_message(cmd, slot.timeout)
+                    if self._diagnostics_enabled():
+                        self._feed_sent(FrameCategory.METADATA, self.framing.counter_send, self.now(), bytes(MSG, "utf8"))
                     self.logger.debug("XCP request timeout", extra={"event": "timeout", "command": cmd.name})
                     raise types.XcpTimeoutError(MSG) from None
                 else:
                     self.timing.stop()
                     return
             self.timing.stop()
-            pid = types.Response.parse(xcpPDU).type
-            if pid == "ERR" and cmd.name != "SYNCH":
-                with self.policy_lock:
-                    self.policy.feed(FrameCategory.ERROR, self.counter_received, self.timestamp.value, xcpPDU[1:])
-                err = types.XcpError.parse(xcpPDU[1:])
-                raise types.XcpResponseError(err)
-            return xcpPDU[1:]
+            if self.latencies is not None or self.adaptive_timeouts is not None:
+                self._record_latency(cmd, entered, sent, slot)
+            return self._response_payload(cmd, xcpPDU)
 
     def request(self, cmd, *data):
         return self._request_internal(cmd, False, *data)
 
+    def request_pipelined(self, requests: Iterable[Tuple], queue_size: int = 1) -> List[Union[bytes, Exception]]:
+        """Send a sequence of commands, keeping up to `queue_size` of them in flight.
+
+        Implements the master side of the XCP interleaved communication model:
+        responses are matched to requests in order.
+
+        Parameters
+        ----------
+        requests: iterable of tuples
+            `(cmd, *data)` -- the same arguments as for :meth:`request`.
+        queue_size: int
+            Maximum number of outstanding commands (`QUEUE_SIZE` from GET_COMM_MODE_INFO).
+
+        Returns
+        -------
+        list
+            One entry per request: the response payload (PID stripped), or the
+            :class:`~pyxcp.types.XcpResponseError` / :class:`~pyxcp.types.XcpTimeoutError` for that request.
+            After a timeout the pipeline is aborted and each remaining request gets its own timeout error;
+            the slave is then resynchronised with SYNCH, so late responses are not mistaken for later replies.
+        """
+        requests = list(requests)
+        results: List[Union[bytes, Exception]] = [None] * len(requests)
+        queue_size = max(1, queue_size)
+        in_flight: deque = deque()
+
+        def complete_oldest() -> bool:
+            idx, cmd, slot, entered, sent, started = in_flight.popleft()
+            try:
+                xcpPDU = self._wait_response(slot)
+            except EmptyFrameError:
+                self._record_timeout(cmd)
+                msg = self._build_timeout_message(cmd, slot.timeout)
+                self.logger.debug("XCP pipelined request timeout", extra={"event": "timeout", "command": cmd.name})
+                results[idx] = types.XcpTimeoutError(msg)
+                return False
+            self.frames_received += 1
+            self.timing.record(time.perf_counter() - started)
+            if self.latencies is not None or self.adaptive_timeouts is not None:
+                self._record_latency(cmd, entered, sent, slot)
+            try:
+                results[idx] = self._response_payload(cmd, xcpPDU)
+            except types.XcpResponseError as ex:
+                results[idx] = ex
+            return True
+
+        with self.command_lock:
+            ok = True
+            for idx, (cmd, *data) in enumerate(requests):
+                entered = self.now()
+                if len(in_flight) >= queue_size:
+                    ok = complete_oldest()
+                    if not ok:
+                        break
+                frame = self._prepare_request(cmd, *data)
+                started = time.perf_counter()  # `timing`, measured like `request()` does.
+                self._feed_sent(FrameCategory.CMD, self.framing.counter_send, self.now(), frame)
+                self.last_command_sent = cmd
+                self.frames_sent += 1
+                slot = self._arm_response_slot(cmd)
+                sent = self.now()
+                self.send(frame)
+                in_flight.append((idx, cmd, slot, entered, sent, started))
+            while ok and in_flight:
+                ok = complete_oldest()
+            if not ok:
+                self._resynchronise()
+                timed_out = next(requests[idx][0] for idx, r in enumerate(results) if isinstance(r, types.XcpTimeoutError))
+                for idx, result in enumerate(results):
+                    if result is None:
+                        results[idx] = types.XcpTimeoutError(
+                            f"{requests[idx][0].name}: pipelined request aborted after an earlier timeout ({timed_out.name})."
+                        )
+        return results
+
     def request_optional_response(self, cmd, *data):
         return self._request_internal(cmd, True, *data)
 
@@ -265,7 +625,93 @@ class BaseTransport(metaclass=abc.ABCMeta):
         Implements packet transmission for block communication model (e.g. DOWNLOAD block mode)
         All parameters are the same as in request(), but it does not receive response.
         """
+        self._check_block_error(cmd)
+        with self.command_lock:
+            if isinstance(data, list):
+                data = data[0]  # C++ interfacing.
+            frame = self._prepare_request(cmd, *data)
+            self._feed_sent(
+                FrameCategory.CMD if int(cmd) >= 0xC0 else FrameCategory.STIM,
+                self.framing.counter_send,
+                self.now(),
+                frame,
+            )
+            self.send(frame)
+
+    def block_request_many(self, requests: Iterable[Tuple[Any, Iterable[int]]], pacer: Optional[Pacer] = None) -> int:
+        """
+        Block-mode transmission of a whole sequence of packets (e.g. a DOWNLOAD/PROGRAM block except its last packet).
+
+        Frames are prepared and handed to :meth:`send_block` in bursts of `BLOCK_BURST_SIZE`,
+        one frame per `pacer` slot (MIN_ST); before each burst the response queue is checked for a negative
+        response, like :meth:`block_request` does before each packet. A burst is fed to the policy
+        right before it is sent, so unsent frames are never recorded.
+
+        Parameters
+        ----------
+        requests: iterable of (cmd, data)
+            `data` is framed as `*data`: the parameters as ints, or a single `bytes` object (no per-byte conversion).
+        pacer: Pacer, optional
+            Separation time between frames; no pacing if omitted.
+
+        Returns
+        -------
+        int
+            Number of bytes sent (frames including transport headers).
+        """
+        if pacer is None:
+            pacer = Pacer(0)
+        requests = list(requests)
+        sent = 0
+        with self.command_lock:
+            for offset in range(0, len(requests), self.BLOCK_BURST_SIZE):
+                burst = requests[offset : offset + self.BLOCK_BURST_SIZE]
+                self._check_block_error(burst[0][0])
+                frames = []
+                timestamp = self.now()
+                for cmd, data in burst:
+                    frame = self._prepare_request(cmd, *data)
+                    self._feed_sent(
+                        FrameCategory.CMD if int(cmd) >= 0xC0 else FrameCategory.STIM,
+                        self.framing.counter_send,
+                        timestamp,
+                        frame,
+                    )
+                    frames.append(frame)
+                self.send_block(frames, pacer)
+                sent += sum(len(frame) for frame in frames)
+        return sent
+
+    def has_native_block_send(self) -> bool:
+        """Whether :meth:`send_block` has a native transmit path.
+
+        Only then queued block-mode transfers (:meth:`block_request_many`) are used for DOWNLOAD/PROGRAM.
+        """
+        return False
+
+    def send_block(self, frames: List[bytes], pacer: Pacer) -> None:
+        """Send `frames` back-to-back, one per `pacer` slot.
+
+        Transports with a native transmit path override this.
+        """
+        for frame in frames:
+            pacer.wait()
+            self.send(frame)
+
+    def _response_payload(self, cmd, xcpPDU: bytes) -> bytes:
+        """Payload of the response `xcpPDU` to `cmd` (PID stripped).
+
+        Raises
+        ------
+        XcpResponseError
+            On a negative response (except to SYNCH), which is fed to the policy as ERROR.
+        """
+        if xcpPDU[0] == ERR_PID and cmd != types.Command.SYNCH:
+            self._feed_sent(FrameCategory.ERROR, self.counter_received, self.now(), xcpPDU[1:])
+            raise types.XcpResponseError(types.XcpError.parse(xcpPDU[1:]))
+        return xcpPDU[1:]
 
+    def _check_block_error(self, cmd) -> None:
         # check response queue before each block request, so that if the slave device
         # has responded with a negative response (e.g. ACCESS_DENIED or SEQUENCE_ERROR), we can
         # process it.
@@ -275,18 +721,6 @@ class BaseTransport(metaclass=abc.ABCMeta):
             if pid == "ERR" and cmd.name != "SYNCH":
                 err = types.XcpError.parse(xcpPDU[1:])
                 raise types.XcpResponseError(err)
-        with self.command_lock:
-            if isinstance(data, list):
-                data = data[0]  # C++ interfacing.
-            frame = self._prepare_request(cmd, *data)
-            with self.policy_lock:
-                self.policy.feed(
-                    FrameCategory.CMD if int(cmd) >= 0xC0 else FrameCategory.STIM,
-                    self.framing.counter_send,
-                    self.timestamp.value,
-                    frame,
-                )
-            self.send(frame)
 
     def _prepare_request(self, cmd, *data):
         """
@@ -319,36 +753,50 @@ class BaseTransport(metaclass=abc.ABCMeta):
         ------
         :class:`pyxcp.types.XcpTimeoutError`
         """
-        block_response = b""
-        start = self.timestamp.value
-        timeout_ns = self.timeout
+        block_response = bytearray(max(length_required, 0))
+        self.block_receive_into(block_response)
+        return bytes(block_response)
 
-        while len(block_response) < length_required:
-            with self.resQueue_condition:
-                # Check if data is available
-                if len(self.resQueue):
-                    partial_response = self.resQueue.popleft()
-                    block_response += partial_response[1:]
-                    continue
+    def block_receive_into(self, buffer) -> None:
+        """
+        Like :meth:`block_receive`, but the payload bytes (without PID) are copied
+        straight into `buffer` (a preallocated `bytearray` or writable `memoryview`)
+        until it is full; padding beyond the last required byte is discarded.
+
+        Waits on `resQueue_condition`, the timeout applies to the whole block.
 
-                # No data available, check timeout
-                elapsed = self.timestamp.value - start
-                if elapsed > timeout_ns:
-                    waited = elapsed / 1e9
-                    msg = f"Response timed out [block_receive]: received {len(block_response)} of {length_required} bytes"
+        Raises
+        ------
+        :class:`pyxcp.types.XcpTimeoutError`
+        """
+        view = memoryview(buffer)
+        length_required = len(view)
+        received = 0
+        start = time.monotonic_ns()
+        deadline = start + self.timeout
+
+        with self.resQueue_condition:
+            while received < length_required:
+                if self.resQueue:
+                    frame = self.resQueue.popleft()
+                    count = min(len(frame) - 1, length_required - received)
+                    if count > 0:
+                        view[received : received + count] = memoryview(frame)[1 : 1 + count]
+                        received += count
+                    continue
+                remaining_ns = deadline - time.monotonic_ns()
+                if remaining_ns <= 0:
+                    waited = (time.monotonic_ns() - start) / 1e9
+                    msg = f"Response timed out [block_receive]: received {received} of {length_required} bytes"
                     msg += f" after {waited:.3f}s"
                     msg += f"\nFrames sent: {self.frames_sent}, received: {self.frames_received}"
-                    msg += f"\nTry: c.Transport.timeout = {(timeout_ns / 1_000_000_000) * 2:.1f}  # Increase timeout"
+                    msg += f"\nTry: c.Transport.timeout = {(self.timeout / 1_000_000_000) * 2:.1f}  # Increase timeout"
                     self.logger.debug("XCP block_receive timeout", extra={"event": "timeout"})
                     raise types.XcpTimeoutError(msg) from None
+                self.resQueue_condition.wait(remaining_ns / 1_000_000_000.0)
 
-                # Wait for data with remaining timeout
-                remaining_ns = timeout_ns - elapsed
-                remaining_sec = remaining_ns / 1_000_000_000.0
-                wait_time = min(remaining_sec, 0.1)
-                self.resQueue_condition.wait(timeout=wait_time)
-
-        return block_response
+        if self.latencies is not None and self.last_command_sent is not None:
+            self.latencies.record_block(self.last_command_sent, time.monotonic_ns() - start)
 
     @abc.abstractmethod
     def send(self, frame):
@@ -398,78 +846,207 @@ class BaseTransport(metaclass=abc.ABCMeta):
                 self.logger.debug(f"<- L{length} C{counter} {hexDump(response)}")
             self.counter_received = counter
             # Record incoming non-DAQ frames for diagnostics
-            self._record_pdu(
-                "in",
-                (FrameCategory.RESPONSE if pid >= 0xFE else FrameCategory.SERV if pid == 0xFC else FrameCategory.EVENT),
+            self._last_pdus.record(
+                PDU_IN,
+                (RESPONSE_CODE if pid >= 0xFE else SERV_CODE if pid == 0xFC else EVENT_CODE),
                 counter,
                 recv_timestamp,
-                response,
                 length,
+                response,
             )
             if pid >= 0xFE:
                 # Trim response to actual length to remove padding (e.g., CAN 0xAA padding)
                 # Issue #205: CAN-FD with max_dlc_required pads frames, causing parsers
                 # to interpret padding bytes as data (e.g., 0xAA read as maxCto=170)
+                pdu = response[:length]
+                # Fed before the waiting request is woken up, which feeds its next command right away.
+                self._feed_received_in_order(RESPONSE_CODE, self.counter_received, self.now(), pdu)
                 with self.resQueue_condition:
-                    self.resQueue.append(response[:length])
-                    self.resQueue_condition.notify()
-                with self.policy_lock:
-                    self.policy.feed(FrameCategory.RESPONSE, self.counter_received, self.timestamp.value, response[:length])
+                    if self._response_slots:
+                        self._response_slots.popleft().resolve(pdu, recv_timestamp)
+                    else:
+                        self.resQueue.append(pdu)
+                        self.resQueue_condition.notify()
                 self.recv_timestamp = recv_timestamp
             elif pid == 0xFD:
                 self.process_event_packet(response[:length])
-                with self.policy_lock:
-                    self.policy.feed(FrameCategory.EVENT, self.counter_received, self.timestamp.value, response[:length])
+                self._feed_received_in_order(EVENT_CODE, self.counter_received, self.now(), response[:length])
             elif pid == 0xFC:
-                with self.policy_lock:
-                    self.policy.feed(FrameCategory.SERV, self.counter_received, self.timestamp.value, response[:length])
+                self._feed_received_in_order(SERV_CODE, self.counter_received, self.now(), response[:length])
+        else:
+            self._process_daq(response[:length], length, counter, recv_timestamp)
+
+    def process_daq_odt(self, odt: bytes, payload: bytes, counter: int, recv_timestamp: int) -> None:
+        """Process a DAQ frame whose ODT number is passed separately from `payload` (XCPonCAN PID_OFF).
+
+        The ODT number is joined with the payload only where the frame is stored (policy batch, diagnostics),
+        no bytes object is built per frame.
+        """
+        self._process_daq(payload, len(odt) + len(payload), counter, recv_timestamp, odt)
+
+    def _process_daq(self, payload: bytes, length: int, counter: int, recv_timestamp: int, odt: bytes = b"") -> None:
+        # DAQ traffic: Some transports reuse or do not advance the counter for DAQ frames.
+        # Do not drop DAQ frames on duplicate counters to avoid losing measurements.
+        if counter == self.counter_received:
+            self.logger.debug(f"Duplicate message counter {counter} received (DAQ) - not dropping")
+            # DAQ still flowing – reset request timeout window to avoid false timeouts while
+            # the slave is busy but has not yet responded to a command.
+            self.extend_response_deadline()
+            # Fall through and process the frame as usual.
+        self.counter_received = counter
+        if self._debug:
+            self.logger.debug(f"<- L{length} C{counter} ODT_Data[0:8] {hexDump((odt + payload)[:8])}")
+        if self.first_daq_timestamp is None:
+            self.first_daq_timestamp = recv_timestamp
+        if self.create_daq_timestamps:
+            timestamp = recv_timestamp
+        else:
+            timestamp = 0
+        # Record DAQ frame (only keep a small payload prefix)
+        self._last_pdus.record(PDU_IN, DAQ_CODE, counter, timestamp, length, payload, DAQ_PDU_DATA_LIMIT, odt[0] if odt else -1)
+        # DAQ activity indicates the slave is alive/busy; keep extending the wait window for any
+        # outstanding request, similar to EV_CMD_PENDING behavior on stacks that don't emit it.
+        self.extend_response_deadline()
+        self._feed_received(DAQ_CODE, self.counter_received, timestamp, payload, odt)
+
+    def _feed_received(self, category: int, counter: int, timestamp: int, payload: bytes, prefix: bytes = b"") -> None:
+        if self._batching:
+            batch = self._policy_batch
+            batch.append(category, counter, timestamp, payload, prefix)
+            if len(batch) >= self.POLICY_BATCH_SIZE:
+                self._feed_policy_batch()
+        elif self._policy_worker is not None:
+            self._policy_batch.append(category, counter, timestamp, payload, prefix)
+            self._feed_policy_batch()
         else:
-            # DAQ traffic: Some transports reuse or do not advance the counter for DAQ frames.
-            # Do not drop DAQ frames on duplicate counters to avoid losing measurements.
-            if counter == self.counter_received:
-                self.logger.debug(f"Duplicate message counter {counter} received (DAQ) - not dropping")
-                # DAQ still flowing – reset request timeout window to avoid false timeouts while
-                # the slave is busy but has not yet responded to a command.
-                self.timer_restart_event.set()
-                # Fall through and process the frame as usual.
-            self.counter_received = counter
-            if self._debug:
-                self.logger.debug(f"<- L{length} C{counter} ODT_Data[0:8] {hexDump(response[:8])}")
-            if self.first_daq_timestamp is None:
-                self.first_daq_timestamp = recv_timestamp
-            if self.create_daq_timestamps:
-                timestamp = recv_timestamp
-            else:
-                timestamp = 0
-            # Record DAQ frame (only keep small prefix in payload string later)
-            self._record_pdu("in", FrameCategory.DAQ, counter, timestamp, response, length)
-            # DAQ activity indicates the slave is alive/busy; keep extending the wait window for any
-            # outstanding request, similar to EV_CMD_PENDING behavior on stacks that don't emit it.
-            self.timer_restart_event.set()
             with self.policy_lock:
-                self.policy.feed(FrameCategory.DAQ, self.counter_received, timestamp, response[:length])
+                # Policies take one contiguous payload.
+                self.policy.feed(FRAME_CATEGORIES[category], counter, timestamp, prefix + payload if prefix else payload)
 
-    def _record_pdu(
-        self,
-        direction: str,
-        category: FrameCategory,
-        counter: int,
-        timestamp: int,
-        payload: bytes,
-        length: Optional[int] = None,
-    ) -> None:
-        try:
-            entry = {
-                "dir": direction,
-                "cat": category.name,
-                "ctr": int(counter),
-                "ts": int(timestamp),
-                "len": int(length if length is not None else len(payload)),
-                "data": hexDump(payload if category != FrameCategory.DAQ else payload[:8])[:512],
+    def _feed_received_in_order(self, category: int, counter: int, timestamp: int, payload: bytes) -> None:
+        """Feed a RES/ERR/EV/SERV frame now, together with the frames collected before it.
+
+        Commands are fed by the requesting thread (:meth:`_feed_sent`); a response held back in the
+        wake-up batch would be recorded after the command it unblocked.
+        """
+        if self._batching or self._policy_worker is not None:
+            self._policy_batch.append(category, counter, timestamp, payload)
+            self._feed_policy_batch()
+        else:
+            with self.policy_lock:
+                self.policy.feed(FRAME_CATEGORIES[category], counter, timestamp, payload)
+
+    def _feed_sent(self, category: FrameCategory, counter: int, timestamp: int, payload: bytes) -> None:
+        """Feed a frame from the requesting thread (CMD/STIM, ERROR, METADATA).
+
+        With a policy worker the frame is queued behind the received frames already handed over,
+        so the recorded order of commands and responses is kept.
+        """
+        if self._policy_worker is not None:
+            with self._policy_queue_condition:
+                if self._policy_worker is not None:
+                    batch = self._spare_batches.pop() if self._spare_batches else FrameBatch()
+                    batch.append(int(category), counter, timestamp, payload)
+                    self._policy_queue.append(batch)
+                    self._policy_queue_condition.notify()
+                    return
+        with self.policy_lock:
+            self.policy.feed(category, counter, timestamp, payload)
+
+    def begin_policy_batch(self) -> None:
+        """Collect received frames instead of feeding them to the policy one by one.
+
+        Listener threads call this before draining the frames of one wake-up and
+        :meth:`flush_policy_batch` afterwards, so the policy is crossed once per wake-up
+        (or every `POLICY_BATCH_SIZE` frames) instead of once per frame.
+        """
+        self._batching = True
+
+    def flush_policy_batch(self) -> None:
+        """Hand all frames collected since :meth:`begin_policy_batch` to the policy."""
+        self._batching = False
+        if self._policy_batch:
+            self._feed_policy_batch()
+
+    def _feed_policy_batch(self) -> None:
+        if self._policy_worker is not None:
+            # Hand the batch over to the policy worker and continue with a fresh one.
+            with self._policy_queue_condition:
+                if self._policy_worker is not None:
+                    self._policy_queue.append(self._policy_batch)
+                    self._policy_batch = self._spare_batches.pop() if self._spare_batches else FrameBatch()
+                    self._policy_queue_condition.notify()
+                    return
+        self._feed_batch_to_policy(self._policy_batch)
+
+    def _feed_batch_to_policy(self, batch: FrameBatch) -> None:
+        with self.policy_lock:
+            feed_batch = batch_feeder(self.policy)
+            if feed_batch is not None:
+                feed_batch(batch.data, batch.offsets, batch.lengths, batch.counters, batch.timestamps, batch.categories)
+            else:
+                feed = self.policy.feed
+                for category, counter, timestamp, payload in batch.frames():
+                    feed(category, counter, timestamp, payload)
+        batch.clear()
+
+    def start_policy_worker(self) -> None:
+        """Feed received frames to the policy from a separate thread.
+
+        The receive thread then only parses frames and completes requests; the
+        frames of each wake-up are queued as one :class:`FrameBatch` and fed by
+        the worker, in order. Frames sent by the master (CMD) are queued the
+        same way, behind the responses received before them.
+        """
+        if self._policy_worker is not None:
+            return
+        self._policy_worker = threading.Thread(target=self._policy_worker_loop, name="pyxcp-policy", daemon=True)
+        self._policy_worker.start()
+
+    def stop_policy_worker(self) -> None:
+        """Stop the policy worker after all queued frames have been fed."""
+        worker = self._policy_worker
+        if worker is None:
+            return
+        with self._policy_queue_condition:
+            self._policy_worker = None
+            self._policy_queue.append(None)
+            self._policy_queue_condition.notify()
+        if worker is not threading.current_thread():
+            worker.join(timeout=2.0)
+
+    def _policy_worker_loop(self) -> None:
+        queue = self._policy_queue
+        condition = self._policy_queue_condition
+        while True:
+            with condition:
+                while not queue:
+                    condition.wait()
+                batch = queue.popleft()
+            if batch is None:
+                return
+            try:
+                self._feed_batch_to_policy(batch)
+            except Exception:
+                self.logger.exception("Policy worker: feeding frames failed")
+                batch.clear()
+            with condition:
+                if len(self._spare_batches) < 4:
+                    self._spare_batches.append(batch)
+
+    def _last_pdu_entries(self, last_n: int) -> List[Dict[str, Any]]:
+        """Render the `last_n` most recent PDUs of the diagnostics ring buffer."""
+        return [
+            {
+                "dir": PDU_DIRECTIONS[direction],
+                "cat": FRAME_CATEGORIES[category].name,
+                "ctr": counter,
+                "ts": timestamp,
+                "len": length,
+                "data": hexDump(data)[:512],
             }
-            self._last_pdus.append(entry)
-        except Exception:
-            pass  # nosec
+            for direction, category, counter, timestamp, length, data in self._last_pdus.entries(last_n)
+        ]
 
     def _build_diagnostics_dump(self) -> str:
         import json as _json
@@ -513,7 +1090,7 @@ class BaseTransport(metaclass=abc.ABCMeta):
                 last_n = int(app.general.diagnostics_last_pdus or last_n)
         except Exception:
             pass  # nosec
-        pdus = list(self._last_pdus)[-last_n:]
+        pdus = self._last_pdu_entries(last_n)
         payload = {
             "transport_params": tp,
             "last_pdus": pdus,
@@ -526,16 +1103,21 @@ class BaseTransport(metaclass=abc.ABCMeta):
         header = "--- Diagnostics (for troubleshooting) ---"
         return f"{header}\n{body}"
 
-    def _build_timeout_message(self, cmd) -> str:
+    def _build_timeout_message(self, cmd, timeout_ns: Optional[int] = None) -> str:
         """Build enhanced timeout error message with diagnostics and troubleshooting hints."""
         timeout_sec = self.timeout / 1_000_000_000
+        adaptive = timeout_ns is not None and timeout_ns < self.timeout
 
         # Count received frames since connection
         received_count = self.frames_received
 
         # Build base message
+        if adaptive:
+            elapsed = f"{timeout_ns / 1_000_000:.1f}ms (adaptive timeout)"
+        else:
+            elapsed = f"{timeout_sec:.1f}s"
         parts = [
-            f"Response timed out after {timeout_sec:.1f}s for command {cmd.name}.",
+            f"Response timed out after {elapsed} for command {cmd.name}.",
             f"Frames sent: {self.frames_sent}, received: {received_count}.",
         ]
 
@@ -564,7 +1146,11 @@ class BaseTransport(metaclass=abc.ABCMeta):
             parts.append("  2. ECU overloaded (reduce DAQ rate)")
             parts.append("  3. Intermittent connection issue")
 
-        parts.append(f"\nTry: c.Transport.timeout = {timeout_sec * 2:.1f}  # Increase timeout")
+        if adaptive:
+            factor = self.adaptive_timeouts.factor
+            parts.append(f"\nTry: c.Transport.adaptive_timeout_factor = {factor * 2:.1f}  # Increase adaptive timeouts")
+        else:
+            parts.append(f"\nTry: c.Transport.timeout = {timeout_sec * 2:.1f}  # Increase timeout")
 
         return "\n".join(parts)
 
@@ -588,29 +1174,47 @@ class BaseTransport(metaclass=abc.ABCMeta):
     #    self._transport_layer_interface = value
 
 
+# Built-in transports; their modules are imported on first use.
+TRANSPORT_MODULES: Dict[str, str] = {
+    "can": "pyxcp.transport.can",
+    "eth": "pyxcp.transport.eth",
+    "sxi": "pyxcp.transport.sxi",
+    "usb": "pyxcp.transport.usb_transport",
+}
+
+
 def create_transport(name: str, *args, **kws) -> BaseTransport:
     """Factory function for transports.
 
+    Only the module of the requested transport is imported.
+
     Returns
     -------
     :class:`BaseTransport` derived instance.
     """
     name = name.lower()
-    transports = available_transports()
-    if name in transports:
-        transport_class: Type[BaseTransport] = transports[name]
-    else:
+    if name in TRANSPORT_MODULES:
+        importlib.import_module(TRANSPORT_MODULES[name])
+    transport_class: Optional[Type[BaseTransport]] = _loaded_transports().get(name)
+    if transport_class is None:
+        transports = available_transports()
         raise ValueError(f"{name!r} is an invalid transport -- please choose one of [{' | '.join(transports.keys())}].")
     return transport_class(*args, **kws)
 
 
 def available_transports() -> Dict[str, Type[BaseTransport]]:
-    """List all subclasses of :class:`BaseTransport`.
+    """List all subclasses of :class:`BaseTransport` (imports the built-in transports).
 
     Returns
     -------
     dict
         name: class
     """
+    for module in TRANSPORT_MODULES.values():
+        importlib.import_module(module)
+    return _loaded_transports()
+
+
+def _loaded_transports() -> Dict[str, Type[BaseTransport]]:
     transports = BaseTransport.__subclasses__()
     return {t.__name__.lower(): t for t in transports}
@@ -2,13 +2,17 @@
 """ """
 
 import functools
+import logging
 import operator
+import threading
 from abc import ABC, abstractmethod
 from bisect import bisect_left
+from collections import deque
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from can import (
+    Bus,
     BusState,
     CanError,
     CanInitializationError,
@@ -20,6 +24,7 @@ from can.interface import _get_class_for_interface
 from rich.console import Console
 
 from pyxcp.config import CAN_INTERFACE_MAP, CanCustom
+from pyxcp.transport import transport_ext
 from pyxcp.transport.base import (
     BaseTransport,
     ChecksumType,
@@ -44,16 +49,48 @@ class FilterState(IntEnum):
 
 
 class SoftwareFilter:
-    """Additional CAN filters in software."""
+    """Additional CAN filters in software.
+
+    Filters are compiled on :meth:`set_filters`: filters matching exactly one identifier
+    (full 11/29-bit mask) go into hash sets, only the remaining masked filters are checked
+    one by one.
+    """
 
     def __init__(self) -> None:
         self.filters = None
+        self.exact_standard: frozenset = frozenset()
+        self.exact_extended: frozenset = frozenset()
+        self.masked: List[Tuple[int, int, Optional[bool]]] = []
         self.reject_all()
 
     def set_filters(self, filters: List[Dict]) -> None:
         self.filters = filters
+        self._compile(filters)
         self.filtering()
 
+    def _compile(self, filters: List[Dict]) -> None:
+        exact_standard = set()
+        exact_extended = set()
+        masked = []
+        for fltr in filters:
+            can_id = fltr["can_id"]
+            can_mask = fltr["can_mask"]
+            if "extended" not in fltr:
+                masked.append((can_id, can_mask, None))  # Both identifier types.
+                continue
+            extended = fltr["extended"]
+            if extended not in (False, True):
+                continue  # Compared with `Message.is_extended_id`, e.g. `None` matches no frame at all.
+            extended = bool(extended)
+            width = MAX_29_BIT_IDENTIFIER if extended else MAX_11_BIT_IDENTIFIER
+            if can_mask & width != width:
+                masked.append((can_id, can_mask, extended))
+            elif can_id & can_mask & ~width == 0:  # Otherwise the filter can't match at all.
+                (exact_extended if extended else exact_standard).add(can_id & width)
+        self.exact_standard = frozenset(exact_standard)
+        self.exact_extended = frozenset(exact_extended)
+        self.masked = masked
+
     def reject_all(self) -> None:
         self.filter_state = FilterState.REJECT_ALL
 
@@ -75,13 +112,14 @@ class SoftwareFilter:
             return False
         elif self.filter_state == FilterState.ACCEPT_ALL or self.filters is None:
             return True
-        for filter in self.filters:
-            if "extended" in filter:
-                if filter["extended"] != msg.is_extended_id:
-                    continue
-            can_id = filter["can_id"]
-            can_mask = filter["can_mask"]
-            if (can_id ^ msg.arbitration_id) & can_mask == 0:
+        arbitration_id = msg.arbitration_id
+        is_extended_id = msg.is_extended_id
+        if arbitration_id in (self.exact_extended if is_extended_id else self.exact_standard):
+            return True
+        for can_id, can_mask, extended in self.masked:
+            if extended is not None and extended != is_extended_id:
+                continue
+            if (can_id ^ arbitration_id) & can_mask == 0:
                 return True
         return False
 
@@ -286,6 +324,67 @@ class Frame:
     __str__ = __repr__
 
 
+class CanReceiveCounters:
+    """Receive counters of one CAN channel."""
+
+    __slots__ = ("received", "filtered", "error_frames", "invalid", "recv_errors", "overflows")
+
+    def __init__(self) -> None:
+        self.received: int = 0  # Handed to the transport.
+        self.filtered: int = 0  # Rejected by the software filter.
+        self.error_frames: int = 0
+        self.invalid: int = 0  # Remote or empty frames.
+        self.recv_errors: int = 0  # `CanError` raised by the interface.
+        self.overflows: int = 0  # Lost in the kernel receive queue (native SocketCAN only).
+
+    @property
+    def dropped(self) -> int:
+        """Frames that reached the host, but were not handed to the transport."""
+        return self.filtered + self.error_frames + self.invalid + self.overflows
+
+    def as_dict(self) -> Dict[str, int]:
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["dropped"] = self.dropped
+        return result
+
+    def __repr__(self) -> str:
+        return f"CanReceiveCounters({self.as_dict()})"
+
+
+# Results of python-can's interface probing, which may be slow (driver libraries, hardware enumeration).
+_interface_configs: Dict[str, List[Dict[str, Any]]] = {}
+_interface_configs_lock = threading.Lock()
+
+
+def available_interface_configs(interface: str) -> List[Dict[str, Any]]:
+    """Available configurations of python-can `interface` (`detect_available_configs()`).
+
+    Probed on first use and cached for the lifetime of the process, see :func:`invalidate_interface_configs`.
+    A failing probe is logged and cached as "no configurations".
+    """
+    with _interface_configs_lock:
+        configs = _interface_configs.get(interface)
+        if configs is None:
+            try:
+                configs = detect_available_configs(interfaces=[interface])
+            except Exception as ex:
+                logging.getLogger("pyxcp.transport.can").warning(
+                    f"XCPonCAN - Failed to query available configs for interface {interface!r}: {ex.__class__.__name__}: {ex}"
+                )
+                configs = []
+            _interface_configs[interface] = configs
+    return list(configs)
+
+
+def invalidate_interface_configs(interface: Optional[str] = None) -> None:
+    """Forget the cached configurations of `interface` (all interfaces if `None`), e.g. after plugging in an adapter."""
+    with _interface_configs_lock:
+        if interface is None:
+            _interface_configs.clear()
+        else:
+            _interface_configs.pop(interface, None)
+
+
 class PythonCanWrapper:
     """Wrapper around python-can - github.com/hardbyte/python-can"""
 
@@ -308,6 +407,17 @@ class PythonCanWrapper:
         self.connected: bool = False
         self.software_filter = SoftwareFilter()
         self.saved_filters = []
+        self.default_channel = self.parameters.get("channel", self.interface_name)
+        self.counters: Dict[Any, CanReceiveCounters] = {}
+
+    def channel_counters(self, channel: Any = None) -> CanReceiveCounters:
+        """Counters of `channel` (as reported by `Message.channel`), created on first use."""
+        if channel is None:
+            channel = self.default_channel
+        counters = self.counters.get(channel)
+        if counters is None:
+            counters = self.counters[channel] = CanReceiveCounters()
+        return counters
 
     def connect(self) -> None:
         if self.connected:
@@ -403,12 +513,25 @@ class PythonCanWrapper:
     def transmit(self, payload: bytes) -> None:
         frame = Message(
             arbitration_id=self.parent.can_id_master.id,
-            is_extended_id=True if self.parent.can_id_master.is_extended else False,
+            is_extended_id=self.parent.can_id_master.is_extended,
             is_fd=self.parent.fd,
             data=payload,
         )
         self.can_interface.send(frame)
 
+    def transmit_block(self, payloads: List[bytes], pacer) -> None:
+        """Transmit `payloads` one per `pacer` slot.
+
+        Messages are built up front; the loop and the waits run in C++ (`send_paced()`, without the GIL),
+        only the bus' `send()` is called back per frame.
+        """
+        master = self.parent.can_id_master
+        fd = self.parent.fd
+        frames = [
+            Message(arbitration_id=master.id, is_extended_id=master.is_extended, is_fd=fd, data=payload) for payload in payloads
+        ]
+        transport_ext.send_paced(self.can_interface.send, frames, pacer)
+
     def read(self) -> Optional[Frame]:
         if not self.connected:
             return None
@@ -418,12 +541,22 @@ class PythonCanWrapper:
             # the full timeout (default 2s), reducing Master.close() delay from ~5s to ~1s
             frame = self.can_interface.recv(0.1)
         except CanError:
+            self.channel_counters().recv_errors += 1
             return None
         else:
-            if frame is None or not len(frame.data):
+            if frame is None:
                 return None  # Timeout condition.
+            counters = self.channel_counters(frame.channel)
+            if frame.is_error_frame:
+                counters.error_frames += 1
+                return None
+            if frame.is_remote_frame or not len(frame.data):
+                counters.invalid += 1
+                return None
             if not self.software_filter.accept(frame):
+                counters.filtered += 1
                 return None  # Filter out unwanted traffic.
+            counters.received += 1
             extended = frame.is_extended_id
             identifier = Identifier.make_identifier(frame.arbitration_id, extended)
             return Frame(
@@ -433,6 +566,404 @@ class PythonCanWrapper:
                 timestamp=seconds_to_nanoseconds(frame.timestamp),
             )
 
+    def read_batch(self, timeout_ms: int = 100, max_frames: int = 256) -> List[Tuple[int, bytes, int]]:
+        """Wait up to `timeout_ms` for a frame, then drain everything already queued.
+
+        Only the first `recv()` blocks, the following ones use a zero timeout until the
+        interface runs dry (or `max_frames` are collected). Frames are returned as
+        `(identifier, data, timestamp)`, `identifier` with bit 31 set for 29-bit identifiers;
+        `data` is the payload as received, also in PID_OFF mode (the transport passes the ODT number separately).
+        """
+        if not self.connected:
+            return []
+        recv = self.can_interface.recv
+        accept = self.software_filter.accept
+        channel_counters = self.channel_counters
+        frames = []
+        timeout = timeout_ms / 1000.0
+        while len(frames) < max_frames:
+            try:
+                msg = recv(timeout)
+            except CanError:
+                channel_counters().recv_errors += 1
+                break
+            if msg is None:
+                break
+            timeout = 0.0
+            counters = channel_counters(msg.channel)
+            if msg.is_error_frame:
+                counters.error_frames += 1
+            elif msg.is_remote_frame or not len(msg.data):
+                counters.invalid += 1
+            elif not accept(msg):
+                counters.filtered += 1
+            else:
+                counters.received += 1
+                raw_id = msg.arbitration_id | CAN_EXTENDED_ID if msg.is_extended_id else msg.arbitration_id
+                frames.append((raw_id, msg.data, seconds_to_nanoseconds(msg.timestamp)))
+        return frames
+
+    def receive_counters(self) -> Dict[Any, CanReceiveCounters]:
+        return dict(self.counters)
+
+    def get_timestamp_resolution(self) -> int:
+        return 10 * 1000
+
+
+def socketcan_filters(filters: List[Dict]) -> List[Tuple[int, int]]:
+    """Translate python-can filter dicts into SocketCAN `(can_id, can_mask)` pairs (CAN_RAW_FILTER).
+
+    Same semantics as python-can's SocketCAN backend: if `extended` is given, the
+    identifier type has to match as well.
+    """
+    result = []
+    for fltr in filters:
+        can_id = fltr["can_id"]
+        can_mask = fltr["can_mask"]
+        if "extended" in fltr:
+            can_mask |= CAN_EXTENDED_ID
+            if fltr["extended"]:
+                can_id |= CAN_EXTENDED_ID
+        result.append((can_id, can_mask))
+    return result
+
+
+class NativeSocketCan:
+    """Native SocketCAN backend (Linux), alternative to :class:`PythonCanWrapper`.
+
+    Receives on a raw `AF_CAN` socket (`SocketCanReader`, transport_ext): one `recvmmsg()`
+    per wake-up, kernel filters and kernel (or hardware) receive timestamps. Frames are
+    returned as `(identifier, data, timestamp)` tuples, no python-can `Message` objects.
+    Bus parameters (bitrate etc.) are not touched, configure the interface with `ip link`.
+    """
+
+    MAX_FRAMES = 64
+
+    def __init__(self, parent, channel: str, fd: bool, hardware_timestamps: bool = False) -> None:
+        if not hasattr(transport_ext, "SocketCanReader"):
+            raise CanInitializationError("Native SocketCAN backend is only available on Linux.")
+        self.parent = parent
+        self.channel: str = channel
+        self.fd: bool = fd
+        self.hardware_timestamps: bool = hardware_timestamps
+        self.reader = None
+        self.connected: bool = False
+        self._pending: deque = deque()
+        # Filtering is done by the kernel.
+        self.software_filter = SoftwareFilter()
+        self.software_filter.accept_all()
+
+    def _filters(self, daq_identifiers: List) -> List[Dict]:
+        return [self.parent.can_id_slave.create_filter_from_id()] + [daq_id.create_filter_from_id() for daq_id in daq_identifiers]
+
+    def _set_pid_map(self) -> None:
+        # PID_OFF translation happens in the reader, without copying.
+        self.reader.set_pid_map({raw_id: pid[0] for raw_id, pid in self.parent.can_id_pid_map.items()})
+
+    def connect(self) -> None:
+        if self.connected:
+            return
+        can_filters = self._filters(self.parent.daq_identifier)
+        self.parent.logger.debug(f"XCPonCAN - Configuring filters: {can_filters}")
+        try:
+            self.reader = transport_ext.SocketCanReader(
+                channel=self.channel,
+                fd=self.fd,
+                max_frames=self.MAX_FRAMES,
+                hardware_timestamps=self.hardware_timestamps,
+                clock_offset=self.parent.timestamp.offset,
+            )
+            self.reader.set_filters(socketcan_filters(can_filters))
+            self._set_pid_map()
+        except OSError as ex:
+            if self.reader is not None:
+                self.reader.close()
+                self.reader = None
+            raise CanInitializationError(f"Native SocketCAN: cannot open {self.channel!r}: {ex}") from ex
+        self.parent.logger.info(f"XCPonCAN - Using native SocketCAN on {self.channel!r} (fd={self.fd})")
+        self.parent.logger.info(f"XCPonCAN - Filters used: {can_filters}")
+        self.connected = True
+
+    def update_daq_filters(self, daq_identifiers: List) -> None:
+        """Update the kernel filters to include DAQ identifiers (effective immediately)."""
+        if not self.connected:
+            self.parent.logger.warning("Cannot update DAQ filters: not connected")
+            return
+        if not daq_identifiers:
+            self.parent.logger.debug("No DAQ identifiers to add to filters")
+            return
+        can_filters = self._filters(daq_identifiers)
+        self.reader.set_filters(socketcan_filters(can_filters))
+        self._set_pid_map()
+        self.parent.logger.info(f"XCPonCAN - Updated DAQ filters: {len(daq_identifiers)} DAQ IDs added")
+        self.parent.logger.debug(f"XCPonCAN - DAQ filters: {can_filters}")
+
+    def close(self) -> None:
+        if self.reader is not None:
+            self.reader.close()
+        self.connected = False
+
+    def transmit(self, payload: bytes) -> None:
+        self.reader.send(self.parent.can_id_master.raw_id, payload, fd=self.parent.fd)
+
+    def transmit_block(self, payloads: List[bytes], pacer) -> None:
+        """Transmit `payloads` one per `pacer` slot; paced and sent natively, without the GIL."""
+        self.reader.send_block(self.parent.can_id_master.raw_id, payloads, fd=self.parent.fd, bitrate_switch=False, pacer=pacer)
+
+    def read_batch(self, timeout_ms: int = 100) -> List[Tuple[int, bytes, int]]:
+        """Frames received within `timeout_ms` as `(identifier, data, timestamp)`, empty on timeout.
+
+        In PID_OFF mode `data` is already prefixed with the ODT number.
+        """
+        if not self.connected:
+            return []
+        return self.reader.receive(timeout_ms)
+
+    def read(self) -> Optional[Frame]:
+        """Single-frame interface, compatible with :meth:`PythonCanWrapper.read` (PID_OFF payloads are already translated)."""
+        if not self._pending:
+            self._pending.extend(self.read_batch())
+            if not self._pending:
+                return None
+        raw_id, data, timestamp = self._pending.popleft()
+        return Frame(id_=Identifier(raw_id), dlc=len(data), data=data, timestamp=timestamp)
+
+    def receive_counters(self) -> Dict[Any, CanReceiveCounters]:
+        counters = CanReceiveCounters()
+        if self.reader is not None:
+            counters.received = self.reader.frames_received
+            counters.overflows = self.reader.overflows
+        return {self.channel: counters}
+
+    def get_timestamp_resolution(self) -> int:
+        return 1
+
+
+class CanBusMultiplexer:
+    """One CAN bus handle and receive thread shared by several XCP slaves on the same channel.
+
+    Pass the multiplexer as `transport_layer_interface` to each :class:`Can` transport (or `Master`);
+    received frames are routed by `can_id_slave` and DAQ identifiers to the owning transport.
+    The bus filters are the union of the filters of all attached transports.
+
+    The bus is either supplied (and left open on close, its original filters are restored) or
+    created from `bus_parameters` (python-can `Bus()` arguments) on the first connect and shut
+    down when the last transport is closed.
+
+    Example:
+
+    .. code-block:: python
+
+        mux = CanBusMultiplexer(interface="vector", channel=0, bitrate=500000)
+        with Master("can", config_ecu1, transport_layer_interface=mux) as ecu1, Master(
+            "can", config_ecu2, transport_layer_interface=mux
+        ) as ecu2:
+            ...
+    """
+
+    MAX_FRAMES_PER_WAKEUP = 256
+
+    def __init__(self, bus: Optional[BusABC] = None, **bus_parameters) -> None:
+        if bus is not None and bus_parameters:
+            raise ValueError("Either supply a bus or parameters to create one, not both.")
+        self.bus: Optional[BusABC] = bus
+        self.owns_bus: bool = bus is None
+        self.bus_parameters = bus_parameters
+        self.logger = logging.getLogger("pyxcp.transport.can.mux")
+        self.saved_filters = None
+        self.transports: Dict["Can", List[Dict]] = {}  # Attached transports and their filters.
+        # Raw identifier (bit 31 set: 29-bit) -> (transport, PID_OFF ODT number); replaced, never mutated.
+        self.routes: Dict[int, Tuple["Can", Optional[bytes]]] = {}
+        self.counters: Dict[Any, CanReceiveCounters] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._receiver: Optional[threading.Thread] = None
+
+    def __str__(self) -> str:
+        return f"CanBusMultiplexer({self.bus if self.bus is not None else self.bus_parameters!s})"
+
+    def attach(self, transport: "Can", daq_identifiers: List["Identifier"]) -> None:
+        """Route the responses and DAQ frames of `transport`; opens the bus and starts the receive thread if necessary."""
+        with self._lock:
+            routes = {key: route for key, route in self.routes.items() if route[0] is not transport}
+            identifiers = [transport.can_id_slave] + list(daq_identifiers)
+            for identifier in identifiers:
+                other = routes.get(identifier.raw_id)
+                if other is not None:
+                    raise ValueError(f"{identifier} is already used by another transport on this bus.")
+                routes[identifier.raw_id] = (transport, transport.can_id_pid_map.get(identifier.raw_id))
+            if self.bus is None:
+                self.bus = Bus(**self.bus_parameters)
+            elif not self.transports and not self.owns_bus:
+                self.saved_filters = self.bus.filters
+            self.transports[transport] = [identifier.create_filter_from_id() for identifier in identifiers]
+            self.routes = routes
+            self._update_filters()
+            if self._receiver is None:
+                self._stop_event = threading.Event()
+                self._receiver = threading.Thread(
+                    target=self._receive_loop, args=(self._stop_event,), name="CanBusMultiplexer", daemon=True
+                )
+                self._receiver.start()
+        self.logger.info(f"XCPonCAN - Multiplexer: {len(self.transports)} transport(s) on '{self.bus!s}'")
+
+    def detach(self, transport: "Can") -> None:
+        """Stop routing to `transport`; the last one stops the receive thread and releases the bus."""
+        receiver = None
+        with self._lock:
+            if self.transports.pop(transport, None) is None:
+                return
+            self.routes = {key: route for key, route in self.routes.items() if route[0] is not transport}
+            if self.transports:
+                self._update_filters()
+                return
+            self._stop_event.set()
+            receiver, self._receiver = self._receiver, None
+        if receiver is not None and receiver is not threading.current_thread():
+            receiver.join(timeout=1.0)
+        with self._lock:
+            if self.transports or self.bus is None:
+                return  # Re-attached in the meantime.
+            if self.owns_bus:
+                self.bus.shutdown()
+                self.bus = None
+            elif self.saved_filters is not None:
+                self.bus.set_filters(self.saved_filters)
+
+    def _update_filters(self) -> None:
+        filters = []
+        for transport_filters in self.transports.values():
+            filters.extend(fltr for fltr in transport_filters if fltr not in filters)
+        self.bus.set_filters(filters)
+        self.logger.debug(f"XCPonCAN - Multiplexer filters: {filters}")
+
+    def send(self, msg: Message) -> None:
+        with self._send_lock:
+            self.bus.send(msg)
+
+    def channel_counters(self, channel: Any = None) -> CanReceiveCounters:
+        if channel is None:
+            channel = self.bus_parameters.get("channel", "custom")
+        counters = self.counters.get(channel)
+        if counters is None:
+            counters = self.counters[channel] = CanReceiveCounters()
+        return counters
+
+    def receive_counters(self) -> Dict[Any, CanReceiveCounters]:
+        return dict(self.counters)
+
+    def _receive_loop(self, stop_event: threading.Event) -> None:
+        """Block for the first frame, drain the queued ones, then hand each transport its share as one policy batch."""
+        recv = self.bus.recv
+        stop_event_set = stop_event.is_set
+        channel_counters = self.channel_counters
+        while not stop_event_set():
+            received: Dict["Can", List[Tuple[bytes, int, Optional[bytes]]]] = {}
+            routes = {}
+            timeout = 0.1
+            count = 0
+            while count < self.MAX_FRAMES_PER_WAKEUP:
+                try:
+                    msg = recv(timeout)
+                except CanError:
+                    channel_counters().recv_errors += 1
+                    break
+                if msg is None:
+                    break
+                if timeout:
+                    routes = self.routes  # Taken after the wait, transports may have been attached meanwhile.
+                    timeout = 0.0
+                counters = channel_counters(msg.channel)
+                if msg.is_error_frame:
+                    counters.error_frames += 1
+                    continue
+                if msg.is_remote_frame or not len(msg.data):
+                    counters.invalid += 1
+                    continue
+                route = routes.get(msg.arbitration_id | CAN_EXTENDED_ID if msg.is_extended_id else msg.arbitration_id)
+                if route is None:
+                    counters.filtered += 1
+                    continue
+                counters.received += 1
+                count += 1
+                transport, pid = route
+                frames = received.get(transport)
+                if frames is None:
+                    frames = received[transport] = []
+                frames.append((msg.data, seconds_to_nanoseconds(msg.timestamp), pid))
+            for transport, frames in received.items():
+                self._deliver(transport, frames)
+
+    def _deliver(self, transport: "Can", frames: List[Tuple[bytes, int, Optional[bytes]]]) -> None:
+        batched = len(frames) > 1
+        if batched:
+            transport.begin_policy_batch()
+        try:
+            data_received = transport.data_received
+            for data, timestamp, odt in frames:
+                data_received(data, timestamp, odt)
+        except Exception as e:
+            transport.logger.error(f"Error in CAN multiplexer thread: {e}")
+        finally:
+            if batched:
+                transport.flush_policy_batch()
+
+
+class MultiplexedCan:
+    """Interface of a :class:`Can` transport attached to a :class:`CanBusMultiplexer`.
+
+    There is no receive thread per transport, the multiplexer delivers the frames.
+    """
+
+    def __init__(self, parent, multiplexer: CanBusMultiplexer) -> None:
+        self.parent = parent
+        self.multiplexer = multiplexer
+        self.daq_identifiers: List[Identifier] = list(parent.daq_identifier)
+        self.connected: bool = False
+
+    def connect(self) -> None:
+        if self.connected:
+            return
+        self.multiplexer.attach(self.parent, self.daq_identifiers)
+        self.parent.logger.info(f"XCPonCAN - Using {self.multiplexer!s}")
+        self.connected = True
+
+    def update_daq_filters(self, daq_identifiers: List) -> None:
+        """Route (and filter) the given DAQ identifiers to this transport."""
+        if not self.connected:
+            self.parent.logger.warning("Cannot update DAQ filters: not connected")
+            return
+        self.daq_identifiers = list(daq_identifiers)
+        self.multiplexer.attach(self.parent, self.daq_identifiers)
+        self.parent.logger.info(f"XCPonCAN - Updated DAQ filters: {len(daq_identifiers)} DAQ IDs added")
+
+    def close(self) -> None:
+        if self.connected:
+            self.multiplexer.detach(self.parent)
+        self.connected = False
+
+    def transmit(self, payload: bytes) -> None:
+        frame = Message(
+            arbitration_id=self.parent.can_id_master.id,
+            is_extended_id=self.parent.can_id_master.is_extended,
+            is_fd=self.parent.fd,
+            data=payload,
+        )
+        self.multiplexer.send(frame)
+
+    def transmit_block(self, payloads: List[bytes], pacer) -> None:
+        """Transmit `payloads` one per `pacer` slot, see :meth:`PythonCanWrapper.transmit_block`."""
+        master = self.parent.can_id_master
+        fd = self.parent.fd
+        frames = [
+            Message(arbitration_id=master.id, is_extended_id=master.is_extended, is_fd=fd, data=payload) for payload in payloads
+        ]
+        transport_ext.send_paced(self.multiplexer.send, frames, pacer)
+
+    def receive_counters(self) -> Dict[Any, CanReceiveCounters]:
+        return self.multiplexer.receive_counters()
+
     def get_timestamp_resolution(self) -> int:
         return 10 * 1000
 
@@ -451,6 +982,10 @@ class Can(BaseTransport):
     HEADER = EmptyHeader()
     HEADER_SIZE = 0
 
+    # Wait after a failed read in the batched listener (seconds), doubled per consecutive failure up to the maximum.
+    LISTEN_ERROR_BACKOFF: float = 0.05
+    LISTEN_ERROR_BACKOFF_MAX: float = 1.0
+
     def __init__(self, config, policy=None, transport_layer_interface: Optional[BusABC] = None):
         framing_config = XcpFramingConfig(
             transport_layer_type=XcpTransportLayerType.CAN,
@@ -481,24 +1016,20 @@ class Can(BaseTransport):
         self.padding_value = self.config.padding_value
         if transport_layer_interface is None:
             self.interface_name = self.config.interface
-            # On platforms that do not support certain backends (e.g., SocketCAN on Windows),
-            # python-can may raise OSError deep inside interface initialization. We want to
-            # fail fast with a clearer hint and avoid unhandled low-level errors.
-            try:
-                self.interface_configuration = detect_available_configs(interfaces=[self.interface_name])
-            except Exception as ex:
-                # Best-effort graceful message; keep original exception context
-                self.logger.critical(
-                    f"XCPonCAN - Failed to query available configs for interface {self.interface_name!r}: {ex.__class__.__name__}: {ex}"
-                )
-                self.interface_configuration = []
             parameters = self.get_interface_parameters()
         else:
             self.interface_name = "custom"
             # print("TRY GET PARAMs", self.get_interface_parameters())
             parameters = {}
+        self.use_native_socketcan: bool = getattr(self.config, "native_socketcan", False)
+        self.drain_receive: bool = getattr(self.config, "drain_receive", False)
+        if isinstance(transport_layer_interface, CanBusMultiplexer):
+            self.can_interface = MultiplexedCan(self, transport_layer_interface)
+        else:
+            self.can_interface = self._create_native_socketcan() if self.use_native_socketcan else None
         try:
-            self.can_interface = PythonCanWrapper(self, self.interface_name, config.timeout, **parameters)
+            if self.can_interface is None:
+                self.can_interface = PythonCanWrapper(self, self.interface_name, config.timeout, **parameters)
         except OSError as ex:
             # Catch platform-specific socket errors early (e.g., SocketCAN on Windows)
             msg = (
@@ -514,6 +1045,30 @@ class Can(BaseTransport):
             f"Slave-ID (Rx): 0x{self.can_id_slave.id:08X}{self.can_id_slave.type_str}"
         )
 
+    @property
+    def interface_configuration(self) -> List[Dict[str, Any]]:
+        """Available configurations of the interface as probed by python-can (on first use, cached per process)."""
+        if self.has_user_supplied_interface:
+            return []
+        return available_interface_configs(self.interface_name)
+
+    def receive_counters(self) -> Dict[Any, CanReceiveCounters]:
+        """Per-channel receive/drop counters of the interface."""
+        return self.can_interface.receive_counters()
+
+    def _create_native_socketcan(self) -> Optional[NativeSocketCan]:
+        """Native SocketCAN backend, `None` if not applicable (python-can is used then)."""
+        if self.has_user_supplied_interface or self.interface_name != "socketcan":
+            self.logger.warning(
+                f"XCPonCAN - Native SocketCAN requires interface 'socketcan', using python-can ({self.interface_name!r})."
+            )
+            return None
+        try:
+            return NativeSocketCan(self, self.config.channel, self.fd, getattr(self.config, "hardware_timestamps", False))
+        except CanInitializationError as ex:
+            self.logger.warning(f"XCPonCAN - {ex} Using python-can.")
+            return None
+
     def get_interface_parameters(self) -> Dict[str, Any]:
         result = dict(channel=self.config.channel)
 
@@ -553,11 +1108,16 @@ class Can(BaseTransport):
                 result.update(extra)
         return result
 
-    def data_received(self, payload: bytes, recv_timestamp: int):
+    def data_received(self, payload: bytes, recv_timestamp: int, odt: Optional[bytes] = None):
+        """`odt`: PID_OFF, the ODT number of a DAQ frame, identified by its CAN identifier (`payload` has no PID)."""
+        counter = (self.counter_received + 1) & 0xFFFF
+        if odt is not None:
+            self.process_daq_odt(odt, payload, counter, recv_timestamp)
+            return
         self.process_response(
             payload,
             len(payload),
-            counter=(self.counter_received + 1) & 0xFFFF,
+            counter=counter,
             recv_timestamp=recv_timestamp,
         )
 
@@ -572,10 +1132,16 @@ class Can(BaseTransport):
         The recv() call blocks for up to 100ms, which prevents CPU hogging while
         maintaining responsiveness for shutdown.
         """
+        if isinstance(self.can_interface, MultiplexedCan):
+            return  # Frames are delivered by the multiplexer's receive thread.
+        if self.drain_receive or isinstance(self.can_interface, NativeSocketCan):
+            self._listen_batched()
+            return
         # Cache frequently used methods and attributes for better performance
         close_event_set = self.closeEvent.is_set
         can_interface_read = self.can_interface.read
         data_received = self.data_received
+        pid_map = self.can_id_pid_map
 
         while True:
             # Check if we should exit the loop
@@ -587,17 +1153,61 @@ class Can(BaseTransport):
                 # read() internally uses recv(0.1) which blocks for 100ms max
                 frame = can_interface_read()
                 if frame:
-                    # Process the frame if one was received
-                    pid = self.can_id_pid_map.get(frame.id.raw_id)
-                    if pid is not None:
-                        # Translate CAN-ID to ODT number in PID_OFF mode.
-                        frame.data = pid + frame.data
-                    data_received(frame.data, frame.timestamp)
+                    # Process the frame if one was received; PID_OFF: the ODT number is passed separately.
+                    data_received(frame.data, frame.timestamp, pid_map.get(frame.id.raw_id) if pid_map else None)
                 # If no frame (None), recv() already waited 100ms, so loop immediately
             except Exception as e:
                 # Log any exceptions but continue processing
                 self.logger.error(f"Error in CAN listen thread: {e}")
 
+    def _listen_batched(self) -> None:
+        """Receive loop for :class:`NativeSocketCan` and drain mode: the frames of each wake-up are processed as one policy batch."""
+        close_event_set = self.closeEvent.is_set
+        read_batch = self.can_interface.read_batch
+        data_received = self.data_received
+        begin_policy_batch = self.begin_policy_batch
+        flush_policy_batch = self.flush_policy_batch
+        native = isinstance(self.can_interface, NativeSocketCan)
+        # PID_OFF: the native reader prefixes the ODT number itself, python-can payloads get it passed separately.
+        pid_map = None if native else self.can_id_pid_map
+        backoff = 0.0
+
+        while True:
+            if close_event_set():
+                return
+            try:
+                frames = read_batch(100)
+            except Exception as e:
+                if close_event_set():
+                    return
+                self.logger.error(f"Error in CAN listen thread: {e}")
+                if native and isinstance(e, OSError):
+                    # The raw socket is unusable.
+                    self.status = 0  # disconnected
+                    return
+                # Continue processing, but don't poll a failing interface in a tight loop.
+                backoff = min(backoff * 2 or self.LISTEN_ERROR_BACKOFF, self.LISTEN_ERROR_BACKOFF_MAX)
+                self.closeEvent.wait(backoff)
+                continue
+            backoff = 0.0
+            if not frames:
+                continue
+            batched = len(frames) > 1
+            if batched:
+                begin_policy_batch()
+            try:
+                if pid_map:
+                    for raw_id, data, timestamp in frames:
+                        data_received(data, timestamp, pid_map.get(raw_id))
+                else:
+                    for _, data, timestamp in frames:
+                        data_received(data, timestamp)
+            except Exception as e:
+                self.logger.error(f"Error in CAN listen thread: {e}")
+            finally:
+                if batched:
+                    flush_policy_batch()
+
     def connect(self):
         # Start listener lazily after a successful interface connection to avoid a dangling
         # thread waiting on a not-yet-connected interface if initialization fails.
@@ -624,16 +1234,25 @@ class Can(BaseTransport):
             self.logger.critical(msg)
             raise CanInitializationError(msg) from ex
         else:
-            # Only now start the default listener if requested.
-            if self.useDefaultListener:
+            # Only now start the default listener if requested (the multiplexer has its own).
+            if self.useDefaultListener and not isinstance(self.can_interface, MultiplexedCan):
                 self.start_listener()
         self.status = 1  # connected
 
     def send(self, frame: bytes) -> None:
         # send the request
-        self.pre_send_timestamp = self.timestamp.value
+        self.pre_send_timestamp = self.now()
         self.can_interface.transmit(payload=pad_frame(frame, self.max_dlc_required, self.padding_value))
-        self.post_send_timestamp = self.timestamp.value
+        self.post_send_timestamp = self.now()
+
+    def has_native_block_send(self) -> bool:
+        # All interfaces pace natively: SocketCAN sends in C++, python-can buses are called back from C++.
+        return True
+
+    def send_block(self, frames: List[bytes], pacer) -> None:
+        self.pre_send_timestamp = self.now()
+        self.can_interface.transmit_block([pad_frame(frame, self.max_dlc_required, self.padding_value) for frame in frames], pacer)
+        self.post_send_timestamp = self.now()
 
     def close_connection(self):
         if hasattr(self, "can_interface"):
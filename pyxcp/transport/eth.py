@@ -2,17 +2,22 @@
 import selectors
 import socket
 import struct
+import sys
 import threading
+import time
 from collections import deque
-from typing import Optional
+from typing import List, Optional
 
 import pyxcp.types as types
 from pyxcp.cpp_ext.cpp_ext import enable_ptp_timestamping, init_networking, receive_with_timestamp, check_timestamping_support
-from pyxcp.transport.transport_ext import EthReceiver
+from pyxcp.transport import transport_ext
+from pyxcp.transport.transport_ext import EthNativeReceiver, EthReceiver, FrameAcquisitionPolicy, PolicyLock
 
 from pyxcp.transport.base import (
     BaseTransport,
     ChecksumType,
+    ResponseSlot,
+    batch_feeder,
     XcpFramingConfig,
     XcpTransportLayerType,
 )
@@ -27,6 +32,8 @@ DEFAULT_XCP_DISCOVERY_RESPONSE_PORT = 5556
 
 RECV_SIZE = 8196
 
+WSAEMSGSIZE = 10040  # Windows: datagram longer than the receive buffer.
+
 
 def socket_to_str(sock: socket.socket) -> str:
     peer = sock.getpeername()
@@ -45,10 +52,48 @@ def socket_to_str(sock: socket.socket) -> str:
     return res
 
 
+class ReceiveBufferPool:
+    """Preallocated receive buffers for `recv_into()`.
+
+    Buffers are taken with :meth:`acquire` and given back with :meth:`release`
+    once their contents have been framed, so receiving doesn't allocate per
+    datagram. :meth:`resize` changes the size of the buffers handed out from
+    now on, buffers of the previous size are dropped.
+
+    Lock-free: `list.append()`/`list.pop()` are atomic.
+    """
+
+    MAX_POOLED = 64
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self._buffers: List[bytearray] = []
+
+    def acquire(self) -> bytearray:
+        size = self.size
+        while self._buffers:
+            try:
+                buffer = self._buffers.pop()
+            except IndexError:
+                break
+            if len(buffer) == size:
+                return buffer
+        return bytearray(size)
+
+    def release(self, buffer) -> None:
+        if type(buffer) is bytearray and len(buffer) == self.size and len(self._buffers) < self.MAX_POOLED:
+            self._buffers.append(buffer)
+
+    def resize(self, size: int) -> None:
+        if size != self.size:
+            self.size = size
+            self._buffers.clear()
+
+
 class Eth(BaseTransport):
     """"""
 
-    MAX_DATAGRAM_SIZE = 512
+    MAX_UDP_PAYLOAD = 65507
     HEADER = struct.Struct("<HH")
 
     def __init__(self, config=None, policy=None, transport_layer_interface: Optional[socket.socket] = None) -> None:
@@ -130,6 +175,23 @@ class Eth(BaseTransport):
         self._packets = deque()
         self._packets_condition = threading.Condition()
         self._eth_receiver = EthReceiver(self.process_response)
+        self.use_native_receiver: bool = getattr(self.config, "native_receiver", False)
+        if self.use_native_receiver:
+            # Shared with the native receive thread, which holds it while feeding DAQ frames to the policy.
+            self.policy_lock = PolicyLock()
+        self.recv_batch_size: int = getattr(self.config, "recv_batch_size", 1)
+        self.single_thread_receive: bool = getattr(self.config, "single_thread_receive", False)
+        self.decouple_policy: bool = getattr(self.config, "decouple_policy", False)
+        # UDP: fixed by `max_datagram_size`, otherwise sized from MAX_CTO/MAX_DTO after CONNECT.
+        self._fixed_datagram_size: int = getattr(self.config, "max_datagram_size", 0)
+        self.datagram_size: int = self._fixed_datagram_size or RECV_SIZE
+        # Datagrams cut off at `datagram_size` by the Python receive paths.
+        self._truncated_datagrams: int = 0
+        self._recv_buffers = ReceiveBufferPool(RECV_SIZE if self.use_tcp else self.datagram_size)
+        self._batch_reader = None
+        self._native_receiver: Optional[EthNativeReceiver] = None
+        self.batched_block_send: bool = getattr(self.config, "batched_block_send", False)
+        self._block_sender = None
 
         # XCP 1.5: Multicast socket for GET_DAQ_CLOCK_MULTICAST
         self._multicast_sock: Optional[socket.socket] = None
@@ -139,19 +201,109 @@ class Eth(BaseTransport):
         if self.status == 0:
             self.sock.connect(self.sockaddr)
             self.logger.info(socket_to_str(self.sock))
+            self._block_sender = self._create_block_sender()
             self.start_listener()
             self.status = 1  # connected
 
     def start_listener(self) -> None:
+        if self.use_native_receiver and self._start_native_receiver():
+            return
+        if self.decouple_policy:
+            self.start_policy_worker()
         super().start_listener()
+        if self.single_thread_receive:
+            # `listen()` reads, frames and dispatches on its own; no packet listener thread.
+            return
         if self._packet_listener.is_alive():
             self._packet_listener.join(timeout=2.0)
         self._packet_listener = threading.Thread(target=self._packet_listen, daemon=True)
         self._packet_listener.start()
 
+    def _start_native_receiver(self) -> bool:
+        """Hand the receiving side of the socket over to a native thread.
+
+        DAQ frames go straight from the socket into the policy's native `feed_batch()`,
+        all other frames are passed to :meth:`process_response` as usual.
+
+        Returns
+        -------
+        bool
+            `False` if the native receiver cannot be used with the current setup.
+        """
+        if self.ptp_enabled:
+            self.logger.warning("XCPonEth - Native receiver does not support PTP timestamping, using Python receiver.")
+            return False
+        if not self._has_native_batch_sink():
+            self.logger.warning(
+                f"XCPonEth - Policy {self.policy.__class__.__name__!r} has no native feed_batch(), using Python receiver."
+            )
+            return False
+        self.stop_native_receiver()
+        self.closeEvent.clear()
+        self._native_receiver = EthNativeReceiver(
+            sock=self.sock.fileno(),
+            tcp=self.use_tcp,
+            recv_size=RECV_SIZE if self.use_tcp else self.datagram_size,
+            daq_timestamps=self.create_daq_timestamps,
+            policy=self.policy,
+            dispatch_handler=self.process_response,
+            policy_lock=self.policy_lock,
+            clock_offset=self.timestamp.offset,
+        )
+        self._native_receiver.start()
+        self.logger.info("XCPonEth - Using native receiver.")
+        return True
+
+    def _has_native_batch_sink(self) -> bool:
+        if not callable(getattr(self.policy, "_frame_batch_sink", None)):
+            return False
+        # `FrameAcquisitionPolicy` hands batches to a Python `feed()` override, the other native policies would bypass it.
+        return isinstance(self.policy, FrameAcquisitionPolicy) or batch_feeder(self.policy) is not None
+
+    def stop_native_receiver(self) -> None:
+        if self._native_receiver is not None:
+            self._native_receiver.stop()
+            if self._native_receiver.error:
+                self.logger.debug(f"XCPonEth - Native receiver stopped: {self._native_receiver.error}")
+            if self._native_receiver.truncated:
+                self._datagrams_truncated(self._native_receiver.truncated)
+            self._native_receiver = None
+
+    @property
+    def truncated_datagrams(self) -> int:
+        """UDP datagrams longer than `datagram_size`; the XCP packets at their tail were lost."""
+        count = self._truncated_datagrams
+        if self._native_receiver is not None:
+            count += self._native_receiver.truncated
+        return count
+
+    def _datagrams_truncated(self, count: int = 1) -> None:
+        first = not self._truncated_datagrams
+        self._truncated_datagrams += count
+        (self.logger.warning if first else self.logger.debug)(
+            f"XCPonEth - Datagram longer than {self.datagram_size} bytes truncated "
+            f"({self._truncated_datagrams} so far), set `c.Transport.Eth.max_datagram_size`."
+        )
+
+    def _wait_response(self, slot: ResponseSlot) -> bytes:
+        receiver = self._native_receiver
+        if receiver is not None:
+            # DAQ frames bypass `process_response()`; extend the deadline here as long as DAQ keeps flowing.
+            daq_frames = receiver.daq_frames
+            while True:
+                response = slot.wait()
+                if response is not None:
+                    return response
+                if receiver.daq_frames == daq_frames:
+                    break
+                daq_frames = receiver.daq_frames
+                slot.extend()
+        return super()._wait_response(slot)
+
     def close(self) -> None:
         """Close the transport-layer connection and event-loop."""
         self.finish_listener()
+        self.stop_native_receiver()
         try:
             if self.listener.is_alive():
                 self.listener.join(timeout=2.0)
@@ -166,30 +318,105 @@ class Eth(BaseTransport):
             # RuntimeError: thread not started yet or already stopped
             # AttributeError: _packet_listener object not initialized
             pass
+        self.stop_policy_worker()
         self.close_connection()
 
+    def set_max_packet_sizes(self, max_cto: int, max_dto: int) -> None:
+        """Grow the UDP receive buffers for a negotiated MAX_CTO/MAX_DTO above `RECV_SIZE`.
+
+        The buffers stay at `RECV_SIZE` (8196 bytes) unless `4 + max(MAX_CTO, MAX_DTO)` is larger,
+        a datagram may carry several XCP packets; a configured `max_datagram_size` takes precedence.
+        TCP is a byte stream, reassembled by the framing layer, so `RECV_SIZE` stays.
+        """
+        if self.use_tcp or self._fixed_datagram_size:
+            return
+        size = min(max(RECV_SIZE, self.HEADER.size + max(max_cto, max_dto)), Eth.MAX_UDP_PAYLOAD)
+        if size == self.datagram_size:
+            return
+        self.datagram_size = size
+        self._recv_buffers.resize(size)
+        if self._batch_reader is not None:
+            self._batch_reader.datagram_size = size
+        if self._native_receiver is not None:
+            self._native_receiver.recv_size = size
+        self.logger.debug(f"XCPonEth - Receive datagram size: {size} bytes (MAX_CTO={max_cto}, MAX_DTO={max_dto}).")
+
+    def _create_batch_reader(self):
+        """`recvmmsg()` based reader for UDP (Linux only), `None` if not applicable."""
+        if self.use_tcp or self.ptp_enabled or self.recv_batch_size <= 1:
+            return None
+        reader_class = getattr(transport_ext, "UdpBatchReader", None)
+        if reader_class is None:
+            return None
+        try:
+            return reader_class(
+                sock=self.sock.fileno(),
+                max_datagrams=self.recv_batch_size,
+                datagram_size=self.datagram_size,
+                clock_offset=self.timestamp.offset,
+            )
+        except (TypeError, ValueError) as ex:
+            self.logger.debug(f"XCPonEth - Batched receive not available: {ex}")
+            return None
+
+    def _create_block_sender(self):
+        """`sendmsg()`/`sendmmsg()` based block-mode transmit (Linux only), `None` if not applicable."""
+        if not self.batched_block_send:
+            return None
+        sender_class = getattr(transport_ext, "EthBlockSender", None)
+        if sender_class is None:
+            return None
+        try:
+            return sender_class(sock=self.sock.fileno(), timeout_ms=max(1, self.timeout // 1_000_000))
+        except (TypeError, ValueError) as ex:
+            self.logger.debug(f"XCPonEth - Batched block transmit not available: {ex}")
+            return None
+
     def _packet_listen(self) -> None:
+        self._batch_reader = self._create_batch_reader()
+        if self._batch_reader is not None:
+            self._packet_listen_batched(self._batch_reader)
+            return
         use_tcp: bool = self.use_tcp
         EVENT_READ = selectors.EVENT_READ
         close_event_set = self.closeEvent.is_set
         socket_fileno = self.sock.fileno
         select = self.selector.select
-        _packets = self._packets
-        _packets_condition = self._packets_condition
         ptp_enabled = self.ptp_enabled
+        pool = self._recv_buffers
+        acquire = pool.acquire
+        release = pool.release
+        if self.single_thread_receive:
+            feed_frame = self._eth_receiver.feed_frame
+
+            def deliver(buffer: bytearray, count: int, recv_timestamp: int) -> None:
+                feed_frame(memoryview(buffer)[:count], recv_timestamp)
+                release(buffer)
 
-        if use_tcp:
-            sock_recv = self.sock.recv
         else:
-            if ptp_enabled:
-                if hasattr(socket, "SO_TIMESTAMPING"):  # Linux
-                    sock_recvmsg = self.sock.recvmsg
-                else:
-                    # Windows uses C++ helper
-                    def win_recv_with_ts(size):
-                        return receive_with_timestamp(socket_fileno(), size)
+            _packets = self._packets
+            _packets_condition = self._packets_condition
+
+            def deliver(buffer: bytearray, count: int, recv_timestamp: int) -> None:
+                # The buffer goes back to the pool once `listen()` has framed it.
+                with _packets_condition:
+                    _packets.append((memoryview(buffer)[:count], recv_timestamp))
+                    _packets_condition.notify()
+
+        perf_counter_ns = time.perf_counter_ns
+        time_ns = time.time_ns
+        clock_offset = self._clock_offset
+        # Linux: MSG_TRUNC makes `recv_into()` return the real length of a truncated datagram.
+        recv_flags = socket.MSG_TRUNC if not use_tcp and sys.platform == "linux" else 0
+
+        sock_recv_into = self.sock.recv_into
+        if ptp_enabled and not use_tcp:
+            if hasattr(socket, "SO_TIMESTAMPING"):  # Linux
+                sock_recvmsg_into = self.sock.recvmsg_into
             else:
-                sock_recv = self.sock.recvfrom
+                # Windows uses C++ helper
+                def win_recv_with_ts(size):
+                    return receive_with_timestamp(socket_fileno(), size)
 
         while True:
             try:
@@ -198,51 +425,39 @@ class Eth(BaseTransport):
                 sel = select(0.02)
                 for _, events in sel:
                     if events & EVENT_READ:
-                        if use_tcp:
-                            recv_timestamp = self.timestamp.value
-                            response = sock_recv(RECV_SIZE)
-                            if not response:
-                                self.sock.close()
-                                self.status = 0
-                                break
+                        buffer = acquire()
+                        if use_tcp or not ptp_enabled:
+                            recv_timestamp = perf_counter_ns() + clock_offset
+                            try:
+                                count = sock_recv_into(buffer, 0, recv_flags)
+                            except OSError as ex:
+                                if getattr(ex, "winerror", None) != WSAEMSGSIZE:
+                                    raise
+                                count = len(buffer) + 1  # The buffer is filled nevertheless.
+                            if count > len(buffer):
+                                self._datagrams_truncated()
+                                count = len(buffer)
+                        elif hasattr(socket, "SO_TIMESTAMPING"):  # Linux
+                            count, ancdata, flags, address = sock_recvmsg_into([buffer], 1024)
+                            now = perf_counter_ns() + clock_offset
+                            recv_timestamp = self._extract_linux_timestamp(ancdata, time_ns() - now) or now
+                            if flags & socket.MSG_TRUNC:
+                                self._datagrams_truncated()
+                        else:  # Windows
+                            res = win_recv_with_ts(len(buffer))
+                            if res:
+                                response, recv_timestamp = res
+                                count = len(response)
+                                buffer[:count] = response
                             else:
-                                with _packets_condition:
-                                    _packets.append((bytes(response), recv_timestamp))
-                                    _packets_condition.notify()
-                        else:
-                            if ptp_enabled:
-                                if hasattr(socket, "SO_TIMESTAMPING"):  # Linux
-                                    # 32 is a guess for ancdata size, might need adjustment
-                                    response, ancdata, flags, address = sock_recvmsg(Eth.MAX_DATAGRAM_SIZE, 1024)
-                                    recv_timestamp = self._extract_linux_timestamp(ancdata) or self.timestamp.value
-                                else:  # Windows
-                                    res = win_recv_with_ts(Eth.MAX_DATAGRAM_SIZE)
-                                    if res:
-                                        response, recv_timestamp = res
-                                    else:
-                                        # Fallback if helper fails
-                                        response, _ = self.sock.recvfrom(Eth.MAX_DATAGRAM_SIZE)
-                                        recv_timestamp = self.timestamp.value
-
-                                if not response:
-                                    self.sock.close()
-                                    self.status = 0
-                                    break
-                                else:
-                                    with _packets_condition:
-                                        _packets.append((bytes(response), recv_timestamp))
-                                        _packets_condition.notify()
-                            else:
-                                recv_timestamp = self.timestamp.value
-                                response, _ = self.sock.recvfrom(Eth.MAX_DATAGRAM_SIZE)
-                                if not response:
-                                    self.sock.close()
-                                    self.status = 0
-                                    break
-                                else:
-                                    with _packets_condition:
-                                        _packets.append((bytes(response), recv_timestamp))
-                                        _packets_condition.notify()
+                                # Fallback if helper fails
+                                recv_timestamp = perf_counter_ns() + clock_offset
+                                count = sock_recv_into(buffer)
+                        if not count:
+                            self.sock.close()
+                            self.status = 0
+                            break
+                        deliver(buffer, count, recv_timestamp)
             except (OSError, ValueError) as ex:
                 self.status = 0  # disconnected
                 if close_event_set() or socket_fileno() == -1:
@@ -255,10 +470,66 @@ class Eth(BaseTransport):
                 self.logger.exception("Unexpected Ethernet packet listener failure")
                 break
 
-    def _extract_linux_timestamp(self, ancdata) -> Optional[int]:
+    def _packet_listen_batched(self, reader) -> None:
+        """Drain the socket with one `recvmmsg()` per wake-up; each `DatagramBatch` is handled as a whole."""
+        close_event_set = self.closeEvent.is_set
+        socket_fileno = self.sock.fileno
+        receive = reader.receive
+        if self.single_thread_receive:
+            feed_datagrams = self._eth_receiver.feed_datagrams
+            begin_policy_batch = self.begin_policy_batch
+            flush_policy_batch = self.flush_policy_batch
+
+            def deliver(batch) -> None:
+                if len(batch) == 1:
+                    feed_datagrams(batch)
+                    return
+                begin_policy_batch()
+                try:
+                    feed_datagrams(batch)
+                finally:
+                    flush_policy_batch()
+
+        else:
+            _packets = self._packets
+            _packets_condition = self._packets_condition
+
+            def deliver(batch) -> None:
+                with _packets_condition:
+                    # A `None` timestamp marks a `DatagramBatch`, the datagrams carry their own.
+                    _packets.append((batch, None))
+                    _packets_condition.notify()
+
+        truncated = reader.truncated
+        while True:
+            try:
+                if close_event_set() or socket_fileno() == -1:
+                    return
+                batch = receive(20)
+                if batch is not None:
+                    if reader.truncated != truncated:
+                        self._datagrams_truncated(reader.truncated - truncated)
+                        truncated = reader.truncated
+                    deliver(batch)
+            except OSError as ex:
+                self.status = 0  # disconnected
+                if close_event_set() or socket_fileno() == -1:
+                    self.logger.debug("Ethernet packet listener stopped during socket shutdown: %s", ex)
+                else:
+                    self.logger.exception("Ethernet packet listener socket failure")
+                break
+            except Exception:
+                self.status = 0  # disconnected
+                self.logger.exception("Unexpected Ethernet packet listener failure")
+                break
+
+    def _extract_linux_timestamp(self, ancdata, realtime_delta: int = 0) -> Optional[int]:
         # SO_TIMESTAMPING returns a struct scm_timestamping
         # which contains 3 timespecs: software, transformed, hardware.
         # We want the hardware one (index 2) if available, otherwise software (index 0).
+        # Hardware (PHC) stamps are returned as-is, in the NIC's time base; software stamps are
+        # wall-clock and mapped onto the transport clock by subtracting `realtime_delta`
+        # (`time.time_ns()` minus transport time, taken right after the receive).
         for cmsg_level, cmsg_type, cmsg_data in ancdata:
             if cmsg_level == socket.SOL_SOCKET and cmsg_type == socket.SO_TIMESTAMPING:
                 # struct timespec { long tv_sec; long tv_nsec; } x 3
@@ -270,16 +541,23 @@ class Eth(BaseTransport):
                     if ts[4] != 0:
                         return ts[4] * 1_000_000_000 + ts[5]
                     # Fallback to software (ts[0], ts[1])
-                    return ts[0] * 1_000_000_000 + ts[1]
+                    return ts[0] * 1_000_000_000 + ts[1] - realtime_delta
         return None
 
     def listen(self) -> None:
+        if self.single_thread_receive:
+            self._packet_listen()
+            return
         popleft = self._packets.popleft
         close_event_set = self.closeEvent.is_set
         socket_fileno = self.sock.fileno
         _packets = self._packets
         _packets_condition = self._packets_condition
         feed_frame = self._eth_receiver.feed_frame
+        feed_datagrams = getattr(self._eth_receiver, "feed_datagrams", None)
+        begin_policy_batch = self.begin_policy_batch
+        flush_policy_batch = self.flush_policy_batch
+        release = self._recv_buffers.release
 
         while True:
             if close_event_set() or socket_fileno() == -1:
@@ -293,16 +571,51 @@ class Eth(BaseTransport):
                     # Wait with timeout to periodically check close event
                     _packets_condition.wait(timeout=0.1)
 
-                # Process all available packets
+                # Process all available packets; bursts are handed to the policy as one batch,
+                # a lone packet (typical command response) is fed directly.
                 count = len(_packets)
-                for _ in range(count):
-                    bts, timestamp = popleft()
-                    feed_frame(bts, timestamp)
+                if count == 1:
+                    bts, timestamp = _packets[0]
+                    if timestamp is not None or len(bts) == 1:
+                        popleft()
+                        if timestamp is None:
+                            feed_datagrams(bts)
+                        else:
+                            feed_frame(bts, timestamp)
+                            release(bts.obj)
+                        continue
+                begin_policy_batch()
+                try:
+                    for _ in range(count):
+                        bts, timestamp = popleft()
+                        if timestamp is None:
+                            feed_datagrams(bts)
+                        else:
+                            feed_frame(bts, timestamp)
+                            release(bts.obj)
+                finally:
+                    flush_policy_batch()
 
     def send(self, frame) -> None:
-        self.pre_send_timestamp = self.timestamp.value
+        self.pre_send_timestamp = self.now()
         self.sock.send(frame)
-        self.post_send_timestamp = self.timestamp.value
+        self.post_send_timestamp = self.now()
+
+    def has_native_block_send(self) -> bool:
+        return self._block_sender is not None or (self.batched_block_send and self.use_tcp)
+
+    def send_block(self, frames: List[bytes], pacer) -> None:
+        if self._block_sender is not None:
+            self.pre_send_timestamp = self.now()
+            self._block_sender.send_block(frames, pacer)
+            self.post_send_timestamp = self.now()
+        elif self.batched_block_send and self.use_tcp and not pacer.interval_ns:
+            # No separation time: one write for the whole block.
+            self.pre_send_timestamp = self.now()
+            self.sock.sendall(b"".join(frames))
+            self.post_send_timestamp = self.now()
+        else:
+            super().send_block(frames, pacer)
 
     def close_connection(self) -> None:
         if not self.invalidSocket:
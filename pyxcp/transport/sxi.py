@@ -1,10 +1,9 @@
-import threading
-from collections import deque
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import serial
 
+from pyxcp.transport import transport_ext
 from pyxcp.transport.transport_ext import (
     SxiFrLBCN,
     SxiFrLBC8,
@@ -110,13 +109,8 @@ class SxI(BaseTransport):
             except serial.SerialException as e:
                 self.logger.critical(f"XCPonSxI - {e}")
                 raise
-        self._condition = threading.Condition()
-        self._frames = deque()
-        # self._frame_listener = threading.Thread(
-        #    target=self._frame_listen,
-        #    args=(),
-        #    kwargs={},
-        # )
+        self._read_timestamp: int = self.now()
+        self.serial_reader = None
 
     def __del__(self) -> None:
         self.close_connection()
@@ -141,13 +135,17 @@ class SxI(BaseTransport):
     def flush(self) -> None:
         self.comm_port.flush()
 
-    def start_listener(self) -> None:
-        super().start_listener()
-        if hasattr(self, "_frame_listener") and self._frame_listener.is_alive():
-            self._frame_listener.join(timeout=2.0)
-        self._frame_listener = threading.Thread(target=self._frame_listen, daemon=True)
-        self._frame_listener.start()
-        # self._listener_running.wait(2.0)
+    def _create_serial_reader(self) -> Optional[Any]:
+        """Native bulk reader on the port's file descriptor (Linux), None if not applicable."""
+        if not hasattr(transport_ext, "SerialReader"):
+            return None
+        try:
+            fd = self.comm_port.fileno()
+        except (AttributeError, OSError, ValueError, serial.SerialException):
+            return None  # E.g. `serial_for_url()` ports without a file descriptor.
+        if not isinstance(fd, int):
+            return None
+        return transport_ext.SerialReader(fd, RECV_SIZE)
 
     def close(self) -> None:
         """Close the transport-layer connection and event-loop."""
@@ -158,51 +156,53 @@ class SxI(BaseTransport):
                 self.listener.join(timeout=2.0)
         except Exception:
             pass
-        try:
-            if hasattr(self, "_frame_listener") and self._frame_listener.is_alive():
-                self._frame_listener.join(timeout=2.0)
-        except Exception:
-            pass
         self.close_connection()
 
     def listen(self) -> None:
+        """Read, parse and dispatch in one thread: frames go from the receiver straight to `process_response()`."""
+        if self.serial_reader is None:
+            self.serial_reader = self._create_serial_reader()
+        if self.serial_reader is not None:
+            read = self.serial_reader.read
+        else:
+            read = self._read_port
+        feed_bytes = self.receiver.feed_bytes
         while True:
             if self.closeEvent.is_set():
                 return
-            frame_to_process = None
-            with self._condition:
-                while not self._frames:
-                    res = self._condition.wait(1.0)
-                    if not res:
-                        break
-                if self._frames:
-                    frame_to_process = self._frames.popleft()
-
-            if frame_to_process:
-                frame, length, counter, timestamp = frame_to_process
-                self.process_response(frame, length, counter, timestamp)
-
-    def _frame_listen(self) -> None:
-        # self._listener_running.set()
-        while True:
-            if self.closeEvent.is_set():
+            try:
+                data = read(100)
+            except OSError as ex:
+                if not self.closeEvent.is_set():
+                    self.logger.error(f"XCPonSxI - reading from {self.port_name!r} failed: {ex}")
                 return
-            data = self.comm_port.read(1)
-            if data:
-                self.receiver.feed_bytes(data)
-                data = self.comm_port.read(self.comm_port.in_waiting)
-                if data:
-                    self.receiver.feed_bytes(data)
+            if not data:
+                continue
+            # All frames completed by one read share its reception timestamp.
+            self._read_timestamp = self.now()
+            self.begin_policy_batch()
+            try:
+                feed_bytes(data)
+            finally:
+                self.flush_policy_batch()
+
+    def _read_port(self, timeout_ms: int) -> bytes:
+        # pyserial fallback: wait up to `timeout_ms` for one byte, then take everything buffered.
+        timeout = timeout_ms / 1000.0
+        if self.comm_port.timeout != timeout:
+            self.comm_port.timeout = timeout  # Reconfigures the port, so only if it changed (i.e. once).
+        data = self.comm_port.read(1)
+        if data and self.comm_port.in_waiting:
+            data += self.comm_port.read(self.comm_port.in_waiting)
+        return data
 
     def frame_dispatcher(self, data: bytes, length: int, counter: int) -> None:
-        with self._condition:
-            self._frames.append((bytes(data), length, counter, self.timestamp.value))
-            self._condition.notify()
+        self.process_response(data, length, counter, self._read_timestamp)
 
     def send(self, frame: bytes) -> None:
-        self.pre_send_timestamp = self.timestamp.value
+        self.pre_send_timestamp = self.now()
         self.comm_port.write(frame)
-        self.post_send_timestamp = self.timestamp.value
+        self.post_send_timestamp = self.now()
 
     def close_connection(self) -> None:
         if hasattr(self, "comm_port") and self.comm_port.is_open and not self.has_user_supplied_interface:
@@ -62,6 +62,16 @@ public:
 
 	virtual void feed(FrameCategory frame_category, std::uint32_t counter, std::uint64_t timestamp, const payload_t& payload) = 0;
 
+	/*
+		Feed all frames received during one listener wake-up in a single call.
+		The default implementation forwards each frame to `feed()`.
+	*/
+	virtual void feed_batch(const FrameBatchView& batch) {
+		for (std::size_t idx = 0; idx < batch.count; ++idx) {
+			feed(static_cast<FrameCategory>(batch.categories[idx]), batch.counters[idx], batch.timestamps[idx], payload_t(batch.payload(idx)));
+		}
+	}
+
 	virtual void finalize() = 0;
 
 protected:
@@ -81,6 +91,8 @@ public:
 
 	void feed(FrameCategory frame_category, std::uint32_t counter, std::uint64_t timestamp, const payload_t& payload) override {}
 
+	void feed_batch(const FrameBatchView& batch) override {}
+
 	void finalize() override {}
 };
 
@@ -205,6 +217,15 @@ public:
 		}
 	}
 
+	void feed_batch(const FrameBatchView& batch) override {
+		for (std::size_t idx = 0; idx < batch.count; ++idx) {
+			const auto frame_category = static_cast<FrameCategory>(batch.categories[idx]);
+			if (m_filter_out && (!(*m_filter_out).contains(frame_category))) {
+				m_writer->add_frame(batch.categories[idx], batch.counters[idx], batch.timestamps[idx], batch.lengths[idx], batch.data + batch.offsets[idx]);
+			}
+		}
+	}
+
 	void finalize() override {
 		m_writer->finalize();
 	}
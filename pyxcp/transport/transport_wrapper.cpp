@@ -7,11 +7,19 @@
 #include <pybind11/stl.h>
 
 #include <cstdint>
+#include <limits>
 
+#include "eth_native.hpp"  // First: winsock2.h has to precede windows.h.
 #include "transport_ext.hpp"
 #include "framing.hpp"
 #include "sxi_framing.hpp"
+#include "usb_framing.hpp"
 #include "eth_framing.hpp"
+#include "eth_mmsg.hpp"
+#include "socketcan.hpp"
+#include "serial_reader.hpp"
+#include "pdu_ring.hpp"
+#include "pacer.hpp"
 
 
 namespace py = pybind11;
@@ -41,6 +49,13 @@ using SxiFrLFWCN  = SxiReceiver< SxiHeaderFormat::LenFillWord, SxiChecksumType::
 using SxiFrLFWC8  = SxiReceiver< SxiHeaderFormat::LenFillWord, SxiChecksumType::Sum8>;
 using SxiFrLFWC16 = SxiReceiver< SxiHeaderFormat::LenFillWord, SxiChecksumType::Sum16>;
 
+#if defined(__linux__)
+// `std::system_error` -> `OSError(errno, message)`.
+[[noreturn]] static void raise_os_error(const std::system_error &error) {
+    PyErr_SetObject(PyExc_OSError, py::make_tuple(error.code().value(), error.what()).ptr());
+    throw py::error_already_set();
+}
+#endif
 
 class PyFrameAcquisitionPolicy : public FrameAcquisitionPolicy {
    public:
@@ -53,6 +68,22 @@ class PyFrameAcquisitionPolicy : public FrameAcquisitionPolicy {
         PYBIND11_OVERRIDE_PURE(void, FrameAcquisitionPolicy, feed, frame_category, counter, timestamp, payload);
     }
 
+    void feed_batch(const FrameBatchView& batch) override {
+        // Hand payloads to Python-side `feed()` overrides as `bytes`, not as (UTF-8 decoded) `str`.
+        py::gil_scoped_acquire gil;
+        py::function           feed = py::get_override(static_cast<const FrameAcquisitionPolicy*>(this), "feed");
+        if (!feed) {
+            FrameAcquisitionPolicy::feed_batch(batch);
+            return;
+        }
+        for (std::size_t idx = 0; idx < batch.count; ++idx) {
+            feed(
+                static_cast<FrameCategory>(batch.categories[idx]), batch.counters[idx], batch.timestamps[idx],
+                py::bytes(batch.data + batch.offsets[idx], batch.lengths[idx])
+            );
+        }
+    }
+
 
     void finalize() override {
         PYBIND11_OVERRIDE_PURE(void, FrameAcquisitionPolicy, finalize);
@@ -60,6 +91,87 @@ class PyFrameAcquisitionPolicy : public FrameAcquisitionPolicy {
 };
 
 
+/*
+    Lock serializing all calls into a policy, shared by Python threads (`with lock:`)
+    and native receive threads (`mutex()`). Waiting for it releases the GIL,
+    so a native thread holding it may still call into Python.
+*/
+class PolicyLock {
+   public:
+
+    void acquire() {
+        if (!m_mutex.try_lock()) {
+            py::gil_scoped_release release;
+            m_mutex.lock();
+        }
+    }
+
+    void release() {
+        m_mutex.unlock();
+    }
+
+    std::mutex& mutex() noexcept {
+        return m_mutex;
+    }
+
+   private:
+
+    std::mutex m_mutex;
+};
+
+
+/*
+    Python facing owner of an `EthNativeReceiver`: keeps the policy and the
+    dispatch handler alive and makes sure the receive thread is stopped
+    (with the GIL released) before they go away.
+*/
+class PyEthNativeReceiver {
+   public:
+
+    PyEthNativeReceiver(
+        native_socket_t sock, bool tcp, std::size_t recv_size, bool daq_timestamps, py::object policy, py::function dispatch_handler,
+        std::uint64_t clock_offset, py::object policy_lock
+    ) :
+        m_policy(std::move(policy)), m_dispatch(std::move(dispatch_handler)), m_policy_lock(std::move(policy_lock)) {
+        if (!py::hasattr(m_policy, "_frame_batch_sink") || m_policy.attr("_frame_batch_sink").is_none()) {
+            throw py::type_error("EthNativeReceiver: policy does not provide a native `feed_batch()`.");
+        }
+        m_sink_capsule = m_policy.attr("_frame_batch_sink")();
+        const FrameBatchSink sink = *m_sink_capsule.get_pointer<FrameBatchSink>();
+
+        m_receiver = std::make_unique<EthNativeReceiver>(
+            sock, tcp, recv_size, daq_timestamps, sink,
+            [this](const std::vector<std::uint8_t>& payload, std::uint16_t length, std::uint16_t counter, std::uint64_t timestamp) {
+                py::gil_scoped_acquire acquire;
+                try {
+                    m_dispatch(py::bytes(reinterpret_cast<const char*>(payload.data()), payload.size()), length, counter, timestamp);
+                } catch (py::error_already_set& ex) {
+                    ex.discard_as_unraisable("EthNativeReceiver dispatch_handler");
+                }
+            },
+            clock_offset, m_policy_lock.is_none() ? nullptr : &m_policy_lock.cast<PolicyLock&>().mutex()
+        );
+    }
+
+    ~PyEthNativeReceiver() {
+        py::gil_scoped_release release;
+        m_receiver->stop();
+    }
+
+    EthNativeReceiver& receiver() noexcept {
+        return *m_receiver;
+    }
+
+   private:
+
+    py::object                         m_policy;
+    py::function                       m_dispatch;
+    py::object                         m_policy_lock;
+    py::capsule                        m_sink_capsule;
+    std::unique_ptr<EthNativeReceiver> m_receiver;
+};
+
+
 PYBIND11_MODULE(transport_ext, m) {
     m.doc() = "pyXCP transport-layer base classes.";
 
@@ -77,6 +189,8 @@ PYBIND11_MODULE(transport_ext, m) {
 	py::class_<FrameAcquisitionPolicy, PyFrameAcquisitionPolicy>(m, "FrameAcquisitionPolicy", py::dynamic_attr())
 		.def(py::init<const std::optional<FrameAcquisitionPolicy::filter_t>&>(), py::arg("filtered_out") = std::nullopt)
 		.def("feed", &FrameAcquisitionPolicy::feed)
+		.def("feed_batch", &policy_feed_batch<FrameAcquisitionPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+		.def("_frame_batch_sink", &policy_frame_batch_sink<FrameAcquisitionPolicy>)
 		.def("finalize", &FrameAcquisitionPolicy::finalize)
 		.def_property_readonly("filtered_out", &FrameAcquisitionPolicy::get_filtered_out)
 	;
@@ -84,6 +198,8 @@ PYBIND11_MODULE(transport_ext, m) {
 	py::class_<LegacyFrameAcquisitionPolicy>(m, "LegacyFrameAcquisitionPolicy", py::dynamic_attr())
 		.def(py::init<const std::optional<FrameAcquisitionPolicy::filter_t>&>(), py::arg("filtered_out") = std::nullopt)
 		.def("feed", &FrameAcquisitionPolicy::feed)
+		.def("feed_batch", &policy_feed_batch<LegacyFrameAcquisitionPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+		.def("_frame_batch_sink", &policy_frame_batch_sink<LegacyFrameAcquisitionPolicy>)
 		.def("finalize", &FrameAcquisitionPolicy::finalize)
 		.def_property_readonly("reqQueue", &LegacyFrameAcquisitionPolicy::get_req_queue)
 		.def_property_readonly("resQueue", &LegacyFrameAcquisitionPolicy::get_res_queue)
@@ -98,12 +214,16 @@ PYBIND11_MODULE(transport_ext, m) {
 	py::class_<NoOpPolicy>(m, "NoOpPolicy", py::dynamic_attr())
 		.def(py::init<const std::optional<FrameAcquisitionPolicy::filter_t>&>(), py::arg("filtered_out") = std::nullopt)
 		.def("feed", &FrameAcquisitionPolicy::feed)
+		.def("feed_batch", &policy_feed_batch<NoOpPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+		.def("_frame_batch_sink", &policy_frame_batch_sink<NoOpPolicy>)
 		.def("finalize", &FrameAcquisitionPolicy::finalize)
 	;
 
 	py::class_<StdoutPolicy>(m, "StdoutPolicy", py::dynamic_attr())
 		.def(py::init<const std::optional<FrameAcquisitionPolicy::filter_t>&>(), py::arg("filtered_out") = std::nullopt)
 		.def("feed", &FrameAcquisitionPolicy::feed)
+		.def("feed_batch", &policy_feed_batch<StdoutPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+		.def("_frame_batch_sink", &policy_frame_batch_sink<StdoutPolicy>)
 		.def("finalize", &FrameAcquisitionPolicy::finalize)
 	;
 
@@ -111,6 +231,8 @@ PYBIND11_MODULE(transport_ext, m) {
 		.def(py::init<const std::string&, const std::optional<FrameAcquisitionPolicy::filter_t>&, uint32_t, uint32_t>(),
 			py::arg("file_name"), py::arg("filtered_out") = std::nullopt, py::arg("prealloc") = 10UL, py::arg("chunk_size") = 1)
 		.def("feed", &FrameAcquisitionPolicy::feed)
+		.def("feed_batch", &policy_feed_batch<FrameRecorderPolicy>, "data"_a, "offsets"_a, "lengths"_a, "counters"_a, "timestamps"_a, "categories"_a)
+		.def("_frame_batch_sink", &policy_frame_batch_sink<FrameRecorderPolicy>)
 		.def("finalize", &FrameAcquisitionPolicy::finalize)
 	;
     // Transport layer type enum
@@ -140,10 +262,9 @@ PYBIND11_MODULE(transport_ext, m) {
 
     py::class_<XcpFraming>(m, "XcpFraming")
         .def(py::init<const XcpFramingConfig&>())
-        .def("prepare_request", [](XcpFraming &self, std::uint32_t cmd, py::bytes data) {
-            std::string s = data;
-            std::vector<uint8_t> data_vec(s.begin(), s.end());
-            return self.prepare_request(cmd, data_vec);
+        .def("prepare_request", [](XcpFraming &self, std::uint32_t cmd, const py::bytes &data) {
+            const auto view = bytes_as_string_view(data);
+            return self.prepare_request(cmd, std::span<const std::uint8_t>(reinterpret_cast<const std::uint8_t *>(view.data()), view.size()));
         }, "cmd"_a, "data"_a)
         .def("prepare_request", [](XcpFraming &self, std::uint32_t cmd, py::args data) {
             std::vector<uint8_t> data_vec;
@@ -160,14 +281,13 @@ PYBIND11_MODULE(transport_ext, m) {
 #define PYBIND11_SXI_RECEIVER(name)                                                                                                    \
     py::class_<name>(m, #name)                                                                                                         \
         .def(py::init([](std::function<void(py::bytes, uint16_t, uint16_t)> dispatch_handler) {                                        \
-            return new name([dispatch_handler](const std::vector<uint8_t>& payload, uint16_t length, uint16_t counter) {                \
+            return new name([dispatch_handler](std::span<const uint8_t> payload, uint16_t length, uint16_t counter) {                  \
                 py::gil_scoped_acquire acquire;                                                                                        \
                 dispatch_handler(py::bytes(reinterpret_cast<const char*>(payload.data()), payload.size()), length, counter);           \
             });                                                                                                                        \
         }), py::arg("dispatch_handler"))                                                                                               \
         .def("feed_bytes", [](name &self, const py::bytes &data) {                                                                     \
-            std::string s = data;                                                                                                      \
-            self.feed_bytes(s);                                                                                                        \
+            self.feed_bytes(std::string_view(data));                                                                                   \
         }, py::arg("data"))                                                                                                            \
     ;
 
@@ -190,6 +310,33 @@ PYBIND11_MODULE(transport_ext, m) {
     PYBIND11_SXI_RECEIVER(SxiFrLFWC8)
     PYBIND11_SXI_RECEIVER(SxiFrLFWC16)
 
+    py::enum_<UsbMessagePacking>(m, "UsbMessagePacking")
+        .value("SINGLE", UsbMessagePacking::Single)
+        .value("MULTIPLE", UsbMessagePacking::Multiple)
+        .value("STREAMING", UsbMessagePacking::Streaming)
+    ;
+
+    py::class_<UsbReceiver>(m, "UsbReceiver")
+        .def(py::init([](std::function<void(py::bytes, uint16_t, uint16_t, uint64_t)> dispatch_handler, const XcpFramingConfig &framing,
+                         UsbMessagePacking packing, std::uint16_t alignment, std::uint16_t max_packet_size) {
+            return new UsbReceiver([dispatch_handler](std::span<const uint8_t> payload, uint16_t length, uint16_t counter, uint64_t timestamp) {
+                py::gil_scoped_acquire acquire;
+                dispatch_handler(py::bytes(reinterpret_cast<const char*>(payload.data()), payload.size()), length, counter, timestamp);
+            }, framing, packing, alignment, max_packet_size);
+        }), py::arg("dispatch_handler"), py::arg("framing"), py::arg("packing") = UsbMessagePacking::Single, py::arg("alignment") = 1,
+            py::arg("max_packet_size") = 0)
+        .def("feed_transfer", [](UsbReceiver &self, const py::buffer &data, uint64_t timestamp) {
+            // Any bytes-like object (e.g. a pooled transfer buffer), split without a copy.
+            const auto info = data.request();
+            self.feed_transfer(std::string_view(static_cast<const char*>(info.ptr), static_cast<std::size_t>(info.size * info.itemsize)), timestamp);
+        }, py::arg("data"), py::arg("timestamp") = 0)
+        .def("reset", &UsbReceiver::reset)
+        .def_property_readonly("messages", &UsbReceiver::messages)
+        .def_property_readonly("transfers", &UsbReceiver::transfers)
+        .def_property_readonly("discarded", &UsbReceiver::discarded)
+        .def_property("max_packet_size", &UsbReceiver::max_packet_size, &UsbReceiver::set_max_packet_size)
+    ;
+
     py::class_<EthReceiver>(m, "EthReceiver")
         .def(py::init([](std::function<void(py::bytes, uint16_t, uint16_t, uint64_t)> dispatch_handler) {
             return new EthReceiver([dispatch_handler](const std::vector<uint8_t>& payload, uint16_t length, uint16_t counter, uint64_t timestamp) {
@@ -201,10 +348,289 @@ PYBIND11_MODULE(transport_ext, m) {
             std::string s = data;
             self.feed_bytes(s, timestamp);
         }, py::arg("data"), py::arg("timestamp") = 0)
-        .def("feed_frame", [](EthReceiver &self, const py::bytes &data, uint64_t timestamp) {
-            std::string s = data;
-            self.feed_frame(std::string_view(s), timestamp);
+        .def("feed_frame", [](EthReceiver &self, const py::buffer &data, uint64_t timestamp) {
+            // Any bytes-like object (e.g. a `memoryview` of a pooled receive buffer), framed without a copy.
+            const auto info = data.request();
+            self.feed_frame(std::string_view(static_cast<const char*>(info.ptr), static_cast<std::size_t>(info.size * info.itemsize)), timestamp);
         }, py::arg("data"), py::arg("timestamp") = 0)
         .def("reset", &EthReceiver::reset)
+#if defined(__linux__)
+        .def("feed_datagrams", [](EthReceiver &self, const DatagramBatch &batch) {
+            for (std::size_t idx = 0; idx < batch.size(); ++idx) {
+                self.feed_frame(batch.datagram(idx), batch.timestamps[idx]);
+            }
+        }, py::arg("batch"))
+#endif
+    ;
+
+#if defined(__linux__)
+    py::class_<DatagramBatch, std::shared_ptr<DatagramBatch>>(m, "DatagramBatch")
+        .def("__len__", &DatagramBatch::size)
+        .def("datagram", [](const DatagramBatch &self, std::size_t idx) {
+            if (idx >= self.size()) {
+                throw py::index_error("DatagramBatch index out of range");
+            }
+            const auto datagram = self.datagram(idx);
+            return py::bytes(datagram.data(), datagram.size());
+        }, py::arg("idx"))
+        .def_property_readonly("lengths", [](const DatagramBatch &self) {
+            return std::vector<std::uint32_t>(self.lengths.begin(), self.lengths.begin() + self.size());
+        })
+        .def_property_readonly("timestamps", [](const DatagramBatch &self) {
+            return std::vector<std::uint64_t>(self.timestamps.begin(), self.timestamps.begin() + self.size());
+        })
+    ;
+
+    py::class_<UdpBatchReader>(m, "UdpBatchReader")
+        .def(py::init<int, std::size_t, std::size_t, std::uint64_t>(),
+            py::arg("sock"), py::arg("max_datagrams"), py::arg("datagram_size"), py::arg("clock_offset") = 0)
+        .def("receive", [](UdpBatchReader &self, int timeout_ms) -> std::shared_ptr<DatagramBatch> {
+            std::shared_ptr<DatagramBatch> batch;
+            std::system_error              error(0, std::generic_category());
+            bool                           failed = false;
+            {
+                py::gil_scoped_release release;
+                try {
+                    batch = self.receive(timeout_ms);
+                } catch (const std::system_error &ex) {
+                    error  = ex;
+                    failed = true;
+                }
+            }
+            if (failed) {
+                raise_os_error(error);
+            }
+            return batch;
+        }, py::arg("timeout_ms"))
+        .def_property_readonly("max_datagrams", &UdpBatchReader::max_datagrams)
+        .def_property("datagram_size", &UdpBatchReader::datagram_size, &UdpBatchReader::set_datagram_size)
+        .def_property_readonly("kernel_timestamps", &UdpBatchReader::kernel_timestamps)
+        .def_property_readonly("datagrams", &UdpBatchReader::datagrams)
+        .def_property_readonly("syscalls", &UdpBatchReader::syscalls)
+        .def_property_readonly("truncated", &UdpBatchReader::truncated)
+    ;
+
+    py::class_<EthBlockSender>(m, "EthBlockSender")
+        .def(py::init<int, int>(), py::arg("sock"), py::arg("timeout_ms") = 2000)
+        .def("send_block", [](EthBlockSender &self, const std::vector<py::bytes> &frames, Pacer &pacer) {
+            std::vector<std::string_view> views;
+            views.reserve(frames.size());
+            for (const auto &frame : frames) {
+                views.emplace_back(frame);
+            }
+            std::system_error error(0, std::generic_category());
+            bool              failed = false;
+            {
+                py::gil_scoped_release release;
+                try {
+                    self.send_block(views, pacer);
+                } catch (const std::system_error &ex) {
+                    error  = ex;
+                    failed = true;
+                }
+            }
+            if (failed) {
+                raise_os_error(error);
+            }
+        }, py::arg("frames"), py::arg("pacer"),
+           "Send `frames` with one `sendmsg()` (TCP) / `sendmmsg()` (UDP), or one per `pacer` slot; without the GIL.")
+        .def_property_readonly("stream", &EthBlockSender::stream)
+        .def_property_readonly("buffer_size", &EthBlockSender::buffer_size)
+        .def_property_readonly("frames", &EthBlockSender::frames)
+        .def_property_readonly("syscalls", &EthBlockSender::syscalls)
+    ;
+
+    py::class_<SocketCanReader>(m, "SocketCanReader")
+        .def(py::init([](const std::string &channel, bool fd, std::size_t max_frames, bool hardware_timestamps, std::uint64_t clock_offset) {
+            try {
+                return new SocketCanReader(channel, fd, max_frames, hardware_timestamps, clock_offset);
+            } catch (const std::system_error &ex) {
+                raise_os_error(ex);
+            }
+        }), py::arg("channel"), py::arg("fd") = false, py::arg("max_frames") = 64, py::arg("hardware_timestamps") = false,
+            py::arg("clock_offset") = 0)
+        .def("set_filters", [](SocketCanReader &self, const std::vector<std::pair<std::uint32_t, std::uint32_t>> &filters) {
+            try {
+                self.set_filters(filters);
+            } catch (const std::system_error &ex) {
+                raise_os_error(ex);
+            }
+        }, py::arg("filters"), "`(can_id, can_mask)` pairs as in `struct can_filter`, bit 31 = CAN_EFF_FLAG.")
+        .def("set_pid_map", &SocketCanReader::set_pid_map, py::arg("pid_map"),
+            "PID_OFF: identifier -> ODT number; received payloads of these identifiers are prefixed with it.")
+        .def("receive", [](SocketCanReader &self, int timeout_ms) {
+            std::size_t       count = 0;
+            std::system_error error(0, std::generic_category());
+            bool              failed = false;
+            {
+                py::gil_scoped_release release;
+                try {
+                    count = self.receive(timeout_ms);
+                } catch (const std::system_error &ex) {
+                    error  = ex;
+                    failed = true;
+                }
+            }
+            if (failed) {
+                raise_os_error(error);
+            }
+            py::list frames(count);
+            for (std::size_t idx = 0; idx < count; ++idx) {
+                const auto data = self.data(idx);
+                frames[idx] = py::make_tuple(self.identifier(idx), py::bytes(data.data(), data.size()), self.timestamp(idx));
+            }
+            return frames;
+        }, py::arg("timeout_ms"), "List of `(identifier, data, timestamp)` received within `timeout_ms`, empty on timeout.")
+        .def("send", [](SocketCanReader &self, std::uint32_t identifier, const py::bytes &data, bool fd, bool bitrate_switch) {
+            const std::string_view payload = data;
+            try {
+                self.send(identifier, payload, fd, bitrate_switch);
+            } catch (const std::system_error &ex) {
+                raise_os_error(ex);
+            }
+        }, py::arg("identifier"), py::arg("data"), py::arg("fd") = false, py::arg("bitrate_switch") = false)
+        .def("send_block", [](SocketCanReader &self, std::uint32_t identifier, const std::vector<py::bytes> &frames, bool fd,
+                              bool bitrate_switch, Pacer &pacer) {
+            std::vector<std::string_view> payloads;
+            payloads.reserve(frames.size());
+            for (const auto &frame : frames) {
+                payloads.emplace_back(frame);
+            }
+            std::system_error error(0, std::generic_category());
+            bool              failed = false;
+            {
+                py::gil_scoped_release release;
+                try {
+                    self.send_block(identifier, payloads, fd, bitrate_switch, pacer);
+                } catch (const std::system_error &ex) {
+                    error  = ex;
+                    failed = true;
+                }
+            }
+            if (failed) {
+                raise_os_error(error);
+            }
+        }, py::arg("identifier"), py::arg("frames"), py::arg("fd"), py::arg("bitrate_switch"), py::arg("pacer"),
+           "Send `frames` one per `pacer` slot, without the GIL.")
+        .def("close", &SocketCanReader::close)
+        .def_property_readonly("fileno", &SocketCanReader::fileno)
+        .def_property_readonly("channel", &SocketCanReader::channel)
+        .def_property_readonly("fd", &SocketCanReader::fd)
+        .def_property_readonly("kernel_timestamps", &SocketCanReader::kernel_timestamps)
+        .def_property_readonly("frames_received", &SocketCanReader::frames_received)
+        .def_property_readonly("syscalls", &SocketCanReader::syscalls)
+        .def_property_readonly("overflows", &SocketCanReader::overflows)
+    ;
+
+    py::class_<SerialReader>(m, "SerialReader")
+        .def(py::init<int, std::size_t>(), py::arg("fd"), py::arg("buffer_size") = SerialReader::DEFAULT_BUFFER_SIZE)
+        .def("read", [](SerialReader &self, int timeout_ms) {
+            std::string_view  data;
+            std::system_error error(0, std::generic_category());
+            bool              failed = false;
+            {
+                py::gil_scoped_release release;
+                try {
+                    data = self.read(timeout_ms);
+                } catch (const std::system_error &ex) {
+                    error  = ex;
+                    failed = true;
+                }
+            }
+            if (failed) {
+                raise_os_error(error);
+            }
+            return py::bytes(data.data(), data.size());
+        }, py::arg("timeout_ms") = 100, "Bytes received within `timeout_ms` (first byte awaited without the GIL), b'' on timeout.")
+        .def_property_readonly("fileno", &SerialReader::fileno)
+        .def_property_readonly("buffer_size", &SerialReader::buffer_size)
+        .def_property_readonly("bytes_received", &SerialReader::bytes_received)
+        .def_property_readonly("syscalls", &SerialReader::syscalls)
+    ;
+#endif
+
+    py::class_<Pacer>(m, "Pacer")
+        .def(py::init<std::uint64_t>(), py::arg("interval_ns") = 0)
+        .def("wait", &Pacer::wait, py::call_guard<py::gil_scoped_release>(), "Block until the next slot is due (GIL released).")
+        .def("reset", &Pacer::reset)
+        .def_property("interval_ns", &Pacer::interval_ns, &Pacer::set_interval_ns)
+        .def_property_readonly("slots", &Pacer::slots)
+        .def_property_readonly("waited_ns", &Pacer::waited_ns)
+    ;
+
+    m.def("send_paced", [](const py::function &send, const py::list &items, Pacer &pacer) {
+        const bool paced = pacer.interval_ns() > 0;
+        for (const auto &item : items) {
+            if (paced) {
+                py::gil_scoped_release release;
+                pacer.wait();
+            } else {
+                pacer.wait();  // Only claims the slot, no reason to hand over the GIL.
+            }
+            send(item);
+        }
+    }, py::arg("send"), py::arg("items"), py::arg("pacer"),
+       "Call `send(item)` for each of `items`, one per `pacer` slot; the loop runs in C++ and waits without the GIL.");
+
+    py::class_<PduRingBuffer>(m, "PduRingBuffer")
+        .def(py::init<std::size_t, std::size_t>(), py::arg("capacity") = 200, py::arg("max_data") = 256)
+        .def("record", [](PduRingBuffer &self, std::uint8_t direction, std::uint8_t category, std::uint32_t counter,
+                          std::uint64_t timestamp, std::uint32_t length, py::handle payload, std::size_t data_limit, int prefix) {
+            PyObject *obj = payload.ptr();
+            if (PyBytes_Check(obj)) {
+                self.record(direction, category, counter, timestamp, length, PyBytes_AS_STRING(obj), PyBytes_GET_SIZE(obj), data_limit,
+                    prefix);
+            } else if (PyByteArray_Check(obj)) {
+                self.record(direction, category, counter, timestamp, length, PyByteArray_AS_STRING(obj), PyByteArray_GET_SIZE(obj),
+                    data_limit, prefix);
+            } else {
+                const auto info = py::reinterpret_borrow<py::buffer>(payload).request();
+                self.record(direction, category, counter, timestamp, length, static_cast<const char *>(info.ptr),
+                    static_cast<std::size_t>(info.size * info.itemsize), data_limit, prefix);
+            }
+        }, py::arg("direction"), py::arg("category"), py::arg("counter"), py::arg("timestamp"), py::arg("length"), py::arg("payload"),
+           py::arg("data_limit") = std::numeric_limits<std::size_t>::max(), py::arg("prefix") = -1,
+           "`prefix` (0..255): byte stored in front of `payload` (e.g. the ODT number of a PID_OFF frame), -1 for none.")
+        .def("entries", [](const PduRingBuffer &self, std::size_t last_n) {
+            py::list result;
+            self.visit(last_n, [&result](const PduRingBuffer::Entry &entry, const char *data) {
+                result.append(py::make_tuple(entry.direction, entry.category, entry.counter, entry.timestamp, entry.length,
+                    py::bytes(data, entry.data_length)));
+            });
+            return result;
+        }, py::arg("last_n") = std::numeric_limits<std::size_t>::max(),
+           "(direction, category, counter, timestamp, length, data) of the `last_n` most recent PDUs, oldest first.")
+        .def("clear", &PduRingBuffer::clear)
+        .def("__len__", &PduRingBuffer::size)
+        .def_property_readonly("capacity", &PduRingBuffer::capacity)
+        .def_property_readonly("max_data", &PduRingBuffer::max_data)
+    ;
+
+    py::class_<PolicyLock>(m, "PolicyLock")
+        .def(py::init<>())
+        .def("acquire", &PolicyLock::acquire)
+        .def("release", &PolicyLock::release)
+        .def("__enter__", &PolicyLock::acquire)
+        .def("__exit__", [](PolicyLock &self, const py::args &) { self.release(); })
+    ;
+
+    py::class_<PyEthNativeReceiver>(m, "EthNativeReceiver")
+        .def(py::init<native_socket_t, bool, std::size_t, bool, py::object, py::function, std::uint64_t, py::object>(),
+            py::arg("sock"), py::arg("tcp"), py::arg("recv_size"), py::arg("daq_timestamps"), py::arg("policy"), py::arg("dispatch_handler"),
+            py::arg("clock_offset") = 0, py::arg("policy_lock") = py::none())
+        .def("start", [](PyEthNativeReceiver &self) { self.receiver().start(); })
+        .def("stop", [](PyEthNativeReceiver &self) { self.receiver().stop(); }, py::call_guard<py::gil_scoped_release>())
+        .def_property_readonly("running", [](PyEthNativeReceiver &self) { return self.receiver().is_running(); })
+        .def_property_readonly("closed", [](PyEthNativeReceiver &self) { return self.receiver().is_closed(); })
+        .def_property_readonly("error", [](PyEthNativeReceiver &self) { return self.receiver().error(); })
+        .def_property_readonly("daq_frames", [](PyEthNativeReceiver &self) { return self.receiver().daq_frames(); })
+        .def_property_readonly("daq_bytes", [](PyEthNativeReceiver &self) { return self.receiver().daq_bytes(); })
+        .def_property_readonly("dispatched_frames", [](PyEthNativeReceiver &self) { return self.receiver().dispatched_frames(); })
+        .def_property_readonly("first_daq_timestamp", [](PyEthNativeReceiver &self) { return self.receiver().first_daq_timestamp(); })
+        .def_property_readonly("last_counter", [](PyEthNativeReceiver &self) { return self.receiver().last_counter(); })
+        .def_property_readonly("truncated", [](PyEthNativeReceiver &self) { return self.receiver().truncated(); })
+        .def_property("recv_size",
+            [](PyEthNativeReceiver &self) { return self.receiver().recv_size(); },
+            [](PyEthNativeReceiver &self, std::size_t recv_size) { self.receiver().set_recv_size(recv_size); })
     ;
 }
@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 
-import threading
+import errno
+import logging
+import sys
 from array import array
-from collections import deque
-from typing import Optional
+from ctypes import CFUNCTYPE, POINTER, Structure, addressof, byref, c_int, c_long, c_ubyte, c_uint, c_void_p, cast
+from typing import Any, Callable, Optional
 
 import usb.backend.libusb0 as libusb0
 import usb.backend.libusb1 as libusb1
@@ -19,11 +21,229 @@ from pyxcp.transport.base import (
     XcpTransportLayerType,
     parse_header_format,
 )
+from pyxcp.transport.transport_ext import UsbMessagePacking, UsbReceiver
 from pyxcp.utils import short_sleep
 
 
 RECV_SIZE = 16384
-FIVE_MS = 5_000_000  # Five milliseconds in nanoseconds.
+
+MESSAGE_PACKING = {
+    "MESSAGE_PACKING_SINGLE": UsbMessagePacking.SINGLE,
+    "MESSAGE_PACKING_MULTIPLE": UsbMessagePacking.MULTIPLE,
+    "MESSAGE_PACKING_STREAMING": UsbMessagePacking.STREAMING,
+}
+
+ALIGNMENT = {
+    "ALIGNMENT_8_BIT": 1,
+    "ALIGNMENT_16_BIT": 2,
+    "ALIGNMENT_32_BIT": 4,
+    "ALIGNMENT_64_BIT": 8,
+}
+
+LIBUSB_ERROR_INTERRUPTED = -10
+
+LIBUSB_TRANSFER_TYPE_BULK = 2
+LIBUSB_TRANSFER_TYPE_INTERRUPT = 3
+
+LIBUSB_TRANSFER_COMPLETED = 0
+LIBUSB_TRANSFER_ERROR = 1
+LIBUSB_TRANSFER_TIMED_OUT = 2
+LIBUSB_TRANSFER_CANCELLED = 3
+LIBUSB_TRANSFER_STALL = 4
+LIBUSB_TRANSFER_NO_DEVICE = 5
+LIBUSB_TRANSFER_OVERFLOW = 6
+
+TRANSFER_ERRORS = {
+    LIBUSB_TRANSFER_ERROR: ("Transfer failed", errno.EIO),
+    LIBUSB_TRANSFER_STALL: ("Endpoint halted", errno.EIO),
+    LIBUSB_TRANSFER_NO_DEVICE: ("Device was disconnected", errno.ENODEV),
+    LIBUSB_TRANSFER_OVERFLOW: ("Device sent more data than requested", errno.EOVERFLOW),
+}
+
+logger = logging.getLogger("pyxcp.transport")
+
+# libusb functions and callbacks are LIBUSB_CALL, i.e. WINAPI on Windows (pyusb loads the library as `WinDLL` there).
+if sys.platform == "win32":
+    from ctypes import WINFUNCTYPE as LIBUSB_FUNCTYPE
+else:
+    LIBUSB_FUNCTYPE = CFUNCTYPE
+
+
+class _Timeval(Structure):
+    _fields_ = [("tv_sec", c_long), ("tv_usec", c_long)]
+
+
+class _LibusbTransfer(Structure):
+    """`struct libusb_transfer` (without the trailing isochronous packet descriptors, not used here)."""
+
+
+_LibusbTransferCallback = LIBUSB_FUNCTYPE(None, POINTER(_LibusbTransfer))
+
+_LibusbTransfer._fields_ = [
+    ("dev_handle", c_void_p),
+    ("flags", c_ubyte),
+    ("endpoint", c_ubyte),
+    ("type", c_ubyte),
+    ("timeout", c_uint),
+    ("status", c_int),
+    ("length", c_int),
+    ("actual_length", c_int),
+    ("callback", _LibusbTransferCallback),
+    ("user_data", c_void_p),
+    ("buffer", c_void_p),
+    ("num_iso_packets", c_int),
+]
+
+
+def _libusb_function(lib, name: str, restype, *argtypes):
+    """Bind `name` from the libusb1 library `lib` with our own prototype; the library's attributes are left as they are."""
+    return LIBUSB_FUNCTYPE(restype, *argtypes)((name, lib))
+
+
+def _libusb1_handles(device: usb.core.Device):
+    """Open `device` and return `(lib, ctx, dev_handle)` of pyusb's libusb1 backend.
+
+    pyusb has no public API for them, so this is the only place that touches pyusb internals
+    (`Device._ctx`, `libusb1._LibUSB` with its `lib` and `ctx`, `_DeviceHandle.handle`);
+    checked against pyusb 1.2 and 1.3 (`pyusb>=1.2,<2`). Raises `USBError` if they are not available.
+    """
+    try:
+        resources = device._ctx
+        backend = resources.backend
+        if not isinstance(backend, libusb1._LibUSB):
+            raise USBError("asynchronous transfers require the libusb1 backend")
+        resources.managed_open()
+        return backend.lib, backend.ctx, resources.handle.handle
+    except AttributeError as ex:
+        raise USBError(f"unsupported pyusb version {usb.__version__} ({ex})") from None
+
+
+def _check(result: int) -> int:
+    if result < 0:
+        raise USBError(f"libusb error {result}", error_code=result)
+    return result
+
+
+class AsyncBulkReader:
+    """IN-EP reception via the libusb1 asynchronous API (bound with ctypes, on the library loaded by pyusb's libusb1 backend).
+
+    `transfers` transfers are kept submitted, each with its own buffer from a fixed pool.
+    A completed transfer is handed to `on_transfer(data, timestamp)` (`data` is a `memoryview`
+    of the pooled buffer, valid during the call) and then resubmitted with the same buffer,
+    so the device always has transfers to fill while the host processes the previous ones.
+    """
+
+    def __init__(
+        self,
+        device: usb.core.Device,
+        endpoint: int,
+        transfers: int,
+        transfer_size: int,
+        on_transfer: Callable[[memoryview, int], None],
+        now: Callable[[], int],
+        interrupt: bool = False,
+    ) -> None:
+        lib, self.ctx, dev_handle = _libusb1_handles(device)
+        transfer_p = POINTER(_LibusbTransfer)
+        self.alloc_transfer = _libusb_function(lib, "libusb_alloc_transfer", transfer_p, c_int)
+        self.free_transfer = _libusb_function(lib, "libusb_free_transfer", None, transfer_p)
+        self.submit_transfer = _libusb_function(lib, "libusb_submit_transfer", c_int, transfer_p)
+        self.cancel_transfer = _libusb_function(lib, "libusb_cancel_transfer", c_int, transfer_p)
+        self.handle_events = _libusb_function(
+            lib, "libusb_handle_events_timeout_completed", c_int, c_void_p, POINTER(_Timeval), POINTER(c_int)
+        )
+        self.on_transfer = on_transfer
+        self.now = now
+        self.running: bool = False
+        self.error: Optional[USBError] = None
+        self.in_flight: int = 0
+        self.completed: int = 0
+        self._callback = _LibusbTransferCallback(self._complete)  # Has to outlive the transfers.
+        self.buffers = [(c_ubyte * transfer_size)() for _ in range(transfers)]
+        self._views = {addressof(buffer): memoryview(buffer).cast("B") for buffer in self.buffers}
+        self.transfers = []
+        for buffer in self.buffers:
+            transfer_p = self.alloc_transfer(0)
+            if not transfer_p:
+                self.close()
+                raise USBError("libusb_alloc_transfer() failed")
+            transfer = transfer_p.contents
+            transfer.dev_handle = dev_handle
+            transfer.endpoint = endpoint
+            transfer.type = LIBUSB_TRANSFER_TYPE_INTERRUPT if interrupt else LIBUSB_TRANSFER_TYPE_BULK
+            transfer.timeout = 0
+            transfer.buffer = cast(buffer, c_void_p)
+            transfer.length = transfer_size
+            transfer.callback = self._callback
+            transfer.num_iso_packets = 0
+            self.transfers.append(transfer_p)
+
+    def run(self, stop: Callable[[], bool]) -> None:
+        """Submit all transfers and handle their completions until `stop()` returns True or a transfer fails."""
+        self.running = True
+        for transfer_p in self.transfers:
+            self._submit(transfer_p)
+        timeout = _Timeval(0, 100_000)
+        try:
+            while self.running and not stop():
+                result = self.handle_events(self.ctx, byref(timeout), None)
+                if result != LIBUSB_ERROR_INTERRUPTED:
+                    _check(result)
+        finally:
+            self.running = False
+            self.cancel()
+        if self.error is not None:
+            raise self.error
+
+    def cancel(self) -> None:
+        """Cancel the submitted transfers and wait (max. one second) for their completion."""
+        for transfer_p in self.transfers:
+            self.cancel_transfer(transfer_p)  # Transfers not in flight just return an error.
+        timeout = _Timeval(0, 10_000)
+        for _ in range(100):
+            if not self.in_flight:
+                break
+            self.handle_events(self.ctx, byref(timeout), None)
+
+    def close(self) -> None:
+        if self.in_flight:
+            return  # Still owned by libusb, leak rather than free.
+        for transfer_p in self.transfers:
+            self.free_transfer(transfer_p)
+        self.transfers = []
+
+    def _submit(self, transfer_p) -> None:
+        try:
+            _check(self.submit_transfer(transfer_p))
+        except USBError as ex:
+            self.error = ex
+            self.running = False
+        else:
+            self.in_flight += 1
+
+    def _complete(self, transfer_p) -> None:
+        # Called by libusb from `libusb_handle_events_timeout_completed()`, i.e. in the thread running `run()`.
+        self.in_flight -= 1
+        transfer = transfer_p.contents
+        status = transfer.status
+        if status == LIBUSB_TRANSFER_COMPLETED:
+            self.completed += 1
+            try:
+                if transfer.actual_length:
+                    self.on_transfer(self._views[transfer.buffer][: transfer.actual_length], self.now())
+            except Exception:
+                # ctypes would swallow it.
+                logger.exception("XCPonUSB - error in IN-EP transfer handler")
+            finally:
+                if self.running:
+                    self._submit(transfer_p)
+        elif status == LIBUSB_TRANSFER_TIMED_OUT:
+            if self.running:
+                self._submit(transfer_p)
+        elif status != LIBUSB_TRANSFER_CANCELLED:
+            message, error_number = TRANSFER_ERRORS.get(status, (f"Transfer status {status}", errno.EIO))
+            self.error = USBError(message, errno=error_number)
+            self.running = False
 
 
 class Usb(BaseTransport):
@@ -58,20 +278,25 @@ class Usb(BaseTransport):
         self.in_ep_message_packing = self.config.in_ep_message_packing
         self.in_ep_alignment = self.config.in_ep_alignment
         self.in_ep_recommended_host_bufsize: int = self.config.in_ep_recommended_host_bufsize
+        self.in_ep_async_transfers: int = getattr(self.config, "in_ep_async_transfers", 0)
+        self.in_ep_transfer_size: int = max(
+            getattr(self.config, "in_ep_transfer_size", RECV_SIZE), self.in_ep_recommended_host_bufsize
+        )
 
         ## OUT-EP (CMD and STIM) Parameters.
         self.out_ep_number: int = self.config.out_ep_number
 
         self.device: Optional[usb.core.Device] = None
         self.status = 0
-
-        self._packet_listener = threading.Thread(
-            target=self._packet_listen,
-            args=(),
-            kwargs={},
-            daemon=True,
+        # Splits IN-EP transfers into XCP packets and dispatches them directly from the receiving thread.
+        self.receiver = UsbReceiver(
+            self.frame_dispatcher,
+            framing_config,
+            MESSAGE_PACKING[self.in_ep_message_packing],
+            ALIGNMENT[self.in_ep_alignment],
+            self.in_ep_max_packet_size,
         )
-        self._packets = deque()
+        self.async_reader: Optional[AsyncBulkReader] = None
 
     def connect(self):
         if self.library:
@@ -114,17 +339,12 @@ class Usb(BaseTransport):
 
         self.out_ep = interface[self.out_ep_number]
         self.in_ep = interface[self.in_ep_number]
+        # Reads ending on a packet boundary may continue in the next one.
+        self.receiver.max_packet_size = self.in_ep.wMaxPacketSize or self.in_ep_max_packet_size
 
         self.start_listener()
         self.status = 1  # connected
 
-    def start_listener(self):
-        super().start_listener()
-        if self._packet_listener.is_alive():
-            self._packet_listener.join(timeout=2.0)
-        self._packet_listener = threading.Thread(target=self._packet_listen, daemon=True)
-        self._packet_listener.start()
-
     def close(self):
         """Close the transport-layer connection and event-loop."""
         self.finish_listener()
@@ -133,41 +353,78 @@ class Usb(BaseTransport):
                 self.listener.join(timeout=2.0)
         except Exception:
             pass
-        try:
-            if self._packet_listener.is_alive():
-                self._packet_listener.join(timeout=2.0)
-        except Exception:
-            pass
         self.close_connection()
 
-    def _packet_listen(self):
+    def listen(self):
+        if self.in_ep_async_transfers > 0:
+            try:
+                self.async_reader = AsyncBulkReader(
+                    self.device,
+                    self.in_ep.bEndpointAddress,
+                    self.in_ep_async_transfers,
+                    self.in_ep_transfer_size,
+                    self.process_transfer,
+                    self.now,
+                    interrupt=self.in_ep_transfer_type == "INTERRUPT_TRANSFER",
+                )
+            except (USBError, AttributeError, TypeError) as ex:
+                # Attribute/type errors: pyusb internals (see `_libusb1_handles()`) or the libusb build are not as expected.
+                self.logger.warning(f"XCPonUSB - asynchronous transfers not available ({ex}), using synchronous reads.")
+            else:
+                self._listen_async()
+                return
+        self._listen_sync()
+
+    def _listen_async(self) -> None:
+        try:
+            self.async_reader.run(self.closeEvent.is_set)
+        except USBError as ex:
+            self.logger.error(f"XCPonUSB - IN-EP transfer failed: {ex}")
+            self.status = 0  # disconnected
+        finally:
+            self.async_reader.close()
+
+    def _listen_sync(self) -> None:
         close_event_set = self.closeEvent.is_set
-        _packets = self._packets
         read = self.in_ep.read
-        buffer = array("B", bytes(RECV_SIZE))
+        now = self.now
+        process_transfer = self.process_transfer
+        buffer = array("B", bytes(self.in_ep_transfer_size))
         buffer_view = memoryview(buffer)
         while True:
             try:
                 if close_event_set():
                     return
                 try:
-                    recv_timestamp = self.timestamp.value
                     read_count = read(buffer, 100)  # 100ms timeout
-                    if read_count != RECV_SIZE:
-                        _packets.append((buffer_view[:read_count].tobytes(), recv_timestamp))
-                    else:
-                        _packets.append((buffer.tobytes(), recv_timestamp))
                 except (USBError, USBTimeoutError):
-                    # print(format_exc())
                     short_sleep()
                     continue
             except BaseException:  # noqa: B036
                 # Note: catch-all only permitted if the intention is re-raising.
                 self.status = 0  # disconnected
                 break
+            if read_count:
+                process_transfer(buffer_view[:read_count], now())
+
+    def process_transfer(self, data: Any, timestamp: int) -> None:
+        """Split one IN-EP transfer into XCP packets; they are fed to the policy as one batch.
+
+        Errors while dispatching are logged, the receive loop keeps running.
+        """
+        self.begin_policy_batch()
+        try:
+            self.receiver.feed_transfer(data, timestamp)
+        except Exception:
+            self.logger.exception("XCPonUSB - error processing IN-EP transfer")
+        finally:
+            self.flush_policy_batch()
+
+    def frame_dispatcher(self, data: bytes, length: int, counter: int, timestamp: int) -> None:
+        self.process_response(data, length, counter, timestamp)
 
     def send(self, frame):
-        self.pre_send_timestamp = self.timestamp.value
+        self.pre_send_timestamp = self.now()
         try:
             self.out_ep.write(frame)
         except (USBError, USBTimeoutError):
@@ -176,53 +433,7 @@ class Usb(BaseTransport):
             # Ignore this here since a Timeout error will be raised anyway if
             # the device does not respond
             pass
-        self.post_send_timestamp = self.timestamp.value
-
-    def listen(self):
-        popleft = self._packets.popleft
-        process_response = self.process_response
-        close_event_set = self.closeEvent.is_set
-        _packets = self._packets
-        length: Optional[int] = None
-        counter: int = 0
-        data: bytearray = bytearray(b"")
-        last_sleep: int = self.timestamp.value
-
-        while True:
-            if close_event_set():
-                return
-            count: int = len(_packets)
-            if not count:
-                short_sleep()
-                last_sleep = self.timestamp.value
-                continue
-            for _ in range(count):
-                bts, timestamp = popleft()
-                data += bts
-                current_size: int = len(data)
-                current_position: int = 0
-                while True:
-                    if self.timestamp.value - last_sleep >= FIVE_MS:
-                        short_sleep()
-                        last_sleep = self.timestamp.value
-                    if length is None:
-                        if current_size >= self.framing.header_size:
-                            length, counter = self.framing.unpack_header(bytes(data), initial_offset=current_position)
-                            current_position += self.framing.header_size
-                            current_size -= self.framing.header_size
-                        else:
-                            data = data[current_position:]
-                            break
-                    else:
-                        if current_size >= length:
-                            response = data[current_position : current_position + length]
-                            process_response(response, length, counter, timestamp)
-                            current_size -= length
-                            current_position += length
-                            length = None
-                        else:
-                            data = data[current_position:]
-                            break
+        self.post_send_timestamp = self.now()
 
     def close_connection(self):
         if self.device is not None:
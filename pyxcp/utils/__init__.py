@@ -46,7 +46,7 @@ def getPythonVersion():
     return sys.version_info
 
 
-def decode_bytes(byte_str: bytes) -> str:
+def decode_bytes(byte_str: Union[bytes, bytearray]) -> str:
     """Decode bytes with the help of chardet"""
     encoding = chardet.detect(byte_str).get("encoding")
     if not encoding: